@@ -1,7 +1,7 @@
 #!/bin/bash
 
 # ExBuy 테스트 결과 비교 스크립트
-# results/*.json 파일을 분석하여 주요 메트릭 비교
+# results/*.json 파일을 분석하여 주요 메트릭 비교 (python3 -m shop.loadgen.k6results)
 
 set -e
 
@@ -27,83 +27,16 @@ if [ ! -d "$RESULTS_DIR" ] || [ -z "$(ls -A $RESULTS_DIR/*.json 2>/dev/null)" ];
     exit 1
 fi
 
-# 임시 파일
-TEMP_FILE=$(mktemp)
-trap "rm -f $TEMP_FILE" EXIT
-
-# JSON 파일에서 메트릭 추출 함수
-extract_metrics() {
-    local file=$1
-    local filename=$(basename "$file" .json)
-
-    # 파일에서 마지막 metrics 블록 추출
-    if ! cat "$file" | jq -r 'select(.type == "Point" and .metric == "http_req_duration") | .data.value' 2>/dev/null | tail -1 > /dev/null; then
-        return 1
-    fi
-
-    # 주요 메트릭 추출
-    local p95=$(cat "$file" | jq -r 'select(.type == "Point" and .metric == "http_req_duration" and .data.tags.expected_response == "true") | .data.value' 2>/dev/null | awk '{sum+=$1; n++} END {if(n>0) print sum/n; else print "N/A"}')
-    local p99=$(cat "$file" | jq -r 'select(.type == "Point" and .metric == "http_req_duration") | .data.value' 2>/dev/null | sort -n | tail -1)
-    local rps=$(cat "$file" | jq -r 'select(.type == "Point" and .metric == "http_reqs") | .data.value' 2>/dev/null | awk '{sum+=$1} END {print sum}')
-    local error_rate=$(cat "$file" | jq -r 'select(.type == "Point" and .metric == "http_req_failed") | .data.value' 2>/dev/null | awk '{sum+=$1; n++} END {if(n>0) print sum/n*100; else print "0"}')
-
-    # 파일명에서 서버와 시나리오 파싱
-    local server=$(echo "$filename" | cut -d'-' -f1-2)
-    local scenario=$(echo "$filename" | cut -d'-' -f3-)
-
-    echo "$server|$scenario|${p95:-N/A}|${p99:-N/A}|${rps:-N/A}|${error_rate:-N/A}" >> $TEMP_FILE
-}
-
-# 모든 JSON 파일 처리
+# k6 JSON 스트리밍 분석 (shop/loadgen/k6results.py) - 서버/시나리오별 p50~p99, 처리량, 오류율
+# 같은 서버/시나리오 파일은 병합된다. 리포트 JSON은 make compare-runs BASELINE=...에 쓸 수 있다
 echo -e "${YELLOW}결과 파일 분석 중...${NC}"
-for file in $RESULTS_DIR/*.json; do
-    extract_metrics "$file" || echo -e "${YELLOW}Warning: $file 파싱 실패${NC}"
-done
-
-# 결과가 있는지 확인
-if [ ! -s "$TEMP_FILE" ]; then
-    echo -e "${RED}분석 가능한 메트릭을 찾을 수 없습니다.${NC}"
-    exit 1
-fi
-
 echo ""
 echo -e "${CYAN}=== 서버별 성능 비교 ===${NC}"
 echo ""
-
-# 헤더 출력
-printf "${CYAN}%-20s %-15s %15s %15s %15s %15s${NC}\n" \
-    "Server" "Scenario" "Avg Latency(ms)" "Max Latency(ms)" "Total Reqs" "Error Rate(%)"
-echo "--------------------------------------------------------------------------------------------------------"
-
-# 결과 출력 (정렬)
-sort -t'|' -k1,1 -k2,2 "$TEMP_FILE" | while IFS='|' read -r server scenario p95 p99 rps error_rate; do
-    # 숫자 포맷팅
-    if [ "$p95" != "N/A" ]; then
-        p95=$(printf "%.2f" "$p95")
-    fi
-    if [ "$p99" != "N/A" ]; then
-        p99=$(printf "%.2f" "$p99")
-    fi
-    if [ "$rps" != "N/A" ]; then
-        rps=$(printf "%.0f" "$rps")
-    fi
-    if [ "$error_rate" != "N/A" ]; then
-        error_rate=$(printf "%.2f" "$error_rate")
-    fi
-
-    # 색상 적용 (에러율에 따라)
-    if [ "$error_rate" != "N/A" ] && (( $(echo "$error_rate > 5" | bc -l 2>/dev/null || echo 0) )); then
-        COLOR=$RED
-    elif [ "$error_rate" != "N/A" ] && (( $(echo "$error_rate > 1" | bc -l 2>/dev/null || echo 0) )); then
-        COLOR=$YELLOW
-    else
-        COLOR=$GREEN
-    fi
-
-    printf "${COLOR}%-20s %-15s %15s %15s %15s %15s${NC}\n" \
-        "$server" "$scenario" "$p95" "$p99" "$rps" "$error_rate"
-done
-
+python3 -m shop.loadgen.k6results summarize $RESULTS_DIR/*.json \
+    --output "$RESULTS_DIR/analysis/latest.json" \
+    --markdown "$RESULTS_DIR/analysis/latest.md" \
+    --no-history
 echo ""
 
 # 테스트 이력 표시
@@ -125,7 +58,8 @@ echo -e "${CYAN}=== 권장 사항 ===${NC}"
 echo ""
 echo "1. 에러율이 5% 이상인 테스트는 재실행을 권장합니다."
 echo "2. 지연시간이 1000ms 이상인 경우 최적화가 필요합니다."
-echo "3. Grafana 대시보드에서 상세 메트릭을 확인하세요: http://localhost:3000"
+echo "3. 두 실행의 유의한 차이는 make compare-runs BASELINE=... CANDIDATE=...로 확인하세요."
+echo "4. Grafana 대시보드에서 상세 메트릭을 확인하세요: http://localhost:3000"
 echo ""
 
 echo -e "${GREEN}==================================${NC}"
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 
 from pathlib import Path
 import os
+import sys
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -38,6 +39,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     # Third-party apps
     'rest_framework',
     'corsheaders',
@@ -49,6 +51,10 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django_prometheus.middleware.PrometheusBeforeMiddleware',
+    'shop.timing.ServerTimingMiddleware',
+    'shop.querystats.QueryStatsMiddleware',
+    'shop.profiler.ProfilerMiddleware',
+    'shop.querybudget.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -99,6 +105,91 @@ DATABASES = {
     }
 }
 
+# 프로세스 단위 연결 풀 (shop/db/pool.py) - gthread/gevent 워커의 스레드·그린렛이 max_size개 연결을 나눠 쓴다
+# 활성화하면 CONN_MAX_AGE는 0 (요청이 끝나면 풀에 반납), 워커당 최대 연결 수 = DB_POOL_MAX_SIZE
+# DB_POOL_MODE=transaction: PgBouncer(pool_mode=transaction) 뒤에서 쓸 때 - 세션 상태(SET TIME ZONE, 서버 측 커서)를 만들지 않음
+DB_POOL = os.getenv('DB_POOL', 'False') == 'True'
+if DB_POOL:
+    DATABASES['default'].update({
+        'ENGINE': 'shop.db',
+        'CONN_MAX_AGE': 0,
+        'POOL': {
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '0')),
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', '5')),                # checkout 대기 한도 (초)
+            'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', '300')),            # idle 연결 정리 (초)
+            'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', '3600')),   # 연결 최대 수명 (초)
+            'check_interval': float(os.getenv('DB_POOL_CHECK_INTERVAL', '30')),  # 이만큼 쉰 연결은 SELECT 1 검사 (초)
+            'mode': os.getenv('DB_POOL_MODE', 'session'),
+        },
+    })
+    if DATABASES['default']['POOL']['mode'] == 'transaction':
+        DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+# 엔드포인트별 쿼리 예산/N+1 검사 (shop/querybudget.py, 예산은 shop/urls.py)
+# raise: 위반 시 예외 (개발/테스트) / sample: 일부 요청만 검사해 경고 로그 + 메트릭 (운영) / off
+QUERY_BUDGET_MODE = os.getenv('QUERY_BUDGET_MODE', 'raise' if DEBUG else 'sample')
+QUERY_BUDGET_SAMPLE_RATE = float(os.getenv('QUERY_BUDGET_SAMPLE_RATE', '0.01'))
+
+# 요청 구간별 시간 (shop/timing.py) - Server-Timing 헤더 + django_request_phase_seconds{view, phase}
+# 구조화 로그(shop.timing, JSON 한 줄)는 샘플 비율만큼, 그리고 SERVER_TIMING_LOG_SLOW_MS 이상인 요청은 항상
+SERVER_TIMING = os.getenv('SERVER_TIMING', 'True') == 'True'
+SERVER_TIMING_LOG_SAMPLE_RATE = float(os.getenv('SERVER_TIMING_LOG_SAMPLE_RATE', '0.01'))
+SERVER_TIMING_LOG_SLOW_MS = float(os.getenv('SERVER_TIMING_LOG_SLOW_MS', '500'))
+
+# SQL fingerprint별 통계 (shop/querystats.py) - view × 시나리오(X-Load-Scenario / User-Agent scenario=)별
+# 호출 수/시간/행 수를 QUERY_STATS_FLUSH_INTERVAL초마다 QUERY_STATS_DIR 파일과 Prometheus로 내보낸다
+# QUERY_STATS_SLOW_MS 이상인 SELECT는 fingerprint당 QUERY_STATS_EXPLAIN_INTERVAL초에 한 번 EXPLAIN (ANALYZE, BUFFERS)
+# manage.py test에서는 기본으로 끈다 - 테스트 프로세스마다 플러시/EXPLAIN 스레드와 stats-{pid}.jsonl이 생기지 않게
+RUNNING_TESTS = sys.argv[1:2] == ['test']
+QUERY_STATS = os.getenv('QUERY_STATS', str(not RUNNING_TESTS)) == 'True'
+QUERY_STATS_DIR = os.getenv('QUERY_STATS_DIR', str(BASE_DIR / 'querystats'))
+QUERY_STATS_FLUSH_INTERVAL = float(os.getenv('QUERY_STATS_FLUSH_INTERVAL', '30'))
+QUERY_STATS_SLOW_MS = float(os.getenv('QUERY_STATS_SLOW_MS', '200'))
+QUERY_STATS_EXPLAIN = os.getenv('QUERY_STATS_EXPLAIN', str(not RUNNING_TESTS)) == 'True'
+QUERY_STATS_EXPLAIN_INTERVAL = float(os.getenv('QUERY_STATS_EXPLAIN_INTERVAL', '300'))
+QUERY_STATS_EXPLAIN_QUEUE = int(os.getenv('QUERY_STATS_EXPLAIN_QUEUE', '8'))
+QUERY_STATS_EXPLAIN_TIMEOUT_MS = int(os.getenv('QUERY_STATS_EXPLAIN_TIMEOUT_MS', '5000'))
+
+# 요청 샘플링 프로파일러 (shop/profiler.py) - 서명 토큰(X-Exbuy-Profile 헤더/?_profile=) 또는 URL 이름별 비율로 무장
+# PROFILER_RULES="product-detail:5,product-list:0.5" (퍼센트), 결과는 PROFILER_DIR에 collapsed/speedscope 파일
+PROFILER_RULES = os.getenv('PROFILER_RULES', '')
+PROFILER_DIR = os.getenv('PROFILER_DIR', str(BASE_DIR / 'profiles'))
+PROFILER_INTERVAL_MS = float(os.getenv('PROFILER_INTERVAL_MS', '1'))
+PROFILER_MAX_ACTIVE = int(os.getenv('PROFILER_MAX_ACTIVE', '4'))       # 워커당 동시 프로파일 수
+PROFILER_TOKEN_MAX_AGE = int(os.getenv('PROFILER_TOKEN_MAX_AGE', '3600'))  # 토큰 유효 시간 (초)
+# 프로파일 태그: 서버 종류와 워커 클래스 (gunicorn-gthread, uvicorn, ... / SERVER_TYPE이 없으면 local)
+PROFILER_TAG = os.getenv('PROFILER_TAG') or (
+    'uvicorn' if os.getenv('SERVER_TYPE') == 'uvicorn'
+    else f"{os.getenv('SERVER_TYPE')}-{os.getenv('WORKER_CLASS', 'sync')}" if os.getenv('SERVER_TYPE')
+    else 'local'
+)
+
+# 읽기 복제본 (shop/replicas.py) - DB_REPLICAS="host:port,host:port" (DB_NAME/USER/PASSWORD는 primary와 동일)
+# 별칭 replica1, replica2, ... 로 등록되고, 지정하면 라우터와 미들웨어가 활성화된다
+# 로컬 테스트는 primary 자신을 가리켜도 된다 (DB_REPLICAS=localhost:5432 - 지연 0으로 취급)
+for index, replica in enumerate(filter(None, os.getenv('DB_REPLICAS', '').split(',')), 1):
+    replica_host, _, replica_port = replica.strip().partition(':')
+    DATABASES[f'replica{index}'] = {
+        **DATABASES['default'],
+        'HOST': replica_host,
+        'PORT': replica_port or DATABASES['default']['PORT'],
+        # 응답 없는 복제본이 지연 검사 스레드를 오래 붙잡지 않도록
+        'OPTIONS': {'connect_timeout': 2},
+        'TEST': {'MIRROR': 'default'},
+    }
+REPLICA_DATABASES = [alias for alias in DATABASES if alias != 'default']
+if REPLICA_DATABASES:
+    DATABASE_ROUTERS = ['shop.replicas.ReplicaRouter']
+    MIDDLEWARE.insert(1, 'shop.replicas.ReplicaRoutingMiddleware')
+
+# 쓰기 요청 후 같은 클라이언트(쿠키)의 읽기를 primary로 보내는 시간 (초, read-your-writes)
+REPLICA_STICKY_SECONDS = float(os.getenv('REPLICA_STICKY_SECONDS', '5'))
+# 이보다 재생 지연이 큰 복제본은 라우팅에서 제외 (초)
+REPLICA_MAX_LAG_SECONDS = float(os.getenv('REPLICA_MAX_LAG_SECONDS', '2'))
+# 프로세스별 복제본 지연 검사 주기 (초)
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv('REPLICA_LAG_CHECK_INTERVAL', '1'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -141,15 +232,21 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# JSON 인코딩/파싱 라이브러리 (orjson: shop/renderers.py·parsers.py / json: DRF 기본 표준 라이브러리)
+JSON_LIBRARY = os.getenv('JSON_LIBRARY', 'orjson')
+
 # REST Framework settings
 REST_FRAMEWORK = {
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'shop.pagination.HybridPagination',  # ?pagination=cursor 로 키셋 모드
     'PAGE_SIZE': 100,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        # 첫 번째가 기본 (Accept 미지정/와일드카드)
+        'shop.renderers.ORJSONRenderer' if JSON_LIBRARY == 'orjson' else 'rest_framework.renderers.JSONRenderer',
+        'shop.renderers.MessagePackRenderer',  # Accept: application/msgpack
     ],
     'DEFAULT_PARSER_CLASSES': [
-        'rest_framework.parsers.JSONParser',
+        'shop.parsers.ORJSONParser' if JSON_LIBRARY == 'orjson' else 'rest_framework.parsers.JSONParser',
+        'shop.parsers.MessagePackParser',  # Content-Type: application/msgpack
         'rest_framework.parsers.MultiPartParser',
         'rest_framework.parsers.FormParser',
     ],
@@ -158,6 +255,52 @@ REST_FRAMEWORK = {
     'EXCEPTION_HANDLER': 'rest_framework.views.exception_handler',
 }
 
+# 네이티브 async 읽기 뷰 (shop/async_views.py)
+# ASGI(Uvicorn) 배포에서는 기본 활성화, WSGI에서는 async_to_sync 비용 때문에 비활성화
+ASYNC_VIEWS = os.getenv(
+    'ASYNC_VIEWS', 'True' if os.getenv('SERVER_TYPE') == 'uvicorn' else 'False'
+) == 'True'
+
+# 목록/검색 응답 고속 직렬화 (shop/fast_serializers.py, 뷰셋별 fast_list_serializer로 개별 지정 가능)
+FAST_SERIALIZERS = os.getenv('FAST_SERIALIZERS', 'True') == 'True'
+
+# 캐시 (shop/cache.py 응답 캐시)
+# CACHE_BACKEND=locmem: 워커별 로컬 메모리 (기본) / redis: 워커 간 공유 (CACHE_URL, 로컬 redis-server로 대체 가능)
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('CACHE_URL', 'redis://localhost:6379/1'),
+            'KEY_PREFIX': 'exbuy',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_prometheus.cache.backends.locmem.LocMemCache',  # get/hit/miss 메트릭 포함
+            'LOCATION': 'exbuy',
+            'KEY_PREFIX': 'exbuy',
+            'OPTIONS': {
+                'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '10000')),
+            },
+        }
+    }
+
+# 상품 목록/상세/검색 응답 캐시 (버전 카운터 무효화, TTL은 초)
+RESPONSE_CACHE = os.getenv('RESPONSE_CACHE', 'True') == 'True'
+RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', '30'))
+
+# POST /api/orders/ingest 기본 청크 크기 (청크마다 커밋)
+ORDER_INGEST_CHUNK_SIZE = int(os.getenv('ORDER_INGEST_CHUNK_SIZE', '1000'))
+
+# 재고 예약 lock_type=batched: 워커 내 예약을 모으는 구간 (밀리초)
+RESERVE_BATCH_WINDOW_MS = float(os.getenv('RESERVE_BATCH_WINDOW_MS', '2'))
+
+# POST /api/batch (shop/batch.py): 요청당 하위 요청 수 상한, 워커당 하위 요청 동시 실행 스레드 수 (1이면 순차)
+BATCH_MAX_REQUESTS = int(os.getenv('BATCH_MAX_REQUESTS', '20'))
+BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', '4'))
+
 # CORS settings (성능 테스트용으로 모두 허용)
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
@@ -174,12 +317,21 @@ LOGGING = {
             'format': '{levelname} {asctime} {module} {message}',
             'style': '{',
         },
+        # JSON 한 줄 그대로 (Promtail/Loki에서 | json으로 파싱)
+        'json_line': {
+            'format': '{message}',
+            'style': '{',
+        },
     },
     'handlers': {
         'console': {
             'class': 'logging.StreamHandler',
             'formatter': 'verbose',
         },
+        'json_console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'json_line',
+        },
     },
     'root': {
         'handlers': ['console'],
@@ -196,5 +348,10 @@ LOGGING = {
             'level': os.getenv('DB_LOG_LEVEL', 'WARNING'),
             'propagate': False,
         },
+        'shop.timing': {
+            'handlers': ['json_console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
@@ -35,6 +35,7 @@ else
         --bind 0.0.0.0:8000 \
         --workers ${WORKERS:-4} \
         --worker-class ${WORKER_CLASS:-sync} \
+        --threads ${THREADS:-1} \
         --timeout ${TIMEOUT:-120} \
         --access-logfile - \
         --error-logfile - \
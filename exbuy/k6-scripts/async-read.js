@@ -0,0 +1,127 @@
+// 비동기 읽기 뷰 비교 테스트 (Uvicorn vs gthread)
+// ASYNC_VIEWS 대상 엔드포인트만 100% 읽기
+
+import http from 'k6/http';
+import { check, sleep } from 'k6';
+import { Rate, Counter } from 'k6/metrics';
+
+const errorRate = new Rate('errors');
+const testMarker = new Counter('test_execution_marker');
+
+const BASE_URL = __ENV.BASE_URL ? `${__ENV.BASE_URL}/api` : 'http://localhost:9003/api';
+const MAX_VU = parseInt(__ENV.MAX_VU || '500');
+const DURATION = __ENV.DURATION || '2m';
+const RAMP_UP = __ENV.RAMP_UP || '30s';
+const RAMP_DOWN = __ENV.RAMP_DOWN || '10s';
+const SERVER_TYPE = __ENV.SERVER_TYPE || 'unknown';
+const SCENARIO_NAME = 'async-read';
+
+export const options = {
+  stages: [
+    { duration: RAMP_UP, target: MAX_VU },
+    { duration: DURATION, target: MAX_VU },
+    { duration: RAMP_DOWN, target: 0 },
+  ],
+  thresholds: {
+    http_req_duration: ['p(95)<800', 'p(99)<1500'],
+    http_req_failed: ['rate<0.1'],
+    errors: ['rate<0.1'],
+  },
+  // 서버 쪽 SQL 통계(shop/querystats.py)가 시나리오별로 나눠 집계하도록 User-Agent에 시나리오를 싣는다
+  userAgent: `k6 exbuy (scenario=${SCENARIO_NAME})`,
+  tags: {
+    scenario: SCENARIO_NAME,
+    server_type: SERVER_TYPE,
+  },
+};
+
+// 테스트 시작 시 실행 (1회만)
+export function setup() {
+  const startTime = new Date().toISOString();
+  console.log(`[TEST START] ${startTime} - Server: ${SERVER_TYPE}, Scenario: ${SCENARIO_NAME}, VU: ${MAX_VU}`);
+  testMarker.add(1, { event: 'start', server: SERVER_TYPE, scenario: SCENARIO_NAME });
+  return { startTime, server: SERVER_TYPE, scenario: SCENARIO_NAME, maxVU: MAX_VU };
+}
+
+// 테스트 종료 시 실행 (1회만)
+export function teardown(data) {
+  const endTime = new Date().toISOString();
+  console.log(`[TEST END] ${endTime} - Server: ${data.server}, Scenario: ${data.scenario}`);
+  testMarker.add(1, { event: 'end', server: data.server, scenario: data.scenario });
+}
+
+export default function () {
+  const scenarios = [
+    () => testProductList(),
+    () => testProductDetail(),
+    () => testProductReviews(),
+    () => testProductSearch(),
+    () => testReviews(),
+    () => testStats(),
+  ];
+
+  const scenario = scenarios[Math.floor(Math.random() * scenarios.length)];
+  scenario();
+
+  sleep(0.1);
+}
+
+function testProductList() {
+  const page = Math.floor(Math.random() * 3) + 1;
+  const res = http.get(`${BASE_URL}/products/?page=${page}`, {
+    tags: { name: 'product-list' },
+  });
+  check(res, {
+    'product list status 200': (r) => r.status === 200,
+  }) || errorRate.add(1);
+}
+
+function testProductDetail() {
+  const productId = Math.floor(Math.random() * 100) + 1;  // ID 범위: 1-100
+  const res = http.get(`${BASE_URL}/products/${productId}/`, {
+    tags: { name: 'product-detail' },
+  });
+  check(res, {
+    'product detail status 200': (r) => r.status === 200,
+  }) || errorRate.add(1);
+}
+
+function testProductReviews() {
+  const productId = Math.floor(Math.random() * 100) + 1;  // ID 범위: 1-100
+  const res = http.get(`${BASE_URL}/products/${productId}/reviews/`, {
+    tags: { name: 'product-reviews' },
+  });
+  check(res, {
+    'product reviews status 200': (r) => r.status === 200,
+  }) || errorRate.add(1);
+}
+
+function testProductSearch() {
+  const queries = ['book', 'phone', 'shirt', 'food', 'home'];
+  const q = queries[Math.floor(Math.random() * queries.length)];
+  const res = http.get(`${BASE_URL}/search/products?q=${q}`, {
+    tags: { name: 'product-search' },
+  });
+  check(res, {
+    'product search status 200': (r) => r.status === 200,
+  }) || errorRate.add(1);
+}
+
+function testReviews() {
+  const productId = Math.floor(Math.random() * 100) + 1;  // ID 범위: 1-100
+  const res = http.get(`${BASE_URL}/reviews/?product_id=${productId}`, {
+    tags: { name: 'reviews' },
+  });
+  check(res, {
+    'reviews status 200': (r) => r.status === 200,
+  }) || errorRate.add(1);
+}
+
+function testStats() {
+  const res = http.get(`${BASE_URL}/stats/top-products?limit=10`, {
+    tags: { name: 'stats-top-products' },
+  });
+  check(res, {
+    'stats status 200': (r) => r.status === 200,
+  }) || errorRate.add(1);
+}
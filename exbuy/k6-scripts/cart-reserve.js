@@ -0,0 +1,137 @@
+// 장바구니 재고 예약 테스트 (100% 쓰기)
+// 3-5개 상품 예약: 다건 엔드포인트 1회 vs 단건 엔드포인트 N회 순차 호출 비교
+// 인기 상품에 몰리는 Zipf 분포로 상품을 골라 행 락 경합을 만든다
+
+import http from 'k6/http';
+import { check, sleep } from 'k6';
+import { Rate, Counter, Trend } from 'k6/metrics';
+
+const errorRate = new Rate('errors');
+const testMarker = new Counter('test_execution_marker');
+const cartDuration = new Trend('cart_duration', true);    // 장바구니 1건 예약 완료까지 (단건 모드는 N회 합)
+const cartRoundTrips = new Counter('cart_round_trips');    // HTTP 왕복 수
+const cartRejected = new Rate('cart_rejected');           // 예약 실패 비율 (재고 부족/잠김)
+
+const BASE_URL = __ENV.BASE_URL ? `${__ENV.BASE_URL}/api` : 'http://localhost:9000/api';
+const MAX_VU = parseInt(__ENV.MAX_VU || '200');
+const DURATION = __ENV.DURATION || '2m';
+const RAMP_UP = __ENV.RAMP_UP || '10s';
+const RAMP_DOWN = __ENV.RAMP_DOWN || '30s';
+const SERVER_TYPE = __ENV.SERVER_TYPE || 'unknown';
+const SCENARIO_NAME = 'cart-reserve';
+// CART_MODE: batch(다건 1회) / single(단건 N회) / both(반반)
+const CART_MODE = __ENV.CART_MODE || 'both';
+const CART_LOCK = __ENV.CART_LOCK || 'nowait';               // 다건: nowait / skip_locked / wait
+const SINGLE_LOCK_TYPE = __ENV.SINGLE_LOCK_TYPE || 'pessimistic';
+const PRODUCTS = parseInt(__ENV.PRODUCTS || '100');
+const ZIPF_S = parseFloat(__ENV.ZIPF_S || '1.2');
+
+// k번째 상품 가중치 1/k^s 누적 분포
+const cumulative = [];
+let total = 0;
+for (let rank = 1; rank <= PRODUCTS; rank++) {
+  total += 1 / Math.pow(rank, ZIPF_S);
+  cumulative.push(total);
+}
+
+function pickProduct() {
+  const target = Math.random() * total;
+  let low = 0;
+  let high = cumulative.length - 1;
+  while (low < high) {
+    const mid = (low + high) >> 1;
+    if (cumulative[mid] < target) low = mid + 1; else high = mid;
+  }
+  return low + 1;
+}
+
+function pickCart() {
+  const size = Math.floor(Math.random() * 3) + 3;  // 3-5개 상품
+  const ids = new Set();
+  while (ids.size < size) ids.add(pickProduct());
+  return [...ids].map((id) => ({ product_id: id, quantity: Math.floor(Math.random() * 2) + 1 }));
+}
+
+export const options = {
+  stages: [
+    { duration: RAMP_UP, target: MAX_VU },
+    { duration: DURATION, target: MAX_VU },
+    { duration: RAMP_DOWN, target: 0 },
+  ],
+  thresholds: {
+    http_req_duration: ['p(95)<800', 'p(99)<1500'],
+    http_req_failed: ['rate<0.15'],
+    errors: ['rate<0.15'],
+  },
+  // 서버 쪽 SQL 통계(shop/querystats.py)가 시나리오별로 나눠 집계하도록 User-Agent에 시나리오를 싣는다
+  userAgent: `k6 exbuy (scenario=${SCENARIO_NAME})`,
+  tags: {
+    scenario: SCENARIO_NAME,
+    server_type: SERVER_TYPE,
+  },
+};
+
+// 테스트 시작 시 실행 (1회만)
+export function setup() {
+  const startTime = new Date().toISOString();
+  console.log(`[TEST START] ${startTime} - Server: ${SERVER_TYPE}, Scenario: ${SCENARIO_NAME}, VU: ${MAX_VU}, Mode: ${CART_MODE}`);
+  testMarker.add(1, { event: 'start', server: SERVER_TYPE, scenario: SCENARIO_NAME });
+  return { startTime, server: SERVER_TYPE, scenario: SCENARIO_NAME, maxVU: MAX_VU };
+}
+
+// 테스트 종료 시 실행 (1회만)
+export function teardown(data) {
+  const endTime = new Date().toISOString();
+  console.log(`[TEST END] ${endTime} - Server: ${data.server}, Scenario: ${data.scenario}`);
+  testMarker.add(1, { event: 'end', server: data.server, scenario: data.scenario });
+}
+
+export default function () {
+  const mode = CART_MODE === 'both' ? (Math.random() < 0.5 ? 'batch' : 'single') : CART_MODE;
+  const items = pickCart();
+
+  if (mode === 'batch') {
+    testBatchReserve(items);
+  } else {
+    testSingleReserves(items);
+  }
+
+  sleep(0.2);
+}
+
+function testBatchReserve(items) {
+  const params = {
+    headers: { 'Content-Type': 'application/json' },
+    tags: { name: `reserve-cart-batch-${CART_LOCK}` },
+  };
+
+  const res = http.post(`${BASE_URL}/inventory/reserve/batch?lock=${CART_LOCK}`, JSON.stringify({ items }), params);
+  cartDuration.add(res.timings.duration, { mode: 'batch' });
+  cartRoundTrips.add(1, { mode: 'batch' });
+  cartRejected.add(res.status === 409, { mode: 'batch' });
+  check(res, {
+    'reserve cart status 200 or 409': (r) => r.status === 200 || r.status === 409,
+  }) || errorRate.add(1);
+}
+
+function testSingleReserves(items) {
+  const params = {
+    headers: { 'Content-Type': 'application/json' },
+    tags: { name: `reserve-cart-single-${SINGLE_LOCK_TYPE}` },
+  };
+
+  // 기존 클라이언트 방식: 상품마다 별도 요청(별도 트랜잭션), 실패해도 앞선 예약은 남는다
+  let elapsed = 0;
+  let rejected = false;
+  for (const item of items) {
+    const res = http.post(`${BASE_URL}/inventory/reserve?lock_type=${SINGLE_LOCK_TYPE}`, JSON.stringify(item), params);
+    elapsed += res.timings.duration;
+    cartRoundTrips.add(1, { mode: 'single' });
+    rejected = rejected || res.status === 400;
+    check(res, {
+      'reserve inventory status 200 or 400': (r) => r.status === 200 || r.status === 400,
+    }) || errorRate.add(1);
+  }
+  cartDuration.add(elapsed, { mode: 'single' });
+  cartRejected.add(rejected, { mode: 'single' });
+}
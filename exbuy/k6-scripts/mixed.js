@@ -14,6 +14,8 @@ const DURATION = __ENV.DURATION || '3m';
 const RAMP_UP = __ENV.RAMP_UP || '10s';
 const RAMP_DOWN = __ENV.RAMP_DOWN || '30s';
 const SERVER_TYPE = __ENV.SERVER_TYPE || 'unknown';
+// 재고 예약 lock_type 목록 (예: LOCK_TYPES=atomic,batched)
+const LOCK_TYPES = (__ENV.LOCK_TYPES || 'optimistic,pessimistic').split(',');
 const SCENARIO_NAME = 'mixed';
 
 export const options = {
@@ -27,6 +29,8 @@ export const options = {
     http_req_failed: ['rate<0.12'],
     errors: ['rate<0.12'],
   },
+  // 서버 쪽 SQL 통계(shop/querystats.py)가 시나리오별로 나눠 집계하도록 User-Agent에 시나리오를 싣는다
+  userAgent: `k6 exbuy (scenario=${SCENARIO_NAME})`,
   tags: {
     scenario: SCENARIO_NAME,
     server_type: SERVER_TYPE,
@@ -190,7 +194,7 @@ function testCreateOrder() {
 
   const res = http.post(`${BASE_URL}/orders/`, payload, params);  // trailing slash 추가
   check(res, {
-    'create order status 201 or 400': (r) => r.status === 201 || r.status === 400,
+    'create order status 201 or 409': (r) => r.status === 201 || r.status === 409,
   }) || errorRate.add(1);
 }
 
@@ -219,7 +223,7 @@ function testReserveInventory() {
     quantity: Math.floor(Math.random() * 5) + 1,
   });
 
-  const lockType = Math.random() < 0.5 ? 'optimistic' : 'pessimistic';
+  const lockType = LOCK_TYPES[Math.floor(Math.random() * LOCK_TYPES.length)];
 
   const params = {
     headers: { 'Content-Type': 'application/json' },
@@ -27,6 +27,8 @@ export const options = {
     http_req_failed: ['rate<0.1'],
     errors: ['rate<0.1'],
   },
+  // 서버 쪽 SQL 통계(shop/querystats.py)가 시나리오별로 나눠 집계하도록 User-Agent에 시나리오를 싣는다
+  userAgent: `k6 exbuy (scenario=${SCENARIO_NAME})`,
   tags: {
     scenario: SCENARIO_NAME,
     server_type: SERVER_TYPE,
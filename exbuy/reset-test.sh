@@ -17,12 +17,25 @@ echo -e "${BLUE}  ExBuy Test Data Reset${NC}"
 echo -e "${BLUE}==================================${NC}"
 echo ""
 
+# 실행 중인 앱 서버 재시작 - 리셋 명령은 별도 컨테이너(run --rm)나 psql로 실행되므로
+# 서버 워커의 로컬 메모리(locmem) 응답 캐시는 비우지 못한다. 재시작으로 리셋 전 데이터의 캐시를 버린다
+restart_app_servers() {
+    local services
+    services=$(docker compose ps --services --status running | grep '^web-' || true)
+    if [ -z "$services" ]; then
+        return
+    fi
+    echo -e "${BLUE}앱 서버 재시작 (응답 캐시 비우기): $(echo $services)${NC}"
+    docker compose restart $services
+}
+
 # 리셋 방법 선택
 echo -e "${YELLOW}Select reset method:${NC}"
 echo "1) Quick reset (재고 복구, 빠름)"
 echo "2) Full reset (데이터 재생성, 느림)"
+echo "3) Snapshot restore (마지막 시딩 스냅샷으로 복원, 수 초)"
 echo ""
-read -p "Enter choice (1-2): " choice
+read -p "Enter choice (1-3): " choice
 
 case $choice in
     1)
@@ -71,19 +84,13 @@ EOF
 
         case $size_choice in
             1)
-                PRODUCTS=1000
-                ORDERS=5000
-                REVIEWS=10000
+                SCALE_FACTOR=0.1
                 ;;
             2)
-                PRODUCTS=10000
-                ORDERS=50000
-                REVIEWS=100000
+                SCALE_FACTOR=1
                 ;;
             3)
-                PRODUCTS=100000
-                ORDERS=500000
-                REVIEWS=1000000
+                SCALE_FACTOR=10
                 ;;
             *)
                 echo -e "${RED}Invalid choice${NC}"
@@ -91,24 +98,35 @@ EOF
                 ;;
         esac
 
-        echo -e "${YELLOW}Generating data: $PRODUCTS products, $ORDERS orders, $REVIEWS reviews${NC}"
+        echo -e "${YELLOW}Generating data: scale factor $SCALE_FACTOR (seed ${SEED:-42})${NC}"
 
-        # 데이터 재생성
+        # 데이터 재생성 (같은 규모/시드면 항상 같은 데이터) + 스냅샷 저장
         docker compose run --rm web-gunicorn-sync python manage.py seed_data \
-            --products $PRODUCTS \
-            --orders $ORDERS \
-            --reviews $REVIEWS \
-            --batch-size 1000
+            --scale-factor $SCALE_FACTOR \
+            --seed ${SEED:-42} \
+            --drop-indexes \
+            --snapshot
 
         echo -e "${GREEN}✓ Full reset completed${NC}"
         ;;
 
+    3)
+        echo -e "${BLUE}Snapshot restore: 스냅샷으로 복원 중...${NC}"
+
+        docker compose run --rm web-gunicorn-sync python manage.py dataset_snapshot status
+        docker compose run --rm web-gunicorn-sync python manage.py dataset_snapshot restore
+
+        echo -e "${GREEN}✓ Snapshot restore completed${NC}"
+        ;;
+
     *)
         echo -e "${RED}Invalid choice${NC}"
         exit 1
         ;;
 esac
 
+restart_app_servers
+
 echo ""
 echo -e "${GREEN}==================================${NC}"
 echo -e "${GREEN}  Reset completed successfully!${NC}"
@@ -1,14 +1,31 @@
 from django.contrib import admin
+from .aggregates import apply_sales, order_sales_change, stored_sales
+from .cache import invalidate_products
 from .models import Product, Order, OrderItem, Review
 
 
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
-    list_display = ['id', 'name', 'price', 'stock', 'category', 'updated_at']
+    list_display = ['id', 'name', 'price', 'stock', 'category', 'review_count', 'updated_at']
     list_filter = ['category', 'updated_at']
     search_fields = ['name', 'description']
     ordering = ['-updated_at']
 
+    # 관리자 편집(가격/재고/카테고리 등)을 응답 캐시에 반영
+    def save_model(self, request, obj, form, change):
+        # 카테고리 변경 시 이전 카테고리 목록도 무효화
+        before = list(Product.objects.filter(pk=obj.pk).values_list('pk', 'category')) if change else []
+        super().save_model(request, obj, form, change)
+        invalidate_products(before + [obj])
+
+    def delete_model(self, request, obj):
+        invalidate_products([obj])
+        super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        invalidate_products(list(queryset.values_list('pk', 'category')))
+        super().delete_queryset(request, queryset)
+
 
 class OrderItemInline(admin.TabularInline):
     model = OrderItem
@@ -24,6 +41,25 @@ class OrderAdmin(admin.ModelAdmin):
     ordering = ['-created_at']
     inlines = [OrderItemInline]
 
+    # 상태/아이템 편집을 일별 판매 롤업에 반영 (변경 전 기여분 제거 후 재반영)
+    # save_model → save_related는 admin 변경 트랜잭션 안에서 순서대로 실행된다
+    def save_model(self, request, obj, form, change):
+        obj._sales_before = stored_sales([obj.pk]) if change else []
+        super().save_model(request, obj, form, change)
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        order = form.instance
+        apply_sales(stored_sales([order.pk]), removed=order._sales_before)
+
+    def delete_model(self, request, obj):
+        with order_sales_change([obj.pk]):
+            super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        with order_sales_change(list(queryset.values_list('pk', flat=True))):
+            super().delete_queryset(request, queryset)
+
 
 @admin.register(OrderItem)
 class OrderItemAdmin(admin.ModelAdmin):
@@ -31,6 +67,21 @@ class OrderItemAdmin(admin.ModelAdmin):
     list_filter = ['order__status']
     search_fields = ['product__name']
 
+    def save_model(self, request, obj, form, change):
+        order_ids = {obj.order_id}
+        if change:
+            order_ids.add(OrderItem.objects.values_list('order_id', flat=True).get(pk=obj.pk))
+        with order_sales_change(order_ids):
+            super().save_model(request, obj, form, change)
+
+    def delete_model(self, request, obj):
+        with order_sales_change([obj.order_id]):
+            super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        with order_sales_change(set(queryset.values_list('order_id', flat=True))):
+            super().delete_queryset(request, queryset)
+
 
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
@@ -0,0 +1,273 @@
+"""
+비정규화 집계 유지보수
+
+- 상품 리뷰 집계 (Product.review_count / rating_sum / rating_N_count)
+  ReviewViewSet 쓰기 경로에서 증분 갱신하고, rebuild_review_stats 명령으로 재계산/검증한다.
+- 상품별 일별 판매 롤업 (ProductDailySales, 취소 주문 제외)
+  주문 생성/벌크 생성/상태 변경/삭제 경로에서 증분 갱신하고, rebuild_sales_rollup 명령으로 재계산/검증한다.
+"""
+from contextlib import contextmanager
+from datetime import date, datetime, time, timezone as dt_timezone
+from decimal import Decimal
+
+from django.db import connection
+from django.utils import timezone
+
+from .models import Product, OrderItem
+
+
+# =============== 리뷰 집계 ===============
+REVIEW_STATS_SQL = """
+    WITH stats AS (
+        SELECT product_id,
+               COUNT(*) AS review_count,
+               SUM(rating) AS rating_sum,
+               COUNT(*) FILTER (WHERE rating = 1) AS rating_1_count,
+               COUNT(*) FILTER (WHERE rating = 2) AS rating_2_count,
+               COUNT(*) FILTER (WHERE rating = 3) AS rating_3_count,
+               COUNT(*) FILTER (WHERE rating = 4) AS rating_4_count,
+               COUNT(*) FILTER (WHERE rating = 5) AS rating_5_count
+        FROM shop_review
+        GROUP BY product_id
+    )
+"""
+
+REVIEW_STATS_COLUMNS = [
+    'review_count', 'rating_sum',
+    'rating_1_count', 'rating_2_count', 'rating_3_count', 'rating_4_count', 'rating_5_count',
+]
+
+
+def apply_review(product_id, rating, delta):
+    """
+    리뷰 1건 추가(delta=1)/삭제(delta=-1)를 상품 집계에 원자적으로 반영 (UPDATE ... RETURNING 1회)
+    상세/목록 응답이 바뀌므로 updated_at(조건부 GET 검증자)도 함께 갱신
+    반환: 상품 카테고리 (응답 캐시 무효화용, 없는 상품이면 None)
+    """
+    rating_field = f'rating_{int(rating)}_count'
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            UPDATE {Product._meta.db_table}
+            SET review_count = review_count + %s, rating_sum = rating_sum + %s,
+                {rating_field} = {rating_field} + %s, updated_at = %s
+            WHERE id = %s
+            RETURNING category
+        """, [delta, rating * delta, delta, timezone.now(), product_id])
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def rebuild_review_stats():
+    """
+    shop_review 전체를 다시 집계해 모든 상품의 리뷰 집계를 덮어쓴다 (리뷰 없는 상품은 0)
+    재계산 중 리뷰 쓰기(와 그 apply_review 증분)가 끼어들지 않도록 리뷰 테이블을 잠근다 (트랜잭션 안에서 호출)
+    반환: 갱신된 상품 수
+    """
+    assignments = ', '.join(f'{col} = COALESCE(stats.{col}, 0)' for col in REVIEW_STATS_COLUMNS)
+    with connection.cursor() as cursor:
+        cursor.execute('LOCK TABLE shop_review IN SHARE ROW EXCLUSIVE MODE')
+        cursor.execute(f"""
+            {REVIEW_STATS_SQL}
+            UPDATE shop_product AS p SET {assignments}
+            FROM shop_product AS p2
+            LEFT JOIN stats ON stats.product_id = p2.id
+            WHERE p.id = p2.id
+        """)
+        return cursor.rowcount
+
+
+def review_stats_drift(limit=20):
+    """
+    저장된 집계와 실제 리뷰 집계가 다른 상품 조회
+    반환: (drift 상품 수, [(product_id, {컬럼: (저장값, 실제값)}), ...] 최대 limit건)
+    """
+    mismatch = ' OR '.join(f'p.{col} <> COALESCE(stats.{col}, 0)' for col in REVIEW_STATS_COLUMNS)
+    select = ', '.join(f'p.{col}, COALESCE(stats.{col}, 0)' for col in REVIEW_STATS_COLUMNS)
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            {REVIEW_STATS_SQL}
+            SELECT p.id, {select}, COUNT(*) OVER ()
+            FROM shop_product AS p
+            LEFT JOIN stats ON stats.product_id = p.id
+            WHERE {mismatch}
+            ORDER BY p.id
+            LIMIT %s
+        """, [limit])
+        rows = cursor.fetchall()
+
+    total = rows[0][-1] if rows else 0
+    samples = []
+    for row in rows:
+        values = row[1:-1]
+        diff = {
+            col: (values[i * 2], values[i * 2 + 1])
+            for i, col in enumerate(REVIEW_STATS_COLUMNS)
+            if values[i * 2] != values[i * 2 + 1]
+        }
+        samples.append((row[0], diff))
+    return total, samples
+
+
+# =============== 판매 롤업 ===============
+SALES_EXCLUDED_STATUSES = ('cancelled',)
+
+# 판매 일자는 주문 생성 시각의 UTC 날짜
+SALES_ROLLUP_SQL = """
+    SELECT oi.product_id,
+           (o.created_at AT TIME ZONE 'UTC')::date AS day,
+           SUM(oi.quantity) AS quantity,
+           SUM(oi.quantity * oi.unit_price) AS revenue,
+           COUNT(DISTINCT oi.order_id) AS order_count
+    FROM shop_orderitem AS oi
+    JOIN shop_order AS o ON o.id = oi.order_id
+    WHERE o.status NOT IN %s AND o.created_at >= %s AND o.created_at <= %s
+    GROUP BY 1, 2
+"""
+
+SALES_ROLLUP_COLUMNS = ['quantity', 'revenue', 'order_count']
+
+SALES_UPSERT_BATCH_SIZE = 1000
+
+
+def sales_day(created_at):
+    return created_at.astimezone(dt_timezone.utc).date()
+
+
+def _day_bounds(date_from=None, date_to=None):
+    """
+    [date_from, date_to] 일자 범위(생략 시 전체)와 created_at 인덱스용 반열린 UTC 구간
+    반환: (첫 일자, 마지막 일자, 시작 시각, 끝 시각)
+    """
+    day_from = date_from or date.min
+    day_to = date_to or date.max
+    start = datetime.combine(day_from, time.min, dt_timezone.utc)
+    end = datetime.combine(day_to, time.max, dt_timezone.utc)
+    return day_from, day_to, start, end
+
+
+def stored_sales(order_ids):
+    """
+    DB에 저장된 주문(취소 제외)의 판매 항목 조회 - apply_sales 입력 형식
+    """
+    return list(
+        OrderItem.objects.filter(order_id__in=order_ids)
+        .exclude(order__status__in=SALES_EXCLUDED_STATUSES)
+        .values_list('order_id', 'order__created_at', 'product_id', 'quantity', 'unit_price')
+    )
+
+
+def _accumulate(rollup, entries, sign):
+    seen = set()
+    for order_id, created_at, product_id, quantity, unit_price in entries:
+        key = (product_id, sales_day(created_at))
+        row = rollup.setdefault(key, [0, Decimal('0.00'), 0])
+        row[0] += quantity * sign
+        row[1] += quantity * unit_price * sign
+        # 같은 주문에 같은 상품이 여러 줄이어도 주문 수는 1
+        if (order_id, product_id) not in seen:
+            seen.add((order_id, product_id))
+            row[2] += sign
+
+
+def apply_sales(entries, sign=1, removed=()):
+    """
+    판매 항목을 일별 롤업에 반영 (INSERT ... ON CONFLICT DO UPDATE 증분)
+    entries/removed: [(order_id, created_at, product_id, quantity, unit_price), ...]
+    sign=-1이면 취소/삭제, removed는 같은 호출에서 빼는 항목 (변경 전 기여분)
+    (product_id, day) 순으로 갱신해 동시 주문 간 행 잠금 순서를 고정한다.
+    """
+    rollup = {}
+    _accumulate(rollup, entries, sign)
+    _accumulate(rollup, removed, -1)
+    rows = sorted((key, row) for key, row in rollup.items() if any(row))
+    if not rows:
+        return 0
+
+    assignments = ', '.join(
+        f'{col} = shop_productdailysales.{col} + EXCLUDED.{col}' for col in SALES_ROLLUP_COLUMNS
+    )
+    with connection.cursor() as cursor:
+        for i in range(0, len(rows), SALES_UPSERT_BATCH_SIZE):
+            batch = rows[i:i + SALES_UPSERT_BATCH_SIZE]
+            params = []
+            for (product_id, day), (quantity, revenue, order_count) in batch:
+                params += [product_id, day, quantity, revenue, order_count]
+            values = ', '.join(['(%s, %s, %s, %s, %s)'] * len(batch))
+            cursor.execute(f"""
+                INSERT INTO shop_productdailysales (product_id, day, quantity, revenue, order_count)
+                VALUES {values}
+                ON CONFLICT (product_id, day) DO UPDATE SET {assignments}
+            """, params)
+    return len(rows)
+
+
+@contextmanager
+def order_sales_change(order_ids):
+    """
+    블록 안에서 주문 상태/아이템이 바뀌면 변경 전 기여분을 빼고 변경 후 기여분을 더한다
+    (상태 변경, 삭제, 관리자 편집 등 생성 이외의 쓰기 경로용 - 트랜잭션 안에서 사용)
+    """
+    before = stored_sales(order_ids)
+    yield
+    apply_sales(stored_sales(order_ids), removed=before)
+
+
+def rebuild_sales_rollup(date_from=None, date_to=None):
+    """
+    [date_from, date_to] 구간(생략 시 전체)의 일별 판매 롤업을 주문 원본에서 다시 계산
+    재계산 중 증분 갱신이 끼어들지 않도록 테이블을 잠근다 (트랜잭션 안에서 호출)
+    반환: 기록된 (상품, 일자) 행 수
+    """
+    day_from, day_to, start, end = _day_bounds(date_from, date_to)
+    with connection.cursor() as cursor:
+        cursor.execute('LOCK TABLE shop_productdailysales IN SHARE ROW EXCLUSIVE MODE')
+        cursor.execute(
+            'DELETE FROM shop_productdailysales WHERE day >= %s AND day <= %s', [day_from, day_to]
+        )
+        cursor.execute(f"""
+            INSERT INTO shop_productdailysales (product_id, day, quantity, revenue, order_count)
+            {SALES_ROLLUP_SQL}
+        """, [SALES_EXCLUDED_STATUSES, start, end])
+        return cursor.rowcount
+
+
+def sales_rollup_drift(date_from=None, date_to=None, limit=20):
+    """
+    저장된 롤업과 주문 원본 집계가 다른 (상품, 일자) 조회
+    반환: (drift 행 수, [((product_id, day), {컬럼: (저장값, 실제값)}), ...] 최대 limit건)
+    """
+    day_from, day_to, start, end = _day_bounds(date_from, date_to)
+    mismatch = ' OR '.join(
+        f'COALESCE(s.{col}, 0) <> COALESCE(a.{col}, 0)' for col in SALES_ROLLUP_COLUMNS
+    )
+    select = ', '.join(
+        f'COALESCE(s.{col}, 0), COALESCE(a.{col}, 0)' for col in SALES_ROLLUP_COLUMNS
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            WITH actual AS ({SALES_ROLLUP_SQL}),
+            stored AS (
+                SELECT product_id, day, quantity, revenue, order_count
+                FROM shop_productdailysales
+                WHERE day >= %s AND day <= %s
+            )
+            SELECT COALESCE(s.product_id, a.product_id), COALESCE(s.day, a.day), {select}, COUNT(*) OVER ()
+            FROM stored AS s
+            FULL OUTER JOIN actual AS a ON a.product_id = s.product_id AND a.day = s.day
+            WHERE {mismatch}
+            ORDER BY 2, 1
+            LIMIT %s
+        """, [SALES_EXCLUDED_STATUSES, start, end, day_from, day_to, limit])
+        rows = cursor.fetchall()
+
+    total = rows[0][-1] if rows else 0
+    samples = []
+    for row in rows:
+        values = row[2:-1]
+        diff = {
+            col: (values[i * 2], values[i * 2 + 1])
+            for i, col in enumerate(SALES_ROLLUP_COLUMNS)
+            if values[i * 2] != values[i * 2 + 1]
+        }
+        samples.append(((row[0], row[1]), diff))
+    return total, samples
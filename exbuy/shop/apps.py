@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class ShopConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'shop'
+
+    def ready(self):
+        # 쿼리 기록용 execute wrapper 등록 (connection_created) - 첫 연결 전에 연결되도록 앱 로딩 시점에 import
+        from . import querybudget  # noqa: F401
+        # Server-Timing 구간 측정 - execute wrapper 등록 + DRF 직렬화/렌더링 훅
+        from . import timing
+        timing.install()
@@ -0,0 +1,251 @@
+"""
+ASGI(Uvicorn) 배포용 네이티브 async 읽기 뷰
+
+settings.ASYNC_VIEWS가 켜져 있으면 shop/urls.py가 동일한 URL을 이 모듈의 뷰로
+우선 매칭한다. GET은 이벤트 루프에서 비동기 ORM(acount/aget/aiterator)으로
+처리하고, 그 외 메서드(POST/PUT/PATCH/DELETE)는 기존 DRF 뷰로 위임한다.
+응답 본문은 동기 DRF 뷰와 동일한 Serializer/Renderer를 사용하므로 바이트 단위로 같다.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.http import Http404, HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException, NotAcceptable
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+
+from . import views
+from .cache import acached_data, category_version_keys, product_version_keys
+from .fast_serializers import compile_serializer, fast_serializers_enabled
+from .conditional import (
+    ValidatedData, aconditional_cached_data, aproduct_detail_state, aproduct_list_state, aproduct_reviews_state,
+    not_modified_response, set_validators,
+)
+from .pagination import HybridPagination, SearchPagination
+from .queries import product_ids_param, product_queryset, search_queryset, review_queryset, top_products_queryset
+from .serializers import (
+    ProductListSerializer, ProductSearchSerializer, ProductDetailSerializer,
+    ReviewSerializer, ReviewListSerializer,
+)
+from .timing import phase
+
+
+def _render(request, data, status=200):
+    """
+    DRF Response와 동일한 렌더러 선택(Accept 협상) + 인코딩
+    """
+    renderers = [renderer() for renderer in api_settings.DEFAULT_RENDERER_CLASSES]
+    negotiator = api_settings.DEFAULT_CONTENT_NEGOTIATION_CLASS()
+    try:
+        renderer, media_type = negotiator.select_renderer(request, renderers)
+    except NotAcceptable:
+        renderer, media_type = renderers[0], renderers[0].media_type
+
+    content_type = media_type
+    if renderer.charset:
+        content_type = f'{media_type}; charset={renderer.charset}'
+
+    with phase('render'):
+        content = renderer.render(data, media_type, {'request': request})
+    response = HttpResponse(content, status=status, content_type=content_type)
+    patch_vary_headers(response, ('Accept',))
+    return response
+
+
+async def _paginated_data(request, queryset, paginator, serializer_class, view=None):
+    """
+    목록 페이지 직렬화 - 뷰셋의 fast_list_serializer 설정에 따라 values() 고속 경로 또는 ModelSerializer
+    """
+    if fast_serializers_enabled(getattr(view, 'fast_list_serializer', None)):
+        fast = compile_serializer(serializer_class)
+        queryset = fast.values(queryset, extra=getattr(view, 'keyset_orderings', ()))
+        page = await paginator.apaginate_queryset(queryset, request, view)
+        return paginator.get_paginated_data(fast.to_representation(page))
+
+    page = await paginator.apaginate_queryset(queryset, request, view)
+    return paginator.get_paginated_data(serializer_class(page, many=True).data)
+
+
+async def _aget_object_or_404(queryset, **kwargs):
+    """
+    DRF generics.get_object_or_404와 동일: 잘못된 pk 형식도 404로 처리
+    """
+    try:
+        return await queryset.aget(**kwargs)
+    except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+        raise Http404
+
+
+def async_read_view(sync_view):
+    """
+    GET은 데코레이트된 async 핸들러로, 나머지 메서드는 sync_view로 위임
+    핸들러는 DRF Request를 받아 직렬화된 데이터(dict/list)를 반환한다.
+    조건부 GET 뷰는 ValidatedData(aconditional_cached_data 결과)를 반환 - 일치하면 304, 아니면 검증자 헤더 추가
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def view(request, *args, **kwargs):
+            if request.method != 'GET':
+                return await sync_to_async(sync_view)(request, *args, **kwargs)
+
+            drf_request = Request(request)
+            checked = None
+            try:
+                data = await handler(drf_request, *args, **kwargs)
+                if isinstance(data, ValidatedData):
+                    checked, data = data
+                    not_modified = not_modified_response(drf_request, checked)
+                    if not_modified is not None:
+                        return not_modified
+            except (APIException, Http404) as exc:
+                response = exception_handler(exc, {'request': drf_request})
+                return _render(drf_request, response.data, response.status_code)
+            return set_validators(_render(drf_request, data), checked)
+
+        return csrf_exempt(view)
+    return decorator
+
+
+# =============== 2-5. Product Views ===============
+@async_read_view(views.ProductViewSet.as_view(
+    {'get': 'list', 'post': 'create'}, basename='product', detail=False
+))
+async def product_list(request):
+    """
+    GET /products (?ids=3,1,2 - 다건 조회)
+    """
+    if 'ids' in request.query_params:
+        return await _product_multi_get(request)
+
+    queryset = product_queryset(request.query_params, 'list')
+
+    async def state():
+        return await aproduct_list_state(queryset)
+
+    async def build():
+        return await _paginated_data(
+            request, queryset, HybridPagination(), ProductListSerializer, views.ProductViewSet
+        )
+
+    return await aconditional_cached_data(
+        request, 'product-list', category_version_keys(request.query_params.get('category')), state, build
+    )
+
+
+async def _product_multi_get(request):
+    ids = product_ids_param(request.query_params)
+    queryset = product_queryset(request.query_params, 'list')
+
+    async def state():
+        return await aproduct_list_state(queryset)
+
+    async def build():
+        return views.product_multi_get_data(ids, await queryset.ain_bulk(ids))
+
+    return await aconditional_cached_data(
+        request, 'product-multi-get', views.product_multi_get_version_keys(ids), state, build
+    )
+
+
+@async_read_view(views.ProductViewSet.as_view(
+    {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'},
+    basename='product', detail=True
+))
+async def product_detail(request, pk):
+    """
+    GET /products/{id}
+    """
+    queryset = product_queryset(request.query_params, 'retrieve')
+
+    async def state():
+        return await aproduct_detail_state(queryset, pk)
+
+    async def build():
+        return ProductDetailSerializer(await _aget_object_or_404(queryset, pk=pk)).data
+
+    return await aconditional_cached_data(request, 'product-detail', product_version_keys(pk), state, build)
+
+
+@async_read_view(views.ProductViewSet.as_view(
+    {'get': 'reviews'}, basename='product', detail=True
+))
+async def product_reviews(request, pk):
+    """
+    GET /products/{id}/reviews
+    """
+    queryset = product_queryset(request.query_params, 'reviews')
+
+    async def state():
+        return await aproduct_reviews_state(queryset, pk)
+
+    async def build():
+        product = await _aget_object_or_404(queryset, pk=pk)
+        reviews = product.reviews.select_related('product').defer('product__search_vector')
+        if fast_serializers_enabled(views.ProductViewSet.fast_list_serializer):
+            fast = compile_serializer(ReviewListSerializer)
+            return fast.to_representation([row async for row in fast.values(reviews).aiterator()])
+        return ReviewListSerializer([review async for review in reviews.aiterator()], many=True).data
+
+    return await aconditional_cached_data(request, 'product-reviews', product_version_keys(pk), state, build)
+
+
+@async_read_view(views.search_products)
+async def search_products(request):
+    """
+    GET /search/products
+    """
+    async def build():
+        queryset = search_queryset(request.query_params)
+        return await _paginated_data(request, queryset, SearchPagination(), ProductSearchSerializer)
+
+    return await acached_data(
+        'product-search', request, category_version_keys(request.query_params.get('category')), build
+    )
+
+
+# =============== 11. Stats ===============
+@async_read_view(views.top_products)
+async def top_products(request):
+    """
+    GET /stats/top-products
+    """
+    result = []
+    async for item in top_products_queryset(request.query_params):
+        result.append({
+            'product_id': item['product_id'],
+            'product_name': item['product__name'],
+            'total_quantity': item['total_quantity'],
+            'total_revenue': item['total_revenue'],
+            'order_count': item['order_count']
+        })
+    return result
+
+
+# =============== 12-13. Review Views ===============
+@async_read_view(views.ReviewViewSet.as_view(
+    {'get': 'list', 'post': 'create'}, basename='review', detail=False
+))
+async def review_list(request):
+    """
+    GET /reviews
+    """
+    queryset = review_queryset(request.query_params, 'list')
+    return await _paginated_data(
+        request, queryset, HybridPagination(), ReviewListSerializer, views.ReviewViewSet
+    )
+
+
+@async_read_view(views.ReviewViewSet.as_view(
+    {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'},
+    basename='review', detail=True
+))
+async def review_detail(request, pk):
+    """
+    GET /reviews/{id}
+    """
+    review = await _aget_object_or_404(review_queryset(request.query_params, 'retrieve'), pk=pk)
+    return ReviewSerializer(review).data
@@ -0,0 +1,146 @@
+"""
+GET 하위 요청 묶음 실행 (POST /api/batch)
+
+상품 상세 여러 개 + 주문 + 리뷰처럼 화면 하나에 필요한 읽기 API를 한 번의 왕복으로 받기 위한 경로.
+하위 요청은 HTTP/미들웨어를 다시 거치지 않고 URL을 해석해 뷰를 프로세스 안에서 직접 호출한다.
+- 대상: shop/urls.py 라우트 (/api/... 경로, GET만) - /api/batch 자신은 제외
+- 부모 요청의 헤더(Host, 쿠키 등)는 물려받고 본문/조건부 헤더(If-None-Match 등)는 뺀다 - 항목마다 본문이 있어야 한다
+- DRF Response는 렌더링하지 않고 response.data를 담는다 (바깥 응답에서 한 번만 인코딩)
+  그 외 응답(async 뷰의 HttpResponse)은 JSON 본문을 파싱해 담는다
+- 항목별 결과 {'path', 'status', 'body'} - 하위 요청의 4xx/5xx는 바깥 응답(200)을 실패시키지 않는다
+
+BATCH_CONCURRENCY > 1이면 하위 요청을 워커 공용 스레드 풀에서 나눠 실행한다 (서로 독립적인 읽기).
+스레드마다 DB 연결을 따로 쓰므로 워커당 연결이 최대 BATCH_CONCURRENCY개 늘어난다 (DB_POOL이면 풀 크기 안에서).
+하위 요청의 SQL은 ContextVar 복사로 바깥 요청(view=batch)의 쿼리 예산/Server-Timing/SQL 통계에 집계된다.
+동시 실행 중 Server-Timing의 db는 스레드별 시간의 합이라 total보다 클 수 있고, serialize/render는 구간이 겹쳐 근사값이다.
+"""
+import contextvars
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db import close_old_connections
+from django.http import Http404, HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework.response import Response
+
+
+logger = logging.getLogger(__name__)
+
+BATCH_URL_NAME = 'batch'
+
+# 하위 요청에 물려주지 않는 부모 요청 META - 본문, 조건부 GET (304 대신 본문), 요청 줄
+_SKIPPED_META = frozenset({
+    'CONTENT_LENGTH', 'CONTENT_TYPE', 'wsgi.input',
+    'HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE', 'HTTP_IF_MATCH', 'HTTP_IF_UNMODIFIED_SINCE',
+    'PATH_INFO', 'QUERY_STRING', 'REQUEST_METHOD', 'RAW_URI', 'REQUEST_URI',
+})
+
+
+class SubRequest(HttpRequest):
+    """
+    부모 요청에서 파생한 GET 요청 - 본문 없음, 응답은 항상 JSON (Accept 고정)
+    """
+    def __init__(self, parent, path):
+        super().__init__()
+        path_info, _, query = path.partition('?')
+        self.META = {key: value for key, value in parent.META.items() if key not in _SKIPPED_META}
+        self.META.update(REQUEST_METHOD='GET', PATH_INFO=path_info, QUERY_STRING=query, HTTP_ACCEPT='application/json')
+        self.method = 'GET'
+        self.path = self.path_info = path_info
+        self.GET = QueryDict(query)
+        self.COOKIES = parent.COOKIES
+        self._scheme = parent.scheme
+        for name in ('user', 'session'):
+            if hasattr(parent, name):
+                setattr(self, name, getattr(parent, name))
+
+    def _get_scheme(self):
+        return self._scheme
+
+
+def _result(path, status, body):
+    return {'path': path, 'status': status, 'body': body}
+
+
+def _body(response):
+    if isinstance(response, Response):
+        return response.data
+    if not response.content:
+        return None
+    if response.get('Content-Type', '').startswith('application/json'):
+        return orjson.loads(response.content)
+    return response.content.decode(response.charset, errors='replace')
+
+
+def dispatch(parent, path):
+    """
+    하위 요청 1건 실행
+    반환: {'path', 'status', 'body'}
+    """
+    path_info = path.partition('?')[0]
+    try:
+        match = resolve(path_info)
+    except Resolver404:
+        return _result(path, 404, {'detail': '찾을 수 없습니다.'})
+    if match.url_name == BATCH_URL_NAME:
+        return _result(path, 400, {'detail': '묶음 요청 안에 묶음 요청을 넣을 수 없습니다.'})
+
+    request = SubRequest(parent, path)
+    request.resolver_match = match
+    callback = async_to_sync(match.func) if iscoroutinefunction(match.func) else match.func
+    try:
+        response = callback(request, *match.args, **match.kwargs)
+    except Http404:
+        return _result(path, 404, {'detail': '찾을 수 없습니다.'})
+    except PermissionDenied:
+        return _result(path, 403, {'detail': '이 작업을 수행할 권한이 없습니다.'})
+    except Exception:
+        logger.exception('batch sub-request failed: GET %s', path)
+        return _result(path, 500, {'detail': '서버 오류가 발생했습니다.'})
+    return _result(path, response.status_code, _body(response))
+
+
+# =============== 동시 실행 ===============
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def _pool():
+    # 워커 프로세스마다 하나 (gunicorn fork 이후 첫 요청에서 생성)
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=settings.BATCH_CONCURRENCY, thread_name_prefix='batch')
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def _dispatch_in_pool(parent, path):
+    try:
+        return dispatch(parent, path)
+    finally:
+        # 풀 스레드는 request_started/finished를 받지 않는다 - 수명이 지났거나 깨진 연결은 여기서 정리
+        close_old_connections()
+
+
+def run_batch(parent, paths):
+    """
+    paths의 GET 하위 요청을 실행해 요청 순서대로 결과 반환
+    parent: 바깥 요청 (Django HttpRequest)
+    """
+    if settings.BATCH_CONCURRENCY <= 1 or len(paths) <= 1:
+        return [dispatch(parent, path) for path in paths]
+
+    pool = _pool()
+    futures = [
+        pool.submit(contextvars.copy_context().run, _dispatch_in_pool, parent, path)
+        for path in paths
+    ]
+    return [future.result() for future in futures]
@@ -0,0 +1,311 @@
+"""
+엔드포인트 인프로세스 마이크로 벤치마크 (manage.py bench)
+
+Docker/k6 없이 Django 테스트 클라이언트로 14개 엔드포인트를 같은 프로세스에서 호출한다.
+엔드포인트마다 측정하는 값:
+- 지연 분포 (p50/p90/p95/p99/max, 워밍업 제외)
+- 요청당 SQL 수와 반환/변경 행 수 평균 (shop/querybudget.py의 track_queries)
+- 요청당 Python 메모리 할당 최대치 (tracemalloc - 느려지므로 지연 측정과 별도 반복)
+
+쓰기 엔드포인트는 기본적으로 요청마다 트랜잭션을 롤백해 데이터셋을 바꾸지 않는다 (COMMIT 비용 제외).
+결과는 JSON으로 저장하고 이전 결과(베이스라인)와 비교해 임계치를 넘으면 회귀로 판정한다.
+"""
+import gc
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import django
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+
+from .models import Order, Product
+from .querybudget import track_queries
+from .seeding import row_counts
+
+
+PERCENTILES = (50, 90, 95, 99)
+UPLOAD_SIZE = 64 * 1024
+
+# 회귀 판정 기본 임계치
+DEFAULT_THRESHOLDS = {
+    'latency_pct': 20.0,       # 지연(stat) 증가율 (%)
+    'latency_floor_ms': 0.3,   # 이보다 작은 지연 증가는 측정 잡음으로 보고 무시 (ms)
+    'queries': 0,              # 허용하는 요청당 SQL 증가 수
+    'rows_pct': 10.0,          # 행 수 증가율 (%)
+    'memory_pct': 25.0,        # 메모리 할당 최대치 증가율 (%)
+}
+
+
+# =============== 입력 데이터 ===============
+class Fixtures:
+    """
+    시드 데이터에서 고른 요청 입력 - 같은 seed와 데이터셋이면 같은 요청 순서
+    """
+
+    def __init__(self, seed, size=50):
+        rng = random.Random(seed)
+        product_ids = list(Product.objects.order_by('id').values_list('id', flat=True)[:5000])
+        if not product_ids:
+            raise LookupError('상품이 없습니다 - seed_data 먼저 실행')
+
+        self.products = rng.sample(product_ids, min(size, len(product_ids)))
+        # 쓰기(주문/예약)는 롤백하지 않는 --commit에서도 재고 부족이 나지 않도록 재고가 넉넉한 상품
+        stocked = list(Product.objects.filter(stock__gte=100).order_by('id').values_list('id', flat=True)[:5000])
+        self.stocked = rng.sample(stocked, min(size, len(stocked))) or self.products
+        reviewed = list(
+            Product.objects.filter(review_count__gt=0).order_by('id').values_list('id', flat=True)[:5000]
+        )
+        self.reviewed = rng.sample(reviewed, min(size, len(reviewed))) or self.products
+        order_ids = list(Order.objects.order_by('id').values_list('id', flat=True)[:5000])
+        self.orders = rng.sample(order_ids, min(size, len(order_ids)))
+
+        # 검색어: 상품명 첫 단어 (전문 검색 결과가 있는 단어)
+        names = Product.objects.filter(id__in=self.products).values_list('name', flat=True)
+        self.terms = sorted({name.split()[0].lower() for name in names if name.split()}) or ['product']
+
+    @staticmethod
+    def pick(values, index):
+        return values[index % len(values)]
+
+    def cart(self, index, size):
+        return [
+            {'product_id': self.pick(self.stocked, index * size + offset), 'quantity': 1}
+            for offset in range(size)
+        ]
+
+
+# =============== 엔드포인트 ===============
+class Endpoint:
+    """
+    request(fixtures, i) → (path, data) - data가 dict면 JSON 본문
+    write=True: 기본적으로 요청마다 롤백
+    """
+
+    def __init__(self, name, method, request, expect=(200,), write=False, multipart=False):
+        self.name = name
+        self.method = method
+        self.request = request
+        self.expect = expect
+        self.write = write
+        self.multipart = multipart
+
+
+ENDPOINTS = [
+    Endpoint('health', 'get', lambda f, i: ('/api/health', None)),
+    Endpoint('product-list', 'get', lambda f, i: (f'/api/products/?page={i % 5 + 1}', None)),
+    Endpoint('product-detail', 'get', lambda f, i: (f'/api/products/{f.pick(f.products, i)}/', None)),
+    Endpoint('product-reviews', 'get', lambda f, i: (f'/api/products/{f.pick(f.reviewed, i)}/reviews/', None)),
+    Endpoint('product-search', 'get', lambda f, i: (f'/api/search/products?q={f.pick(f.terms, i)}', None)),
+    Endpoint(
+        'order-create', 'post',
+        lambda f, i: ('/api/orders/', {'user_id': i % 1000 + 1, 'items': f.cart(i, 2)}),
+        expect=(201,), write=True,
+    ),
+    Endpoint('order-detail', 'get', lambda f, i: (f'/api/orders/{f.pick(f.orders, i)}/', None)),
+    Endpoint(
+        'order-update', 'patch',
+        lambda f, i: (f'/api/orders/{f.pick(f.orders, i)}/', {'status': ('processing', 'shipped')[i % 2]}),
+        write=True,
+    ),
+    Endpoint(
+        'order-bulk', 'post',
+        lambda f, i: ('/api/orders/bulk', {
+            'orders': [{'user_id': (i * 10 + n) % 1000 + 1, 'items': f.cart(i * 10 + n, 2)} for n in range(10)]
+        }),
+        expect=(201,), write=True,
+    ),
+    Endpoint(
+        'inventory-reserve', 'post',
+        lambda f, i: ('/api/inventory/reserve?lock_type=optimistic', {
+            'product_id': f.pick(f.stocked, i), 'quantity': 1,
+        }),
+        write=True,
+    ),
+    Endpoint('stats-top-products', 'get', lambda f, i: ('/api/stats/top-products?limit=10', None)),
+    Endpoint(
+        'review-create', 'post',
+        lambda f, i: ('/api/reviews/', {
+            'product': f.pick(f.products, i), 'user_id': i % 1000 + 1, 'rating': i % 5 + 1, 'body': 'bench review',
+        }),
+        expect=(201,), write=True,
+    ),
+    Endpoint('review-list', 'get', lambda f, i: (f'/api/reviews/?page={i % 5 + 1}', None)),
+    Endpoint(
+        'file-upload', 'post',
+        lambda f, i: ('/api/uploads', {'file': SimpleUploadedFile('bench.bin', b'x' * UPLOAD_SIZE)}),
+        expect=(201,), multipart=True,
+    ),
+]
+
+
+# =============== 측정 ===============
+def _call(client, endpoint, fixtures, index, commit):
+    path, data = endpoint.request(fixtures, index)
+    method = getattr(client, endpoint.method)
+    if data is None:
+        send = lambda: method(path)
+    elif endpoint.multipart:
+        send = lambda: method(path, data)
+    else:
+        send = lambda: method(path, data, content_type='application/json')
+
+    if not endpoint.write or commit:
+        return send()
+    with transaction.atomic():
+        response = send()
+        transaction.set_rollback(True)
+    return response
+
+
+def _percentiles(samples):
+    ordered = sorted(samples)
+    if len(ordered) == 1:
+        return {f'p{p}': ordered[0] for p in PERCENTILES}
+    cuts = statistics.quantiles(ordered, n=100, method='inclusive')
+    return {f'p{p}': cuts[p - 1] for p in PERCENTILES}
+
+
+def run_endpoint(client, endpoint, fixtures, iterations, warmup, memory_iterations, commit=False):
+    """
+    반환: 엔드포인트 결과 dict (JSON 저장 형식)
+    """
+    for index in range(warmup):
+        _call(client, endpoint, fixtures, index, commit)
+
+    gc.collect()
+    latencies, queries, rows, statuses = [], [], [], {}
+    for index in range(warmup, warmup + iterations):
+        with track_queries() as log:
+            started = time.perf_counter()
+            response = _call(client, endpoint, fixtures, index, commit)
+            latencies.append((time.perf_counter() - started) * 1000)
+        queries.append(log.queries)
+        rows.append(log.rows)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    # 메모리 할당 - 요청 전후 traced 메모리 대비 최대치 (tracemalloc 부하로 지연 측정과 분리)
+    memory = []
+    if memory_iterations:
+        tracemalloc.start()
+        try:
+            for index in range(memory_iterations):
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                _call(client, endpoint, fixtures, index, commit)
+                memory.append((tracemalloc.get_traced_memory()[1] - before) / 1024)
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'method': endpoint.method.upper(),
+        'path': endpoint.request(fixtures, 0)[0],
+        'iterations': iterations,
+        'statuses': {str(code): count for code, count in sorted(statuses.items())},
+        'unexpected_status': sum(count for code, count in statuses.items() if code not in endpoint.expect),
+        'latency_ms': {
+            **_percentiles(latencies),
+            'mean': statistics.fmean(latencies),
+            'max': max(latencies),
+        },
+        # 같은 seed/데이터셋이면 요청 입력이 같으므로 평균도 결정적 - 일부 입력에서만 생기는 N+1도 잡힌다
+        'queries': round(statistics.fmean(queries), 2),
+        'queries_max': max(queries),
+        'rows': round(statistics.fmean(rows), 2),
+        'memory_kib': {
+            'median': statistics.median(memory),
+            'max': max(memory),
+        } if memory else None,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_meta(options):
+    return {
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'dataset': row_counts(),
+        'options': options,
+    }
+
+
+# =============== 베이스라인 비교 ===============
+def _change(before, after):
+    if before in (None, 0):
+        return None if after in (None, 0) else float('inf')
+    return (after - before) / before * 100
+
+
+def compare(current, baseline, thresholds, stat='p50'):
+    """
+    반환: [{'endpoint', 'metric', 'before', 'after', 'change', 'regressed'}, ...] - 양쪽에 있는 엔드포인트만
+    """
+    rows = []
+    for name, result in current['endpoints'].items():
+        previous = baseline['endpoints'].get(name)
+        if previous is None:
+            continue
+
+        before, after = previous['latency_ms'][stat], result['latency_ms'][stat]
+        change = _change(before, after)
+        rows.append({
+            'endpoint': name, 'metric': f'latency {stat} (ms)', 'before': before, 'after': after, 'change': change,
+            'regressed': change is not None and change > thresholds['latency_pct']
+            and after - before > thresholds['latency_floor_ms'],
+        })
+
+        before, after = previous['queries'], result['queries']
+        rows.append({
+            'endpoint': name, 'metric': 'queries', 'before': before, 'after': after, 'change': _change(before, after),
+            'regressed': after - before > thresholds['queries'],
+        })
+
+        before, after = previous['rows'], result['rows']
+        change = _change(before, after)
+        rows.append({
+            'endpoint': name, 'metric': 'rows', 'before': before, 'after': after, 'change': change,
+            'regressed': change is not None and change > thresholds['rows_pct'],
+        })
+
+        if previous.get('memory_kib') and result.get('memory_kib'):
+            before, after = previous['memory_kib']['median'], result['memory_kib']['median']
+            change = _change(before, after)
+            rows.append({
+                'endpoint': name, 'metric': 'memory (KiB)', 'before': before, 'after': after, 'change': change,
+                'regressed': change is not None and change > thresholds['memory_pct'],
+            })
+    return rows
+
+
+def load(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def dump(path, data):
+    with open(path, 'w') as file:
+        json.dump(data, file, indent=2, ensure_ascii=False)
+        file.write('\n')
+
+
+def dataset_mismatch(current, baseline):
+    """
+    반환: 행 수가 다른 테이블 목록 - 다른 데이터셋과의 비교는 의미가 작다
+    """
+    before, after = baseline['meta'].get('dataset', {}), current['meta'].get('dataset', {})
+    return sorted(table for table in after if before.get(table) != after[table])
@@ -0,0 +1,197 @@
+"""
+읽기 응답 캐시 (버전 카운터 기반 무효화)
+
+상품 목록/상세/검색 응답의 직렬화 결과(dict/list)를 settings.CACHES['default']에 저장한다.
+캐시 키 = 뷰 이름 + 정규화된 쿼리 파라미터 + Host + 관련 버전 카운터 값이며,
+쓰기 경로는 삭제 대신 버전 카운터를 올려(bump) 이전 키를 도달 불가능하게 만든다.
+
+- 상품 상세/상품 리뷰/다건 조회: 상품 버전 (ver:product:{id})
+- 상품 목록/검색: 카테고리 버전 (ver:category:{name}, 카테고리 필터가 없으면 전체 카테고리)
+
+상품 행(updated_at 포함)을 바꾸는 쓰기는 invalidate_products로 상품과 카테고리 버전을 함께 올린다.
+버전 증가는 트랜잭션 커밋 이후(on_commit)에 수행해 커밋 전 데이터가 새 버전으로 캐시되지 않게 한다.
+CACHE_BACKEND=locmem은 워커별 캐시라 다른 워커의 무효화는 RESPONSE_CACHE_TTL 이후 반영되고,
+redis(공유 백엔드)는 모든 워커에 즉시 반영된다.
+조건부 GET 검증자는 본문과 함께 저장된다 (shop/conditional.py) - 늦게 반영되는 동안에도 ETag는 보낸 본문의 것이다.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django_prometheus.conf import NAMESPACE
+from prometheus_client import Counter
+
+from .models import Product
+
+
+PRODUCT_VERSION_KEY = 'ver:product:{}'
+CATEGORY_VERSION_KEY = 'ver:category:{}'
+ALL_CATEGORIES = [value for value, _ in Product.CATEGORY_CHOICES]
+
+# 응답에 영향을 주지 않는 파라미터는 키에서 제외
+IGNORED_PARAMS = {'_'}
+
+
+# =============== Prometheus 메트릭 (/metrics) ===============
+response_cache_hits = Counter(
+    'django_response_cache_hits_total', '응답 캐시 적중 수', ['view'], namespace=NAMESPACE
+)
+response_cache_misses = Counter(
+    'django_response_cache_misses_total', '응답 캐시 미스 수', ['view'], namespace=NAMESPACE
+)
+response_cache_invalidations = Counter(
+    'django_response_cache_invalidations_total', '응답 캐시 버전 증가(무효화) 수', ['scope'], namespace=NAMESPACE
+)
+
+
+# =============== 버전 카운터 ===============
+def product_version_keys(product_id):
+    return [PRODUCT_VERSION_KEY.format(product_id)]
+
+
+def category_version_keys(category=None):
+    """
+    카테고리 필터가 있으면 해당 카테고리, 없으면 전체 카테고리 버전에 의존
+    """
+    categories = [category] if category else ALL_CATEGORIES
+    return [CATEGORY_VERSION_KEY.format(name) for name in categories]
+
+
+def _seed():
+    # 버전 키가 만료/축출된 뒤 다시 만들어져도 이전 값과 겹치지 않도록 현재 시각으로 시작
+    return time.time_ns()
+
+
+def _versions(keys):
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _seed(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+async def _aversions(keys):
+    versions = await cache.aget_many(keys)
+    for key in keys:
+        if key not in versions:
+            await cache.aadd(key, _seed(), timeout=None)
+            versions[key] = await cache.aget(key)
+    return [versions[key] for key in keys]
+
+
+def _bump(keys):
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            # 아직 읽힌 적 없는 버전 - 이 키로 저장된 응답도 없다
+            cache.add(key, _seed(), timeout=None)
+
+
+def _invalidate(product_ids, categories=()):
+    if not settings.RESPONSE_CACHE or not (product_ids or categories):
+        return
+
+    def bump():
+        _bump([PRODUCT_VERSION_KEY.format(product_id) for product_id in sorted(product_ids)])
+        _bump([CATEGORY_VERSION_KEY.format(category) for category in sorted(categories)])
+        response_cache_invalidations.labels(scope='product').inc(len(product_ids))
+        response_cache_invalidations.labels(scope='category').inc(len(categories))
+
+    transaction.on_commit(bump)
+
+
+def invalidate_products(products):
+    """
+    상품 행(재고/가격/리뷰 집계/updated_at) 변경 후 호출 - 상품 버전과 소속 카테고리 버전 증가
+    products: Product 인스턴스 또는 (id, category) 반복자
+    """
+    product_ids, categories = set(), set()
+    for product in products:
+        product_id, category = (product.pk, product.category) if isinstance(product, Product) else product
+        product_ids.add(product_id)
+        categories.add(category)
+    _invalidate(product_ids, categories)
+
+
+def invalidate_product_details(product_ids):
+    """
+    상품 행은 그대로이고 상품별 응답만 바뀌는 변경(리뷰 본문 수정 - 상품 리뷰 목록) 후 호출 - 상품 버전만 증가
+    """
+    _invalidate(set(product_ids))
+
+
+def clear_response_cache():
+    """
+    데이터 전체 교체(seed_data 등) 후 호출
+    """
+    cache.clear()
+
+
+# =============== 캐시 조회 ===============
+def _cache_key(view_name, request, versions):
+    params = sorted(
+        (name, sorted(values))
+        for name, values in request.query_params.lists()
+        if name not in IGNORED_PARAMS and any(values)
+    )
+    # next/previous 링크가 절대 URL이라 Host도 키에 포함
+    raw = repr((request.get_host(), params, versions))
+    return f'resp:{view_name}:{hashlib.md5(raw.encode()).hexdigest()}'
+
+
+def cache_lookup(view_name, request, version_keys):
+    """
+    반환: (캐시 키, 저장된 값 또는 None) - RESPONSE_CACHE=False면 (None, None)
+    """
+    if not settings.RESPONSE_CACHE:
+        return None, None
+    key = _cache_key(view_name, request, _versions(version_keys))
+    value = cache.get(key)
+    (response_cache_hits if value is not None else response_cache_misses).labels(view=view_name).inc()
+    return key, value
+
+
+async def acache_lookup(view_name, request, version_keys):
+    if not settings.RESPONSE_CACHE:
+        return None, None
+    key = _cache_key(view_name, request, await _aversions(version_keys))
+    value = await cache.aget(key)
+    (response_cache_hits if value is not None else response_cache_misses).labels(view=view_name).inc()
+    return key, value
+
+
+def cache_store(key, value):
+    if key is not None:
+        cache.set(key, value, settings.RESPONSE_CACHE_TTL)
+
+
+async def acache_store(key, value):
+    if key is not None:
+        await cache.aset(key, value, settings.RESPONSE_CACHE_TTL)
+
+
+def cached_data(view_name, request, version_keys, build):
+    """
+    캐시된 응답 데이터 반환, 없으면 build()로 만들어 저장
+    build에서 발생한 예외(404, 400)는 캐시하지 않고 그대로 전파
+    """
+    key, data = cache_lookup(view_name, request, version_keys)
+    if data is None:
+        data = build()
+        cache_store(key, data)
+    return data
+
+
+async def acached_data(view_name, request, version_keys, build):
+    """
+    비동기 버전 (async_views.py 전용) - build는 코루틴 함수
+    """
+    key, data = await acache_lookup(view_name, request, version_keys)
+    if data is None:
+        data = await build()
+        await acache_store(key, data)
+    return data
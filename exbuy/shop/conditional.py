@@ -0,0 +1,195 @@
+"""
+조건부 GET (ETag / Last-Modified)
+
+상품 상세/목록, 상품 리뷰 목록 응답에 강한 검증자(strong ETag)와 Last-Modified를 붙이고,
+If-None-Match / If-Modified-Since가 일치하면 직렬화 없이 304를 반환한다.
+
+검증자는 응답 본문 대신 가벼운 쿼리로 계산한다.
+- 상품 상세: (id, updated_at) 1행
+- 상품 목록: 필터된 집합의 MAX(updated_at), MAX(id), COUNT(*)
+- 상품 리뷰: 상품 (id, updated_at) + 리뷰 MAX(updated_at), MAX(id), COUNT(*)
+
+응답 캐시(shop/cache.py)와 함께 쓰면 검증자 원본(state)을 본문과 같은 캐시 항목에 저장한다.
+- 캐시 적중: 저장된 state로 304를 판단 - DB를 거치지 않고, ETag는 항상 보내는 본문의 것이다
+- 캐시 미스: state 쿼리 → 일치하면 304 (본문 생성/저장 없음), 아니면 본문을 만들어 state와 함께 저장
+캐시 키의 버전은 state/본문 조회 전에 읽으므로, 그 사이 커밋된 쓰기는 이 항목을 도달 불가능하게 만든다.
+ETag는 요청마다 state + 쿼리 파라미터/Host/Accept로 계산한다 (캐시 키에 없는 Accept 등이 달라도 구분).
+
+상품 행을 바꾸는 모든 쓰기 경로(재고 차감, 리뷰 집계 등)는 updated_at도 함께 갱신해야 한다.
+목록의 Last-Modified는 삭제를 반영하지 못하므로 클라이언트는 ETag(If-None-Match)를 우선 사용한다.
+"""
+import hashlib
+from collections import namedtuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from .cache import acache_lookup, acache_store, cache_lookup, cache_store
+from .models import Review
+
+
+# async 핸들러 반환값 - async_read_view가 304 판단과 헤더 설정을 맡는다
+ValidatedData = namedtuple('ValidatedData', ['validators', 'data'])
+
+
+def _etag(kind, request, values):
+    """
+    같은 데이터라도 쿼리 파라미터(페이지, 정렬), Host(절대 URL 링크), Accept(렌더러)가 다르면 본문이 다르다
+    """
+    params = sorted((name, sorted(items)) for name, items in request.query_params.lists())
+    raw = repr((kind, values, params, request.get_host(), request.META.get('HTTP_ACCEPT', '')))
+    return f'"{hashlib.md5(raw.encode()).hexdigest()}"'
+
+
+def validators(request, state):
+    """
+    state: (kind, values, last_modified) - 요청과 무관한 검증자 원본, 없는 대상이면 None
+    반환: (etag, last_modified 타임스탬프) 또는 None
+    """
+    if state is None:
+        return None
+    kind, values, last_modified = state
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return _etag(kind, request, values), timestamp
+
+
+# =============== 검증자 계산 ===============
+def _detail_query(queryset, pk):
+    return queryset.filter(pk=pk).order_by().values_list('id', 'updated_at')
+
+
+def _set_aggregates():
+    return {'last_modified': Max('updated_at'), 'max_id': Max('id'), 'count': Count('id')}
+
+
+def product_detail_state(queryset, pk):
+    """
+    반환: state 또는 None (없는 상품 - 본문 처리에서 404)
+    """
+    try:
+        row = _detail_query(queryset, pk).first()
+    except (TypeError, ValueError, ValidationError):
+        return None
+    if row is None:
+        return None
+    return 'product', row, row[1]
+
+
+async def aproduct_detail_state(queryset, pk):
+    try:
+        row = await _detail_query(queryset, pk).afirst()
+    except (TypeError, ValueError, ValidationError):
+        return None
+    if row is None:
+        return None
+    return 'product', row, row[1]
+
+
+def product_list_state(queryset):
+    stats = queryset.order_by().aggregate(**_set_aggregates())
+    return 'product-list', tuple(stats.values()), stats['last_modified']
+
+
+async def aproduct_list_state(queryset):
+    stats = await queryset.order_by().aaggregate(**_set_aggregates())
+    return 'product-list', tuple(stats.values()), stats['last_modified']
+
+
+def _reviews_state(product_row, stats):
+    # 리뷰 목록에 상품명이 포함되므로 상품 updated_at도 반영
+    last_modified = max(filter(None, [product_row[1], stats['last_modified']]))
+    return 'product-reviews', (product_row, tuple(stats.values())), last_modified
+
+
+def product_reviews_state(queryset, pk):
+    try:
+        row = _detail_query(queryset, pk).first()
+    except (TypeError, ValueError, ValidationError):
+        return None
+    if row is None:
+        return None
+    stats = Review.objects.filter(product_id=row[0]).order_by().aggregate(**_set_aggregates())
+    return _reviews_state(row, stats)
+
+
+async def aproduct_reviews_state(queryset, pk):
+    try:
+        row = await _detail_query(queryset, pk).afirst()
+    except (TypeError, ValueError, ValidationError):
+        return None
+    if row is None:
+        return None
+    stats = await Review.objects.filter(product_id=row[0]).order_by().aaggregate(**_set_aggregates())
+    return _reviews_state(row, stats)
+
+
+# =============== 응답 처리 ===============
+def not_modified_response(request, validators):
+    """
+    조건부 요청이 일치하면 304 응답, 아니면 None
+    """
+    if validators is None:
+        return None
+    etag, last_modified = validators
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    return _apply(response, validators) if response is not None else None
+
+
+def _apply(response, validators):
+    etag, last_modified = validators
+    response.headers['ETag'] = etag
+    if last_modified is not None:
+        response.headers['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def set_validators(response, validators):
+    """
+    200 응답에만 검증자 헤더 추가 (에러 응답은 제외)
+    """
+    if validators is not None and response.status_code == 200:
+        _apply(response, validators)
+    return response
+
+
+def conditional_cached_get(request, view_name, version_keys, state, build):
+    """
+    동기 DRF 뷰용: 조건부 GET + 응답 캐시
+    state: () -> state (DB 쿼리, 캐시 미스일 때만 호출) / build: () -> 본문 데이터
+    """
+    key, entry = cache_lookup(view_name, request, version_keys)
+    if entry is None:
+        current = state()
+        if not_modified_response(request, validators(request, current)) is not None:
+            # 클라이언트가 이미 가진 본문 - 만들지도 저장하지도 않는다
+            entry = (current, None)
+        else:
+            entry = (current, build())
+            cache_store(key, entry)
+
+    current, data = entry
+    checked = validators(request, current)
+    not_modified = not_modified_response(request, checked)
+    if not_modified is not None:
+        return not_modified
+    return set_validators(Response(data), checked)
+
+
+async def aconditional_cached_data(request, view_name, version_keys, state, build):
+    """
+    비동기 버전 (async_views.py 전용) - state, build는 코루틴 함수
+    반환: ValidatedData (data가 None이면 조건부 요청 일치)
+    """
+    key, entry = await acache_lookup(view_name, request, version_keys)
+    if entry is None:
+        current = await state()
+        if not_modified_response(request, validators(request, current)) is not None:
+            return ValidatedData(validators(request, current), None)
+        entry = (current, await build())
+        await acache_store(key, entry)
+
+    current, data = entry
+    return ValidatedData(validators(request, current), data)
@@ -0,0 +1,35 @@
+"""
+연결 풀 DB 백엔드 (settings.DB_POOL=True면 DATABASES ENGINE='shop.db')
+
+Django PostgreSQL 백엔드와 같고, 연결 생성/종료만 프로세스 단위 풀(shop/db/pool.py)의
+checkout/checkin으로 바꾼다. CONN_MAX_AGE=0과 함께 써서 요청이 끝나면 연결을 풀에 반납한다.
+
+POOL['mode'] = 'transaction': PgBouncer(pool_mode=transaction) 뒤에서도 안전하도록 세션 상태를 만들지 않는다.
+- 연결마다 SET TIME ZONE을 보내지 않는다 (DB 서버 timezone이 TIME_ZONE과 같아야 함)
+- 서버 측 커서(iterator)는 settings의 DISABLE_SERVER_SIDE_CURSORS로 끈다
+"""
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from .pool import connection_pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def _pool(self):
+        return connection_pool(self.alias, self.settings_dict)
+
+    def get_new_connection(self, conn_params):
+        # 새 연결은 Django 기본 구현이 만들고 isolation_level을 지정한다 - 재사용 연결은 같은 값을 직접 지정
+        self.isolation_level = IsolationLevel(
+            self.settings_dict['OPTIONS'].get('isolation_level', IsolationLevel.READ_COMMITTED)
+        )
+        return self._pool().checkout(lambda: super(DatabaseWrapper, self).get_new_connection(conn_params))
+
+    def _close(self):
+        if self.connection is not None:
+            self._pool().checkin(self.connection)
+
+    def ensure_timezone(self):
+        if self._pool().mode == 'transaction':
+            return False
+        return super().ensure_timezone()
@@ -0,0 +1,239 @@
+"""
+프로세스 단위 PostgreSQL 연결 풀 (ENGINE='shop.db', settings.DB_POOL)
+
+CONN_MAX_AGE 영구 연결은 스레드(gthread)/그린렛(gevent)마다 백엔드를 하나씩 붙잡는다.
+풀은 워커 프로세스의 모든 스레드가 max_size개 연결을 나눠 쓰게 한다.
+
+- checkout: idle 연결(최근 반납 순, LIFO) → 없으면 max_size 이내에서 새 연결 → 없으면 timeout까지 대기
+  timeout을 넘기면 PoolTimeout (Django가 OperationalError로 감싼다)
+- 상태 검사: check_interval 이상 쉬었던 연결은 빌려주기 전에 SELECT 1, 실패하면 버리고 다시 빌린다
+- 반납: 트랜잭션이 열려 있으면 롤백, 끊겼거나 롤백이 실패하면 버린다
+- 정리: checkout/반납 시 max_idle 넘게 쉰 연결(min_size 초과분)과 max_lifetime 넘은 연결을 닫는다
+  (별도 스레드 없이 풀 사용 시점에 정리 - gevent에서도 그대로 동작)
+
+fork 후 자식 프로세스는 부모의 연결을 쓰지 않고 새 풀을 만든다 (부모 연결을 닫지도 않는다).
+"""
+import os
+import threading
+import time
+from collections import deque
+
+import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from django_prometheus.conf import NAMESPACE
+from prometheus_client import Counter, Gauge, Histogram
+
+
+# =============== Prometheus 메트릭 (/metrics) ===============
+pool_wait = Histogram(
+    'django_db_pool_wait_seconds', '연결 checkout 대기 시간 (새 연결 생성 시간 제외)', ['alias'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    namespace=NAMESPACE,
+)
+pool_connections = Gauge(
+    'django_db_pool_connections', '풀 연결 수', ['alias', 'state'], namespace=NAMESPACE
+)
+pool_max_connections = Gauge(
+    'django_db_pool_max_connections', '풀 최대 연결 수 (max_size)', ['alias'], namespace=NAMESPACE
+)
+pool_timeouts = Counter(
+    'django_db_pool_timeouts_total', 'checkout 대기 시간 초과 수', ['alias'], namespace=NAMESPACE
+)
+pool_opened = Counter(
+    'django_db_pool_connections_opened_total', '풀이 새로 연 연결 수', ['alias'], namespace=NAMESPACE
+)
+pool_closed = Counter(
+    'django_db_pool_connections_closed_total', '풀이 닫은 연결 수', ['alias', 'reason'], namespace=NAMESPACE
+)
+
+
+class PoolTimeout(psycopg2.OperationalError):
+    """
+    timeout 안에 연결을 빌리지 못함
+    """
+
+
+class _Entry:
+    __slots__ = ('connection', 'created_at', 'last_used')
+
+    def __init__(self, connection, now):
+        self.connection = connection
+        self.created_at = now
+        self.last_used = now
+
+
+class ConnectionPool:
+    """
+    mode: 'session' / 'transaction' (PgBouncer 호환 - 세션 상태를 만들지 않음, shop/db/base.py 참고)
+    """
+
+    def __init__(self, alias, max_size=10, min_size=0, timeout=5.0, max_idle=300.0, max_lifetime=3600.0,
+                 check_interval=30.0, mode='session'):
+        self.alias = alias
+        self.mode = mode
+        self.max_size = max_size
+        self.min_size = min_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.check_interval = check_interval
+
+        self._cond = threading.Condition()
+        self._idle = deque()    # 오른쪽이 최근 반납
+        self._in_use = {}       # id(connection) → _Entry
+        self._size = 0          # 열린 연결 + 여는 중인 자리
+        pool_max_connections.labels(alias=alias).set(max_size)
+
+    # ----- 빌리기 -----
+    def checkout(self, connect):
+        """
+        connect: 새 연결을 만드는 함수 (Django 기본 get_new_connection)
+        """
+        started = time.monotonic()
+        while True:
+            entry = self._acquire(started + self.timeout)
+            if entry is None or self._usable(entry):
+                break
+
+        pool_wait.labels(alias=self.alias).observe(time.monotonic() - started)
+        if entry is None:
+            try:
+                entry = _Entry(connect(), time.monotonic())
+            except BaseException:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            pool_opened.labels(alias=self.alias).inc()
+
+        with self._cond:
+            self._in_use[id(entry.connection)] = entry
+            self._update_gauges()
+        return entry.connection
+
+    def _acquire(self, deadline):
+        """
+        반환: idle 연결 _Entry, 또는 None (새 연결 자리를 확보함)
+        """
+        expired = []
+        try:
+            with self._cond:
+                while True:
+                    expired += self._reap(time.monotonic())
+                    if self._idle:
+                        return self._idle.pop()
+                    if self._size < self.max_size:
+                        self._size += 1
+                        return None
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        pool_timeouts.labels(alias=self.alias).inc()
+                        raise PoolTimeout(
+                            f'DB 연결 풀({self.alias}) 대기 시간 초과: {self.timeout}s 동안 '
+                            f'{self.max_size}개 연결이 모두 사용 중'
+                        )
+                    self._cond.wait(remaining)
+        finally:
+            self._close_all(expired)
+
+    def _usable(self, entry):
+        connection = entry.connection
+        now = time.monotonic()
+        if connection.closed:
+            self._discard(entry, 'broken')
+            return False
+        if now - entry.created_at >= self.max_lifetime:
+            self._discard(entry, 'lifetime')
+            return False
+        if now - entry.last_used >= self.check_interval:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+            except psycopg2.Error:
+                self._discard(entry, 'health_check')
+                return False
+        return True
+
+    # ----- 반납 -----
+    def checkin(self, connection):
+        with self._cond:
+            entry = self._in_use.pop(id(connection), None)
+        if entry is None:
+            # 풀에서 빌리지 않은 연결 (풀 생성 전 연결 등)
+            connection.close()
+            return
+
+        if connection.closed:
+            self._discard(entry, 'broken')
+            return
+        if connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            try:
+                connection.rollback()
+            except psycopg2.Error:
+                self._discard(entry, 'broken')
+                return
+
+        with self._cond:
+            entry.last_used = time.monotonic()
+            self._idle.append(entry)
+            expired = self._reap(entry.last_used)
+            self._update_gauges()
+            self._cond.notify()
+        self._close_all(expired)
+
+    # ----- 정리 -----
+    def _reap(self, now):
+        """
+        (락 안에서) 오래 쉰/수명이 다한 idle 연결을 풀에서 빼고 반환 - 닫기는 락 밖에서
+        """
+        expired = []
+        for entry in list(self._idle):
+            if now - entry.created_at >= self.max_lifetime:
+                expired.append((entry, 'lifetime'))
+            elif now - entry.last_used >= self.max_idle and self._size - len(expired) > self.min_size:
+                expired.append((entry, 'idle'))
+        for entry, _ in expired:
+            self._idle.remove(entry)
+        self._size -= len(expired)
+        if expired:
+            self._update_gauges()
+        return expired
+
+    def _discard(self, entry, reason):
+        with self._cond:
+            self._in_use.pop(id(entry.connection), None)
+            self._size -= 1
+            self._update_gauges()
+            self._cond.notify()
+        self._close_all([(entry, reason)])
+
+    def _close_all(self, entries):
+        for entry, reason in entries:
+            try:
+                entry.connection.close()
+            except psycopg2.Error:
+                pass
+            pool_closed.labels(alias=self.alias, reason=reason).inc()
+
+    def _update_gauges(self):
+        pool_connections.labels(alias=self.alias, state='in_use').set(len(self._in_use))
+        pool_connections.labels(alias=self.alias, state='idle').set(len(self._idle))
+
+
+# =============== 프로세스별 풀 ===============
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def connection_pool(alias, settings_dict):
+    """
+    settings_dict['POOL']: ConnectionPool 인자 (max_size, min_size, timeout, max_idle, max_lifetime, check_interval, mode)
+    """
+    key = (os.getpid(), alias)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ConnectionPool(alias, **settings_dict.get('POOL', {}))
+    return pool
@@ -0,0 +1,209 @@
+"""
+목록 응답용 고속 직렬화 (values() + 사전 컴파일된 필드 변환기)
+
+ModelSerializer는 행마다 모델 인스턴스를 만들고 필드별 to_representation을 호출한다.
+FastSerializer는 같은 Serializer 클래스의 필드 선언을 한 번 분석해
+- 필요한 컬럼만 values()로 조회하고 (source='product.name' → 'product__name' JOIN)
+- Decimal/datetime 등 변환이 필요한 필드만 미리 만든 변환기를 적용하는
+행 변환 함수를 생성(컴파일)한다. 결과는 기존 Serializer.data와 JSON 바이트 단위로 같다.
+
+지원하지 않는 필드(SerializerMethodField, 중첩 Serializer 등)가 있으면 ImproperlyConfigured.
+뷰셋은 FastListMixin을 상속하고 fast_list_serializer로 켜고 끈다 (기본: settings.FAST_SERIALIZERS).
+"""
+import decimal
+import functools
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .timing import timed
+
+
+# 변환 없이 그대로 내보내도 DRF 결과와 같은 (DRF 필드, 모델 필드) 조합
+_PASSTHROUGH = (
+    (serializers.IntegerField, (models.IntegerField, models.AutoField)),
+    (serializers.CharField, (models.CharField, models.TextField)),
+)
+
+
+def _model_field(model, source):
+    """
+    'product.name' 같은 source를 따라가 마지막 모델 필드 반환 (속성/프로퍼티면 None)
+    """
+    field = None
+    for part in source.split('.'):
+        if model is None:
+            return None
+        try:
+            field = model._meta.get_field(part)
+        except Exception:
+            return None
+        model = field.related_model
+    return field
+
+
+def _decimal_converter(field):
+    """
+    DecimalField.to_representation과 동일 (quantize 후 '{:f}' 문자열)
+    """
+    if not getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING) or field.localize:
+        return field.to_representation
+
+    quantum = decimal.Decimal('.1') ** field.decimal_places if field.decimal_places is not None else None
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    if quantum is None:
+        return lambda value: '{:f}'.format(value)
+
+    def convert(value):
+        return '{:f}'.format(value.quantize(quantum, rounding=rounding, context=context))
+    return convert
+
+
+def _datetime_binder(field):
+    """
+    DateTimeField.to_representation과 동일 (현재 타임존 변환 후 ISO 8601, +00:00 → Z)
+    타임존은 요청마다 달라질 수 있어 to_representation 호출 시점에 결정한다.
+    """
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != 'iso-8601':
+        return None
+
+    def bind():
+        tz = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+        if tz is None:
+            return field.to_representation
+
+        def convert(value):
+            if value.tzinfo is None:
+                return field.to_representation(value)
+            value = value.astimezone(tz).isoformat()
+            if value.endswith('+00:00'):
+                value = value[:-6] + 'Z'
+            return value
+        return convert
+    return bind
+
+
+class FastSerializer:
+    """
+    Serializer 클래스의 읽기 필드를 values() 컬럼 + 변환기로 컴파일
+    compile_serializer()로 클래스당 한 번만 만든다.
+    """
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        model = serializer_class.Meta.model
+        self.columns = []
+        plan = []  # (출력 이름, 컬럼, 변환기, bind 필요 여부)
+
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, (serializers.BaseSerializer, serializers.SerializerMethodField,
+                                  serializers.ManyRelatedField, serializers.HiddenField)) or field.source == '*':
+                raise ImproperlyConfigured(
+                    f'{serializer_class.__name__}.{name}: FastSerializer가 지원하지 않는 필드입니다.'
+                )
+
+            column = field.source.replace('.', '__')
+            model_field = _model_field(model, field.source)
+            self.columns.append(column)
+            plan.append((name, column) + self._converter(field, model_field))
+
+        self._plan = plan
+        self._convert = self._compile(plan)
+
+    @staticmethod
+    def _converter(field, model_field):
+        if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+            return None, False  # values('product') → product_id
+        if isinstance(field, serializers.DecimalField):
+            return _decimal_converter(field), False
+        if isinstance(field, serializers.DateTimeField):
+            binder = _datetime_binder(field)
+            return (binder, True) if binder else (field.to_representation, False)
+        if isinstance(field, serializers.FloatField):
+            return float, False
+        for drf_type, model_types in _PASSTHROUGH:
+            if type(field) is drf_type and isinstance(model_field, model_types):
+                return None, False
+        return field.to_representation, False
+
+    @staticmethod
+    def _compile(plan):
+        """
+        행 변환 함수 생성: [{'id': row['id'], 'price': c2(v) ...} for row in rows]
+        """
+        params, items = [], []
+        for i, (name, column, converter, _) in enumerate(plan):
+            if converter is None:
+                items.append(f'{name!r}: row[{column!r}]')
+            else:
+                params.append(f'c{i}')
+                items.append(f'{name!r}: None if (v := row[{column!r}]) is None else c{i}(v)')
+
+        source = (
+            f"def convert(rows, {', '.join(params)}):\n"
+            f"    return [{{{', '.join(items)}}} for row in rows]\n"
+        )
+        namespace = {}
+        exec(source, namespace)
+        return namespace['convert']
+
+    def values(self, queryset, extra=()):
+        """
+        선언된 필드 컬럼만 조회하는 values() QuerySet (extra: 커서 등 응답 외 컬럼)
+        """
+        return queryset.values(*self.columns, *[column for column in extra if column not in self.columns])
+
+    @timed('serialize')
+    def to_representation(self, rows):
+        converters = [
+            converter() if bind else converter
+            for _, _, converter, bind in self._plan
+            if converter is not None
+        ]
+        return self._convert(rows, *converters)
+
+
+@functools.lru_cache(maxsize=None)
+def compile_serializer(serializer_class):
+    return FastSerializer(serializer_class)
+
+
+def fast_serializers_enabled(flag=None):
+    return settings.FAST_SERIALIZERS if flag is None else flag
+
+
+class FastListMixin:
+    """
+    list 액션을 values() + FastSerializer로 처리하는 뷰셋 믹스인
+    fast_list_serializer = False면 기존 ModelSerializer 경로 (None: settings.FAST_SERIALIZERS)
+    """
+    fast_list_serializer = None
+
+    def use_fast_list(self):
+        return fast_serializers_enabled(self.fast_list_serializer)
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_fast_list():
+            return super().list(request, *args, **kwargs)
+
+        fast = compile_serializer(self.get_serializer_class())
+        queryset = fast.values(
+            self.filter_queryset(self.get_queryset()),
+            extra=getattr(self, 'keyset_orderings', ()),
+        )
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(fast.to_representation(page))
+        return Response(fast.to_representation(queryset))
@@ -0,0 +1,240 @@
+"""
+NDJSON 스트리밍 주문 적재 (POST /orders/ingest)
+
+요청 본문을 한 줄(주문 1건)씩 읽어 chunk_size건마다 별도 트랜잭션으로 커밋한다.
+메모리에는 현재 청크만 유지하므로 본문 크기와 무관하게 사용량이 일정하다.
+줄 형식은 /orders/bulk의 주문 1건과 같다: {"user_id": 1, "items": [{"product_id": 3, "quantity": 2}]}
+
+청크 처리 (쿼리 수는 청크 크기와 무관):
+1. 청크가 참조하는 상품 행을 id 순으로 잠그고 재고/가격 조회 (SELECT ... FOR UPDATE)
+2. 줄 순서대로 재고 배정 - 재고 부족/없는 상품이 있는 주문만 거부
+3. 재고 차감 UPDATE ... FROM (VALUES) 1회
+4. 주문 id를 시퀀스에서 미리 받아 shop_order / shop_orderitem에 COPY
+5. 일별 판매 롤업 UPSERT, 응답 캐시 무효화 (커밋 후)
+"""
+import io
+from decimal import Decimal
+
+import orjson
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from .aggregates import apply_sales
+from .cache import invalidate_products
+from .inventory import decrement_locked
+
+
+# ?chunk_size 상한 (청크 하나가 한 트랜잭션 - 락 유지 시간과 메모리 상한)
+MAX_CHUNK_SIZE = 10000
+
+# 한 줄(주문 1건) 최대 바이트
+MAX_LINE_BYTES = 1024 * 1024
+
+# 거부된 줄 상세는 요청 전체에서 이 개수까지만 응답에 포함 (개수는 모두 집계)
+MAX_ERRORS = 100
+
+INT4_MAX = 2 ** 31 - 1
+
+LOCK_SQL = """
+    SELECT id, stock, price, category FROM shop_product
+    WHERE id = ANY(%s)
+    ORDER BY id
+    FOR UPDATE
+"""
+
+ORDER_IDS_SQL = "SELECT nextval(pg_get_serial_sequence('shop_order', 'id')) FROM generate_series(1, %s)"
+
+ORDER_COPY_SQL = 'COPY shop_order (id, user_id, status, total_price, created_at, updated_at) FROM STDIN'
+ORDER_ITEM_COPY_SQL = 'COPY shop_orderitem (order_id, product_id, quantity, unit_price) FROM STDIN'
+
+
+class IngestError(Exception):
+    """
+    청크 처리 중 DB 오류 - 앞선 청크는 커밋된 상태
+    """
+
+    def __init__(self, summary, cause):
+        super().__init__(str(cause))
+        self.summary = summary
+
+
+# =============== 줄 읽기/검증 ===============
+def read_lines(stream):
+    """
+    스트림을 한 줄씩 읽어 (줄 번호, 바이트 또는 None=길이 초과) 반환 - 빈 줄은 건너뜀
+    """
+    number = 0
+    while True:
+        line = stream.readline(MAX_LINE_BYTES + 1)
+        if not line:
+            return
+        number += 1
+        if len(line) > MAX_LINE_BYTES:
+            # 줄의 나머지를 버린다
+            while line and not line.endswith(b'\n'):
+                line = stream.readline(MAX_LINE_BYTES + 1)
+            yield number, None
+            continue
+        line = line.strip()
+        if line:
+            yield number, line
+
+
+def _int(value, minimum, maximum=INT4_MAX):
+    return type(value) is int and minimum <= value <= maximum
+
+
+def parse_order(line):
+    """
+    반환: {'user_id', 'items': [{'product_id', 'quantity'}]} - 형식 오류면 ValueError
+    (OrderCreateSerializer와 같은 규칙을 DRF 없이 검사)
+    """
+    if line is None:
+        raise ValueError(f'줄이 너무 깁니다 (최대 {MAX_LINE_BYTES}바이트).')
+    try:
+        data = orjson.loads(line)
+    except orjson.JSONDecodeError as exc:
+        raise ValueError(f'JSON parse error - {exc}')
+
+    if not isinstance(data, dict):
+        raise ValueError('주문은 JSON 객체여야 합니다.')
+    if not _int(data.get('user_id'), -INT4_MAX - 1):
+        raise ValueError('user_id는 정수여야 합니다.')
+    items = data.get('items')
+    if not isinstance(items, list) or not items:
+        raise ValueError('최소 1개 이상의 상품이 필요합니다.')
+
+    parsed = []
+    for item in items:
+        if not isinstance(item, dict) or not _int(item.get('product_id'), 1, 2 ** 63 - 1):
+            raise ValueError('product_id는 양의 정수여야 합니다.')
+        if not _int(item.get('quantity'), 1):
+            raise ValueError('quantity는 1 이상의 정수여야 합니다.')
+        parsed.append({'product_id': item['product_id'], 'quantity': item['quantity']})
+    return {'user_id': data['user_id'], 'items': parsed}
+
+
+# =============== 청크 적재 ===============
+def _copy(cursor, sql, rows):
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(map(str, row)))
+        buffer.write('\n')
+    buffer.seek(0)
+    cursor.copy_expert(sql, buffer)
+
+
+def ingest_chunk(orders):
+    """
+    orders: [(줄 번호, 주문)] - 한 트랜잭션으로 적재
+    반환: (생성 수, [(줄 번호, 오류)] 재고 부족/없는 상품으로 거부된 주문)
+    """
+    rejected = []
+    now = timezone.now()
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        product_ids = sorted({item['product_id'] for _, order in orders for item in order['items']})
+        cursor.execute(LOCK_SQL, [product_ids])
+        products = {product_id: [stock, price, category] for product_id, stock, price, category in cursor.fetchall()}
+
+        # 줄 순서대로 재고 배정
+        accepted, decrements = [], {}
+        for number, order in orders:
+            needed = {}
+            for item in order['items']:
+                needed[item['product_id']] = needed.get(item['product_id'], 0) + item['quantity']
+
+            missing = [product_id for product_id in needed if product_id not in products]
+            if missing:
+                rejected.append((number, f'상품 ID {missing[0]}를 찾을 수 없습니다.'))
+                continue
+            short = [product_id for product_id, quantity in needed.items() if products[product_id][0] < quantity]
+            if short:
+                rejected.append((number, f'재고 부족: 상품 ID {short[0]}'))
+                continue
+
+            for product_id, quantity in needed.items():
+                products[product_id][0] -= quantity
+                decrements[product_id] = decrements.get(product_id, 0) + quantity
+            accepted.append(order)
+
+        if not accepted:
+            return 0, rejected
+
+        decrement_locked(cursor, decrements, now)
+
+        # COPY는 생성된 id를 돌려주지 않으므로 시퀀스에서 미리 받는다
+        cursor.execute(ORDER_IDS_SQL, [len(accepted)])
+        order_ids = [row[0] for row in cursor.fetchall()]
+
+        order_rows, item_rows, sales = [], [], []
+        for order_id, order in zip(order_ids, accepted):
+            total_price = Decimal('0.00')
+            for item in order['items']:
+                price = products[item['product_id']][1]
+                total_price += price * item['quantity']
+                item_rows.append((order_id, item['product_id'], item['quantity'], price))
+                sales.append((order_id, now, item['product_id'], item['quantity'], price))
+            order_rows.append((order_id, order['user_id'], 'pending', total_price, now.isoformat(), now.isoformat()))
+
+        _copy(cursor, ORDER_COPY_SQL, order_rows)
+        _copy(cursor, ORDER_ITEM_COPY_SQL, item_rows)
+
+        apply_sales(sales)
+        invalidate_products((product_id, products[product_id][2]) for product_id in decrements)
+
+    return len(accepted), rejected
+
+
+def ingest_orders(stream, chunk_size):
+    """
+    NDJSON 스트림 전체 적재 - 유효한 주문 chunk_size건마다 커밋
+    반환: {'created', 'rejected', 'lines', 'chunks', 'committed_through_line', 'errors': [줄 순서로 앞 MAX_ERRORS건]}
+    거부된 줄은 개수만 누적하고 상세는 MAX_ERRORS건까지만 보관 - 형식 오류만 이어지는 본문도 메모리가 일정
+    청크 처리 중 DB 오류가 나면 그때까지의 요약을 담은 IngestError
+    """
+    summary = {'created': 0, 'rejected': 0, 'lines': 0, 'chunks': 0, 'committed_through_line': 0, 'errors': []}
+    # 현재 청크의 형식 오류 상세 - 재고 거부는 청크를 적재한 뒤에야 알 수 있으므로 청크 단위로 줄 순서로 합친다
+    orders, pending = [], []
+
+    def reject(number, error):
+        summary['rejected'] += 1
+        # 상한을 넘는 뒤쪽 형식 오류는 합쳐도 잘리므로 보관하지 않는다
+        if len(summary['errors']) + len(pending) < MAX_ERRORS:
+            pending.append({'line': number, 'error': error})
+
+    def keep_errors(rejected=()):
+        summary['rejected'] += len(rejected)
+        merged = pending + [{'line': number, 'error': error} for number, error in rejected]
+        merged.sort(key=lambda error: error['line'])
+        summary['errors'].extend(merged[:MAX_ERRORS - len(summary['errors'])])
+        pending.clear()
+
+    def flush():
+        try:
+            created, rejected = ingest_chunk(orders)
+        except DatabaseError as exc:
+            keep_errors()
+            raise IngestError(summary, exc) from exc
+        summary['chunks'] += 1
+        summary['created'] += created
+        summary['committed_through_line'] = summary['lines']
+        keep_errors(rejected)
+
+    for number, line in read_lines(stream):
+        summary['lines'] = number
+        try:
+            orders.append((number, parse_order(line)))
+        except ValueError as exc:
+            reject(number, str(exc))
+
+        if len(orders) >= chunk_size:
+            flush()
+            orders = []
+
+    if orders:
+        flush()
+    keep_errors()
+    # 남은 줄이 모두 형식 오류여도 처리는 끝났다 (다시 보낼 줄 없음)
+    summary['committed_through_line'] = summary['lines']
+    return summary
@@ -0,0 +1,329 @@
+"""
+재고 예약 (경합 없는 차감)
+
+- atomic: 조건부 UPDATE 1문으로 확인 + 차감 + 결과 조회
+  UPDATE ... SET stock = stock - qty WHERE id = ? AND stock >= qty RETURNING stock
+  행 락은 문장 실행 동안만 잡히고, 재고 부족이면 0행이라 초과 판매가 불가능하다.
+- batched: 같은 워커(프로세스)로 짧은 구간(RESERVE_BATCH_WINDOW_MS) 안에 들어온 예약을
+  모아 상품별 합계로 UPDATE 1문에 처리한다 (그룹 커밋).
+  먼저 도착한 요청이 리더가 되어 구간만큼 기다린 뒤 묶음을 실행하고, 나머지는 결과를 기다린다.
+  요청을 동시에 처리하는 워커(gthread --threads, gevent)에서만 묶음이 만들어진다.
+- 장바구니(다건) 예약: 여러 상품을 한 트랜잭션에서 예약 (reserve_cart)
+  상품 id 순으로 행 락을 잡아 교착 상태를 피하고, 잠긴 행은 기다리지 않는다 (SKIP LOCKED).
+  SELECT ... FOR UPDATE 1회 + UPDATE 1회 왕복으로 끝난다.
+
+주문 생성/벌크 주문 생성도 decrement_stock(조건부 합계 차감)으로 재고를 줄인다.
+"""
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django_prometheus.conf import NAMESPACE
+from prometheus_client import Histogram
+
+from .cache import invalidate_products
+from .querybudget import untracked
+
+
+# 재고 부족 / 없는 상품 - 뷰에서 400 / 404로 변환
+INSUFFICIENT = 'insufficient'
+NOT_FOUND = 'not_found'
+
+# 장바구니 예약 줄별 상태 (INSUFFICIENT, NOT_FOUND 포함)
+RESERVED = 'reserved'
+AVAILABLE = 'available'  # 재고는 충분하지만 다른 줄이 실패해 예약하지 않음
+LOCKED = 'locked'
+
+CART_LOCK_MODES = ('nowait', 'skip_locked', 'wait')
+
+
+# =============== Prometheus 메트릭 (/metrics) ===============
+inventory_lock_wait = Histogram(
+    'django_inventory_lock_wait_seconds',
+    '재고 예약 행 락(SELECT ... FOR UPDATE) 획득 시간',
+    ['endpoint', 'lock'],
+    namespace=NAMESPACE,
+    buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5),
+)
+
+
+# =============== 단건 조건부 차감 ===============
+RESERVE_SQL = """
+    UPDATE shop_product SET stock = stock - %s, updated_at = %s
+    WHERE id = %s AND stock >= %s
+    RETURNING stock, category
+"""
+
+
+def _reserve_one(cursor, product_id, quantity, now):
+    """
+    반환: (남은 재고, 카테고리) 또는 INSUFFICIENT / NOT_FOUND
+    """
+    cursor.execute(RESERVE_SQL, [quantity, now, product_id, quantity])
+    row = cursor.fetchone()
+    if row is not None:
+        return row
+    # 실패 경로에서만 원인 구분용 조회
+    cursor.execute('SELECT 1 FROM shop_product WHERE id = %s', [product_id])
+    return INSUFFICIENT if cursor.fetchone() else NOT_FOUND
+
+
+def reserve_atomic(product_id, quantity):
+    """
+    반환: 남은 재고 또는 INSUFFICIENT / NOT_FOUND (autocommit이면 문장 단위로 커밋)
+    """
+    with connection.cursor() as cursor:
+        result = _reserve_one(cursor, product_id, quantity, timezone.now())
+    if isinstance(result, str):
+        return result
+    remaining, category = result
+    invalidate_products([(product_id, category)])
+    return remaining
+
+
+# =============== 묶음 조건부 차감 (그룹 커밋, 주문 생성 공용) ===============
+# 상품 id 순으로 행 락을 먼저 잡아 다른 묶음/주문과 교착 상태가 생기지 않게 한다
+DECREMENT_SQL = """
+    WITH requested (id, quantity) AS (VALUES {values}),
+    locked AS (
+        SELECT p.id FROM shop_product AS p
+        WHERE p.id IN (SELECT id FROM requested)
+        ORDER BY p.id
+        FOR UPDATE
+    )
+    UPDATE shop_product AS p
+    SET stock = p.stock - requested.quantity, updated_at = %s
+    FROM requested JOIN locked ON locked.id = requested.id
+    WHERE p.id = requested.id AND p.stock >= requested.quantity
+    RETURNING p.id, p.stock, p.category, p.price, p.name
+"""
+
+
+def decrement_stock(cursor, quantities, now):
+    """
+    quantities: {product_id: 차감량} - 재고가 차감량 이상인 상품만 차감 (UPDATE 1문)
+    반환: {product_id: (남은 재고, 카테고리, 가격, 이름)} - 빠진 상품은 재고 부족 또는 없는 상품
+    """
+    if not quantities:
+        # 빈 VALUES 목록은 SQL 문법 오류 (빈 벌크 주문)
+        return {}
+    totals = sorted(quantities.items())
+    values = ', '.join(['(%s::bigint, %s::integer)'] * len(totals))
+    cursor.execute(
+        DECREMENT_SQL.format(values=values),
+        [param for row in totals for param in row] + [now],
+    )
+    return {row[0]: row[1:] for row in cursor.fetchall()}
+
+
+def stock_failures(cursor, quantities, decremented):
+    """
+    decrement_stock에서 빠진 상품의 원인 구분 (실패 경로 전용)
+    반환: (없는 상품 id 목록, [{'product_id', 'name', 'requested', 'stock'}] 재고 부족 목록)
+    """
+    failed = sorted(product_id for product_id in quantities if product_id not in decremented)
+    cursor.execute('SELECT id, name, stock FROM shop_product WHERE id = ANY(%s) ORDER BY id', [failed])
+    found = {product_id: (name, stock) for product_id, name, stock in cursor.fetchall()}
+    missing = [product_id for product_id in failed if product_id not in found]
+    shortages = [
+        {'product_id': product_id, 'name': name, 'requested': quantities[product_id], 'stock': stock}
+        for product_id, (name, stock) in found.items()
+    ]
+    return missing, shortages
+
+
+class _Reservation:
+    __slots__ = ('product_id', 'quantity', 'result', 'error', 'done')
+
+    def __init__(self, product_id, quantity):
+        self.product_id = product_id
+        self.quantity = quantity
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class ReservationBatcher:
+    """
+    워커 내 예약 요청을 window초 단위로 모아 한 트랜잭션(대부분 UPDATE 1문)으로 처리
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self._lock = threading.Lock()
+        self._pending = None
+
+    def reserve(self, product_id, quantity):
+        """
+        반환: 남은 재고 또는 INSUFFICIENT / NOT_FOUND
+        """
+        reservation = _Reservation(product_id, quantity)
+        with self._lock:
+            leader = self._pending is None
+            if leader:
+                self._pending = []
+            self._pending.append(reservation)
+
+        if leader:
+            time.sleep(self.window)
+            with self._lock:
+                batch, self._pending = self._pending, None
+            try:
+                # 묶음의 SQL은 리더 요청의 쿼리 예산에 세지 않는다 (실패 상품은 예약마다 단건 차감)
+                with untracked():
+                    self._execute(batch)
+            except Exception as exc:
+                for item in batch:
+                    item.error = exc
+            finally:
+                for item in batch:
+                    item.done.set()
+        else:
+            reservation.done.wait()
+
+        if reservation.error is not None:
+            raise reservation.error
+        return reservation.result
+
+    @staticmethod
+    def _execute(batch):
+        """
+        상품별 합계를 한 번에 차감하고, 합계만큼 재고가 없는 상품만 도착 순서대로 단건 차감
+        각 예약의 남은 재고는 도착 순서대로 처리했을 때의 값
+        """
+        by_product = defaultdict(list)
+        for item in batch:
+            by_product[item.product_id].append(item)
+        totals = {product_id: sum(item.quantity for item in items) for product_id, items in by_product.items()}
+
+        now = timezone.now()
+        changed = []
+        with transaction.atomic(), connection.cursor() as cursor:
+            for product_id, (remaining, category, _, _) in decrement_stock(cursor, totals, now).items():
+                # 뒤에 도착한 예약 수량을 더해 가며 각 예약 시점의 남은 재고 계산
+                for item in reversed(by_product.pop(product_id)):
+                    item.result = remaining
+                    remaining += item.quantity
+                changed.append((product_id, category))
+
+            # 합계 차감에 실패한 상품 (재고 부족 구간 또는 없는 상품)
+            for product_id in sorted(by_product):
+                for item in by_product[product_id]:
+                    result = _reserve_one(cursor, product_id, item.quantity, now)
+                    if isinstance(result, str):
+                        item.result = result
+                    else:
+                        item.result = result[0]
+                        changed.append((product_id, result[1]))
+
+            invalidate_products(changed)
+
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+
+def reserve_batched(product_id, quantity):
+    global _batcher
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = ReservationBatcher(settings.RESERVE_BATCH_WINDOW_MS / 1000)
+    return _batcher.reserve(product_id, quantity)
+
+
+# =============== 장바구니(다건) 예약 ===============
+CART_LOCK_SQL = """
+    SELECT id, stock, category FROM shop_product
+    WHERE id = ANY(%s)
+    ORDER BY id
+    FOR UPDATE{skip_locked}
+"""
+
+# 이미 FOR UPDATE로 잠근 행 차감 (재고 확인은 호출자가 잠근 값으로 끝낸 상태)
+LOCKED_DECREMENT_SQL = """
+    UPDATE shop_product AS p
+    SET stock = p.stock - requested.quantity, updated_at = %s
+    FROM (VALUES {values}) AS requested (id, quantity)
+    WHERE p.id = requested.id
+"""
+
+
+def decrement_locked(cursor, quantities, now):
+    """
+    quantities: {product_id: 차감량} - 같은 트랜잭션에서 잠근 상품만 (UPDATE 1문)
+    """
+    if not quantities:
+        return
+    values = ', '.join(['(%s::bigint, %s::integer)'] * len(quantities))
+    cursor.execute(
+        LOCKED_DECREMENT_SQL.format(values=values),
+        [now] + [param for row in sorted(quantities.items()) for param in row],
+    )
+
+
+def reserve_cart(lines, lock='nowait'):
+    """
+    lines: [{'product_id', 'quantity'}, ...] - 같은 상품이 여러 줄이면 줄 순서대로 차감
+    lock:
+      nowait      잠긴 상품이 있으면 기다리지 않고 전체 실패 (전부 예약 또는 전부 취소)
+      skip_locked 잠긴 상품/재고 부족/없는 상품 줄만 건너뛰고 나머지 예약
+      wait        행 락을 기다린 뒤 전체 예약 또는 전체 취소
+    반환: (예약 반영 여부, 줄별 결과 [{'product_id', 'quantity', 'status', 'remaining_stock'}])
+    """
+    product_ids = sorted({line['product_id'] for line in lines})
+    partial = lock == 'skip_locked'
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        start = time.perf_counter()
+        cursor.execute(
+            CART_LOCK_SQL.format(skip_locked='' if lock == 'wait' else ' SKIP LOCKED'),
+            [product_ids],
+        )
+        rows = cursor.fetchall()
+        inventory_lock_wait.labels(endpoint='cart', lock=lock).observe(time.perf_counter() - start)
+
+        stock = {product_id: remaining for product_id, remaining, _ in rows}
+        categories = {product_id: category for product_id, _, category in rows}
+
+        # 락을 못 잡은 상품: 존재하면 다른 트랜잭션이 잠근 것 (실패 경로에서만 조회)
+        missing = [product_id for product_id in product_ids if product_id not in stock]
+        locked = set()
+        if missing:
+            cursor.execute('SELECT id FROM shop_product WHERE id = ANY(%s)', [missing])
+            locked = {row[0] for row in cursor.fetchall()}
+
+        results = []
+        for line in lines:
+            product_id, quantity = line['product_id'], line['quantity']
+            if product_id in stock:
+                status = AVAILABLE if stock[product_id] >= quantity else INSUFFICIENT
+            else:
+                status = LOCKED if product_id in locked else NOT_FOUND
+            if status == AVAILABLE:
+                stock[product_id] -= quantity
+            results.append({'product_id': product_id, 'quantity': quantity, 'status': status})
+
+        accepted = [result for result in results if result['status'] == AVAILABLE]
+        if not accepted or (not partial and len(accepted) < len(results)):
+            # 전체 실패: 락만 잡고 아무것도 바꾸지 않았으므로 커밋해도 무해
+            return False, results
+
+        totals = defaultdict(int)
+        for result in accepted:
+            totals[result['product_id']] += result['quantity']
+        decrement_locked(cursor, totals, timezone.now())
+
+        # 줄 순서대로 처리했을 때 각 줄 직후의 남은 재고
+        remaining = {product_id: stock[product_id] + total for product_id, total in totals.items()}
+        for result in accepted:
+            remaining[result['product_id']] -= result['quantity']
+            result['status'] = RESERVED
+            result['remaining_stock'] = remaining[result['product_id']]
+
+        invalidate_products([(product_id, categories[product_id]) for product_id in totals])
+
+    return True, results
@@ -0,0 +1,8 @@
+"""
+개방형(open model) HTTP 부하 생성기 - k6 시나리오 재현, HDR 히스토그램, coordinated omission 보정
+
+    python -m shop.loadgen --url http://localhost:9000 --scenario mixed --rate 5000 --duration 1m
+    python manage.py loadgen --stages "1000:30s,2000:30s,4000:30s"
+
+Django를 불러오지 않으므로 Docker 없이 어느 머신에서나 실행할 수 있다.
+"""
@@ -0,0 +1,21 @@
+import argparse
+import sys
+
+from .runner import add_arguments, execute
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m shop.loadgen',
+        description='개방형 부하 생성기 (constant / step 도착률, CO 보정 HDR 히스토그램)',
+    )
+    add_arguments(parser)
+    options = vars(parser.parse_args(argv))
+    try:
+        execute(options, print)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
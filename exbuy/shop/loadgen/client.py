@@ -0,0 +1,238 @@
+"""
+부하 생성용 최소 HTTP/1.1 클라이언트 (asyncio Protocol, keep-alive 연결 풀)
+
+요청 바이트는 미리 만들어 두고, 응답은 상태 코드와 본문 길이만 해석한다 (Content-Length / chunked).
+범용 클라이언트(aiohttp 등)보다 요청당 CPU가 훨씬 적어 한 프로세스에서 수만 req/s를 낼 수 있다.
+파이프라이닝은 하지 않는다 - 연결당 동시 요청 1개.
+"""
+import asyncio
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+
+STATUS_CONNECT_ERROR = 0     # 연결 실패/끊김
+STATUS_TIMEOUT = -1          # 응답 시간 초과
+
+
+class ResponseError(Exception):
+    pass
+
+
+def build_request(host, method, path, body=None, content_type='application/json', user_agent='exbuy-loadgen'):
+    lines = [f'{method} {path} HTTP/1.1', f'Host: {host}', f'User-Agent: {user_agent}', 'Accept: */*']
+    if body is not None:
+        lines += [f'Content-Type: {content_type}', f'Content-Length: {len(body)}']
+    head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+    return head + body if body is not None else head
+
+
+class _Connection(asyncio.Protocol):
+    def __init__(self, pool):
+        self.pool = pool
+        self.transport = None
+        self.buffer = bytearray()
+        self.waiter = None
+        self.timeout_handle = None
+        self.closed = False
+        # 현재 응답 해석 상태
+        self._status = None
+        self._body_start = None
+        self._length = None
+        self._chunked = False
+        self._keep_alive = True
+
+    # =============== asyncio Protocol ===============
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self.buffer += data
+        if self.waiter is not None:
+            self._parse()
+
+    def connection_lost(self, exc):
+        self.closed = True
+        self._finish(exception=ConnectionError('연결이 끊겼습니다'))
+
+    # =============== 요청 ===============
+    def request(self, raw, timeout):
+        loop = self.pool.loop
+        self.waiter = loop.create_future()
+        self._status = None
+        self._body_start = None
+        self.timeout_handle = loop.call_later(timeout, self._timeout)
+        self.transport.write(raw)
+        return self.waiter
+
+    def _timeout(self):
+        self.timeout_handle = None
+        self._finish(exception=asyncio.TimeoutError())
+        self.close()
+
+    def _finish(self, result=None, exception=None):
+        waiter, self.waiter = self.waiter, None
+        if self.timeout_handle is not None:
+            self.timeout_handle.cancel()
+            self.timeout_handle = None
+        if waiter is None or waiter.done():
+            return
+        if exception is not None:
+            waiter.set_exception(exception)
+        else:
+            waiter.set_result(result)
+
+    def close(self):
+        self.closed = True
+        if self.transport is not None:
+            self.transport.close()
+
+    # =============== 응답 해석 ===============
+    def _parse(self):
+        buffer = self.buffer
+        if self._status is None:
+            end = buffer.find(b'\r\n\r\n')
+            if end < 0:
+                return
+            head = bytes(buffer[:end]).decode('latin-1')
+            status_line, _, header_text = head.partition('\r\n')
+            try:
+                self._status = int(status_line.split(' ', 2)[1])
+            except (IndexError, ValueError):
+                self._finish(exception=ResponseError(f'잘못된 상태 줄: {status_line[:80]!r}'))
+                self.close()
+                return
+            self._length = 0
+            self._chunked = False
+            self._keep_alive = not status_line.startswith('HTTP/1.0')
+            for line in header_text.split('\r\n'):
+                name, _, value = line.partition(':')
+                name = name.strip().lower()
+                if name == 'content-length':
+                    self._length = int(value)
+                elif name == 'transfer-encoding' and 'chunked' in value.lower():
+                    self._chunked = True
+                elif name == 'connection':
+                    self._keep_alive = value.strip().lower() != 'close'
+            self._body_start = end + 4
+
+        if self._chunked:
+            consumed = self._chunked_end(self._body_start)
+            if consumed is None:
+                return
+        else:
+            consumed = self._body_start + self._length
+            if len(buffer) < consumed:
+                return
+
+        del buffer[:consumed]
+        status, keep_alive = self._status, self._keep_alive
+        self._status = None
+        self._finish((status, consumed))
+        if not keep_alive:
+            self.close()
+
+    def _chunked_end(self, position):
+        """
+        반환: 마지막 청크(0)와 트레일러까지의 끝 위치 또는 None (아직 덜 받음)
+        """
+        buffer = self.buffer
+        while True:
+            line_end = buffer.find(b'\r\n', position)
+            if line_end < 0:
+                return None
+            size = int(bytes(buffer[position:line_end]).split(b';', 1)[0], 16)
+            if size == 0:
+                # 트레일러가 없으면 line_end 바로 뒤의 빈 줄
+                trailer_end = buffer.find(b'\r\n\r\n', line_end)
+                return trailer_end + 4 if trailer_end >= 0 else None
+            position = line_end + 2 + size + 2
+            if len(buffer) < position:
+                return None
+
+
+class ConnectionPool:
+    """
+    대상 서버 하나에 대한 keep-alive 연결 풀 - 필요할 때 max_connections까지 연결을 연다
+    유휴 연결이 없고 최대치에 도달하면 연결이 반환될 때까지 기다린다 (이 대기도 지연에 포함된다)
+    """
+
+    def __init__(self, url, max_connections, timeout, user_agent='exbuy-loadgen'):
+        parts = urlsplit(url)
+        if parts.scheme != 'http':
+            raise ValueError('http:// URL만 지원합니다')
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.host_header = parts.netloc
+        self.base_path = parts.path.rstrip('/')
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.loop = asyncio.get_running_loop()
+        self.idle = deque()
+        self.waiters = deque()
+        self.size = 0
+        self.peak = 0
+
+    def build(self, method, path, body=None):
+        return build_request(self.host_header, method, self.base_path + path, body, user_agent=self.user_agent)
+
+    async def _acquire(self):
+        while self.idle:
+            connection = self.idle.pop()
+            if not connection.closed:
+                return connection
+            self.size -= 1
+        if self.size < self.max_connections:
+            self.size += 1
+            try:
+                _, connection = await self.loop.create_connection(lambda: _Connection(self), self.host, self.port)
+            except BaseException:
+                self.size -= 1
+                self._wake()
+                raise
+            self.peak = max(self.peak, self.size)
+            return connection
+        waiter = self.loop.create_future()
+        self.waiters.append(waiter)
+        await waiter
+        return await self._acquire()
+
+    def _release(self, connection):
+        if connection.closed:
+            self.size -= 1
+        else:
+            self.idle.append(connection)
+        self._wake()
+
+    def _wake(self):
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    async def send(self, raw):
+        """
+        반환: (상태 코드, 응답 바이트 수, 요청을 보낸 시각(perf_counter))
+        상태 코드 0: 연결 오류, -1: 시간 초과
+        """
+        try:
+            connection = await self._acquire()
+        except OSError:
+            return STATUS_CONNECT_ERROR, 0, time.perf_counter()
+        sent = time.perf_counter()
+        try:
+            status, size = await connection.request(raw, self.timeout)
+        except asyncio.TimeoutError:
+            status, size = STATUS_TIMEOUT, 0
+        except (ConnectionError, ResponseError, ValueError):
+            connection.close()
+            status, size = STATUS_CONNECT_ERROR, 0
+        self._release(connection)
+        return status, size, sent
+
+    def close(self):
+        for connection in self.idle:
+            connection.close()
+        self.idle.clear()
@@ -0,0 +1,157 @@
+"""
+HDR 히스토그램 (HdrHistogram 알고리즘의 순수 Python 구현)
+
+값(µs)을 유효 숫자 significant_figures 자리 정밀도로 기록한다 - 구간 폭이 값에 비례하므로
+1µs부터 1시간까지 고정 크기 배열 하나로 상대 오차 0.1%(3자리) 이내의 백분위를 얻는다.
+같은 설정의 히스토그램은 버킷별 합으로 손실 없이 병합된다 (프로세스별 결과, 여러 실행 결과).
+
+직렬화 형식: {'significant_figures', 'highest', 'counts': {인덱스: 횟수}} - 0이 아닌 버킷만
+"""
+import math
+
+
+class Histogram:
+    """
+    lowest=1, highest: 기록 가능한 최대값 (넘는 값은 highest로 기록하고 saturated로 센다)
+    """
+
+    def __init__(self, highest=3_600_000_000, significant_figures=3):
+        if not 1 <= significant_figures <= 5:
+            raise ValueError('significant_figures는 1~5')
+        self.highest = highest
+        self.significant_figures = significant_figures
+
+        largest_single_unit = 2 * 10 ** significant_figures
+        sub_bucket_count_magnitude = math.ceil(math.log2(largest_single_unit))
+        self._half_magnitude = sub_bucket_count_magnitude - 1
+        self._sub_bucket_count = 1 << sub_bucket_count_magnitude
+        self._half_count = self._sub_bucket_count >> 1
+        self._mask = self._sub_bucket_count - 1
+
+        smallest_untrackable = self._sub_bucket_count
+        bucket_count = 1
+        while smallest_untrackable <= highest:
+            smallest_untrackable <<= 1
+            bucket_count += 1
+        self.counts = [0] * ((bucket_count + 1) * self._half_count)
+
+        self.total = 0
+        self.saturated = 0
+        self.min = None
+        self.max = 0
+        self._sum = 0
+
+    # =============== 기록 ===============
+    def _index(self, value):
+        bucket = (value | self._mask).bit_length() - self._half_magnitude - 1
+        sub_bucket = value >> bucket
+        return ((bucket + 1) << self._half_magnitude) + sub_bucket - self._half_count
+
+    def record(self, value, count=1):
+        value = int(value)
+        if value < 0:
+            value = 0
+        if value > self.highest:
+            value = self.highest
+            self.saturated += count
+        self.counts[self._index(value)] += count
+        self.total += count
+        self._sum += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    # =============== 조회 ===============
+    def _bucket_of(self, index):
+        bucket = (index >> self._half_magnitude) - 1
+        sub_bucket = (index & (self._half_count - 1)) + self._half_count
+        if bucket < 0:
+            sub_bucket -= self._half_count
+            bucket = 0
+        return bucket, sub_bucket
+
+    def _highest_equivalent(self, index):
+        bucket, sub_bucket = self._bucket_of(index)
+        return ((sub_bucket + 1) << bucket) - 1
+
+    def value_at_percentile(self, percentile):
+        """
+        percentile 위치의 값 (구간의 최대 동등값 - 과소 보고하지 않는다)
+        """
+        if not self.total:
+            return 0
+        target = max(1, math.ceil(min(percentile, 100.0) / 100 * self.total))
+        running = 0
+        for index, count in enumerate(self.counts):
+            if count:
+                running += count
+                if running >= target:
+                    return min(self._highest_equivalent(index), self.max)
+        return self.max
+
+    def percentiles(self, percentiles):
+        """
+        반환: {백분위: 값} - 한 번의 누적 순회로 계산
+        """
+        targets = sorted(percentiles)
+        result = {}
+        if not self.total:
+            return {percentile: 0 for percentile in targets}
+        running = 0
+        position = 0
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            running += count
+            while position < len(targets) and running >= max(1, math.ceil(targets[position] / 100 * self.total)):
+                result[targets[position]] = min(self._highest_equivalent(index), self.max)
+                position += 1
+            if position == len(targets):
+                break
+        for percentile in targets[position:]:
+            result[percentile] = self.max
+        return result
+
+    @property
+    def mean(self):
+        return self._sum / self.total if self.total else 0
+
+    # =============== 병합/직렬화 ===============
+    def add(self, other):
+        if (other.significant_figures, len(other.counts)) != (self.significant_figures, len(self.counts)):
+            raise ValueError('설정(significant_figures/highest)이 다른 히스토그램은 병합할 수 없습니다')
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.total += other.total
+        self.saturated += other.saturated
+        self._sum += other._sum
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+        return self
+
+    def to_dict(self):
+        return {
+            'significant_figures': self.significant_figures,
+            'highest': self.highest,
+            'total': self.total,
+            'saturated': self.saturated,
+            'min': self.min,
+            'max': self.max,
+            'sum': self._sum,
+            'counts': {str(index): count for index, count in enumerate(self.counts) if count},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data['highest'], data['significant_figures'])
+        for index, count in data['counts'].items():
+            histogram.counts[int(index)] = count
+        histogram.total = data['total']
+        histogram.saturated = data.get('saturated', 0)
+        histogram.min = data['min']
+        histogram.max = data['max']
+        histogram._sum = data['sum']
+        return histogram
@@ -0,0 +1,766 @@
+"""
+k6 JSON 결과(--out json=..., NDJSON) 스트리밍 분석기
+
+파일을 한 줄씩 읽어 http_req_duration / http_req_failed Point만 해석한다 - 파일 크기와 무관하게 메모리 일정.
+(서버 태그, 시나리오) 실행 그룹마다, 엔드포인트(name 태그)별과 전체('*')로 모은다.
+- 지연: HDR 히스토그램 (shop/loadgen/hdr.py) - 같은 그룹의 여러 파일(반복 실행)은 손실 없이 병합
+- 시간 창(--window, 기본 10초)별 지연 평균/p50/p95/p99, 처리량, 오류율 - 실행 비교의 표본
+
+실행 비교는 창별 값을 표본으로 보고(batch means) Welch t 검정으로 차이의 신뢰 구간을 구한다.
+인접 창의 자기상관만큼 분산을 키우고, 엔드포인트 × 지표 전체에 Bonferroni 보정을 한다 (여러 행 중 우연히 하나가 걸리는 것 방지).
+신뢰 구간이 0을 포함하지 않고 변화가 --min-change 이상 나쁜 쪽이면 유의한 회귀로 표시한다.
+램프업/다운 구간은 요청 수가 창 중앙값의 절반 미만인 창으로 보고 비교에서 뺀다.
+
+    python -m shop.loadgen.k6results summarize results/gunicorn-sync-mixed.json
+    python -m shop.loadgen.k6results compare --baseline results/analysis/이전.json --candidate results/gunicorn-sync-mixed.json
+"""
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+from datetime import datetime, timedelta, timezone
+
+from .hdr import Histogram
+from .runner import parse_duration
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+
+TOTAL = '*'
+PERCENTILES = (50, 90, 95, 99, 100)
+WINDOW_METRICS = ('mean', 'p50', 'p95', 'p99', 'rps', 'error_rate')
+# 값이 커지면 나쁜 지표 (rps만 반대)
+HIGHER_IS_WORSE = {'mean': True, 'p50': True, 'p95': True, 'p99': True, 'rps': False, 'error_rate': True}
+
+HISTOGRAM_HIGHEST = 600_000_000    # 10분 (µs)
+WINDOW_SIGNIFICANT_FIGURES = 2     # 창 히스토그램은 작게 (창 수 × 엔드포인트 수만큼 생긴다)
+
+DEFAULT_HISTORY = os.path.join('results', 'test-history.jsonl')
+DEFAULT_ANALYSIS_DIR = os.path.join('results', 'analysis')
+
+_DURATION = b'"http_req_duration"'
+_FAILED = b'"http_req_failed"'
+_POINT = b'"Point"'
+_SCENARIOS = ('read-heavy', 'write-heavy', 'mixed', 'read-only', 'cart-reserve', 'async-read')
+
+
+# =============== 시각 ===============
+_second_cache = {}
+
+
+def _timestamp(value):
+    """
+    k6 시각 '2024-05-09T14:34:45.625742514+09:00' → epoch 초 (나노초 자리 허용, 초 단위 앞부분은 캐시)
+    """
+    prefix, tz = value[:19], value[-6:] if value[-6] in '+-' else 'Z'
+    base = _second_cache.get((prefix, tz))
+    if base is None:
+        moment = datetime.fromisoformat(prefix).replace(tzinfo=timezone.utc)
+        if tz != 'Z':
+            sign = 1 if tz[0] == '+' else -1
+            moment -= sign * timedelta(hours=int(tz[1:3]), minutes=int(tz[4:6]))
+        if len(_second_cache) > 100_000:
+            _second_cache.clear()
+        base = _second_cache[(prefix, tz)] = moment.timestamp()
+    if len(value) > 19 and value[19] == '.':
+        end = len(value) - (1 if tz == 'Z' else 6)
+        fraction = value[20:end]
+        return base + int(fraction) / 10 ** len(fraction)
+    return base
+
+
+# =============== 집계 ===============
+class _Window:
+    __slots__ = ('latency', 'requests', 'failed', 'checks')
+
+    def __init__(self):
+        self.latency = Histogram(HISTOGRAM_HIGHEST, WINDOW_SIGNIFICANT_FIGURES)
+        self.requests = 0
+        self.failed = 0
+        self.checks = 0
+
+
+class Series:
+    """
+    한 엔드포인트(또는 전체)의 누적 지연 히스토그램과 완료된 창별 값
+    """
+
+    def __init__(self):
+        self.latency = Histogram(HISTOGRAM_HIGHEST)
+        self.requests = 0
+        self.failed = 0
+        self.checks = 0
+        self.windows = []      # [{'requests', 'mean', 'p50', 'p95', 'p99', 'rps', 'error_rate'}, ...]
+        self._open = {}        # 창 번호 → _Window (아직 끝나지 않은 창)
+
+    def duration(self, index, value):
+        self.latency.record(value)
+        self.requests += 1
+        window = self._open.get(index)
+        if window is None:
+            window = self._open[index] = _Window()
+            # 순서가 조금 섞여 들어와도 되도록 두 창 전까지만 닫는다
+            for stale in [number for number in self._open if number < index - 2]:
+                self._close(stale)
+        window.latency.record(value)
+        window.requests += 1
+
+    def failure(self, index, value):
+        self.checks += 1
+        self.failed += value
+        window = self._open.get(index)
+        if window is None:
+            window = self._open[index] = _Window()
+        window.checks += 1
+        window.failed += value
+
+    def _close(self, index):
+        window = self._open.pop(index)
+        if not window.requests:
+            return
+        values = window.latency.percentiles((50, 95, 99))
+        self.windows.append({
+            'index': index,
+            'requests': window.requests,
+            'mean': window.latency.mean / 1000,
+            'p50': values[50] / 1000,
+            'p95': values[95] / 1000,
+            'p99': values[99] / 1000,
+            'rps': None,    # finish()에서 창 길이로 계산
+            'error_rate': window.failed / window.checks * 100 if window.checks else 0.0,
+        })
+
+    def finish(self, window_seconds):
+        for index in sorted(self._open):
+            self._close(index)
+        for window in self.windows:
+            window['rps'] = window['requests'] / window_seconds
+        self.windows.sort(key=lambda window: window['index'])
+
+    def add(self, other):
+        self.latency.add(other.latency)
+        self.requests += other.requests
+        self.failed += other.failed
+        self.checks += other.checks
+        self.windows.extend(other.windows)
+        return self
+
+    def summary(self, duration):
+        values = self.latency.percentiles(PERCENTILES)
+        return {
+            'requests': self.requests,
+            'rps': self.requests / duration if duration else 0.0,
+            'error_rate': self.failed / self.checks * 100 if self.checks else 0.0,
+            'mean': self.latency.mean / 1000,
+            **{('max' if percentile == 100 else f'p{percentile}'): values[percentile] / 1000 for percentile in PERCENTILES},
+        }
+
+    def to_dict(self):
+        return {
+            'latency': self.latency.to_dict(),
+            'requests': self.requests,
+            'failed': self.failed,
+            'checks': self.checks,
+            'windows': self.windows,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        series = cls()
+        series.latency = Histogram.from_dict(data['latency'])
+        series.requests = data['requests']
+        series.failed = data['failed']
+        series.checks = data['checks']
+        series.windows = data['windows']
+        return series
+
+
+class Run:
+    """
+    (서버, 시나리오) 실행 그룹 - 파일 여러 개(반복 실행)를 합칠 수 있다
+    """
+
+    def __init__(self, server, scenario):
+        self.server = server
+        self.scenario = scenario
+        self.sources = []
+        self.started_at = None
+        self.duration = 0.0      # 파일별 실행 시간 합 (초)
+        self.series = {}
+
+    @property
+    def key(self):
+        return self.server, self.scenario
+
+    def add(self, other):
+        self.sources += other.sources
+        if other.started_at and (self.started_at is None or other.started_at < self.started_at):
+            self.started_at = other.started_at
+        self.duration += other.duration
+        for name, series in other.series.items():
+            if name in self.series:
+                self.series[name].add(series)
+            else:
+                self.series[name] = series
+        return self
+
+    def summary(self):
+        return {name: series.summary(self.duration) for name, series in self.series.items()}
+
+    def to_dict(self):
+        return {
+            'server': self.server,
+            'scenario': self.scenario,
+            'sources': self.sources,
+            'started_at': self.started_at,
+            'duration': self.duration,
+            'summary': self.summary(),
+            'series': {name: series.to_dict() for name, series in self.series.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        run = cls(data['server'], data['scenario'])
+        run.sources = data['sources']
+        run.started_at = data['started_at']
+        run.duration = data['duration']
+        run.series = {name: Series.from_dict(series) for name, series in data['series'].items()}
+        return run
+
+
+def _guess(path):
+    # 태그가 없을 때 파일 이름 {서버}-{시나리오}.json 에서 추정
+    stem = os.path.basename(path).rsplit('.', 1)[0]
+    for scenario in _SCENARIOS:
+        if stem.endswith('-' + scenario):
+            return stem[:-len(scenario) - 1], scenario
+    return stem, 'unknown'
+
+
+def read_k6(path, window_seconds):
+    """
+    k6 NDJSON 파일 하나 → {(서버, 시나리오): Run}
+    """
+    default_server, default_scenario = _guess(path)
+    runs = {}
+    origin = None
+    first = last = None
+
+    with open(path, 'rb') as file:
+        for line in file:
+            if _POINT not in line:
+                continue
+            is_duration = _DURATION in line
+            if not is_duration and _FAILED not in line:
+                continue
+            point = _loads(line)
+            metric = point.get('metric')
+            if metric not in ('http_req_duration', 'http_req_failed'):
+                continue
+            data = point['data']
+            tags = data.get('tags') or {}
+            moment = _timestamp(data['time'])
+            if origin is None:
+                origin = moment
+            first = moment if first is None or moment < first else first
+            last = moment if last is None or moment > last else last
+            index = int((moment - origin) // window_seconds)
+
+            key = (tags.get('server_type') or default_server, tags.get('scenario') or default_scenario)
+            if key[1] == 'default':
+                key = (key[0], default_scenario)
+            run = runs.get(key)
+            if run is None:
+                run = runs[key] = Run(*key)
+            name = tags.get('name') or tags.get('url') or 'unknown'
+            for series_name in (TOTAL, name):
+                series = run.series.get(series_name)
+                if series is None:
+                    series = run.series[series_name] = Series()
+                if is_duration:
+                    series.duration(index, int(data['value'] * 1000))
+                else:
+                    series.failure(index, int(data['value']))
+
+    for run in runs.values():
+        run.sources = [path]
+        run.started_at = datetime.fromtimestamp(first, timezone.utc).isoformat(timespec='seconds') if first else None
+        run.duration = (last - first) if first is not None else 0.0
+        for series in run.series.values():
+            series.finish(window_seconds)
+    return runs
+
+
+def load(paths, window_seconds):
+    """
+    k6 NDJSON 또는 summarize가 저장한 리포트 JSON 여러 개 → {(서버, 시나리오): Run} (같은 키는 병합)
+    """
+    merged = {}
+    for path in paths:
+        for key, run in _load_one(path, window_seconds).items():
+            if key in merged:
+                merged[key].add(run)
+            else:
+                merged[key] = run
+    return merged
+
+
+def _load_one(path, window_seconds):
+    with open(path, 'rb') as file:
+        head = file.read(64).lstrip()
+    if b'"exbuy-k6-report"' in head:
+        with open(path, 'rb') as file:
+            report = _loads(file.read())
+        return {(run['server'], run['scenario']): Run.from_dict(run) for run in report['runs']}
+    return read_k6(path, window_seconds)
+
+
+# =============== 실행 비교 (batch means + Welch t) ===============
+def _beta_fraction(a, b, x):
+    """
+    정규화 불완전 베타 함수의 연분수 (수정 Lentz 방법)
+    """
+    tiny = 1e-300
+    c, d = 1.0, 1 - (a + b) * x / (a + 1)
+    d = 1 / (d if abs(d) > tiny else tiny)
+    result = d
+    for m in range(1, 500):
+        for numerator in (
+            m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+            -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1)),
+        ):
+            d = 1 + numerator * d
+            d = 1 / (d if abs(d) > tiny else tiny)
+            c = 1 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            result *= c * d
+        if abs(c * d - 1) < 1e-15:
+            break
+    return result
+
+
+def _regularized_beta(a, b, x):
+    """
+    I_x(a, b)
+    """
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log1p(-x))
+    if x < (a + 1) / (a + b + 2):
+        return front * _beta_fraction(a, b, x) / a
+    return 1 - front * _beta_fraction(b, a, 1 - x) / b
+
+
+def _t_upper_tail(t, df):
+    """
+    P(T > t), t ≥ 0
+    """
+    return _regularized_beta(df / 2, 0.5, df / (df + t * t)) / 2
+
+
+def _t_quantile(probability, df):
+    """
+    Student t 분위수 (df는 실수 - Welch 자유도) - 꼬리 확률을 이분법으로 역산한 정확한 값
+    Bonferroni 보정으로 probability가 0.9999를 넘고 창이 적어 df가 작아도 근사 오차가 없다
+    """
+    if probability < 0.5:
+        return -_t_quantile(1 - probability, df)
+    tail = 1 - probability
+    low, high = 0.0, 1.0
+    while _t_upper_tail(high, df) > tail:
+        low, high = high, high * 2
+    for _ in range(200):
+        middle = (low + high) / 2
+        if _t_upper_tail(middle, df) > tail:
+            low = middle
+        else:
+            high = middle
+        if high - low <= 1e-12 * high:
+            break
+    return (low + high) / 2
+
+
+def steady_windows(windows):
+    """
+    램프업/다운 창 제외 - 요청 수가 중앙값의 절반 미만인 창
+    """
+    if not windows:
+        return []
+    threshold = statistics.median(window['requests'] for window in windows) / 2
+    return [window for window in windows if window['requests'] >= threshold]
+
+
+def _autocorrelation_factor(values):
+    """
+    인접 창은 독립이 아니다 (캐시 예열, GC, 큐 적체가 여러 창에 걸친다)
+    lag-1 자기상관 r로 평균 분산을 (1 + r) / (1 - r)배 키운다 - 음의 상관은 무시
+    """
+    mean = statistics.fmean(values)
+    denominator = sum((value - mean) ** 2 for value in values)
+    if denominator == 0:
+        return 1.0
+    r = sum((a - mean) * (b - mean) for a, b in zip(values, values[1:])) / denominator
+    r = min(max(r, 0.0), 0.9)
+    return (1 + r) / (1 - r)
+
+
+def welch(before, after, confidence):
+    """
+    반환: (평균 차이 after - before, 신뢰 구간 하한, 상한) 또는 None (창 3개 미만)
+    """
+    if len(before) < 3 or len(after) < 3:
+        return None
+    mean_before, mean_after = statistics.fmean(before), statistics.fmean(after)
+    var_before = statistics.variance(before) / len(before) * _autocorrelation_factor(before)
+    var_after = statistics.variance(after) / len(after) * _autocorrelation_factor(after)
+    diff = mean_after - mean_before
+    standard_error = math.sqrt(var_before + var_after)
+    if standard_error == 0:
+        return diff, diff, diff
+    df = (var_before + var_after) ** 2 / (
+        var_before ** 2 / (len(before) - 1) + var_after ** 2 / (len(after) - 1)
+    ) if var_before or var_after else len(before) + len(after) - 2
+    margin = _t_quantile(1 - (1 - confidence) / 2, max(df, 2)) * standard_error
+    return diff, diff - margin, diff + margin
+
+
+def compare_runs(baseline, candidate, confidence=0.95, min_change=10.0, min_requests=30):
+    """
+    반환: [{'server', 'scenario', 'endpoint', 'metric', 'before', 'after', 'change', 'low', 'high', 'verdict'}, ...]
+    verdict: regression / improvement / same (유의하지 않음) / insufficient (창 부족)
+    엔드포인트 × 지표를 한꺼번에 검정하므로 Bonferroni 보정 - 구간은 검정 수만큼 넓어진다
+    """
+    pairs = [
+        (key, name)
+        for key in sorted(set(baseline) & set(candidate))
+        for name in sorted(set(baseline[key].series) & set(candidate[key].series), key=lambda name: (name != TOTAL, name))
+        if baseline[key].series[name].requests >= min_requests and candidate[key].series[name].requests >= min_requests
+    ]
+    tests = max(1, len(pairs) * len(WINDOW_METRICS))
+    adjusted = 1 - (1 - confidence) / tests
+
+    rows = []
+    for key, name in pairs:
+        before_windows = steady_windows(baseline[key].series[name].windows)
+        after_windows = steady_windows(candidate[key].series[name].windows)
+        for metric in WINDOW_METRICS:
+            before = [window[metric] for window in before_windows if window[metric] is not None]
+            after = [window[metric] for window in after_windows if window[metric] is not None]
+            result = welch(before, after, adjusted)
+            row = {
+                'server': key[0], 'scenario': key[1], 'endpoint': name, 'metric': metric,
+                'before': statistics.fmean(before) if before else None,
+                'after': statistics.fmean(after) if after else None,
+                'change': None, 'low': None, 'high': None, 'verdict': 'insufficient',
+            }
+            if result is not None:
+                diff, low, high = result
+                row.update(low=low, high=high, verdict='same')
+                if row['before']:
+                    row['change'] = diff / row['before'] * 100
+                significant = low > 0 or high < 0
+                # 오류율은 %p 차이, 나머지는 상대 변화로 최소 크기를 본다
+                large = abs(diff) >= min_change / 10 if metric == 'error_rate' else (
+                    row['change'] is not None and abs(row['change']) >= min_change
+                )
+                if significant and large:
+                    worse = (diff > 0) == HIGHER_IS_WORSE[metric]
+                    row['verdict'] = 'regression' if worse else 'improvement'
+            rows.append(row)
+    return rows
+
+
+# =============== 이력 / 리포트 ===============
+def _history_context(history, run):
+    """
+    test-history.jsonl에서 이 실행 직전의 start 이벤트 (VU, 워커 수, DURATION)
+    """
+    if not history or not os.path.exists(history) or not run.started_at:
+        return {}
+    found = {}
+    with open(history) as file:
+        for line in file:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if event.get('event') != 'start':
+                continue
+            if (event.get('server'), event.get('scenario')) != run.key:
+                continue
+            if event.get('timestamp', '') <= run.started_at.replace('+00:00', 'Z'):
+                found = event
+    return {key: found[key] for key in ('max_vu', 'duration', 'workers') if key in found}
+
+
+def append_history(history, run, report_path):
+    total = run.summary().get(TOTAL, {})
+    entry = {
+        'timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'event': 'summary',
+        'server': run.server,
+        'scenario': run.scenario,
+        'started_at': run.started_at,
+        'duration_s': round(run.duration, 1),
+        'requests': total.get('requests', 0),
+        'rps': round(total.get('rps', 0.0), 1),
+        'error_rate': round(total.get('error_rate', 0.0), 3),
+        **{key: round(total.get(key, 0.0), 2) for key in ('mean', 'p50', 'p90', 'p95', 'p99', 'max')},
+        'sources': run.sources,
+        'report': report_path,
+    }
+    os.makedirs(os.path.dirname(history) or '.', exist_ok=True)
+    with open(history, 'a') as file:
+        file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+def report_document(runs, window_seconds):
+    return {
+        'format': 'exbuy-k6-report',
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'window': window_seconds,
+        'runs': [run.to_dict() for run in runs.values()],
+    }
+
+
+def _label(name):
+    return '전체' if name == TOTAL else name
+
+
+def summary_lines(run):
+    lines = [
+        f'{run.server} / {run.scenario} - {run.started_at or "-"}, {run.duration:.0f}s, 파일 {len(run.sources)}개',
+        f'  {"엔드포인트":<32} {"요청":>9} {"req/s":>8} {"오류%":>6} {"p50":>8} {"p90":>8} {"p95":>8} {"p99":>8} {"max":>9}',
+    ]
+    summary = run.summary()
+    for name in sorted(summary, key=lambda name: (name != TOTAL, name)):
+        row = summary[name]
+        lines.append(
+            f'  {_label(name):<32} {row["requests"]:>9,} {row["rps"]:>8.1f} {row["error_rate"]:>6.2f} '
+            f'{row["p50"]:>8.1f} {row["p90"]:>8.1f} {row["p95"]:>8.1f} {row["p99"]:>8.1f} {row["max"]:>9.1f}'
+        )
+    return lines
+
+
+def summary_markdown(run, context):
+    """
+    BENCHMARKS.md '결과 리포트 예시' 형식
+    """
+    total = run.summary()[TOTAL]
+    environment = [f'- 서버: {run.server}' + (f', {context["workers"]} workers' if 'workers' in context else '')]
+    if 'max_vu' in context:
+        environment.append(f'- 부하: {context["max_vu"]} VU, {context.get("duration", "-")}')
+    environment.append(f'- 시나리오: {run.scenario}')
+    environment.append(f'- 측정: {run.started_at or "-"}, {run.duration:.0f}s ({", ".join(os.path.basename(p) for p in run.sources)})')
+
+    lines = [
+        '## 테스트 결과 요약', '',
+        '**환경:**', *environment, '',
+        '**결과:**',
+        f'- RPS: {total["rps"]:.0f}',
+        f'- p50 latency: {total["p50"]:.0f}ms',
+        f'- p95 latency: {total["p95"]:.0f}ms',
+        f'- p99 latency: {total["p99"]:.0f}ms',
+        f'- Error rate: {total["error_rate"]:.1f}%', '',
+        '| 엔드포인트 | 요청 | req/s | 오류율 | p50 (ms) | p95 (ms) | p99 (ms) | max (ms) |',
+        '|------------|------|-------|--------|----------|----------|----------|----------|',
+    ]
+    summary = run.summary()
+    for name in sorted(summary, key=lambda name: (name != TOTAL, name)):
+        row = summary[name]
+        lines.append(
+            f'| {_label(name)} | {row["requests"]:,} | {row["rps"]:.1f} | {row["error_rate"]:.2f}% | '
+            f'{row["p50"]:.1f} | {row["p95"]:.1f} | {row["p99"]:.1f} | {row["max"]:.1f} |'
+        )
+    return lines
+
+
+_VERDICTS = {'regression': '✗ 회귀', 'improvement': '✓ 개선', 'same': '', 'insufficient': '창 부족'}
+
+
+def _number(value):
+    return f'{value:.2f}' if value is not None else '-'
+
+
+def _change(row):
+    if row['change'] is not None:
+        return f'{row["change"]:+.1f}%'
+    if row['low'] is not None and row['before'] is not None:
+        return f'{row["after"] - row["before"]:+.2f}'
+    return '-'
+
+
+def _interval(row):
+    if row['low'] is None:
+        return '-'
+    return f'[{row["low"]:+.2f}, {row["high"]:+.2f}]'
+
+
+def _shown(row, show_all):
+    # 엔드포인트별 행은 유의한 변화만, 전체('*')는 항상
+    return show_all or row['endpoint'] == TOTAL or row['verdict'] in ('regression', 'improvement')
+
+
+def comparison_lines(rows, show_all=False):
+    lines = [
+        f'{"서버/시나리오":<28} {"엔드포인트":<30} {"지표":<10} {"이전":>9} {"현재":>9} {"변화":>8} {"차이 신뢰구간":>20}'
+    ]
+    for row in rows:
+        if not _shown(row, show_all):
+            continue
+        lines.append(
+            f'{row["server"] + "/" + row["scenario"]:<28} {_label(row["endpoint"]):<30} {row["metric"]:<10} '
+            f'{_number(row["before"]):>9} {_number(row["after"]):>9} {_change(row):>8} {_interval(row):>20}  '
+            f'{_VERDICTS[row["verdict"]]}'
+        )
+    return lines
+
+
+def comparison_markdown(rows, confidence):
+    lines = [
+        f'## 실행 비교 (창별 평균, Welch t {confidence * 100:.0f}% 신뢰구간, Bonferroni 보정)', '',
+        '| 서버/시나리오 | 엔드포인트 | 지표 | 이전 | 현재 | 변화 | 차이 신뢰구간 | 판정 |',
+        '|---------------|------------|------|------|------|------|---------------|------|',
+    ]
+    for row in rows:
+        if not _shown(row, False):
+            continue
+        lines.append(
+            f'| {row["server"]}/{row["scenario"]} | {_label(row["endpoint"])} | {row["metric"]} | '
+            f'{_number(row["before"])} | {_number(row["after"])} | {_change(row)} | {_interval(row)} | '
+            f'{_VERDICTS[row["verdict"]] or "차이 없음"} |'
+        )
+    for title, verdict in (('**개선 사항:**', 'improvement'), ('**회귀:**', 'regression')):
+        found = [row for row in rows if row['verdict'] == verdict]
+        lines += ['', title]
+        lines += [
+            f'{number}. {row["server"]}/{row["scenario"]} {_label(row["endpoint"])} {row["metric"]} {_change(row)}'
+            for number, row in enumerate(found, 1)
+        ] or ['- 없음']
+    return lines
+
+
+# =============== CLI ===============
+def _write(path, text):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as file:
+        file.write(text)
+
+
+def summarize(options):
+    window = parse_duration(options.window)
+    runs = load(options.files, window)
+    if not runs:
+        raise SystemExit('http_req_duration Point가 없습니다 - k6 run --out json=... 결과 파일인지 확인하세요')
+
+    for run in runs.values():
+        print('\n'.join(summary_lines(run)))
+        print()
+
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    if options.output:
+        output = options.output
+    elif len(runs) == 1:
+        run = next(iter(runs.values()))
+        output = os.path.join(DEFAULT_ANALYSIS_DIR, f'{run.server}-{run.scenario}-{stamp}.json')
+    else:
+        output = os.path.join(DEFAULT_ANALYSIS_DIR, f'report-{stamp}.json')
+    _write(output, json.dumps(report_document(runs, window), ensure_ascii=False))
+    print(f'리포트: {output}  (compare --baseline에 사용)')
+
+    if options.markdown:
+        sections = []
+        for run in runs.values():
+            sections += summary_markdown(run, _history_context(options.history, run)) + ['']
+        _write(options.markdown, '\n'.join(sections))
+        print(f'마크다운: {options.markdown}')
+
+    if not options.no_history:
+        for run in runs.values():
+            append_history(options.history, run, output)
+        print(f'이력 추가: {options.history} (event=summary)')
+
+
+def compare(options):
+    window = parse_duration(options.window)
+    baseline = load(options.baseline, window)
+    candidate = load(options.candidate, window)
+    common = set(baseline) & set(candidate)
+    if not common:
+        raise SystemExit(
+            f'공통 (서버, 시나리오)가 없습니다 - 이전: {sorted(baseline)}, 현재: {sorted(candidate)}'
+        )
+
+    rows = compare_runs(baseline, candidate, options.confidence, options.min_change)
+    print(f'창 {window:g}s 단위 평균 비교, 차이(현재 - 이전)의 {options.confidence * 100:.0f}% 신뢰구간, Bonferroni 보정 '
+          f'(|변화| ≥ {options.min_change:g}% 이고 구간이 0을 포함하지 않으면 유의)')
+    print('\n'.join(comparison_lines(rows, options.all)))
+
+    if options.markdown:
+        _write(options.markdown, '\n'.join(comparison_markdown(rows, options.confidence)) + '\n')
+        print(f'마크다운: {options.markdown}')
+    if options.json:
+        _write(options.json, json.dumps({
+            'format': 'exbuy-k6-comparison',
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'baseline': options.baseline,
+            'candidate': options.candidate,
+            'confidence': options.confidence,
+            'min_change': options.min_change,
+            'rows': rows,
+        }, ensure_ascii=False, indent=2))
+        print(f'JSON: {options.json}')
+
+    regressions = [row for row in rows if row['verdict'] == 'regression']
+    if regressions:
+        print(f'\n✗ 유의한 회귀 {len(regressions)}건')
+        if not options.no_fail:
+            return 1
+    else:
+        print('\n✓ 유의한 회귀 없음')
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m shop.loadgen.k6results', description='k6 JSON 결과 스트리밍 분석 / 실행 비교'
+    )
+    parser.add_argument('--window', default='10s', help='비교 표본 시간 창 (기본: 10s)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    summary = commands.add_parser('summarize', help='결과 요약 + 리포트 JSON 저장 + test-history.jsonl 추가')
+    summary.add_argument('files', nargs='+', help='k6 JSON 결과 또는 리포트 JSON (같은 서버/시나리오는 병합)')
+    summary.add_argument('--output', help=f'리포트 JSON 경로 (기본: {DEFAULT_ANALYSIS_DIR}/{{서버}}-{{시나리오}}-{{시각}}.json)')
+    summary.add_argument('--markdown', help='BENCHMARKS.md 결과 리포트 형식 마크다운 경로')
+    summary.add_argument('--history', default=DEFAULT_HISTORY, help=f'이력 파일 (기본: {DEFAULT_HISTORY})')
+    summary.add_argument('--no-history', action='store_true', help='이력에 추가하지 않음')
+
+    comparison = commands.add_parser('compare', help='두 실행 비교 (유의한 회귀가 있으면 종료 코드 1)')
+    comparison.add_argument('--baseline', nargs='+', required=True, help='이전 실행 (k6 JSON 또는 리포트 JSON)')
+    comparison.add_argument('--candidate', nargs='+', required=True, help='현재 실행 (k6 JSON 또는 리포트 JSON)')
+    comparison.add_argument('--confidence', type=float, default=0.95, help='신뢰 수준 (기본: 0.95)')
+    comparison.add_argument(
+        '--min-change', type=float, default=10.0, help='유의하더라도 이보다 작은 변화(%%, 오류율은 1/10 %%p)는 무시 (기본: 10)'
+    )
+    comparison.add_argument('--all', action='store_true', help='유의하지 않은 엔드포인트 행도 출력')
+    comparison.add_argument('--markdown', help='비교 마크다운 경로')
+    comparison.add_argument('--json', help='비교 JSON 경로')
+    comparison.add_argument('--no-fail', action='store_true', help='회귀가 있어도 종료 코드 0')
+
+    options = parser.parse_args(argv)
+    if options.command == 'summarize':
+        summarize(options)
+        return 0
+    return compare(options)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
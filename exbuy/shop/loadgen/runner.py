@@ -0,0 +1,540 @@
+"""
+개방형(open model) 부하 생성기 실행부
+
+k6 스크립트(closed model)는 VU가 응답을 받은 뒤 sleep 후 다음 요청을 보낸다. 서버가 느려지면 보내는 요청도 줄어
+느린 구간이 측정에서 빠진다 (coordinated omission). 여기서는 도착 시각을 응답과 무관하게 미리 정한다.
+- constant: 목표 req/s에 맞춘 균일 간격 / poisson: 지수 분포 간격 (평균은 같음)
+- step: --stages "1000:30s,2000:30s,4000:30s" - 단계마다 목표 req/s를 유지
+
+응답 시간은 '의도한 전송 시각'부터 잰다 (CO 보정). 연결 대기나 생성기 지연으로 늦게 보낸 요청도
+사용자가 실제로 기다린 시간으로 기록된다. 실제 전송 시각부터 잰 서비스 시간도 함께 기록해 둘을 비교할 수 있다.
+여러 프로세스가 도착 시각을 나눠 맡고 (프로세스 k는 k번째, k+N번째, ... 도착), 결과 히스토그램은 병합한다.
+"""
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime, timezone
+
+from .client import STATUS_CONNECT_ERROR, STATUS_TIMEOUT, ConnectionPool
+from .hdr import Histogram
+from .scenarios import SCENARIOS, picker
+
+
+PERCENTILES = (50, 90, 99, 99.9, 99.99, 100)
+
+# 자동 프로세스 수 계산 기준 - 한 프로세스(uvloop)가 여유 있게 내는 req/s
+PROCESS_RATE = 8000
+
+PROGRESS_INTERVAL = 5.0
+
+# 전송 지연 p99가 이보다 크면 경고 (µs)
+LAG_WARNING = 10_000
+
+_DURATION = re.compile(r'^(\d+(?:\.\d+)?)(ms|s|m|h)?$')
+_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600, None: 1}
+
+
+def parse_duration(value):
+    """
+    '500ms' / '30s' / '5m' / '1h' / '10' (초) → 초
+    """
+    match = _DURATION.match(str(value).strip())
+    if not match:
+        raise ValueError(f'잘못된 시간: {value!r} (예: 30s, 5m)')
+    return float(match.group(1)) * _UNITS[match.group(2)]
+
+
+def parse_stages(value):
+    """
+    "1000:30s,2000:1m" → [(1000.0, 30.0), (2000.0, 60.0)]
+    """
+    stages = []
+    for item in filter(None, (part.strip() for part in value.split(','))):
+        rate, _, duration = item.partition(':')
+        if not duration:
+            raise ValueError(f'잘못된 단계: {item!r} (형식: req/s:시간)')
+        stages.append((float(rate), parse_duration(duration)))
+    if not stages:
+        raise ValueError('단계가 없습니다')
+    return stages
+
+
+def arrivals(stages, warmup, processes, index, arrival, rng):
+    """
+    프로세스 index가 맡은 도착 시각 - (시작 기준 초, 단계 번호) / 워밍업 단계 번호는 -1
+    """
+    plan = [(-1, stages[0][0], warmup)] if warmup else []
+    plan += [(number, rate, duration) for number, (rate, duration) in enumerate(stages)]
+
+    start = 0.0
+    for number, rate, duration in plan:
+        end = start + duration
+        if rate > 0:
+            if arrival == 'poisson':
+                # 독립 포아송 과정의 합은 포아송 - 프로세스마다 rate/N
+                offset = start + rng.expovariate(rate / processes)
+                while offset < end:
+                    yield offset, number
+                    offset += rng.expovariate(rate / processes)
+            else:
+                interval = processes / rate
+                first = start + index / rate
+                count = 0
+                offset = first
+                while offset < end:
+                    yield offset, number
+                    count += 1
+                    offset = first + count * interval
+        start = end
+
+
+# =============== 집계 ===============
+class Stats:
+    """
+    response: 의도한 전송 시각 → 응답 완료 (CO 보정, µs)
+    service: 실제 전송 → 응답 완료 (보정 없음, µs)
+    lag: 의도한 전송 시각 → 실제 전송 (생성기 지연 + 연결 대기, µs)
+    """
+
+    def __init__(self, stage_count):
+        self.response = Histogram()
+        self.service = Histogram()
+        self.lag = Histogram()
+        self.requests = {}
+        self.stages = [
+            {'sent': 0, 'completed': 0, 'errors': 0, 'dropped': 0, 'response': Histogram()}
+            for _ in range(stage_count)
+        ]
+        self.warmup = 0
+        self.bytes = 0
+        self.connections = 0
+
+    def record(self, name, ok, status, intended, sent, done, stage, size):
+        response = int((done - intended) * 1_000_000)
+        self.response.record(response)
+        self.service.record(int((done - sent) * 1_000_000))
+        self.lag.record(int((sent - intended) * 1_000_000))
+        self.bytes += size
+
+        entry = self.requests.get(name)
+        if entry is None:
+            entry = self.requests[name] = {'count': 0, 'errors': 0, 'statuses': {}, 'response': Histogram()}
+        entry['count'] += 1
+        entry['statuses'][status] = entry['statuses'].get(status, 0) + 1
+        entry['response'].record(response)
+
+        bucket = self.stages[stage]
+        bucket['completed'] += 1
+        bucket['response'].record(response)
+        if not ok:
+            entry['errors'] += 1
+            bucket['errors'] += 1
+
+    @property
+    def completed(self):
+        return sum(stage['completed'] for stage in self.stages)
+
+    @property
+    def errors(self):
+        return sum(stage['errors'] for stage in self.stages)
+
+    @property
+    def dropped(self):
+        return sum(stage['dropped'] for stage in self.stages)
+
+    def add(self, other):
+        self.response.add(other.response)
+        self.service.add(other.service)
+        self.lag.add(other.lag)
+        for name, entry in other.requests.items():
+            mine = self.requests.setdefault(
+                name, {'count': 0, 'errors': 0, 'statuses': {}, 'response': Histogram()}
+            )
+            mine['count'] += entry['count']
+            mine['errors'] += entry['errors']
+            for status, count in entry['statuses'].items():
+                mine['statuses'][status] = mine['statuses'].get(status, 0) + count
+            mine['response'].add(entry['response'])
+        for mine, stage in zip(self.stages, other.stages):
+            for key in ('sent', 'completed', 'errors', 'dropped'):
+                mine[key] += stage[key]
+            mine['response'].add(stage['response'])
+        self.warmup += other.warmup
+        self.bytes += other.bytes
+        self.connections += other.connections
+        return self
+
+    def to_dict(self):
+        return {
+            'response': self.response.to_dict(),
+            'service': self.service.to_dict(),
+            'lag': self.lag.to_dict(),
+            'requests': {
+                name: {**entry, 'statuses': {str(k): v for k, v in entry['statuses'].items()},
+                       'response': entry['response'].to_dict()}
+                for name, entry in self.requests.items()
+            },
+            'stages': [{**stage, 'response': stage['response'].to_dict()} for stage in self.stages],
+            'warmup': self.warmup,
+            'bytes': self.bytes,
+            'connections': self.connections,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(len(data['stages']))
+        stats.response = Histogram.from_dict(data['response'])
+        stats.service = Histogram.from_dict(data['service'])
+        stats.lag = Histogram.from_dict(data['lag'])
+        stats.requests = {
+            name: {**entry, 'statuses': {int(k): v for k, v in entry['statuses'].items()},
+                   'response': Histogram.from_dict(entry['response'])}
+            for name, entry in data['requests'].items()
+        }
+        stats.stages = [{**stage, 'response': Histogram.from_dict(stage['response'])} for stage in data['stages']]
+        stats.warmup = data['warmup']
+        stats.bytes = data['bytes']
+        stats.connections = data['connections']
+        return stats
+
+
+# =============== 프로세스 ===============
+async def _generate(config, index, start_wall):
+    loop = asyncio.get_running_loop()
+    processes = config['processes']
+    seed = config['seed']
+    rng = random.Random(seed * 1000 + index if seed is not None else None)
+    pick = picker(config['scenario'], rng)
+    # User-Agent의 scenario=는 서버 쪽 SQL 통계(shop/querystats.py)의 시나리오 키 - k6 스크립트와 같은 형식
+    pool = ConnectionPool(
+        config['url'], config['connections'], config['timeout'],
+        user_agent=f'exbuy-loadgen (scenario={config["scenario"]})',
+    )
+    stats = Stats(len(config['stages']))
+    max_pending = config['max_pending']
+
+    tasks = set()
+    in_flight = 0
+    # uvloop의 loop.time()은 ms 단위라 시각은 모두 perf_counter로 잰다
+    start = time.perf_counter() + (start_wall - time.time())
+
+    async def fire(request, path, raw, intended, stage):
+        nonlocal in_flight
+        status, size, sent = await pool.send(raw)
+        in_flight -= 1
+        if stage < 0:
+            stats.warmup += 1
+        else:
+            stats.record(
+                request.name_for(path), status in request.expect, status, intended, sent, time.perf_counter(), stage,
+                size,
+            )
+
+    progress = loop.create_task(_progress(stats, pool, config, lambda: in_flight, start)) if index == 0 else None
+
+    for offset, stage in arrivals(config['stages'], config['warmup'], processes, index, config['arrival'], rng):
+        intended = start + offset
+        delay = intended - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if stage >= 0:
+            stats.stages[stage]['sent'] += 1
+        if in_flight >= max_pending:
+            # 미처리 요청이 너무 많음 - 보내지 않고 센다 (k6 dropped_iterations)
+            if stage >= 0:
+                stats.stages[stage]['dropped'] += 1
+            continue
+        request = pick()
+        method, path, body = request.build(rng, config)
+        in_flight += 1
+        task = loop.create_task(fire(request, path, pool.build(method, path, body), intended, stage))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    if tasks:
+        await asyncio.wait(tasks)
+    if progress is not None:
+        progress.cancel()
+    pool.close()
+    stats.connections = pool.peak
+    return stats.to_dict()
+
+
+async def _progress(stats, pool, config, in_flight, start):
+    # 0번 프로세스 기준 진행 상황 (× 프로세스 수로 전체 추정)
+    processes = config['processes']
+    last_completed, last_time = 0, time.perf_counter()
+    while True:
+        await asyncio.sleep(PROGRESS_INTERVAL)
+        now = time.perf_counter()
+        completed = stats.completed + stats.warmup
+        rate = (completed - last_completed) / (now - last_time) * processes
+        last_completed, last_time = completed, now
+        print(
+            f'  [{now - start:6.0f}s] {rate:9,.0f} req/s  진행 중 {in_flight() * processes:>6,}  '
+            f'연결 {pool.size * processes:>5,}  오류 {stats.errors * processes:>7,}  드롭 {stats.dropped * processes:>7,}',
+            file=sys.stderr, flush=True,
+        )
+
+
+def _worker(config, index, start_wall):
+    if config['uvloop']:
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(_generate(config, index, start_wall))
+
+
+def run(config):
+    """
+    config: add_arguments()의 옵션 dict
+    반환: 결과 dict ({'meta', 'stats': Stats})
+    """
+    stages = parse_stages(config['stages']) if config['stages'] else [
+        (config['rate'], parse_duration(config['duration']))
+    ]
+    peak = max(rate for rate, _ in stages)
+    processes = config['processes'] or min(os.cpu_count() or 1, max(1, math.ceil(peak / PROCESS_RATE)))
+    if config['scenario'] not in SCENARIOS:
+        raise ValueError(f'알 수 없는 시나리오: {config["scenario"]}')
+
+    worker_config = {
+        'url': config['url'],
+        'scenario': config['scenario'],
+        'stages': stages,
+        'warmup': parse_duration(config['warmup']),
+        'arrival': config['arrival'],
+        'processes': processes,
+        'connections': math.ceil(config['connections'] / processes),
+        'max_pending': math.ceil((config['max_pending'] or config['connections'] * 10) / processes),
+        'timeout': parse_duration(config['timeout']),
+        'lock_types': [item.strip() for item in config['lock_types'].split(',') if item.strip()],
+        'seed': config['seed'],
+        'uvloop': not config['no_uvloop'],
+    }
+
+    started_at = datetime.now(timezone.utc)
+    # 프로세스 시작 시간을 두고 모든 프로세스가 같은 시각부터 도착을 센다
+    start_wall = time.time() + 0.5 + 0.05 * processes
+    if processes == 1:
+        results = [_worker(worker_config, 0, start_wall)]
+    else:
+        method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+        with multiprocessing.get_context(method).Pool(processes) as pool:
+            results = pool.starmap(_worker, [(worker_config, index, start_wall) for index in range(processes)])
+
+    stats = Stats.from_dict(results[0])
+    for result in results[1:]:
+        stats.add(Stats.from_dict(result))
+    return {
+        'meta': {
+            'started_at': started_at.isoformat(timespec='seconds'),
+            'url': config['url'],
+            'server': config['server'],
+            'scenario': config['scenario'],
+            'arrival': config['arrival'],
+            'stages': [{'rate': rate, 'duration': duration} for rate, duration in stages],
+            'warmup': worker_config['warmup'],
+            'processes': processes,
+            'connections': config['connections'],
+            'timeout': worker_config['timeout'],
+            'seed': config['seed'],
+        },
+        'stats': stats,
+    }
+
+
+# =============== 결과 ===============
+def _ms(micros):
+    return micros / 1000
+
+
+def _percentile_cells(histogram):
+    values = histogram.percentiles(PERCENTILES)
+    return ' '.join(f'{_ms(values[percentile]):>9.2f}' for percentile in PERCENTILES)
+
+
+def _percentile_header():
+    return ' '.join(f'{"max" if percentile == 100 else f"p{percentile:g}":>9}' for percentile in PERCENTILES)
+
+
+def report(result):
+    """
+    반환: 출력할 줄 목록
+    """
+    meta, stats = result['meta'], result['stats']
+    lines = [
+        f'대상 {meta["url"]} ({meta["server"]}) / 시나리오 {meta["scenario"]} / 도착 {meta["arrival"]} / '
+        f'프로세스 {meta["processes"]} / 연결 상한 {meta["connections"]} (최대 사용 {stats.connections})',
+        '',
+        f'{"단계":<6} {"목표 req/s":>11} {"달성 req/s":>11} {"완료":>10} {"오류":>8} {"드롭":>8} '
+        f'{"p50":>9} {"p99":>9} {"p99.9":>9}  (ms, CO 보정)',
+    ]
+    for number, (spec, stage) in enumerate(zip(meta['stages'], stats.stages), 1):
+        values = stage['response'].percentiles((50, 99, 99.9))
+        achieved = (stage['sent'] - stage['dropped']) / spec['duration'] if spec['duration'] else 0
+        lines.append(
+            f'{number:<6} {spec["rate"]:>11,.0f} {achieved:>11,.0f} {stage["completed"]:>10,} {stage["errors"]:>8,} '
+            f'{stage["dropped"]:>8,} {_ms(values[50]):>9.2f} {_ms(values[99]):>9.2f} {_ms(values[99.9]):>9.2f}'
+        )
+
+    lines += [
+        '',
+        f'{"":<28} {_percentile_header()}  (ms)',
+        f'{"응답 시간 (CO 보정)":<28} {_percentile_cells(stats.response)}',
+        f'{"서비스 시간 (보정 없음)":<28} {_percentile_cells(stats.service)}',
+        f'{"전송 지연 (의도→전송)":<28} {_percentile_cells(stats.lag)}',
+        '',
+        f'{"요청":<32} {"완료":>9} {"오류":>7} {"p50":>9} {"p99":>9}  상태',
+    ]
+    for name, entry in sorted(stats.requests.items()):
+        values = entry['response'].percentiles((50, 99))
+        statuses = ' '.join(
+            f'{_status_label(status)}×{count}' for status, count in sorted(entry['statuses'].items())
+        )
+        lines.append(
+            f'{name:<32} {entry["count"]:>9,} {entry["errors"]:>7,} '
+            f'{_ms(values[50]):>9.2f} {_ms(values[99]):>9.2f}  {statuses}'
+        )
+
+    completed = stats.completed
+    lines += ['', f'완료 {completed:,} / 오류 {stats.errors:,} ({stats.errors / completed * 100 if completed else 0:.2f}%) / '
+                  f'드롭 {stats.dropped:,} / 수신 {stats.bytes / 1024 / 1024:,.1f} MiB / 워밍업 {stats.warmup:,}']
+    return lines
+
+
+def warnings(result):
+    """
+    반환: 측정 신뢰도 경고 목록
+    """
+    stats = result['stats']
+    found = []
+    if stats.dropped:
+        found.append(
+            f'드롭 {stats.dropped:,}건 - 미처리 요청이 --max-pending을 넘음 (서버가 목표 속도를 처리하지 못함, 드롭된 요청의 지연은 빠짐)'
+        )
+    lag_p99 = stats.lag.value_at_percentile(99)
+    if lag_p99 > LAG_WARNING:
+        if stats.connections < result['meta']['connections']:
+            # 연결이 남는데 늦게 보냈다면 연결 대기가 아니라 생성기 CPU 부족
+            found.append(
+                f'전송 지연 p99 {_ms(lag_p99):.1f}ms (연결 여유 있음) - 생성기 포화 가능성, --processes를 늘리세요'
+            )
+        else:
+            found.append(
+                f'전송 지연 p99 {_ms(lag_p99):.1f}ms - 연결이 모두 사용 중 (서버 포화 또는 --connections 부족)'
+            )
+    if stats.response.saturated:
+        found.append(f'히스토그램 범위를 넘은 값 {stats.response.saturated:,}건')
+    return found
+
+
+def _status_label(status):
+    if status == STATUS_CONNECT_ERROR:
+        return '연결오류'
+    if status == STATUS_TIMEOUT:
+        return '시간초과'
+    return str(status)
+
+
+def result_document(result):
+    return {'meta': result['meta'], 'histograms': result['stats'].to_dict()}
+
+
+def default_output(result):
+    meta = result['meta']
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    return os.path.join('results', 'loadgen', f'{meta["server"]}-{meta["scenario"]}-{stamp}.json')
+
+
+def execute(config, write):
+    """
+    실행 → 결과 표 출력 → JSON 저장 / write: 한 줄 출력 함수
+    """
+    target = config['stages'] or f'{config["rate"]:g} req/s × {config["duration"]}'
+    write(f'부하 생성: {config["url"]} {config["scenario"]} ({target}, 워밍업 {config["warmup"]})')
+    result = run(config)
+    write('')
+    for line in report(result):
+        write(line)
+    for warning in warnings(result):
+        write(f'⚠ {warning}')
+
+    output = config['output'] or default_output(result)
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump(result_document(result), file, ensure_ascii=False)
+    write(f'결과: {output}')
+    return result
+
+
+# =============== 옵션 ===============
+def add_arguments(parser):
+    """
+    python -m shop.loadgen 과 manage.py loadgen이 같은 옵션을 쓴다
+    """
+    parser.add_argument(
+        '--url',
+        default=os.getenv('BASE_URL', 'http://localhost:9000'),
+        help='대상 서버 (기본: BASE_URL 또는 http://localhost:9000)'
+    )
+    parser.add_argument(
+        '--scenario',
+        choices=sorted(SCENARIOS),
+        default='mixed',
+        help='k6 스크립트와 같은 요청 구성 (기본: mixed)'
+    )
+    parser.add_argument('--rate', type=float, default=1000, help='constant 모드 목표 req/s (기본: 1000)')
+    parser.add_argument('--duration', default='1m', help='constant 모드 측정 시간 (기본: 1m)')
+    parser.add_argument(
+        '--stages',
+        help='step 모드 - "req/s:시간" 목록 (예: "1000:30s,2000:30s,4000:30s", 지정하면 --rate/--duration 무시)'
+    )
+    parser.add_argument(
+        '--arrival',
+        choices=['constant', 'poisson'],
+        default='constant',
+        help='도착 간격 (기본: constant - 균일 간격, poisson: 지수 분포)'
+    )
+    parser.add_argument('--warmup', default='5s', help='첫 단계 속도로 보내고 집계에서 뺄 시간 (기본: 5s)')
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=0,
+        help=f'생성기 프로세스 수 (기본: 최대 목표 req/s / {PROCESS_RATE}, CPU 수 이하)'
+    )
+    parser.add_argument(
+        '--connections',
+        type=int,
+        default=1000,
+        help='전체 최대 keep-alive 연결 수 - 동시에 처리 중인 요청 상한 (기본: 1000)'
+    )
+    parser.add_argument(
+        '--max-pending',
+        type=int,
+        default=0,
+        help='전체 미처리 요청 상한 - 넘으면 드롭 (기본: 연결 수 × 10)'
+    )
+    parser.add_argument('--timeout', default='10s', help='요청 시간 초과 (기본: 10s)')
+    parser.add_argument(
+        '--lock-types',
+        default=os.getenv('LOCK_TYPES', 'optimistic,pessimistic'),
+        help='재고 예약 lock_type 목록 (기본: LOCK_TYPES 또는 optimistic,pessimistic)'
+    )
+    parser.add_argument('--seed', type=int, help='요청 선택 시드 (기본: 무작위)')
+    parser.add_argument(
+        '--server',
+        default=os.getenv('SERVER_TYPE', 'unknown'),
+        help='결과에 기록할 서버 태그 (기본: SERVER_TYPE 또는 unknown)'
+    )
+    parser.add_argument('--output', help='결과 JSON 경로 (기본: results/loadgen/{서버}-{시나리오}-{시각}.json)')
+    parser.add_argument('--no-uvloop', action='store_true', help='uvloop 대신 기본 asyncio 이벤트 루프 사용')
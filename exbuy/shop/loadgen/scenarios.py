@@ -0,0 +1,218 @@
+"""
+k6-scripts/의 요청 구성 재현 (read-heavy.js / write-heavy.js / mixed.js)
+
+시나리오 = [(비중, [요청, ...]), ...] - 비중으로 그룹을 고르고 그룹 안에서는 균등하게 고른다 (k6 스크립트와 동일).
+요청 이름은 k6의 name 태그와 같다. 상품 id 1-100, 주문 id 1-500 범위도 k6 스크립트를 따른다.
+"""
+import json
+
+
+PRODUCT_IDS = 100
+ORDER_IDS = 500
+USER_IDS = 10000
+
+
+class Request:
+    """
+    build(rng, options) → (method, path, body 또는 None)
+    expect: 성공으로 보는 상태 코드 (k6 check와 동일)
+    """
+
+    def __init__(self, name, build, expect=(200,)):
+        self.name = name
+        self.build = build
+        self.expect = frozenset(expect)
+
+    def name_for(self, path):
+        return self.name
+
+
+def _json(data):
+    return json.dumps(data, separators=(',', ':')).encode()
+
+
+def _product(rng):
+    return rng.randint(1, PRODUCT_IDS)
+
+
+def _order(rng):
+    return rng.randint(1, ORDER_IDS)
+
+
+# =============== 읽기 ===============
+HEALTH = Request('health-check', lambda rng, options: ('GET', '/api/health', None))
+
+PRODUCT_LIST = Request('product-list', lambda rng, options: ('GET', '/api/products/?page=1', None))
+PRODUCT_LIST_OPTIMIZED = Request(
+    'product-list-optimized', lambda rng, options: ('GET', '/api/products/?page=1&optimize=true', None)
+)
+PRODUCT_LIST_MIXED = Request(
+    'product-list',
+    lambda rng, options: (
+        'GET', f'/api/products/?page={rng.randint(1, 3)}{"&optimize=true" if rng.random() < 0.5 else ""}', None
+    ),
+)
+
+PRODUCT_DETAIL = Request('product-detail', lambda rng, options: ('GET', f'/api/products/{_product(rng)}/', None))
+PRODUCT_DETAIL_OPTIMIZED = Request(
+    'product-detail-optimized', lambda rng, options: ('GET', f'/api/products/{_product(rng)}/?optimize=true', None)
+)
+PRODUCT_DETAIL_MIXED = Request(
+    'product-detail',
+    lambda rng, options: (
+        'GET', f'/api/products/{_product(rng)}/{"?optimize=true" if rng.random() < 0.5 else ""}', None
+    ),
+)
+
+SEARCH_TERMS = ['book', 'phone', 'shirt', 'food', 'home']
+SEARCH_TERMS_MIXED = ['book', 'phone', 'shirt', 'laptop', 'food', 'home', 'electronics']
+CATEGORIES = ['electronics', 'clothing', 'food', 'books', 'home']
+
+PRODUCT_SEARCH = Request(
+    'product-search', lambda rng, options: ('GET', f'/api/search/products?q={rng.choice(SEARCH_TERMS)}', None)
+)
+PRODUCT_SEARCH_MIXED = Request(
+    'product-search',
+    lambda rng, options: (
+        'GET',
+        f'/api/search/products?q={rng.choice(SEARCH_TERMS_MIXED)}'
+        + (f'&category={rng.choice(CATEGORIES)}' if rng.random() < 0.5 else ''),
+        None,
+    ),
+)
+
+REVIEWS = Request('reviews', lambda rng, options: ('GET', f'/api/reviews/?product_id={_product(rng)}', None))
+REVIEWS_MIXED = Request(
+    'reviews',
+    lambda rng, options: (
+        'GET', f'/api/reviews/?product_id={_product(rng)}{"&optimize=true" if rng.random() < 0.3 else ""}', None
+    ),
+)
+
+ORDER_DETAIL = Request(
+    'order-detail', lambda rng, options: ('GET', f'/api/orders/{_order(rng)}/', None), expect=(200, 404)
+)
+ORDER_DETAIL_MIXED = Request(
+    'order-detail',
+    lambda rng, options: ('GET', f'/api/orders/{_order(rng)}/{"?optimize=true" if rng.random() < 0.5 else ""}', None),
+    expect=(200, 404),
+)
+
+STATS = Request('stats', lambda rng, options: ('GET', '/api/stats/top-products?limit=10', None))
+STATS_MIXED = Request(
+    'stats-top-products',
+    lambda rng, options: ('GET', f'/api/stats/top-products?limit={rng.choice((5, 10, 20))}', None),
+)
+
+
+# =============== 쓰기 ===============
+CREATE_ORDER = Request(
+    'create-order',
+    lambda rng, options: ('POST', '/api/orders/', _json({
+        'user_id': rng.randint(1, USER_IDS),
+        'items': [
+            {'product_id': _product(rng), 'quantity': rng.randint(1, 5)},
+            {'product_id': _product(rng), 'quantity': rng.randint(1, 3)},
+        ],
+    })),
+    expect=(201, 409),
+)
+CREATE_ORDER_MIXED = Request(
+    'create-order',
+    lambda rng, options: ('POST', '/api/orders/', _json({
+        'user_id': rng.randint(1, USER_IDS),
+        'items': [
+            {'product_id': _product(rng), 'quantity': rng.randint(1, 5)} for _ in range(rng.randint(1, 3))
+        ],
+    })),
+    expect=(201, 409),
+)
+
+
+def _review(body):
+    return lambda rng, options: ('POST', '/api/reviews/', _json({
+        'product': _product(rng),
+        'user_id': rng.randint(1, USER_IDS),
+        'rating': rng.randint(1, 5),
+        'body': body,
+    }))
+
+
+CREATE_REVIEW = Request('create-review', _review('This is a test review from k6 load testing.'), expect=(201,))
+CREATE_REVIEW_MIXED = Request(
+    'create-review', _review('Test review from k6 mixed scenario. This product is great!'), expect=(201,)
+)
+
+
+class _ReserveInventory(Request):
+    """
+    lock_type을 options['lock_types']에서 고른다 - 이름은 k6와 같이 reserve-inventory-{lock_type}
+    """
+
+    def __init__(self):
+        super().__init__('reserve-inventory', self._build, expect=(200, 400))
+
+    @staticmethod
+    def _build(rng, options):
+        lock_type = rng.choice(options['lock_types'])
+        body = _json({'product_id': _product(rng), 'quantity': rng.randint(1, 5)})
+        return 'POST', f'/api/inventory/reserve?lock_type={lock_type}', body
+
+    def name_for(self, path):
+        return f'{self.name}-{path.rpartition("=")[2]}'
+
+
+RESERVE_INVENTORY = _ReserveInventory()
+
+UPDATE_ORDER_STATUS = Request(
+    'update-order-status',
+    lambda rng, options: (
+        'PATCH', f'/api/orders/{_order(rng)}/', _json({'status': rng.choice(('processing', 'shipped', 'delivered'))})
+    ),
+    expect=(200, 404),
+)
+
+
+# =============== 시나리오 ===============
+SCENARIOS = {
+    # read-heavy.js: 읽기 8종 균등 (이름과 달리 쓰기 없음)
+    'read-heavy': [
+        (1.0, [
+            HEALTH, PRODUCT_LIST, PRODUCT_DETAIL, PRODUCT_SEARCH,
+            PRODUCT_LIST_OPTIMIZED, PRODUCT_DETAIL_OPTIMIZED, REVIEWS, STATS,
+        ]),
+    ],
+    # write-heavy.js: 70% 쓰기, 30% 읽기
+    'write-heavy': [
+        (0.7, [CREATE_ORDER, CREATE_REVIEW, RESERVE_INVENTORY, UPDATE_ORDER_STATUS]),
+        (0.3, [PRODUCT_LIST, ORDER_DETAIL]),
+    ],
+    # mixed.js: 60% 읽기, 40% 쓰기
+    'mixed': [
+        (0.6, [
+            HEALTH, PRODUCT_LIST_MIXED, PRODUCT_DETAIL_MIXED, PRODUCT_SEARCH_MIXED,
+            REVIEWS_MIXED, ORDER_DETAIL_MIXED, STATS_MIXED,
+        ]),
+        (0.4, [CREATE_ORDER_MIXED, CREATE_REVIEW_MIXED, RESERVE_INVENTORY, UPDATE_ORDER_STATUS]),
+    ],
+}
+
+
+def picker(scenario, rng):
+    """
+    반환: 호출할 때마다 시나리오 비중대로 Request를 고르는 함수
+    """
+    groups = SCENARIOS[scenario]
+    cumulative, total = [], 0.0
+    for weight, _ in groups:
+        total += weight
+        cumulative.append(total)
+
+    def pick():
+        roll = rng.random() * total
+        for bound, (_, requests) in zip(cumulative, groups):
+            if roll < bound:
+                return rng.choice(requests)
+        return rng.choice(groups[-1][1])
+
+    return pick
@@ -0,0 +1,214 @@
+import logging
+import os
+import time
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+
+from shop.bench import (
+    DEFAULT_THRESHOLDS, ENDPOINTS, Fixtures, compare, dataset_mismatch, dump, load, run_endpoint, run_meta,
+)
+
+
+BENCH_DIR = os.path.join('results', 'bench')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+
+
+class Command(BaseCommand):
+    help = '14개 엔드포인트 인프로세스 벤치마크 (지연 분포, 쿼리 수, 행 수, 메모리) + 베이스라인 회귀 비교'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--endpoint',
+            choices=[endpoint.name for endpoint in ENDPOINTS],
+            action='append',
+            help='측정할 엔드포인트 (반복 지정 가능, 기본: 전체)'
+        )
+        parser.add_argument('--iterations', type=int, default=100, help='엔드포인트별 측정 요청 수 (기본: 100)')
+        parser.add_argument('--warmup', type=int, default=10, help='측정 전 워밍업 요청 수 (기본: 10)')
+        parser.add_argument(
+            '--memory-iterations',
+            type=int,
+            default=10,
+            help='tracemalloc 메모리 측정 요청 수 (기본: 10, 0이면 생략)'
+        )
+        parser.add_argument('--seed', type=int, default=42, help='요청 입력(상품/주문 id, 검색어) 선택 시드 (기본: 42)')
+        parser.add_argument(
+            '--commit',
+            action='store_true',
+            help='쓰기 요청을 실제로 커밋 (기본: 요청마다 롤백 - 데이터셋 유지, COMMIT 비용 제외)'
+        )
+        parser.add_argument(
+            '--cache',
+            action='store_true',
+            help='응답 캐시 사용 (기본: 끔 - 쿼리/직렬화 경로 측정)'
+        )
+        parser.add_argument(
+            '--output',
+            help=f'결과 JSON 경로 (기본: {BENCH_DIR}/bench-{{시각}}.json)'
+        )
+        parser.add_argument(
+            '--baseline',
+            default=BASELINE_PATH,
+            help=f'비교할 베이스라인 JSON (기본: {BASELINE_PATH}, 없으면 비교 생략)'
+        )
+        parser.add_argument(
+            '--update-baseline',
+            action='store_true',
+            help='이번 결과를 베이스라인으로 저장'
+        )
+        parser.add_argument(
+            '--stat',
+            choices=['p50', 'p90', 'p95', 'p99', 'mean'],
+            default='p50',
+            help='지연 비교 기준 (기본: p50 - 노트북 측정 잡음에 강함)'
+        )
+        parser.add_argument(
+            '--latency-threshold', type=float, default=DEFAULT_THRESHOLDS['latency_pct'],
+            help=f'지연 증가 허용치 %% (기본: {DEFAULT_THRESHOLDS["latency_pct"]})'
+        )
+        parser.add_argument(
+            '--latency-floor-ms', type=float, default=DEFAULT_THRESHOLDS['latency_floor_ms'],
+            help=f'이보다 작은 지연 증가(ms)는 무시 (기본: {DEFAULT_THRESHOLDS["latency_floor_ms"]})'
+        )
+        parser.add_argument(
+            '--query-threshold', type=int, default=DEFAULT_THRESHOLDS['queries'],
+            help=f'요청당 SQL 증가 허용 수 (기본: {DEFAULT_THRESHOLDS["queries"]})'
+        )
+        parser.add_argument(
+            '--rows-threshold', type=float, default=DEFAULT_THRESHOLDS['rows_pct'],
+            help=f'행 수 증가 허용치 %% (기본: {DEFAULT_THRESHOLDS["rows_pct"]})'
+        )
+        parser.add_argument(
+            '--memory-threshold', type=float, default=DEFAULT_THRESHOLDS['memory_pct'],
+            help=f'메모리 할당 증가 허용치 %% (기본: {DEFAULT_THRESHOLDS["memory_pct"]})'
+        )
+        parser.add_argument(
+            '--no-fail',
+            action='store_true',
+            help='회귀가 있어도 종료 코드 0 (기본: 회귀 시 실패 - CI 게이트)'
+        )
+
+    def handle(self, *args, **options):
+        # 지연 분포와 평균은 측정 요청이 1회 이상이어야 계산된다
+        if options['iterations'] < 1:
+            raise CommandError('--iterations는 1 이상이어야 합니다.')
+        if options['warmup'] < 0 or options['memory_iterations'] < 0:
+            raise CommandError('--warmup과 --memory-iterations는 0 이상이어야 합니다.')
+        try:
+            fixtures = Fixtures(options['seed'])
+        except LookupError as exc:
+            raise CommandError(str(exc))
+
+        # 재고 부족 등 4xx 경고 로그 생략
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+
+        endpoints = [
+            endpoint for endpoint in ENDPOINTS if not options['endpoint'] or endpoint.name in options['endpoint']
+        ]
+        self.stdout.write(
+            f'엔드포인트 {len(endpoints)}개 × {options["iterations"]}회 (워밍업 {options["warmup"]}, '
+            f'메모리 {options["memory_iterations"]}회, 쓰기 {"커밋" if options["commit"] else "롤백"}, '
+            f'응답 캐시 {"사용" if options["cache"] else "끔"})\n'
+        )
+        self.stdout.write(
+            f'{"엔드포인트":<20} {"p50":>8} {"p95":>8} {"p99":>8} {"max":>8} {"SQL":>5} {"행":>7} {"메모리KiB":>10}  상태'
+        )
+
+        client = Client()
+        results = {}
+        started = time.perf_counter()
+        with override_settings(RESPONSE_CACHE=options['cache']):
+            for endpoint in endpoints:
+                result = run_endpoint(
+                    client, endpoint, fixtures, options['iterations'], options['warmup'],
+                    options['memory_iterations'], commit=options['commit'],
+                )
+                results[endpoint.name] = result
+                self._row(endpoint.name, result)
+
+        current = {
+            'meta': run_meta({
+                key: options[key] for key in ('iterations', 'warmup', 'memory_iterations', 'seed', 'commit', 'cache')
+            }),
+            'endpoints': results,
+        }
+        self.stdout.write(f'\n측정 시간 {time.perf_counter() - started:.1f}s')
+
+        output = options['output'] or os.path.join(
+            BENCH_DIR, f'bench-{datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")}.json'
+        )
+        os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+        dump(output, current)
+        self.stdout.write(f'결과: {output}')
+
+        regressions = []
+        baseline_path = options['baseline']
+        if baseline_path and os.path.exists(baseline_path) and not options['update_baseline']:
+            regressions = self._compare(current, load(baseline_path), baseline_path, options)
+        elif not options['update_baseline']:
+            self.stdout.write(f'베이스라인 없음 ({baseline_path}) - --update-baseline으로 저장')
+
+        if options['update_baseline']:
+            os.makedirs(os.path.dirname(baseline_path) or '.', exist_ok=True)
+            dump(baseline_path, current)
+            self.stdout.write(self.style.SUCCESS(f'✓ 베이스라인 저장: {baseline_path}'))
+
+        unexpected = [name for name, result in results.items() if result['unexpected_status']]
+        if unexpected:
+            self.stdout.write(self.style.WARNING(f'예상과 다른 응답 상태: {", ".join(unexpected)}'))
+
+        if regressions and not options['no_fail']:
+            raise CommandError(f'성능 회귀 {len(regressions)}건: {", ".join(sorted(set(regressions)))}')
+
+    def _row(self, name, result):
+        latency = result['latency_ms']
+        memory = f'{result["memory_kib"]["median"]:>10,.0f}' if result['memory_kib'] else f'{"-":>10}'
+        statuses = ' '.join(f'{code}×{count}' for code, count in result['statuses'].items())
+        line = (
+            f'{name:<20} {latency["p50"]:>8.2f} {latency["p95"]:>8.2f} {latency["p99"]:>8.2f} {latency["max"]:>8.2f} '
+            f'{result["queries"]:>5g} {result["rows"]:>7g} {memory}  {statuses}'
+        )
+        self.stdout.write(self.style.WARNING(line) if result['unexpected_status'] else line)
+
+    def _compare(self, current, baseline, baseline_path, options):
+        """
+        반환: 회귀가 있는 엔드포인트 이름 목록 (지표별 중복 포함)
+        """
+        thresholds = {
+            'latency_pct': options['latency_threshold'],
+            'latency_floor_ms': options['latency_floor_ms'],
+            'queries': options['query_threshold'],
+            'rows_pct': options['rows_threshold'],
+            'memory_pct': options['memory_threshold'],
+        }
+        meta = baseline['meta']
+        self.stdout.write(f'\n베이스라인 비교: {baseline_path} ({meta["created_at"]}, 커밋 {meta.get("git_commit") or "-"})')
+        mismatch = dataset_mismatch(current, baseline)
+        if mismatch:
+            self.stdout.write(self.style.WARNING(
+                f'데이터셋이 다릅니다 ({", ".join(mismatch)}) - 같은 --scale-factor/스냅샷에서 비교하세요'
+            ))
+
+        rows = compare(current, baseline, thresholds, stat=options['stat'])
+        changed = [row for row in rows if row['regressed'] or (row['change'] is not None and abs(row['change']) >= 5)]
+        if not changed:
+            self.stdout.write(self.style.SUCCESS('✓ 변화 없음 (모든 지표 ±5% 이내)'))
+            return []
+
+        self.stdout.write(f'{"엔드포인트":<20} {"지표":<18} {"이전":>10} {"현재":>10} {"변화":>9}')
+        for row in changed:
+            change = '신규' if row['change'] == float('inf') else f'{row["change"]:+.1f}%'
+            line = f'{row["endpoint"]:<20} {row["metric"]:<18} {row["before"]:>10.2f} {row["after"]:>10.2f} {change:>9}'
+            if row['regressed']:
+                self.stdout.write(self.style.ERROR(line + '  ✗ 회귀'))
+            elif row['change'] is not None and row['change'] < 0:
+                self.stdout.write(self.style.SUCCESS(line))
+            else:
+                self.stdout.write(line)
+
+        regressions = [row['endpoint'] for row in rows if row['regressed']]
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS('✓ 임계치를 넘는 회귀 없음'))
+        return regressions
@@ -0,0 +1,96 @@
+import io
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from shop.models import Order, Product
+from shop.parsers import ORJSONParser, MessagePackParser
+from shop.renderers import ORJSONRenderer, MessagePackRenderer
+from shop.serializers import OrderDetailSerializer
+
+
+FORMATS = [
+    ('json (DRF)', JSONRenderer(), JSONParser()),
+    ('orjson', ORJSONRenderer(), ORJSONParser()),
+    ('msgpack', MessagePackRenderer(), MessagePackParser()),
+]
+
+
+class Command(BaseCommand):
+    help = '렌더러/파서 벤치마크: DRF json vs orjson vs msgpack (주문 상세 인코딩, 벌크 주문 디코딩)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--orders',
+            type=int,
+            default=100,
+            help='인코딩할 주문 상세 수 (OrderDetailSerializer, 기본: 100)'
+        )
+        parser.add_argument(
+            '--bulk-size',
+            type=int,
+            default=1000,
+            help='디코딩할 벌크 주문 페이로드의 주문 수 (기본: 1000)'
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=50,
+            help='반복 횟수 (기본: 50)'
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+
+        # 1. 인코딩: GET /orders/{id} 응답 N건 (items + product_name 포함)
+        orders = list(Order.objects.prefetch_related('items__product').order_by('-id')[:options['orders']])
+        if not orders:
+            raise CommandError('주문 데이터가 없습니다 - seed_data 먼저 실행')
+        detail = OrderDetailSerializer(orders, many=True).data
+
+        expected = FORMATS[0][1].render(detail)
+        if FORMATS[1][1].render(detail) != expected:
+            raise CommandError('orjson 출력이 DRF JSONRenderer와 다릅니다.')
+
+        self.stdout.write(f'\n[인코딩] OrderDetailSerializer {len(orders)}건 × {iterations}회')
+        self.stdout.write(f'{"형식":<12} {"크기":>10} {"ops/s":>10} {"MB/s":>10}')
+        for name, renderer, _ in FORMATS:
+            size = len(renderer.render(detail))
+            rate = self._ops_per_sec(lambda: renderer.render(detail), iterations)
+            self.stdout.write(f'{name:<12} {size:>8,} B {rate:>10,.0f} {rate * size / 1e6:>10,.1f}')
+
+        # 2. 디코딩: POST /orders/bulk 요청 본문 (주문당 아이템 1~5개)
+        product_ids = list(Product.objects.values_list('id', flat=True)[:1000]) or [1]
+        rng = random.Random(42)
+        payload = {'orders': [
+            {
+                'user_id': rng.randint(1, 10000),
+                'items': [
+                    {'product_id': rng.choice(product_ids), 'quantity': rng.randint(1, 3)}
+                    for _ in range(rng.randint(1, 5))
+                ],
+            }
+            for _ in range(options['bulk_size'])
+        ]}
+
+        self.stdout.write(f'\n[디코딩] 벌크 주문 {options["bulk_size"]}건 × {iterations}회')
+        self.stdout.write(f'{"형식":<12} {"크기":>10} {"ops/s":>10} {"MB/s":>10}')
+        for name, renderer, parser in FORMATS:
+            body = renderer.render(payload)
+            if parser.parse(io.BytesIO(body)) != payload:
+                raise CommandError(f'{name}: 디코딩 결과가 원본과 다릅니다.')
+            rate = self._ops_per_sec(lambda: parser.parse(io.BytesIO(body)), iterations)
+            self.stdout.write(f'{name:<12} {len(body):>8,} B {rate:>10,.0f} {rate * len(body) / 1e6:>10,.1f}')
+
+        self.stdout.write(self.style.SUCCESS('\n✓ orjson 출력 동일 (바이트 단위), 디코딩 결과 동일'))
+
+    @staticmethod
+    def _ops_per_sec(func, iterations):
+        func()  # 워밍업
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return iterations / (time.perf_counter() - start)
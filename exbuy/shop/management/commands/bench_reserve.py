@@ -0,0 +1,170 @@
+import logging
+import random
+import statistics
+import threading
+import time
+from itertools import accumulate
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+
+from shop.cache import invalidate_products
+from shop.models import Product
+
+
+LOCK_TYPES = ['optimistic', 'pessimistic', 'atomic', 'batched']
+
+
+def zipf_sampler(product_ids, s, rng):
+    """
+    k번째 상품을 1/k^s 비율로 뽑는 샘플러 (s가 클수록 소수 인기 상품에 집중)
+    """
+    cumulative = list(accumulate(1 / rank ** s for rank in range(1, len(product_ids) + 1)))
+    return lambda: rng.choices(product_ids, cum_weights=cumulative)[0]
+
+
+class Command(BaseCommand):
+    help = '재고 예약 lock_type 비교: Zipf 분포 상품에 동시 예약 (TPS, 지연, 초과 판매 검증)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lock-type',
+            choices=LOCK_TYPES,
+            action='append',
+            help='측정할 lock_type (반복 지정 가능, 기본: 전체)'
+        )
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=16,
+            help='동시 요청 스레드 수 (기본: 16)'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=2000,
+            help='lock_type별 총 예약 요청 수 (기본: 2000)'
+        )
+        parser.add_argument(
+            '--products',
+            type=int,
+            default=100,
+            help='대상 상품 수 - id 오름차순 (기본: 100)'
+        )
+        parser.add_argument(
+            '--zipf',
+            type=float,
+            default=1.2,
+            help='Zipf 지수 (기본: 1.2, 0이면 균등 분포)'
+        )
+        parser.add_argument(
+            '--stock',
+            type=int,
+            default=None,
+            help='측정 전 대상 상품 재고를 이 값으로 설정 (기본: 현재 재고 유지)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='난수 시드 (기본: 42)'
+        )
+
+    def handle(self, *args, **options):
+        product_ids = list(Product.objects.order_by('id').values_list('id', flat=True)[:options['products']])
+        if not product_ids:
+            raise CommandError('상품이 없습니다 - seed_data 먼저 실행')
+
+        # 재고 부족(400) 경고 로그 생략
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+
+        original = dict(Product.objects.filter(id__in=product_ids).values_list('id', 'stock'))
+        self.stdout.write(
+            f'상품 {len(product_ids)}개 (Zipf s={options["zipf"]}), 스레드 {options["threads"]}, '
+            f'요청 {options["requests"]}회/모드\n'
+        )
+        self.stdout.write(
+            f'{"lock_type":<12} {"TPS":>8} {"p50 ms":>8} {"p99 ms":>8} {"성공":>6} {"부족":>6} {"오류":>6} {"초과 판매":>10}'
+        )
+
+        try:
+            for lock_type in options['lock_type'] or LOCK_TYPES:
+                if options['stock'] is not None:
+                    Product.objects.filter(id__in=product_ids).update(stock=options['stock'])
+                self._run(lock_type, product_ids, options)
+        finally:
+            # 재고 원복 (updated_at은 갱신된 채로 둔다)
+            self._restore(original)
+            invalidate_products(Product.objects.filter(id__in=product_ids).values_list('id', 'category'))
+
+    def _run(self, lock_type, product_ids, options):
+        before = dict(Product.objects.filter(id__in=product_ids).values_list('id', 'stock'))
+        rng = random.Random(options['seed'])
+        pick = zipf_sampler(product_ids, options['zipf'], rng)
+        # 모드 간 같은 요청열을 사용
+        work = [(pick(), rng.randint(1, 5)) for _ in range(options['requests'])]
+        work_lock = threading.Lock()
+        latencies, reserved, counts = [], {}, {'ok': 0, 'short': 0, 'error': 0}
+        result_lock = threading.Lock()
+
+        def worker():
+            client = Client()
+            try:
+                while True:
+                    with work_lock:
+                        if not work:
+                            return
+                        product_id, quantity = work.pop()
+                    start = time.perf_counter()
+                    response = client.post(
+                        f'/api/inventory/reserve?lock_type={lock_type}',
+                        {'product_id': product_id, 'quantity': quantity},
+                        content_type='application/json',
+                    )
+                    elapsed = time.perf_counter() - start
+                    with result_lock:
+                        latencies.append(elapsed)
+                        if response.status_code == 200:
+                            counts['ok'] += 1
+                            reserved[product_id] = reserved.get(product_id, 0) + quantity
+                        elif response.status_code == 400:
+                            counts['short'] += 1
+                        else:
+                            counts['error'] += 1
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        # 초과 판매: 재고가 음수가 됐거나 성공 응답 합계와 실제 차감량이 다른 상품 수
+        after = dict(Product.objects.filter(id__in=product_ids).values_list('id', 'stock'))
+        oversold = sum(
+            1 for product_id in product_ids
+            if after[product_id] < 0 or before[product_id] - after[product_id] != reserved.get(product_id, 0)
+        )
+
+        latencies.sort()
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        self.stdout.write(
+            f'{lock_type:<12} {len(latencies) / elapsed:>8,.0f} {statistics.median(latencies) * 1000:>8.1f} '
+            f'{p99 * 1000:>8.1f} {counts["ok"]:>6} {counts["short"]:>6} {counts["error"]:>6} '
+            + (self.style.ERROR(f'{oversold:>10}') if oversold else f'{oversold:>10}')
+        )
+
+        # 다음 모드가 같은 재고에서 시작하도록 원복
+        self._restore(before)
+
+    @staticmethod
+    def _restore(stocks):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                'UPDATE shop_product SET stock = %s WHERE id = %s',
+                [(stock, product_id) for product_id, stock in stocks.items()],
+            )
@@ -0,0 +1,85 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from shop.fast_serializers import compile_serializer
+from shop.models import Product, Order, Review
+from shop.serializers import ProductListSerializer, ReviewListSerializer, OrderListSerializer
+
+
+# (이름, Serializer, 기존 경로 QuerySet) - 목록 뷰와 같은 쿼리 구성
+TARGETS = [
+    ('product-list', ProductListSerializer, lambda: Product.objects.order_by('-created_at')),
+    ('review-list', ReviewListSerializer,
+     lambda: Review.objects.select_related('product').defer('product__search_vector').order_by('-created_at')),
+    ('order-list', OrderListSerializer, lambda: Order.objects.order_by('-created_at')),
+]
+
+
+class Command(BaseCommand):
+    help = '목록 직렬화 마이크로 벤치마크: ModelSerializer vs FastSerializer (rows/sec, JSON 동일성 검증)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=100,
+            help='반복당 행 수 (기본: 100, 목록 1페이지)'
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=50,
+            help='반복 횟수 (기본: 50)'
+        )
+        parser.add_argument(
+            '--no-db',
+            action='store_true',
+            help='조회 시간을 제외하고 직렬화만 측정 (행을 미리 로드)'
+        )
+
+    def handle(self, *args, **options):
+        rows, iterations = options['rows'], options['iterations']
+        renderer = JSONRenderer()
+
+        self.stdout.write(f'행 {rows}개 × {iterations}회 ({"직렬화만" if options["no_db"] else "조회 + 직렬화"})\n')
+        self.stdout.write(f'{"대상":<14} {"ModelSerializer":>18} {"FastSerializer":>18} {"배속":>8}')
+
+        for name, serializer_class, queryset in TARGETS:
+            fast = compile_serializer(serializer_class)
+
+            if options['no_db']:
+                instances = list(queryset()[:rows])
+                values = list(fast.values(queryset())[:rows])
+                drf = lambda: serializer_class(instances, many=True).data
+                compiled = lambda: fast.to_representation(values)
+            else:
+                drf = lambda: serializer_class(list(queryset()[:rows]), many=True).data
+                compiled = lambda: fast.to_representation(list(fast.values(queryset())[:rows]))
+
+            # 출력 동일성 (JSON 바이트)
+            expected, actual = renderer.render(drf()), renderer.render(compiled())
+            if expected != actual:
+                raise CommandError(f'{name}: FastSerializer 출력이 ModelSerializer와 다릅니다.')
+
+            count = len(compiled())
+            if not count:
+                self.stdout.write(f'{name:<14} (데이터 없음 - seed_data 먼저 실행)')
+                continue
+
+            drf_rate = self._rows_per_sec(drf, count, iterations)
+            fast_rate = self._rows_per_sec(compiled, count, iterations)
+            self.stdout.write(
+                f'{name:<14} {drf_rate:>12,.0f} rows/s {fast_rate:>12,.0f} rows/s {fast_rate / drf_rate:>7.1f}x'
+            )
+
+        self.stdout.write(self.style.SUCCESS('\n✓ JSON 출력 동일 (바이트 단위)'))
+
+    @staticmethod
+    def _rows_per_sec(func, count, iterations):
+        func()  # 워밍업
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return count * iterations / (time.perf_counter() - start)
@@ -0,0 +1,67 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from shop.cache import clear_response_cache
+from shop.seeding import SEED_TABLES, SNAPSHOT_SCHEMA, restore_snapshot, row_counts, save_snapshot, snapshot_info
+
+
+class Command(BaseCommand):
+    help = f'시딩 데이터 스냅샷 ({SNAPSHOT_SCHEMA} 스키마) 저장/복원 - 재시딩 없이 알려진 상태로 되돌리기'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'action',
+            choices=['save', 'restore', 'status'],
+            help='save: 현재 데이터 저장 / restore: 스냅샷으로 복원 / status: 스냅샷 정보와 현재 행 수 비교'
+        )
+        parser.add_argument(
+            '--keep-indexes',
+            action='store_true',
+            help='복원 시 보조 인덱스를 유지한 채 적재 (기본: 삭제 후 재생성 - 대용량에서 더 빠름)'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+
+        if options['action'] == 'save':
+            self.stdout.write('스냅샷 저장 중...')
+            save_snapshot(log=self.stdout.write)
+            self.stdout.write(self.style.SUCCESS(f'✓ 스냅샷 저장 완료 ({time.perf_counter() - started:.1f}s)'))
+            return
+
+        if options['action'] == 'status':
+            self._status()
+            return
+
+        self.stdout.write('스냅샷 복원 중...')
+        info = restore_snapshot(drop_indexes=not options['keep_indexes'], log=self.stdout.write)
+        if info is None:
+            raise CommandError('저장된 스냅샷이 없습니다 - seed_data --snapshot 또는 dataset_snapshot save 먼저 실행')
+
+        # 플래너 통계 갱신, 복원 전 데이터로 만든 응답 캐시 제거
+        # (공유 캐시만 해당 - locmem은 서버 프로세스마다 따로라 make snapshot-restore/reset-test.sh가 앱 서버를 재시작)
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {', '.join(SEED_TABLES)}")
+        clear_response_cache()
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ 스냅샷 복원 완료 ({time.perf_counter() - started:.1f}s, 저장 시각 {info["saved_at"]})'
+        ))
+
+    def _status(self):
+        info = snapshot_info()
+        if info is None:
+            self.stdout.write(self.style.WARNING('저장된 스냅샷이 없습니다'))
+            return
+
+        self.stdout.write(f'저장 시각: {info["saved_at"]}')
+        if info['dataset']:
+            self.stdout.write('데이터셋: ' + ', '.join(f'{key}={value}' for key, value in info['dataset'].items()))
+
+        current = row_counts()
+        self.stdout.write(f'{"테이블":<24} {"스냅샷":>12} {"현재":>12}')
+        for table in SEED_TABLES:
+            saved = info['rows'][table]
+            line = f'{table:<24} {saved:>12,} {current[table]:>12,}'
+            self.stdout.write(line if saved == current[table] else self.style.WARNING(line))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from shop.loadgen.runner import add_arguments, execute
+
+
+class Command(BaseCommand):
+    help = '개방형 부하 생성기 (shop/loadgen) - k6 시나리오를 목표 req/s로 재현, CO 보정 HDR 히스토그램'
+
+    def add_arguments(self, parser):
+        add_arguments(parser)
+
+    def handle(self, *args, **options):
+        try:
+            execute(options, self.stdout.write)
+        except ValueError as exc:
+            raise CommandError(str(exc))
@@ -0,0 +1,113 @@
+import json
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from shop.profiler import (
+    COLLAPSED_SUFFIX, SPEEDSCOPE_SUFFIX, make_token, parse_file_stem, read_collapsed, speedscope_document,
+    write_collapsed,
+)
+
+
+class Command(BaseCommand):
+    help = '요청 프로파일러 (shop/profiler.py) - 무장 토큰 발급, 저장된 프로파일 목록, 여러 워커의 프로파일 병합'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'action',
+            choices=['token', 'list', 'merge'],
+            help='token: X-Exbuy-Profile 토큰 발급 / list: URL 이름·태그별 요약 / merge: collapsed + speedscope로 병합'
+        )
+        parser.add_argument('--dir', default=settings.PROFILER_DIR, help='프로파일 디렉터리 (기본: PROFILER_DIR)')
+        parser.add_argument('--view', action='append', help='URL 이름 필터 (여러 번 지정 가능)')
+        parser.add_argument('--tag', action='append', help='서버 태그 필터 (예: gunicorn-gthread, uvicorn)')
+        parser.add_argument('--since', type=float, help='최근 N분 안의 프로파일만')
+        parser.add_argument(
+            '--output',
+            help='병합 결과 경로 (확장자 제외, 기본: {dir}/merged-{시각}) - .collapsed와 .speedscope.json 생성'
+        )
+
+    def handle(self, *args, **options):
+        if options['action'] == 'token':
+            self.stdout.write(make_token())
+            self.stderr.write(
+                f'유효 시간 {settings.PROFILER_TOKEN_MAX_AGE}초 - '
+                'curl -H "X-Exbuy-Profile: <토큰>" ... 또는 ?_profile=<토큰>'
+            )
+            return
+
+        profiles = self._profiles(options)
+        if not profiles:
+            raise CommandError(f'{options["dir"]}에 조건에 맞는 프로파일이 없습니다')
+
+        if options['action'] == 'list':
+            self._list(profiles)
+        else:
+            self._merge(profiles, options)
+
+    def _profiles(self, options):
+        """
+        반환: [(경로, 파일 이름 정보), ...] - 병합 결과 등 규칙에 맞지 않는 파일은 제외
+        """
+        directory = options['dir']
+        if not os.path.isdir(directory):
+            return []
+        since = (
+            datetime.now(timezone.utc) - timedelta(minutes=options['since']) if options['since'] is not None else None
+        )
+        profiles = []
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(COLLAPSED_SUFFIX):
+                continue
+            info = parse_file_stem(name[:-len(COLLAPSED_SUFFIX)])
+            if info is None:
+                continue
+            if options['view'] and info['view'] not in options['view']:
+                continue
+            if options['tag'] and info['tag'] not in options['tag']:
+                continue
+            if since is not None and info['started_at'] < since:
+                continue
+            profiles.append((os.path.join(directory, name), info))
+        return profiles
+
+    def _list(self, profiles):
+        groups = defaultdict(lambda: {'count': 0, 'micros': 0, 'workers': set()})
+        for path, info in profiles:
+            group = groups[(info['view'], info['tag'])]
+            group['count'] += 1
+            group['micros'] += sum(read_collapsed(path).values())
+            group['workers'].add(info['worker'].partition('-')[0])
+
+        self.stdout.write(f'{"URL 이름":<26} {"태그":<20} {"프로파일":>8} {"워커":>6} {"샘플 시간(ms)":>14}')
+        for (view, tag), group in sorted(groups.items()):
+            self.stdout.write(
+                f'{view:<26} {tag:<20} {group["count"]:>8} {len(group["workers"]):>6} {group["micros"] / 1000:>14.1f}'
+            )
+
+    def _merge(self, profiles, options):
+        merged = {}
+        for path, _ in profiles:
+            for line, micros in read_collapsed(path).items():
+                merged[line] = merged.get(line, 0) + micros
+
+        output = options['output'] or os.path.join(
+            options['dir'], f'merged-{datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")}'
+        )
+        write_collapsed(output + COLLAPSED_SUFFIX, merged)
+
+        views = sorted({info['view'] for _, info in profiles})
+        tags = sorted({info['tag'] for _, info in profiles})
+        workers = {info['worker'].partition('-')[0] for _, info in profiles}
+        name = f'{", ".join(views)} ({", ".join(tags)}) - 프로파일 {len(profiles)}개, 워커 {len(workers)}개'
+        with open(output + SPEEDSCOPE_SUFFIX, 'w') as file:
+            json.dump(speedscope_document(name, merged), file)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ 프로파일 {len(profiles)}개 병합 (워커 {len(workers)}개, 샘플 시간 {sum(merged.values()) / 1000:.1f}ms)'
+        ))
+        self.stdout.write(f'  {output}{COLLAPSED_SUFFIX}  (flamegraph.pl / speedscope)')
+        self.stdout.write(f'  {output}{SPEEDSCOPE_SUFFIX}  (https://www.speedscope.app)')
@@ -0,0 +1,123 @@
+import glob
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from shop.querystats import EXPLAIN_PREFIX, STATS_PREFIX
+
+
+SORT_KEYS = {
+    'total': lambda row: row['total_ms'],
+    'calls': lambda row: row['calls'],
+    'mean': lambda row: row['total_ms'] / row['calls'],
+    'max': lambda row: row['max_ms'],
+    'rows': lambda row: row['rows'],
+}
+
+
+class Command(BaseCommand):
+    help = 'SQL fingerprint 통계 (shop/querystats.py) - 워커별 파일을 합쳐 view/시나리오별 상위 쿼리와 EXPLAIN 샘플 출력'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'action', choices=['top', 'explain'],
+            help='top: fingerprint별 집계 (pg_stat_statements 형식) / explain: 느린 쿼리 EXPLAIN (ANALYZE, BUFFERS) 샘플',
+        )
+        parser.add_argument('--dir', default=settings.QUERY_STATS_DIR, help='통계 디렉터리 (기본: QUERY_STATS_DIR)')
+        parser.add_argument('--view', action='append', help='URL 이름 필터 (여러 번 지정 가능)')
+        parser.add_argument('--scenario', action='append', help='시나리오 필터 (k6 scenario, 없으면 -)')
+        parser.add_argument('--server', action='append', help='서버 태그 필터 (예: gunicorn-gthread, uvicorn)')
+        parser.add_argument('--query-id', action='append', help='query_id 필터 (Prometheus 라벨과 같은 12자리)')
+        parser.add_argument('--since', type=float, help='최근 N분 안의 기록만')
+        parser.add_argument(
+            '--by', choices=['view', 'query'], default='view',
+            help='view: (view, 시나리오, 쿼리)별 / query: 쿼리별로 모든 view 합산 (기본: view)',
+        )
+        parser.add_argument('--sort', choices=sorted(SORT_KEYS), default='total', help='정렬 기준 (기본: total)')
+        parser.add_argument('--limit', type=int, help='출력 행 수 (기본: top 20, explain 5)')
+        parser.add_argument('--full', action='store_true', help='fingerprint를 자르지 않고 출력')
+
+    def handle(self, *args, **options):
+        prefix = STATS_PREFIX if options['action'] == 'top' else EXPLAIN_PREFIX
+        if options['limit'] is None:
+            options['limit'] = 20 if options['action'] == 'top' else 5
+        records = list(self._records(prefix, options))
+        if not records:
+            raise CommandError(f'{options["dir"]}에 조건에 맞는 기록({prefix}*.jsonl)이 없습니다')
+        if options['action'] == 'top':
+            self._top(records, options)
+        else:
+            self._explain(records, options)
+
+    def _records(self, prefix, options):
+        since = (
+            datetime.now(timezone.utc) - timedelta(minutes=options['since']) if options['since'] is not None else None
+        )
+        filters = [
+            (field, set(options[option]))
+            for field, option in (('view', 'view'), ('scenario', 'scenario'), ('server', 'server'), ('query_id', 'query_id'))
+            if options[option]
+        ]
+        for path in sorted(glob.glob(os.path.join(options['dir'], f'{prefix}*.jsonl'))):
+            with open(path) as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # 기록 중인 마지막 줄
+                    if any(record.get(field) not in values for field, values in filters):
+                        continue
+                    if since is not None and datetime.fromisoformat(record['timestamp']) < since:
+                        continue
+                    yield record
+
+    def _fingerprint(self, text, options):
+        return text if options['full'] else (text[:117] + '...' if len(text) > 120 else text)
+
+    def _top(self, records, options):
+        groups = {}
+        for record in records:
+            if options['by'] == 'view':
+                key = (record['view'], record['scenario'], record['query_id'])
+            else:
+                key = ('*', '*', record['query_id'])
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = {
+                    'view': key[0], 'scenario': key[1], 'query_id': key[2], 'fingerprint': record['fingerprint'],
+                    'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0,
+                }
+            group['calls'] += record['calls']
+            group['total_ms'] += record['total_ms']
+            group['max_ms'] = max(group['max_ms'], record['max_ms'])
+            group['rows'] += record['rows']
+
+        rows = sorted(groups.values(), key=SORT_KEYS[options['sort']], reverse=True)
+        overall = sum(row['total_ms'] for row in rows) or 1.0
+        self.stdout.write(
+            f'{"view":<24} {"시나리오":<12} {"호출":>9} {"총 ms":>11} {"평균 ms":>9} {"최대 ms":>9} '
+            f'{"행/호출":>8} {"비중":>6}  query_id      fingerprint'
+        )
+        for row in rows[:options['limit']]:
+            self.stdout.write(
+                f'{row["view"]:<24} {row["scenario"]:<12} {row["calls"]:>9,} {row["total_ms"]:>11,.1f} '
+                f'{row["total_ms"] / row["calls"]:>9.3f} {row["max_ms"]:>9.2f} {row["rows"] / row["calls"]:>8.1f} '
+                f'{row["total_ms"] / overall * 100:>5.1f}%  {row["query_id"]}  {self._fingerprint(row["fingerprint"], options)}'
+            )
+        if len(rows) > options['limit']:
+            self.stdout.write(f'... {len(rows) - options["limit"]}개 더 (--limit)')
+
+    def _explain(self, records, options):
+        records.sort(key=lambda record: record['timestamp'], reverse=True)
+        for record in records[:options['limit']]:
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{record["timestamp"]} {record["server"]} {record["view"]} ({record["scenario"]}) '
+                f'query_id={record["query_id"]} - 요청 중 {record["duration_ms"]:.1f}ms ({record["alias"]})'
+            ))
+            self.stdout.write(self._fingerprint(record['fingerprint'], options))
+            for line in record['plan']:
+                self.stdout.write(f'  {line}')
+            self.stdout.write('')
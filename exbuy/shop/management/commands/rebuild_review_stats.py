@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from shop.aggregates import rebuild_review_stats, review_stats_drift
+
+
+class Command(BaseCommand):
+    help = '상품 리뷰 집계(review_count, rating_sum, rating_N_count) 검증 및 재계산'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='재계산 없이 drift만 검사 (drift가 있으면 실패 종료)'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=20,
+            help='출력할 drift 상품 수 (기본: 20)'
+        )
+
+    def handle(self, *args, **options):
+        total, samples = review_stats_drift(options['limit'])
+
+        if total:
+            self.stdout.write(self.style.WARNING(f'drift 상품 {total}개 발견'))
+            for product_id, diff in samples:
+                detail = ', '.join(f'{col}: {stored} → {actual}' for col, (stored, actual) in diff.items())
+                self.stdout.write(f'  → 상품 {product_id}: {detail}')
+        else:
+            self.stdout.write(self.style.SUCCESS('✓ drift 없음'))
+
+        if options['check']:
+            if total:
+                raise CommandError(f'리뷰 집계 drift: {total}개 상품')
+            return
+
+        with transaction.atomic():
+            updated = rebuild_review_stats()
+        self.stdout.write(self.style.SUCCESS(f'✓ 리뷰 집계 재계산 완료 (상품 {updated}개)'))
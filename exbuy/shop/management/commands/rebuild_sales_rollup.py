@@ -0,0 +1,56 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from shop.aggregates import rebuild_sales_rollup, sales_rollup_drift
+
+
+class Command(BaseCommand):
+    help = '상품별 일별 판매 롤업(ProductDailySales) 백필/검증 및 재계산'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--from',
+            dest='date_from',
+            type=date.fromisoformat,
+            help='재계산 시작 일자 YYYY-MM-DD (UTC, 기본: 전체)'
+        )
+        parser.add_argument(
+            '--to',
+            dest='date_to',
+            type=date.fromisoformat,
+            help='재계산 마지막 일자 YYYY-MM-DD (UTC, 포함, 기본: 전체)'
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='재계산 없이 drift만 검사 (drift가 있으면 실패 종료)'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=20,
+            help='출력할 drift 행 수 (기본: 20)'
+        )
+
+    def handle(self, *args, **options):
+        date_from, date_to = options['date_from'], options['date_to']
+        total, samples = sales_rollup_drift(date_from, date_to, options['limit'])
+
+        if total:
+            self.stdout.write(self.style.WARNING(f'drift (상품, 일자) {total}개 발견'))
+            for (product_id, day), diff in samples:
+                detail = ', '.join(f'{col}: {stored} → {actual}' for col, (stored, actual) in diff.items())
+                self.stdout.write(f'  → 상품 {product_id} @ {day}: {detail}')
+        else:
+            self.stdout.write(self.style.SUCCESS('✓ drift 없음'))
+
+        if options['check']:
+            if total:
+                raise CommandError(f'판매 롤업 drift: {total}개 (상품, 일자)')
+            return
+
+        with transaction.atomic():
+            rows = rebuild_sales_rollup(date_from, date_to)
+        self.stdout.write(self.style.SUCCESS(f'✓ 판매 롤업 재계산 완료 ((상품, 일자) {rows}개)'))
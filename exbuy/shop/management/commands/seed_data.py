@@ -1,9 +1,15 @@
-from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
 from faker import Faker
+import os
 import random
+import time
+from datetime import datetime, timezone as dt_timezone
 from decimal import Decimal
+from shop.aggregates import rebuild_review_stats, rebuild_sales_rollup
+from shop.cache import clear_response_cache
 from shop.models import Product, Order, OrderItem, Review
+from shop.seeding import SEED_TABLES, DatasetProfile, fast_seed, save_snapshot, scaled_counts
 
 fake = Faker()
 
@@ -36,6 +42,64 @@ class Command(BaseCommand):
             default=1000,
             help='배치 크기 (기본: 1000)'
         )
+        parser.add_argument(
+            '--fast',
+            action='store_true',
+            help='고속 모드: 병렬 프로세스로 행 생성 + COPY FROM STDIN 적재 (TRUNCATE 후 한 트랜잭션)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count(),
+            help='고속 모드 생성 프로세스 수 (기본: CPU 수)'
+        )
+        parser.add_argument(
+            '--drop-indexes',
+            action='store_true',
+            help='고속 모드에서 보조 인덱스를 지우고 적재 후 재생성'
+        )
+        parser.add_argument(
+            '--scale-factor',
+            type=float,
+            default=None,
+            help='재현 가능한 데이터셋 규모 (1 = 상품 10K/주문 50K/리뷰 100K, 개수 옵션 대신 사용). '
+                 '고속 모드 + skewed 분포 + 시드 42가 기본'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=None,
+            help='고속 모드 난수 시드 - 같은 시드/규모면 같은 데이터, 지정하면 고속 모드 '
+                 '(기본: --scale-factor 사용 시 42, 아니면 무작위)'
+        )
+        parser.add_argument(
+            '--profile',
+            choices=['uniform', 'skewed'],
+            default=None,
+            help='고속 모드 생성 분포, 지정하면 고속 모드 (기본: --scale-factor 사용 시 skewed, 아니면 uniform)'
+        )
+        parser.add_argument(
+            '--zipf',
+            type=float,
+            default=1.1,
+            help='skewed 분포의 상품 인기도 Zipf 지수 (기본: 1.1)'
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=365,
+            help='skewed 분포에서 주문/리뷰 created_at을 분산할 기간 (기본: 365일)'
+        )
+        parser.add_argument(
+            '--end-date',
+            default='2025-01-01',
+            help='skewed 분포 created_at 기준일 (YYYY-MM-DD, 기본: 2025-01-01 - 실행 날짜와 무관하게 고정)'
+        )
+        parser.add_argument(
+            '--snapshot',
+            action='store_true',
+            help='시딩 후 스냅샷 저장 (dataset_snapshot restore로 복원)'
+        )
 
     def handle(self, *args, **options):
         products_count = options['products']
@@ -43,6 +107,24 @@ class Command(BaseCommand):
         reviews_count = options['reviews']
         batch_size = options['batch_size']
 
+        if options['scale_factor'] is not None:
+            if options['scale_factor'] <= 0:
+                raise CommandError('--scale-factor는 0보다 커야 합니다.')
+            options.update(scaled_counts(options['scale_factor']))
+            options['fast'] = True
+            if options['seed'] is None:
+                options['seed'] = 42
+
+        # 시드/분포는 고속 모드 생성기에만 있다 - 기존 ORM 모드에서 조용히 무시하지 않도록 고속 모드로 전환
+        if options['seed'] is not None or options['profile'] is not None:
+            options['fast'] = True
+
+        if options['fast']:
+            self._fast_seed(options)
+            return
+        if options['snapshot']:
+            raise CommandError('--snapshot은 고속 모드(--fast / --scale-factor)에서만 사용할 수 있습니다.')
+
         self.stdout.write(self.style.WARNING('기존 데이터 삭제 중...'))
         Review.objects.all().delete()
         OrderItem.objects.all().delete()
@@ -66,12 +148,90 @@ class Command(BaseCommand):
         self._create_reviews(reviews_count, batch_size)
         self.stdout.write(self.style.SUCCESS(f'✓ 리뷰 {reviews_count}개 생성 완료'))
 
+        # 4. 리뷰 집계 (bulk_create는 증분 갱신을 거치지 않으므로 일괄 재계산)
+        self.stdout.write('리뷰 집계 계산 중...')
+        with transaction.atomic():
+            rebuild_review_stats()
+        self.stdout.write(self.style.SUCCESS('✓ 리뷰 집계 계산 완료'))
+
+        # 5. 일별 판매 롤업 (주문도 증분 갱신을 거치지 않으므로 일괄 재계산)
+        self.stdout.write('판매 롤업 계산 중...')
+        with transaction.atomic():
+            rebuild_sales_rollup()
+        self.stdout.write(self.style.SUCCESS('✓ 판매 롤업 계산 완료'))
+
+        # 6. 응답 캐시 비우기 (공유 캐시 백엔드에 남은 이전 데이터 제거)
+        clear_response_cache()
+
         self.stdout.write(self.style.SUCCESS('\n=== 데이터 생성 완료 ==='))
         self.stdout.write(f'상품: {Product.objects.count()}')
         self.stdout.write(f'주문: {Order.objects.count()}')
         self.stdout.write(f'주문 아이템: {OrderItem.objects.count()}')
         self.stdout.write(f'리뷰: {Review.objects.count()}')
 
+    def _profile(self, options):
+        """--profile / --scale-factor → DatasetProfile"""
+        name = options['profile'] or ('skewed' if options['scale_factor'] is not None else 'uniform')
+        if name == 'uniform':
+            return DatasetProfile.uniform()
+        try:
+            end = datetime.strptime(options['end_date'], '%Y-%m-%d').replace(tzinfo=dt_timezone.utc)
+        except ValueError:
+            raise CommandError('--end-date는 YYYY-MM-DD 형식이어야 합니다.')
+        return DatasetProfile.skewed(zipf=options['zipf'], days=options['days'], end=end)
+
+    def _fast_seed(self, options):
+        """COPY 기반 고속 생성 - 테이블별 처리량(rows/s) 출력"""
+        profile = self._profile(options)
+        dataset = {
+            'scale_factor': options['scale_factor'], 'seed': options['seed'],
+            'products': options['products'], 'orders': options['orders'], 'reviews': options['reviews'],
+            **profile.describe(),
+        }
+        self.stdout.write(self.style.WARNING(
+            f'고속 모드: 기존 데이터 TRUNCATE 후 COPY 적재 (생성 프로세스 {options["workers"]}개, '
+            f'분포 {profile.name}, 시드 {options["seed"]})'
+        ))
+        started = time.perf_counter()
+        stats, index_seconds = fast_seed(
+            options['products'], options['orders'], options['reviews'],
+            workers=options['workers'], drop_indexes=options['drop_indexes'], seed=options['seed'],
+            profile=profile, log=self.stdout.write,
+        )
+        load_seconds = time.perf_counter() - started
+
+        self.stdout.write('리뷰 집계 / 판매 롤업 계산 중...')
+        started = time.perf_counter()
+        with transaction.atomic():
+            rebuild_review_stats()
+            rebuild_sales_rollup()
+        aggregate_seconds = time.perf_counter() - started
+
+        # 플래너 통계 갱신 (대량 적재 직후에는 autovacuum 통계가 비어 있다)
+        started = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {', '.join(SEED_TABLES)}")
+        analyze_seconds = time.perf_counter() - started
+
+        clear_response_cache()
+
+        self.stdout.write(self.style.SUCCESS('\n=== 데이터 생성 완료 (고속 모드) ==='))
+        self.stdout.write(f'{"테이블":<24} {"행":>10} {"초":>8} {"rows/s":>10}')
+        for table, rows in stats.rows.items():
+            self.stdout.write(
+                f'{table:<24} {rows:>10,} {stats.seconds[table]:>8.1f} {stats.rate(table):>10,.0f}'
+            )
+        self.stdout.write(
+            f'적재 {load_seconds:.1f}s (인덱스 재생성 {index_seconds:.1f}s 포함), '
+            f'집계 {aggregate_seconds:.1f}s, ANALYZE {analyze_seconds:.1f}s'
+        )
+
+        if options['snapshot']:
+            self.stdout.write('스냅샷 저장 중...')
+            started = time.perf_counter()
+            save_snapshot(dataset, log=self.stdout.write)
+            self.stdout.write(self.style.SUCCESS(f'✓ 스냅샷 저장 완료 ({time.perf_counter() - started:.1f}s)'))
+
     @transaction.atomic
     def _create_products(self, count, batch_size):
         """상품 대량 생성"""
@@ -0,0 +1,76 @@
+# Generated by Django 5.0.14 on 2026-10-17 23:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0003_product_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='rating_1_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_2_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_3_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_4_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_5_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_sum',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='review_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        # 기존 리뷰로 집계 채우기 (shop.aggregates.rebuild_review_stats와 동일한 SQL)
+        migrations.RunSQL(
+            sql="""
+                WITH stats AS (
+                    SELECT product_id,
+                           COUNT(*) AS review_count,
+                           SUM(rating) AS rating_sum,
+                           COUNT(*) FILTER (WHERE rating = 1) AS rating_1_count,
+                           COUNT(*) FILTER (WHERE rating = 2) AS rating_2_count,
+                           COUNT(*) FILTER (WHERE rating = 3) AS rating_3_count,
+                           COUNT(*) FILTER (WHERE rating = 4) AS rating_4_count,
+                           COUNT(*) FILTER (WHERE rating = 5) AS rating_5_count
+                    FROM shop_review
+                    GROUP BY product_id
+                )
+                UPDATE shop_product AS p SET
+                    review_count = stats.review_count,
+                    rating_sum = stats.rating_sum,
+                    rating_1_count = stats.rating_1_count,
+                    rating_2_count = stats.rating_2_count,
+                    rating_3_count = stats.rating_3_count,
+                    rating_4_count = stats.rating_4_count,
+                    rating_5_count = stats.rating_5_count
+                FROM stats
+                WHERE stats.product_id = p.id
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
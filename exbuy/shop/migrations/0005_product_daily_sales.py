@@ -0,0 +1,48 @@
+# Generated by Django 5.0.14 on 2026-10-17 23:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0004_product_review_aggregates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductDailySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('quantity', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('order_count', models.IntegerField(default=0)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='shop.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day', 'product'], name='shop_produc_day_77d69e_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='productdailysales',
+            constraint=models.UniqueConstraint(fields=('product', 'day'), name='shop_dailysales_product_day_uniq'),
+        ),
+        # 기존 주문으로 롤업 채우기 (shop.aggregates.rebuild_sales_rollup과 동일한 집계)
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO shop_productdailysales (product_id, day, quantity, revenue, order_count)
+                SELECT oi.product_id,
+                       (o.created_at AT TIME ZONE 'UTC')::date AS day,
+                       SUM(oi.quantity),
+                       SUM(oi.quantity * oi.unit_price),
+                       COUNT(DISTINCT oi.order_id)
+                FROM shop_orderitem AS oi
+                JOIN shop_order AS o ON o.id = oi.order_id
+                WHERE o.status <> 'cancelled'
+                GROUP BY 1, 2
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-17 23:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0005_product_daily_sales'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        # 기존 리뷰는 작성 시각을 수정 시각으로 사용
+        migrations.RunSQL(
+            sql='UPDATE shop_review SET updated_at = created_at',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
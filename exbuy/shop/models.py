@@ -1,8 +1,16 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 
+class ProductManager(models.Manager):
+    def get_queryset(self):
+        # search_vector(tsvector)는 검색 조건/랭킹에서만 사용 - 일반 조회에서는 로드하지 않음
+        return super().get_queryset().defer('search_vector')
+
+
 class Product(models.Model):
     """
     상품 모델 - 성능 테스트의 핵심 읽기 대상
@@ -15,6 +23,9 @@ class Product(models.Model):
         ('home', 'Home & Garden'),
     ]
 
+    # 전문 검색(FTS) 텍스트 설정 - search_vector 생성식과 검색 쿼리가 반드시 같은 값을 사용
+    SEARCH_CONFIG = 'english'
+
     name = models.CharField(max_length=200, db_index=True)
     price = models.DecimalField(max_digits=10, decimal_places=2, db_index=True)
     stock = models.IntegerField(default=0, validators=[MinValueValidator(0)])
@@ -23,17 +34,54 @@ class Product(models.Model):
     updated_at = models.DateTimeField(auto_now=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # 리뷰 집계 (비정규화) - ReviewViewSet 쓰기 시 증분 갱신, rebuild_review_stats로 재계산
+    review_count = models.IntegerField(default=0, editable=False)
+    rating_sum = models.IntegerField(default=0, editable=False)
+    rating_1_count = models.IntegerField(default=0, editable=False)
+    rating_2_count = models.IntegerField(default=0, editable=False)
+    rating_3_count = models.IntegerField(default=0, editable=False)
+    rating_4_count = models.IntegerField(default=0, editable=False)
+    rating_5_count = models.IntegerField(default=0, editable=False)
+
+    # 전문 검색용 tsvector (PostgreSQL STORED 생성 컬럼, name 가중치 A > description 가중치 B)
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('name', weight='A', config=SEARCH_CONFIG)
+            + SearchVector('description', weight='B', config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = ProductManager()
+
     class Meta:
         ordering = ['-created_at']
         indexes = [
+            GinIndex(fields=['search_vector']),  # 전문 검색 (@@ 연산자)
             models.Index(fields=['category', 'price']),  # 복합 인덱스: 카테고리별 가격 필터링
             models.Index(fields=['updated_at', 'stock']),  # 최근 업데이트 + 재고 조회
             models.Index(fields=['name']),  # 텍스트 검색용
+            models.Index(fields=['created_at', 'id']),  # 키셋 페이지네이션 (기본 정렬)
+            models.Index(fields=['price', 'id']),  # 키셋 페이지네이션 (가격 정렬)
         ]
 
     def __str__(self):
         return self.name
 
+    @property
+    def average_rating(self):
+        if not self.review_count:
+            return None
+        return self.rating_sum / self.review_count
+
+    @property
+    def rating_histogram(self):
+        return {
+            star: getattr(self, f'rating_{star}_count')
+            for star in range(1, 6)
+        }
+
 
 class Order(models.Model):
     """
@@ -58,6 +106,7 @@ class Order(models.Model):
         indexes = [
             models.Index(fields=['user_id', 'status']),  # 사용자별 주문 상태 조회
             models.Index(fields=['created_at', 'total_price']),  # 기간별 매출 집계
+            models.Index(fields=['created_at', 'id']),  # 키셋 페이지네이션
         ]
 
     def __str__(self):
@@ -95,13 +144,39 @@ class Review(models.Model):
     rating = models.IntegerField(validators=[MinValueValidator(1), MaxValueValidator(5)])
     body = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)  # 조건부 GET 검증자 (shop/conditional.py)
 
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['product', 'rating']),  # 상품별 평점 조회
             models.Index(fields=['user_id', 'created_at']),  # 사용자별 리뷰 이력
+            models.Index(fields=['created_at', 'id']),  # 키셋 페이지네이션
+            models.Index(fields=['product', 'created_at', 'id']),  # 상품별 리뷰 키셋 페이지네이션
         ]
 
     def __str__(self):
         return f"Review by User {self.user_id} - {self.rating}/5"
+
+
+class ProductDailySales(models.Model):
+    """
+    상품별 일별 판매 롤업 - /stats/top-products 전용 (취소 주문 제외)
+    주문 쓰기 경로에서 증분 갱신하고, rebuild_sales_rollup으로 재계산한다.
+    """
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='daily_sales')
+    day = models.DateField()  # 주문 생성일 (UTC)
+    quantity = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    order_count = models.IntegerField(default=0)  # 해당 일자에 이 상품을 포함한 주문 수
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'day'], name='shop_dailysales_product_day_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['day', 'product']),  # 기간 윈도우 집계
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} @ {self.day}: {self.quantity}"
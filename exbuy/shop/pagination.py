@@ -0,0 +1,253 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.paginator import InvalidPage
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimate_count(queryset):
+    """
+    플래너 통계 기반 추정 COUNT
+    EXPLAIN의 최상위 'Plan Rows'를 사용하므로 테이블 스캔 없이 계획 비용만 든다.
+    PostgreSQL 이외의 DB에서는 None
+    """
+    if connections[queryset.db].vendor != 'postgresql':
+        return None
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+async def aestimate_count(queryset):
+    if connections[queryset.db].vendor != 'postgresql':
+        return None
+    plan = json.loads(await queryset.order_by().aexplain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class KeysetPagination(BasePagination):
+    """
+    키셋(커서) 페이지네이션 - OFFSET/COUNT(*) 없이 (정렬키, id) 인덱스를 따라 이동
+    ?pagination=cursor[&ordering=-price][&count=estimate]
+    다음 페이지부터는 응답의 next/previous 링크(cursor 파라미터)를 그대로 사용한다.
+
+    뷰에서 keyset_orderings(허용 정렬 필드)와 keyset_default_ordering을 지정할 수 있다.
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    count_query_param = 'count'
+
+    default_orderings = ('created_at',)
+    default_ordering = '-created_at'
+
+    invalid_cursor_message = '잘못된 커서입니다.'
+
+    def _prepare(self, queryset, request, view=None):
+        """
+        커서 위치/정렬을 해석해 LIMIT page_size + 1 쿼리를 만든다 (평가는 호출자가 수행)
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+
+        allowed = getattr(view, 'keyset_orderings', self.default_orderings)
+        default = getattr(view, 'keyset_default_ordering', self.default_ordering)
+        cursor = self.decode_cursor(request)
+
+        ordering = cursor['o'] if cursor else request.query_params.get(self.ordering_query_param, default)
+        field = ordering.lstrip('-')
+        if field not in allowed:
+            raise ValidationError({
+                self.ordering_query_param: f'커서 페이지네이션은 {", ".join(allowed)} 정렬만 지원합니다.'
+            })
+
+        self.ordering = ordering
+        self.field = field
+        self.descending = ordering.startswith('-')
+        self.reverse = bool(cursor and cursor['r'])
+        self.has_cursor = cursor is not None
+
+        # 역방향(previous) 이동 시 정렬을 뒤집어 조회한 뒤 결과를 다시 뒤집는다
+        descending = self.descending != self.reverse
+        prefix = '-' if descending else ''
+        queryset = queryset.order_by(f'{prefix}{field}', f'{prefix}id')
+        # 추정 COUNT는 커서 조건 없이 - 결과 집합 전체 크기 (페이지를 넘겨도 같은 값)
+        self.queryset = queryset
+
+        if cursor:
+            model_field = queryset.model._meta.get_field(field)
+            try:
+                value = model_field.to_python(cursor['v'])
+                pk = int(cursor['id'])
+            except Exception:
+                raise NotFound(self.invalid_cursor_message)
+
+            # (field, id) < (value, pk) 를 인덱스 범위 조건(field <= value)과 함께 표현
+            op = 'lt' if descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{field}__{op}e': value}),
+                Q(**{f'{field}__{op}': value}) | Q(**{f'id__{op}': pk}),
+            )
+
+        self.want_count = request.query_params.get(self.count_query_param) == 'estimate'
+        return queryset[:self.page_size + 1]
+
+    def _finish(self, rows):
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if self.reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.has_cursor
+
+        self.page = rows
+        return rows
+
+    def paginate_queryset(self, queryset, request, view=None):
+        rows = list(self._prepare(queryset, request, view))
+        self.estimated_count = estimate_count(self.queryset) if self.want_count else None
+        return self._finish(rows)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        rows = [obj async for obj in self._prepare(queryset, request, view)]
+        self.estimated_count = await aestimate_count(self.queryset) if self.want_count else None
+        return self._finish(rows)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            return {'o': str(cursor['o']), 'v': cursor['v'], 'id': cursor['id'], 'r': bool(cursor['r'])}
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, obj, reverse):
+        # 모델 인스턴스 또는 values() 행(dict, shop/fast_serializers.py)
+        if isinstance(obj, dict):
+            value, pk = obj[self.field], obj['id']
+        else:
+            value, pk = getattr(obj, self.field), obj.pk
+        cursor = {'o': self.ordering, 'v': str(value) if value is not None else None, 'id': pk, 'r': reverse}
+        encoded = base64.urlsafe_b64encode(json.dumps(cursor, separators=(',', ':')).encode('ascii'))
+        url = remove_query_param(self.base_url, self.ordering_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded.decode('ascii'))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_data(self, data):
+        result = OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+        ])
+        if self.want_count:
+            result['estimated_count'] = self.estimated_count
+        result['results'] = data
+        return result
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+
+class HybridPagination(PageNumberPagination):
+    """
+    기본 페이지네이션 (settings.REST_FRAMEWORK['DEFAULT_PAGINATION_CLASS'])
+    - 기본: PageNumberPagination (count/next/previous/results, 기존 응답 형식 유지)
+    - ?pagination=cursor 또는 ?cursor=...: KeysetPagination
+    """
+    keyset_class = KeysetPagination
+    mode_query_param = 'pagination'
+
+    def use_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.keyset_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        비동기 버전 (async_views.py 전용)
+        """
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = self.keyset_class()
+            return await self.keyset.apaginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        paginator = self.django_paginator_class(queryset, page_size)
+        # Paginator.count(cached_property)를 acount() 결과로 미리 채워 동기 COUNT 방지
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            )
+            raise NotFound(msg)
+
+        # 페이지 슬라이스(LIMIT/OFFSET)를 한 번에 비동기 조회
+        self.page.object_list = [obj async for obj in self.page.object_list]
+        self.request = request
+        return self.page.object_list
+
+    def get_paginated_data(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_data(data)
+        return OrderedDict([
+            ('count', self.page.paginator.count),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ])
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+
+class SearchPagination(HybridPagination):
+    """
+    검색 결과 페이지네이션 (랭킹 순이라 페이지 번호 모드만 사용)
+    상위 max_window건으로 결과 창을 제한해 인기 검색어도 COUNT/OFFSET 비용에 상한을 둔다.
+    ?page=2&page_size=50
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    max_window = 1000
+
+    def use_keyset(self, request):
+        return False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return super().paginate_queryset(queryset[:self.max_window], request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        return await super().apaginate_queryset(queryset[:self.max_window], request, view)
@@ -0,0 +1,45 @@
+"""
+API 파서 (settings.REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'])
+
+- ORJSONParser: JSONParser와 같은 결과(NaN/Infinity 거부)를 orjson으로 파싱
+- MessagePackParser: Content-Type: application/msgpack 요청 본문 파싱
+"""
+import msgpack
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+from .renderers import ORJSONRenderer, MessagePackRenderer
+
+
+class ORJSONParser(JSONParser):
+    """
+    orjson 기반 JSONParser (UTF-8 이외의 인코딩은 기존 JSONParser로 처리)
+    """
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class MessagePackParser(BaseParser):
+    """
+    application/msgpack 파서
+    """
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False, strict_map_key=False)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError('MessagePack parse error - %s' % (str(exc) or type(exc).__name__))
@@ -0,0 +1,370 @@
+"""
+요청 단위 샘플링 프로파일러 (ProfilerMiddleware)
+
+무장(arm)된 요청만 프로파일링한다.
+- 서명된 토큰: X-Exbuy-Profile 헤더 또는 ?_profile= 쿼리 (manage.py profiles token으로 발급, DEBUG면 아무 값)
+- URL 이름별 비율: PROFILER_RULES="product-detail:5,product-list:0.5" (퍼센트)
+
+무장된 요청은 프로세스당 하나인 샘플러 스레드가 PROFILER_INTERVAL_MS 간격으로 sys._current_frames()에서
+요청 스택을 읽는다. 미들웨어 프레임 아래의 스택만 세고, 샘플 사이 실제 경과 시간(µs)을 가중치로 더한다.
+무장된 요청이 없으면 샘플러 스레드는 종료되고, 미들웨어는 헤더/쿼리 문자열 확인만 한다.
+
+- gthread/sync: 요청 스레드의 스택
+- gevent: 샘플러는 원래의 OS 스레드로 돌고, 요청 그린렛이 실행 중일 때의 스택만 센다 (다른 그린렛 실행 구간은 제외)
+- async 뷰(uvicorn): 이벤트 루프에서 실행 중인 요청 코루틴 스택 (sync_to_async 스레드 안의 ORM 실행은 제외)
+
+결과는 PROFILER_DIR에 요청마다 collapsed stack(.collapsed, flamegraph.pl/speedscope 호환)과
+speedscope JSON(.speedscope.json)으로 쓴다. 파일 이름과 루트 프레임에 서버 태그(PROFILER_TAG)와 URL 이름이 붙는다.
+여러 워커의 결과는 manage.py profiles merge로 합친다.
+"""
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timezone
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core import signing
+from django.urls import Resolver404, resolve
+
+
+PROFILE_HEADER = 'HTTP_X_EXBUY_PROFILE'
+PROFILE_QUERY = '_profile'
+TOKEN_SALT = 'shop.profiler'
+
+COLLAPSED_SUFFIX = '.collapsed'
+SPEEDSCOPE_SUFFIX = '.speedscope.json'
+
+# 파일 이름: {URL 이름}__{서버 태그}__{UTC 시각}__{pid}-{순번}
+FILE_NAME_SEPARATOR = '__'
+
+_counter = itertools.count(1)
+
+
+# =============== 무장 토큰 ===============
+def make_token():
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign('profile')
+
+
+def valid_token(value):
+    if not value:
+        return False
+    if settings.DEBUG:
+        return True
+    try:
+        signing.TimestampSigner(salt=TOKEN_SALT).unsign(value, max_age=settings.PROFILER_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def parse_rules(value):
+    """
+    "product-detail:5,product-list:0.5" → {'product-detail': 0.05, 'product-list': 0.005}
+    """
+    rules = {}
+    for item in filter(None, (part.strip() for part in value.split(','))):
+        name, _, percent = item.partition(':')
+        rules[name.strip()] = float(percent or 100) / 100
+    return rules
+
+
+# =============== 프레임 이름 ===============
+_labels = {}
+_path_prefixes = None
+
+
+def _short_path(filename):
+    global _path_prefixes
+    if _path_prefixes is None:
+        # 긴 경로 순으로 잘라낸다 (site-packages가 BASE_DIR 아래에 있을 수도 있음)
+        _path_prefixes = sorted(
+            {os.path.join(path, '') for path in sys.path if path and os.path.isdir(path)}
+            | {os.path.join(str(settings.BASE_DIR), '')},
+            key=len, reverse=True,
+        )
+    for prefix in _path_prefixes:
+        if filename.startswith(prefix):
+            return filename[len(prefix):]
+    return filename
+
+
+def _label(code):
+    label = _labels.get(code)
+    if label is None:
+        name = getattr(code, 'co_qualname', code.co_name)
+        # collapsed 형식은 ';'로 프레임을 나누고 마지막 공백 뒤를 값으로 읽는다
+        label = f'{name} ({_short_path(code.co_filename)}:{code.co_firstlineno})'.replace(';', ',')
+        _labels[code] = label
+    return label
+
+
+# =============== 프로파일 ===============
+class Profile:
+    """
+    root: 미들웨어 프레임 - 이 프레임 아래(안쪽)의 스택만 샘플로 센다
+    stacks: {(code, ...): 누적 µs} - 바깥 → 안쪽 순
+    """
+
+    def __init__(self, root, trigger):
+        self.root = root
+        self.trigger = trigger
+        self.thread_id = None
+        self.stacks = {}
+        self.samples = 0
+        self.started_at = datetime.now(timezone.utc)
+        self.started = self.last = time.perf_counter()
+
+    def sample(self, frames, now):
+        elapsed = now - self.last
+        self.last = now
+        stack = self._stack(frames)
+        if stack is None:
+            return
+        self.samples += 1
+        self.stacks[stack] = self.stacks.get(stack, 0) + int(elapsed * 1_000_000)
+
+    def _stack(self, frames):
+        # 요청 스레드를 찾은 뒤에는 그 스레드만 본다
+        if self.thread_id is not None:
+            candidates = [(self.thread_id, frames.get(self.thread_id))]
+        else:
+            candidates = frames.items()
+        for thread_id, frame in candidates:
+            codes = []
+            while frame is not None and frame is not self.root:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            if frame is self.root:
+                self.thread_id = thread_id
+                codes.reverse()
+                return tuple(codes)
+        return None
+
+    def collapsed_lines(self, prefix):
+        merged = {}
+        for codes, micros in self.stacks.items():
+            line = ';'.join(prefix + [_label(code) for code in codes])
+            merged[line] = merged.get(line, 0) + micros
+        return merged
+
+
+# =============== 샘플러 스레드 ===============
+_active = {}
+_sampler_running = False
+
+
+def _original(module, name):
+    # gevent 몽키패치 환경에서도 샘플러는 실제 OS 스레드와 블로킹 sleep을 써야 요청 그린렛을 가로챌 수 있다
+    if 'gevent' in sys.modules:
+        from gevent import monkey
+        if monkey.is_module_patched(module):
+            return monkey.get_original(module, name)
+    return getattr(__import__(module), name)
+
+
+# _active와 _sampler_running을 함께 보호 - 샘플러 종료 판단과 start()의 무장이 엇갈리면 샘플러 없는 프로파일이 남는다
+# 샘플러(OS 스레드)와 요청 그린렛이 함께 쓰므로 gevent 잠금이 아닌 OS 잠금
+_lock = _original('_thread', 'allocate_lock')()
+
+
+def _sampler():
+    global _sampler_running
+    sleep = _original('time', 'sleep')
+    interval = settings.PROFILER_INTERVAL_MS / 1000
+    while True:
+        with _lock:
+            if not _active:
+                _sampler_running = False
+                return
+            # stop() 뒤에는 저장 중인 프로파일의 stacks를 건드리지 않도록 잠금 안에서 샘플링
+            frames = sys._current_frames()
+            now = time.perf_counter()
+            for profile in _active.values():
+                profile.sample(frames, now)
+            del frames
+        sleep(interval)
+
+
+def start(root, trigger):
+    """
+    반환: Profile 또는 None (동시 프로파일 수 초과)
+    """
+    global _sampler_running
+    with _lock:
+        if len(_active) >= settings.PROFILER_MAX_ACTIVE:
+            return None
+        profile = Profile(root, trigger)
+        _active[id(profile)] = profile
+        if not _sampler_running:
+            _sampler_running = True
+            _original('_thread', 'start_new_thread')(_sampler, ())
+    return profile
+
+
+def stop(profile):
+    with _lock:
+        _active.pop(id(profile), None)
+
+
+# =============== 파일 출력 ===============
+def speedscope_document(name, lines):
+    """
+    collapsed {스택: µs} → speedscope 파일 (sampled 프로파일 1개)
+    """
+    frame_index = {}
+    frames, samples, weights = [], [], []
+    for line, micros in lines.items():
+        indexes = []
+        for label in line.split(';'):
+            if label not in frame_index:
+                frame_index[label] = len(frames)
+                frames.append({'name': label})
+            indexes.append(frame_index[label])
+        samples.append(indexes)
+        weights.append(micros)
+    return {
+        '$schema': 'https://www.speedscope.app/file-format-schema.json',
+        'exporter': 'exbuy shop.profiler',
+        'name': name,
+        'activeProfileIndex': 0,
+        'shared': {'frames': frames},
+        'profiles': [{
+            'type': 'sampled',
+            'name': name,
+            'unit': 'microseconds',
+            'startValue': 0,
+            'endValue': sum(weights),
+            'samples': samples,
+            'weights': weights,
+        }],
+    }
+
+
+def write_collapsed(path, lines):
+    with open(path, 'w') as file:
+        for line, micros in sorted(lines.items()):
+            file.write(f'{line} {micros}\n')
+
+
+def read_collapsed(path):
+    lines = {}
+    with open(path) as file:
+        for raw in file:
+            line, _, micros = raw.rstrip('\n').rpartition(' ')
+            if line:
+                lines[line] = lines.get(line, 0) + int(micros)
+    return lines
+
+
+def file_stem(view, tag, started_at):
+    stamp = started_at.strftime('%Y%m%dT%H%M%S.%fZ')
+    return FILE_NAME_SEPARATOR.join([view, tag, stamp, f'{os.getpid()}-{next(_counter)}'])
+
+
+def parse_file_stem(stem):
+    """
+    반환: {'view', 'tag', 'started_at', 'worker'} 또는 None (다른 파일)
+    """
+    parts = stem.split(FILE_NAME_SEPARATOR)
+    if len(parts) != 4:
+        return None
+    view, tag, stamp, worker = parts
+    try:
+        started_at = datetime.strptime(stamp, '%Y%m%dT%H%M%S.%fZ').replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+    return {'view': view, 'tag': tag, 'started_at': started_at, 'worker': worker}
+
+
+def save(profile, request, response, view):
+    """
+    반환: 파일 이름(확장자 제외) 또는 None (샘플 없음 - 간격보다 짧은 요청)
+    """
+    if not profile.stacks:
+        return None
+    tag = settings.PROFILER_TAG
+    lines = profile.collapsed_lines([tag, view])
+    directory = settings.PROFILER_DIR
+    os.makedirs(directory, exist_ok=True)
+    stem = file_stem(view, tag, profile.started_at)
+
+    write_collapsed(os.path.join(directory, stem + COLLAPSED_SUFFIX), lines)
+    elapsed = (time.perf_counter() - profile.started) * 1000
+    name = f'{request.method} {request.get_full_path()} → {response.status_code} ({elapsed:.1f}ms, {tag}, {profile.trigger})'
+    with open(os.path.join(directory, stem + SPEEDSCOPE_SUFFIX), 'w') as file:
+        json.dump(speedscope_document(name, lines), file)
+    return stem
+
+
+# =============== 미들웨어 ===============
+class ProfilerMiddleware:
+    """
+    응답 헤더 X-Exbuy-Profile: 저장한 프로파일 파일 이름 (토큰으로 무장한 요청만)
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.rules = parse_rules(settings.PROFILER_RULES)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _trigger(self, request):
+        """
+        반환: 'token' / 'rule' / None (무장 안 됨)
+        """
+        token = request.META.get(PROFILE_HEADER)
+        if token is None and PROFILE_QUERY in request.META.get('QUERY_STRING', ''):
+            token = request.GET.get(PROFILE_QUERY)
+        if token is not None:
+            return 'token' if valid_token(token) else None
+        if self.rules:
+            try:
+                view = resolve(request.path_info).url_name
+            except Resolver404:
+                return None
+            if random.random() < self.rules.get(view, 0):
+                return 'rule'
+        return None
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        trigger = self._trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+        profile = start(sys._getframe(), trigger)
+        try:
+            response = self.get_response(request)
+        finally:
+            if profile is not None:
+                stop(profile)
+        return self._finish(request, response, profile)
+
+    async def __acall__(self, request):
+        trigger = self._trigger(request)
+        if trigger is None:
+            return await self.get_response(request)
+        profile = start(sys._getframe(), trigger)
+        try:
+            response = await self.get_response(request)
+        finally:
+            if profile is not None:
+                stop(profile)
+        return self._finish(request, response, profile)
+
+    @staticmethod
+    def _finish(request, response, profile):
+        if profile is None:
+            return response
+        match = request.resolver_match
+        view = match.url_name if match is not None and match.url_name else 'unresolved'
+        stem = save(profile, request, response, view)
+        if stem is not None and profile.trigger == 'token':
+            response['X-Exbuy-Profile'] = stem
+        return response
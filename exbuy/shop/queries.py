@@ -0,0 +1,187 @@
+"""
+읽기 경로 공용 QuerySet 빌더
+
+동기 DRF 뷰(views.py)와 ASGI 전용 비동기 뷰(async_views.py)가
+동일한 필터/정렬 규칙을 공유하도록 쿼리 구성만 분리해 둔다.
+"""
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, FloatField, Sum, Value
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+
+from .models import Product, ProductDailySales, Review
+
+
+# 다건 조회(?ids=) 한 번에 받을 수 있는 상품 수
+MAX_MULTI_GET_IDS = 100
+
+
+def product_search_query(q):
+    """
+    사용자 입력을 tsquery로 변환 (websearch 문법: "정확한 구문", OR, -제외)
+    """
+    return SearchQuery(q, search_type='websearch', config=Product.SEARCH_CONFIG)
+
+
+def product_ids_param(params):
+    """
+    ?ids=3,1,2 → [3, 1, 2] (요청 순서 유지, 중복 제거)
+    """
+    ids = []
+    for value in params.get('ids', '').split(','):
+        value = value.strip()
+        if not value:
+            continue
+        try:
+            product_id = int(value)
+        except ValueError:
+            raise ValidationError({'ids': '상품 ID는 쉼표로 구분한 정수여야 합니다.'})
+        if product_id not in ids:
+            ids.append(product_id)
+    if not ids:
+        raise ValidationError({'ids': '상품 ID를 하나 이상 지정해야 합니다.'})
+    if len(ids) > MAX_MULTI_GET_IDS:
+        raise ValidationError({'ids': f'상품 ID는 최대 {MAX_MULTI_GET_IDS}개까지 지정할 수 있습니다.'})
+    return ids
+
+
+def product_queryset(params, action=None):
+    """
+    상품 목록/상세 QuerySet
+    ?category=electronics&min_price=100&max_price=1000&q=laptop&ordering=-price
+    ?ids=3,1,2 (다건 조회)
+    """
+    queryset = Product.objects.all()
+
+    # 다건 조회 (?ids=) - 검증자도 지정한 상품 집합으로 계산된다
+    if 'ids' in params:
+        queryset = queryset.filter(id__in=product_ids_param(params))
+
+    # 필터링
+    category = params.get('category')
+    if category:
+        queryset = queryset.filter(category=category)
+
+    min_price = params.get('min_price')
+    if min_price:
+        queryset = queryset.filter(price__gte=min_price)
+
+    max_price = params.get('max_price')
+    if max_price:
+        queryset = queryset.filter(price__lte=max_price)
+
+    # 검색 (search_vector GIN 인덱스)
+    q = params.get('q')
+    if q:
+        queryset = queryset.filter(search_vector=product_search_query(q))
+
+    # 정렬
+    ordering = params.get('ordering', '-created_at')
+    queryset = queryset.order_by(ordering)
+
+    # 상세 조회의 리뷰 통계는 Product 집계 컬럼(review_count, rating_*)을 그대로 사용
+    return queryset
+
+
+def search_queryset(params):
+    """
+    상품 검색 QuerySet
+    ?q=laptop&category=electronics&min_price=500&in_stock=true
+    q가 있으면 전문 검색(search_vector @@ tsquery) 후 랭킹 순 정렬
+    """
+    queryset = Product.objects.all()
+
+    q = params.get('q', '')
+    if q:
+        query = product_search_query(q)
+        queryset = queryset.filter(search_vector=query).annotate(
+            rank=SearchRank(F('search_vector'), query)
+        ).order_by('-rank', 'id')
+    else:
+        # 검색어가 없으면 랭킹 null (values() 기반 직렬화에서도 같은 컬럼 사용)
+        queryset = queryset.annotate(rank=Value(None, output_field=FloatField()))
+
+    category = params.get('category')
+    if category:
+        queryset = queryset.filter(category=category)
+
+    min_price = params.get('min_price')
+    if min_price:
+        queryset = queryset.filter(price__gte=min_price)
+
+    max_price = params.get('max_price')
+    if max_price:
+        queryset = queryset.filter(price__lte=max_price)
+
+    in_stock = params.get('in_stock')
+    if in_stock == 'true':
+        queryset = queryset.filter(stock__gt=0)
+
+    return queryset
+
+
+def review_queryset(params, action=None):
+    """
+    리뷰 목록/상세 QuerySet
+    ?product_id=1&user_id=42
+    """
+    queryset = Review.objects.all()
+
+    # 상품별 필터
+    product_id = params.get('product_id')
+    if product_id:
+        queryset = queryset.filter(product_id=product_id)
+
+    # 사용자별 필터
+    user_id = params.get('user_id')
+    if user_id:
+        queryset = queryset.filter(user_id=user_id)
+
+    # 최적화: 목록 조회 시 기본적으로 select_related 적용 (N+1 방지)
+    if action == 'list':
+        queryset = queryset.select_related('product').defer('product__search_vector')
+
+    return queryset
+
+
+def _date_param(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: '날짜는 YYYY-MM-DD 형식이어야 합니다.'})
+    return parsed
+
+
+def top_products_queryset(params):
+    """
+    상품별 판매 통계 - 일별 판매 롤업을 기간/카테고리로 합산 (GROUP BY, JOIN)
+    ?limit=10&from=2024-01-01&to=2024-01-31&category=electronics (from/to는 UTC 일자, 포함)
+    """
+    limit = int(params.get('limit', 10))
+    queryset = ProductDailySales.objects.all()
+
+    date_from = _date_param(params, 'from')
+    if date_from:
+        queryset = queryset.filter(day__gte=date_from)
+
+    date_to = _date_param(params, 'to')
+    if date_to:
+        queryset = queryset.filter(day__lte=date_to)
+
+    category = params.get('category')
+    if category:
+        queryset = queryset.filter(product__category=category)
+
+    return queryset.values(
+        'product_id',
+        'product__name'
+    ).annotate(
+        total_quantity=Sum('quantity'),
+        total_revenue=Sum('revenue'),
+        order_count=Sum('order_count')
+    ).order_by('-total_revenue')[:limit]
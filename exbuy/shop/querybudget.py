@@ -0,0 +1,300 @@
+"""
+엔드포인트별 쿼리 예산 (QueryBudgetMiddleware) 과 N+1 감지
+
+요청마다 실행된 SQL 수와 SQL 형태(리터럴/파라미터/IN 목록을 지운 fingerprint)별 반복 횟수를 센다.
+예산은 shop/urls.py의 라우트 옆에서 URL 이름별로 선언한다 (declare_query_budgets).
+
+- 쿼리 수가 예산(queries)을 넘으면 'queries' 위반
+- 같은 형태의 SQL이 repeats번을 넘게 반복되면 'n_plus_one' 위반 (반복문 안의 지연 로딩 - 예: OrderItem.product)
+- 예산이 선언되지 않은 URL 이름은 세기만 하고 검사하지 않는다
+
+settings.QUERY_BUDGET_MODE
+- raise: 모든 요청을 검사하고 위반 시 QueryBudgetExceeded (개발/테스트 기본 - DEBUG=True)
+- sample: QUERY_BUDGET_SAMPLE_RATE 비율의 요청만 검사하고 위반은 경고 로그 + Prometheus 카운터 (운영 기본)
+- off: 검사하지 않음
+
+테스트/셸에서는 track_queries() / assert_query_budget()으로 요청 밖의 코드도 같은 규칙으로 검사할 수 있다.
+shop/tests/test_querybudget.py는 라우트가 받는 모든 메서드를 raise 모드로 실행해 선언된 예산이 실제 쓰기 경로와 맞는지 확인한다.
+"""
+import logging
+import random
+import re
+import time
+from collections import Counter as ShapeCounter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.urls import get_resolver
+from django_prometheus.conf import NAMESPACE
+from prometheus_client import Counter, Histogram
+
+
+logger = logging.getLogger(__name__)
+
+# 같은 형태의 SQL이 이보다 많이 반복되면 N+1로 본다 (QueryBudget(repeats=...)로 엔드포인트별 조정)
+DEFAULT_REPEATS = 3
+
+
+# =============== Prometheus 메트릭 (/metrics) ===============
+budget_checked = Counter(
+    'django_query_budget_checked_requests_total', '쿼리 예산을 검사한 요청 수', ['view'], namespace=NAMESPACE
+)
+budget_violations = Counter(
+    'django_query_budget_violations_total', '쿼리 예산 위반 수 (kind: queries / n_plus_one)', ['view', 'kind'],
+    namespace=NAMESPACE,
+)
+queries_per_request = Histogram(
+    'django_query_budget_queries_per_request', '검사한 요청의 SQL 실행 수', ['view'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100, 250),
+    namespace=NAMESPACE,
+)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    raise 모드/assert_query_budget의 예산 위반 (테스트에서는 실패로 보고된다)
+    """
+
+
+# =============== SQL fingerprint ===============
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%s")
+# 괄호 안의 값 목록 - 원소 1개 이상, 형 변환(?::bigint) 포함: IN (?), IN (?, ?), VALUES (?::bigint, ?::integer)
+_VALUE = r'\?(?:\s*::\s*\w+(?:\[\])?)?'
+_VALUE_LISTS = re.compile(rf'\(\s*{_VALUE}(?:\s*,\s*{_VALUE})*\s*\)')
+_ROW_LISTS = re.compile(r'\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+')
+_SPACES = re.compile(r'\s+')
+_SELECT_LIST = re.compile(r'^SELECT (?:DISTINCT )?.+? FROM ', re.S)
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql):
+    """
+    SQL 형태 - 리터럴/파라미터는 ?, 괄호 안의 값 목록(IN, VALUES 행)과 행 목록은 길이와 무관하게 (...)
+    """
+    shape = _LITERALS.sub('?', sql)
+    shape = _VALUE_LISTS.sub('(...)', shape)
+    shape = _ROW_LISTS.sub('(...)', shape)
+    return _SPACES.sub(' ', shape).strip()
+
+
+def _summary(shape, limit=300):
+    # 로그/예외 메시지용 - 컬럼 목록을 줄여 FROM/WHERE가 보이게
+    return _SELECT_LIST.sub('SELECT … FROM ', shape)[:limit]
+
+
+# =============== 요청별 쿼리 기록 ===============
+class QueryLog:
+    """
+    queries: 실행 수 (executemany는 1회), duration: DB 실행 시간 합 (초), shapes: fingerprint별 실행 수
+    rows: 반환/변경된 행 수 합 (cursor.rowcount, 서버 측 커서는 0)
+    중첩된 track_queries()는 바깥 기록(parent)에도 함께 남긴다
+    """
+
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.queries = 0
+        self.rows = 0
+        self.duration = 0.0
+        self.shapes = ShapeCounter()
+
+    def record(self, sql, duration, rows=0):
+        shape = fingerprint(sql)
+        log = self
+        while log is not None:
+            log.queries += 1
+            log.rows += rows
+            log.duration += duration
+            log.shapes[shape] += 1
+            log = log.parent
+
+    def repeated(self, limit):
+        """
+        limit번을 넘게 반복된 (fingerprint, 횟수) - 많은 순
+        """
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > limit]
+
+
+_query_log = ContextVar('query_log', default=None)
+
+# 중첩 atomic의 트랜잭션 제어문 - BEGIN/COMMIT처럼 쿼리로 세지 않는다
+_TRANSACTION_CONTROL = ('SAVEPOINT ', 'RELEASE SAVEPOINT ', 'ROLLBACK TO SAVEPOINT ')
+
+
+def _execute_wrapper(execute, sql, params, many, context):
+    log = _query_log.get()
+    if log is None or sql.startswith(_TRANSACTION_CONTROL):
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        log.record(sql, time.perf_counter() - started, max(context['cursor'].rowcount, 0))
+
+
+@receiver(connection_created)
+def _install_wrapper(sender, connection, **kwargs):
+    # 연결(DB 별칭 × 스레드)마다 한 번 - 기록 중이 아닐 때는 ContextVar 조회 1회만 추가된다
+    if _execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_execute_wrapper)
+
+
+@contextmanager
+def track_queries():
+    """
+    블록 안에서 실행된 SQL을 기록 (모든 DB 별칭, sync_to_async 스레드 포함)
+        with track_queries() as log:
+            ...
+        log.queries, log.shapes
+    """
+    log = QueryLog(_query_log.get())
+    token = _query_log.set(log)
+    try:
+        yield log
+    finally:
+        _query_log.reset(token)
+
+
+@contextmanager
+def untracked():
+    """
+    블록 안의 SQL은 현재 기록(요청 예산)에 세지 않는다
+    여러 요청 몫의 SQL을 한 요청이 대신 실행할 때 (재고 예약 그룹 커밋의 리더) - 리더 요청에만 몰리지 않도록
+    """
+    token = _query_log.set(None)
+    try:
+        yield
+    finally:
+        _query_log.reset(token)
+
+
+# =============== 예산 ===============
+class QueryBudget:
+    """
+    queries: 요청당 최대 SQL 수 (None이면 제한 없음 - 데이터 크기에 비례하는 적재 엔드포인트)
+    repeats: 같은 형태의 SQL 최대 반복 수 (None이면 N+1 검사 안 함)
+    """
+
+    def __init__(self, queries, repeats=DEFAULT_REPEATS):
+        self.queries = queries
+        self.repeats = repeats
+
+    def violations(self, log):
+        """
+        반환: [(kind, 설명), ...]
+        """
+        found = []
+        if self.queries is not None and log.queries > self.queries:
+            found.append(('queries', f'SQL {log.queries}회 실행 (예산 {self.queries}회)'))
+        if self.repeats is not None:
+            for shape, count in log.repeated(self.repeats):
+                found.append(('n_plus_one', f'같은 SQL {count}회 반복 (허용 {self.repeats}회): {_summary(shape)}'))
+        return found
+
+    def __repr__(self):
+        return f'QueryBudget(queries={self.queries}, repeats={self.repeats})'
+
+
+_budgets = {}
+
+
+def declare_query_budgets(budgets):
+    """
+    budgets: {URL 이름: QueryBudget 또는 {HTTP 메서드: QueryBudget}} - shop/urls.py에서 선언
+    라우터 URL은 메서드마다 같은 이름을 쓰므로 (GET/POST /orders → order-list) 메서드별로 나눌 수 있다
+    """
+    _budgets.update(budgets)
+
+
+def budget_for(url_name, method='GET'):
+    if not _budgets:
+        # 요청 없이 호출된 경우 (테스트 헬퍼) - URLconf를 불러와 선언을 등록
+        get_resolver().url_patterns
+    budget = _budgets.get(url_name)
+    if isinstance(budget, dict):
+        budget = budget.get(method)
+    return budget
+
+
+@contextmanager
+def assert_query_budget(url_name, method='GET'):
+    """
+    테스트 헬퍼 - 블록 안의 SQL이 URL 이름의 예산을 넘으면 QueryBudgetExceeded
+        with assert_query_budget('order-detail'):
+            OrderDetailSerializer(order).data
+    """
+    budget = budget_for(url_name, method)
+    if budget is None:
+        raise LookupError(f'{method} {url_name}: shop/urls.py에 선언된 쿼리 예산이 없습니다')
+    with track_queries() as log:
+        yield log
+    problems = budget.violations(log)
+    if problems:
+        raise QueryBudgetExceeded(f'{method} {url_name}: ' + ' / '.join(message for _, message in problems))
+
+
+# =============== 미들웨어 ===============
+class QueryBudgetMiddleware:
+    """
+    view(URL 이름) 라벨 - 해석되지 않은 요청(404)은 검사하지 않는다
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.mode = settings.QUERY_BUDGET_MODE
+        self.sample_rate = settings.QUERY_BUDGET_SAMPLE_RATE
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _tracked(self):
+        if self.mode == 'raise':
+            return True
+        return self.mode == 'sample' and random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._tracked():
+            return self.get_response(request)
+        with track_queries() as log:
+            response = self.get_response(request)
+        self._check(request, log)
+        return response
+
+    async def __acall__(self, request):
+        if not self._tracked():
+            return await self.get_response(request)
+        with track_queries() as log:
+            response = await self.get_response(request)
+        self._check(request, log)
+        return response
+
+    def _check(self, request, log):
+        match = request.resolver_match
+        if match is None or not match.url_name:
+            return
+        view = match.url_name
+        budget_checked.labels(view=view).inc()
+        queries_per_request.labels(view=view).observe(log.queries)
+
+        budget = budget_for(view, request.method)
+        if budget is None:
+            return
+        problems = budget.violations(log)
+        if not problems:
+            return
+        for kind in {kind for kind, _ in problems}:
+            budget_violations.labels(view=view, kind=kind).inc()
+
+        message = f'{request.method} {request.path} ({view}) 쿼리 예산 위반: ' + ' / '.join(
+            message for _, message in problems
+        )
+        if self.mode == 'raise':
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
@@ -0,0 +1,367 @@
+"""
+SQL fingerprint별 실행 통계 (QueryStatsMiddleware) - view(URL 이름) × 부하 시나리오 단위의 pg_stat_statements
+
+요청 안에서 실행된 SQL을 fingerprint(shop/querybudget.py - 리터럴/파라미터 제거, IN 목록 축약)별로
+호출 수, 총 시간, 최대 시간, 행 수로 모은다. 요청 중에는 요청 전용 dict에만 더하고,
+요청이 끝날 때 view/시나리오 키로 프로세스 집계에 한 번 합친다 (잠금 1회).
+
+- 시나리오: X-Load-Scenario 헤더 또는 User-Agent의 scenario=... (k6 스크립트 userAgent, shop.loadgen) - 없으면 '-'
+- 플러시: QUERY_STATS_FLUSH_INTERVAL초마다 백그라운드 스레드가 구간 집계를
+  QUERY_STATS_DIR/stats-{pid}.jsonl에 추가하고 Prometheus 카운터를 올린다 (query_id = fingerprint 해시 12자리)
+- 느린 쿼리: QUERY_STATS_SLOW_MS 이상인 읽기 전용 SELECT는 fingerprint당 QUERY_STATS_EXPLAIN_INTERVAL초에 한 번
+  EXPLAIN (ANALYZE, BUFFERS)를 백그라운드 스레드에서 같은 DB 별칭으로 다시 실행해
+  QUERY_STATS_DIR/explain-{pid}.jsonl에 쓴다. 큐(QUERY_STATS_EXPLAIN_QUEUE)가 차면 버린다.
+  롤백되는 트랜잭션 + statement_timeout 안에서 실행하고, 행 잠금(FOR UPDATE/SHARE)이나 롤백으로 되돌려지지 않는
+  함수 호출(nextval/setval, pg_advisory_* 등)이 있는 SELECT는 제외한다 (explainable).
+  gevent 워커에서는 psycopg2 호출이 그린렛을 양보하지 않으므로 EXPLAIN 시간만큼 워커가 멈춘다.
+
+여러 워커의 파일은 manage.py querystats top / explain으로 합쳐 본다.
+"""
+import atexit
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django_prometheus.conf import NAMESPACE
+from prometheus_client import Counter, Gauge
+
+from .querybudget import fingerprint
+from .timing import UNRESOLVED_VIEW
+
+
+logger = logging.getLogger(__name__)
+
+SCENARIO_HEADER = 'HTTP_X_LOAD_SCENARIO'
+NO_SCENARIO = '-'
+_SCENARIO = re.compile(r'[\w.-]{1,40}')
+_USER_AGENT_SCENARIO = re.compile(r'scenario=([\w.-]{1,40})')
+
+STATS_PREFIX = 'stats-'
+EXPLAIN_PREFIX = 'explain-'
+
+# 중첩 atomic의 트랜잭션 제어문은 세지 않는다 (shop/querybudget.py와 같은 기준)
+_TRANSACTION_CONTROL = ('SAVEPOINT ', 'RELEASE SAVEPOINT ', 'ROLLBACK TO SAVEPOINT ')
+# EXPLAIN ANALYZE는 문장을 실제로 실행한다 - 롤백돼도 되돌려지지 않는 부수 효과가 있는 SELECT는 다시 실행하지 않는다
+# 행 잠금, 시퀀스(nextval - ingest.py ORDER_IDS_SQL, setval), advisory 잠금, NOTIFY/대기, 설정 변경, SELECT INTO
+_ROW_LOCKS = re.compile(r'\bFOR (?:NO KEY )?(?:UPDATE|SHARE)\b')
+_SIDE_EFFECTS = re.compile(
+    r'\b(?:nextval|setval|currval|lastval|pg_(?:try_)?advisory_\w+|pg_notify|pg_sleep\w*|set_config'
+    r'|pg_cancel_backend|pg_terminate_backend|pg_reload_conf|lo_\w+|dblink\w*)\s*\(|\bINTO\b',
+    re.I,
+)
+
+
+# =============== Prometheus 메트릭 (/metrics) ===============
+query_calls = Counter(
+    'django_query_stats_calls_total', 'fingerprint별 SQL 실행 수', ['view', 'scenario', 'query_id'],
+    namespace=NAMESPACE,
+)
+query_seconds = Counter(
+    'django_query_stats_seconds_total', 'fingerprint별 SQL 실행 시간 합', ['view', 'scenario', 'query_id'],
+    namespace=NAMESPACE,
+)
+query_rows = Counter(
+    'django_query_stats_rows_total', 'fingerprint별 반환/변경 행 수 합', ['view', 'scenario', 'query_id'],
+    namespace=NAMESPACE,
+)
+query_max_seconds = Gauge(
+    'django_query_stats_max_seconds', '마지막 플러시 구간의 fingerprint별 최대 실행 시간',
+    ['view', 'scenario', 'query_id'],
+    namespace=NAMESPACE,
+)
+explain_samples = Counter(
+    'django_query_stats_explain_total', '느린 쿼리 EXPLAIN 샘플 (result: saved / dropped / failed)', ['result'],
+    namespace=NAMESPACE,
+)
+
+
+def query_id(shape):
+    return hashlib.sha1(shape.encode()).hexdigest()[:12]
+
+
+def scenario_of(request):
+    value = request.META.get(SCENARIO_HEADER)
+    if value is not None:
+        return value if _SCENARIO.fullmatch(value) else NO_SCENARIO
+    match = _USER_AGENT_SCENARIO.search(request.META.get('HTTP_USER_AGENT', ''))
+    return match.group(1) if match else NO_SCENARIO
+
+
+def explainable(shape):
+    """
+    EXPLAIN ANALYZE로 다시 실행해도 되는 SQL인지 - 행 잠금/부수 효과 함수가 없는 SELECT
+    """
+    return shape.startswith('SELECT ') and not _ROW_LOCKS.search(shape) and not _SIDE_EFFECTS.search(shape)
+
+
+# =============== 요청별 기록 ===============
+class RequestStats:
+    """
+    shapes: {fingerprint: [호출 수, 총 시간(초), 최대 시간(초), 행 수]}
+    slow: {fingerprint: (가장 느린 실행 시간, sql, params, DB 별칭)} - QUERY_STATS_SLOW_MS 이상이고 explainable인 SELECT만
+    """
+    __slots__ = ('shapes', 'slow', 'slow_threshold')
+
+    def __init__(self, slow_threshold):
+        self.shapes = {}
+        self.slow = {}
+        self.slow_threshold = slow_threshold
+
+    def record(self, sql, params, many, alias, duration, rows):
+        shape = fingerprint(sql)
+        entry = self.shapes.get(shape)
+        if entry is None:
+            self.shapes[shape] = [1, duration, duration, rows]
+        else:
+            entry[0] += 1
+            entry[1] += duration
+            if duration > entry[2]:
+                entry[2] = duration
+            entry[3] += rows
+        if duration >= self.slow_threshold and not many and explainable(shape):
+            previous = self.slow.get(shape)
+            if previous is None or duration > previous[0]:
+                self.slow[shape] = (duration, sql, params, alias)
+
+
+_request_stats = ContextVar('query_stats', default=None)
+
+
+def _execute_wrapper(execute, sql, params, many, context):
+    stats = _request_stats.get()
+    if stats is None or sql.startswith(_TRANSACTION_CONTROL):
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.record(
+            sql, params, many, context['connection'].alias,
+            time.perf_counter() - started, max(context['cursor'].rowcount, 0),
+        )
+
+
+@receiver(connection_created)
+def _install_wrapper(sender, connection, **kwargs):
+    if _execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_execute_wrapper)
+
+
+# =============== 프로세스 집계와 플러시 ===============
+_lock = threading.Lock()
+_totals = {}
+_explained = {}
+_explain_queue = None
+_worker_pid = None
+
+
+def _start_workers():
+    # fork(gunicorn 워커) 후 첫 요청에서 프로세스마다 한 번 - 부모의 스레드는 자식에 없다
+    global _worker_pid, _explain_queue
+    _worker_pid = os.getpid()
+    _totals.clear()
+    _explained.clear()
+    _explain_queue = queue.Queue(maxsize=settings.QUERY_STATS_EXPLAIN_QUEUE)
+    threading.Thread(target=_flusher, name='querystats-flush', daemon=True).start()
+    if settings.QUERY_STATS_EXPLAIN:
+        threading.Thread(target=_explainer, name='querystats-explain', daemon=True).start()
+
+
+def merge(view, scenario, stats):
+    if _worker_pid != os.getpid():
+        with _lock:
+            if _worker_pid != os.getpid():
+                _start_workers()
+    with _lock:
+        for shape, (calls, total, maximum, rows) in stats.shapes.items():
+            key = (view, scenario, shape)
+            entry = _totals.get(key)
+            if entry is None:
+                _totals[key] = [calls, total, maximum, rows]
+            else:
+                entry[0] += calls
+                entry[1] += total
+                if maximum > entry[2]:
+                    entry[2] = maximum
+                entry[3] += rows
+    if stats.slow and _explain_queue is not None and settings.QUERY_STATS_EXPLAIN:
+        _queue_explains(view, scenario, stats.slow)
+
+
+def _file(prefix):
+    directory = settings.QUERY_STATS_DIR
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f'{prefix}{os.getpid()}.jsonl')
+
+
+def flush():
+    """
+    마지막 플러시 이후의 집계를 파일과 Prometheus로 내보낸다
+    """
+    global _totals
+    with _lock:
+        totals, _totals = _totals, {}
+    if not totals:
+        return
+    stamp = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    lines = []
+    for (view, scenario, shape), (calls, total, maximum, rows) in totals.items():
+        identifier = query_id(shape)
+        labels = {'view': view, 'scenario': scenario, 'query_id': identifier}
+        query_calls.labels(**labels).inc(calls)
+        query_seconds.labels(**labels).inc(total)
+        query_rows.labels(**labels).inc(rows)
+        query_max_seconds.labels(**labels).set(maximum)
+        lines.append(json.dumps({
+            'timestamp': stamp,
+            'server': settings.PROFILER_TAG,
+            'pid': os.getpid(),
+            'view': view,
+            'scenario': scenario,
+            'query_id': identifier,
+            'calls': calls,
+            'total_ms': round(total * 1000, 3),
+            'max_ms': round(maximum * 1000, 3),
+            'rows': rows,
+            'fingerprint': shape,
+        }, ensure_ascii=False))
+    with open(_file(STATS_PREFIX), 'a') as file:
+        file.write('\n'.join(lines) + '\n')
+
+
+def _flusher():
+    interval = settings.QUERY_STATS_FLUSH_INTERVAL
+    while True:
+        time.sleep(interval)
+        try:
+            flush()
+        except Exception:
+            logger.exception('쿼리 통계 플러시 실패')
+
+
+def _flush_at_exit():
+    if _worker_pid == os.getpid():
+        flush()
+
+
+atexit.register(_flush_at_exit)
+
+
+# =============== 느린 쿼리 EXPLAIN ===============
+def _queue_explains(view, scenario, slow):
+    now = time.monotonic()
+    interval = settings.QUERY_STATS_EXPLAIN_INTERVAL
+    for shape, (duration, sql, params, alias) in slow.items():
+        if connections[alias].vendor != 'postgresql':
+            continue
+        with _lock:
+            if now - _explained.get(shape, -interval) < interval:
+                continue
+            _explained[shape] = now
+        try:
+            _explain_queue.put_nowait((view, scenario, shape, duration, sql, params, alias))
+        except queue.Full:
+            explain_samples.labels(result='dropped').inc()
+            with _lock:
+                _explained.pop(shape, None)
+
+
+def explain(sql, params, alias, timeout_ms):
+    """
+    반환: EXPLAIN (ANALYZE, BUFFERS) 결과 줄 목록 - 롤백되는 트랜잭션 안에서 실행
+    """
+    with transaction.atomic(using=alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute(f'SET LOCAL statement_timeout = {int(timeout_ms)}')
+            cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS) {sql}', params)
+            plan = [row[0] for row in cursor.fetchall()]
+        transaction.set_rollback(True, using=alias)
+    return plan
+
+
+def _explainer():
+    while True:
+        view, scenario, shape, duration, sql, params, alias = _explain_queue.get()
+        try:
+            plan = explain(sql, params, alias, settings.QUERY_STATS_EXPLAIN_TIMEOUT_MS)
+        except Exception as error:
+            explain_samples.labels(result='failed').inc()
+            logger.warning('EXPLAIN 실패 (%s, %s): %s', view, query_id(shape), error)
+            continue
+        finally:
+            # 이 스레드의 연결은 풀/서버에 돌려준다 (요청 스레드와 별개)
+            connections.close_all()
+        explain_samples.labels(result='saved').inc()
+        with open(_file(EXPLAIN_PREFIX), 'a') as file:
+            file.write(json.dumps({
+                'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'server': settings.PROFILER_TAG,
+                'pid': os.getpid(),
+                'view': view,
+                'scenario': scenario,
+                'query_id': query_id(shape),
+                'alias': alias,
+                'duration_ms': round(duration * 1000, 3),
+                'fingerprint': shape,
+                'plan': plan,
+            }, ensure_ascii=False) + '\n')
+
+
+# =============== 미들웨어 ===============
+class QueryStatsMiddleware:
+    """
+    요청 동안 RequestStats를 ContextVar에 두고, 끝나면 view(URL 이름)/시나리오 키로 프로세스 집계에 합친다
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = settings.QUERY_STATS
+        self.slow_threshold = settings.QUERY_STATS_SLOW_MS / 1000
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+        stats = RequestStats(self.slow_threshold)
+        token = _request_stats.set(stats)
+        try:
+            return self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+            self._finish(request, stats)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+        stats = RequestStats(self.slow_threshold)
+        token = _request_stats.set(stats)
+        try:
+            return await self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+            self._finish(request, stats)
+
+    @staticmethod
+    def _finish(request, stats):
+        if not stats.shapes:
+            return
+        match = request.resolver_match
+        view = match.url_name if match is not None and match.url_name else UNRESOLVED_VIEW
+        merge(view, scenario_of(request), stats)
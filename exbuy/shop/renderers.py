@@ -0,0 +1,60 @@
+"""
+API 렌더러 (settings.REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'])
+
+- ORJSONRenderer: DRF JSONRenderer와 같은 출력 규칙(압축 구분자, 비ASCII 그대로, U+2028/2029 이스케이프,
+  Decimal → float, datetime → ISO 8601 + 'Z')을 orjson으로 인코딩
+- MessagePackRenderer: Accept: application/msgpack 요청용 바이너리 인코딩 (값 변환 규칙은 JSON과 동일)
+"""
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# datetime/Decimal/UUID/lazy 문자열 등 orjson·msgpack이 직접 처리하지 못하는 타입은 DRF 인코더 규칙을 그대로 사용
+_encoder = JSONEncoder()
+
+
+def encode_default(obj):
+    return _encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    orjson 기반 JSONRenderer
+    indent 요청(Accept: application/json; indent=4)이나 orjson이 표현할 수 없는 값(64비트 초과 정수 등)은
+    기존 JSONRenderer로 처리한다.
+    """
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context) is not None or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=encode_default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # JSONRenderer와 동일하게 U+2028/U+2029를 이스케이프 (JavaScript 호환)
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    application/msgpack 렌더러 (?format=msgpack 또는 Accept 협상)
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
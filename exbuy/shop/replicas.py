@@ -0,0 +1,225 @@
+"""
+읽기 복제본 라우팅 (settings.DB_REPLICAS가 있을 때만 활성화)
+
+요청 단위로 읽기 DB를 정한다 (ReplicaRoutingMiddleware → contextvar → ReplicaRouter).
+- 안전한 메서드(GET/HEAD/OPTIONS) 요청의 읽기 → 지연이 허용치 이내인 복제본 중 하나
+- 쓰기 메서드 요청, 트랜잭션(atomic) 안의 읽기, 요청 밖(관리 명령/셸) → primary
+- 요청 중 쓰기가 일어나면 그 요청의 이후 읽기는 primary로 고정
+- read-your-writes: 쓰기 요청 응답에 쿠키(REPLICA_STICKY_COOKIE)를 붙여
+  REPLICA_STICKY_SECONDS 동안 같은 클라이언트의 읽기를 primary로 보낸다
+
+복제본 지연은 프로세스마다 REPLICA_LAG_CHECK_INTERVAL 간격으로 복제본에 직접 조회하고,
+REPLICA_MAX_LAG_SECONDS를 넘거나 연결할 수 없는 복제본은 다음 검사까지 제외한다.
+모든 복제본이 제외되면 primary로 읽는다.
+
+응답 캐시(shop/cache.py)는 버전 증가 직후 지연된 복제본에서 읽은 응답을 새 버전으로 저장할 수 있다.
+이 경우에도 최대 RESPONSE_CACHE_TTL 동안만 남으며, 쓴 클라이언트 자신은 스티키 구간 동안 primary를 읽는다.
+"""
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django_prometheus.conf import NAMESPACE
+from prometheus_client import Counter, Gauge
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# 쿠키 값: primary 고정 만료 시각 (epoch 초)
+REPLICA_STICKY_COOKIE = 'exbuy_primary_until'
+
+# 복제본 재생 지연 (초) - primary를 가리키는 별칭(로컬 테스트)이면 0
+# 수신한 WAL을 모두 재생했다면 primary에 쓰기가 없어 replay timestamp가 오래됐을 뿐이므로 0
+LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+# =============== Prometheus 메트릭 (/metrics) ===============
+route_decisions = Counter(
+    'django_db_route_decisions_total', '요청별 읽기 DB 라우팅 결정 수', ['target', 'reason'], namespace=NAMESPACE
+)
+replica_lag = Gauge(
+    'django_db_replica_lag_seconds', '마지막 검사의 복제본 재생 지연 (초)', ['alias'], namespace=NAMESPACE
+)
+replica_available = Gauge(
+    'django_db_replica_available', '복제본 라우팅 대상 여부 (1: 사용, 0: 지연 초과/연결 실패로 제외)', ['alias'],
+    namespace=NAMESPACE,
+)
+replica_exclusions = Counter(
+    'django_db_replica_exclusions_total', '지연 검사에서 복제본이 제외된 횟수', ['alias', 'reason'], namespace=NAMESPACE
+)
+
+
+# =============== 복제본 지연 검사 ===============
+class ReplicaMonitor:
+    """
+    프로세스 단위 복제본 상태 캐시 - 검사 주기가 지나면 한 스레드만 검사하고 나머지는 직전 결과를 쓴다
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked_at = None
+        self.healthy = []
+
+    def _check(self, alias):
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute(LAG_SQL)
+                lag = float(cursor.fetchone()[0])
+        except DatabaseError:
+            replica_available.labels(alias=alias).set(0)
+            replica_exclusions.labels(alias=alias, reason='unavailable').inc()
+            return False
+
+        replica_lag.labels(alias=alias).set(lag)
+        if lag > settings.REPLICA_MAX_LAG_SECONDS:
+            replica_available.labels(alias=alias).set(0)
+            replica_exclusions.labels(alias=alias, reason='lagging').inc()
+            return False
+        replica_available.labels(alias=alias).set(1)
+        return True
+
+    def due(self):
+        return self._checked_at is None or time.monotonic() - self._checked_at >= settings.REPLICA_LAG_CHECK_INTERVAL
+
+    def refresh(self):
+        """
+        검사 주기가 지났으면 모든 복제본 지연을 조회해 healthy(지연 허용치 이내 별칭 목록) 갱신
+        """
+        if not self.due() or not self._lock.acquire(blocking=False):
+            return
+        try:
+            self.healthy = [alias for alias in settings.REPLICA_DATABASES if self._check(alias)]
+            self._checked_at = time.monotonic()
+        finally:
+            self._lock.release()
+
+
+monitor = ReplicaMonitor()
+
+
+# =============== 요청별 라우팅 상태 ===============
+class Route:
+    """
+    alias: 읽기 DB (None이면 primary), reason: 메트릭 라벨
+    async 뷰의 sync_to_async 스레드에도 같은 객체가 전달되므로 쓰기 고정(pin)이 요청 전체에 반영된다
+    """
+
+    def __init__(self, alias, reason):
+        self.alias = alias
+        self.reason = reason
+        self.wrote = False
+
+    def pin(self):
+        self.wrote = True
+        if self.alias is not None:
+            self.alias, self.reason = None, 'write_in_request'
+
+
+_route = ContextVar('db_route', default=None)
+
+
+def _sticky(request):
+    try:
+        return float(request.COOKIES.get(REPLICA_STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def decide(request):
+    """
+    monitor.refresh()는 호출 측에서 (async 미들웨어는 스레드에서) 먼저 실행
+    """
+    if request.method not in SAFE_METHODS:
+        return Route(None, 'write_method')
+    if _sticky(request):
+        return Route(None, 'read_your_writes')
+    aliases = monitor.healthy
+    if not aliases:
+        return Route(None, 'no_healthy_replica')
+    return Route(random.choice(aliases), 'replica')
+
+
+class ReplicaRouter:
+    """
+    settings.DATABASE_ROUTERS - 쓰기/마이그레이션은 항상 primary
+    """
+
+    def db_for_read(self, model, **hints):
+        route = _route.get()
+        if route is None or route.alias is None:
+            return DEFAULT_DB_ALIAS
+        # 트랜잭션 안의 읽기는 같은 트랜잭션의 쓰기/락을 봐야 한다
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return route.alias
+
+    def db_for_write(self, model, **hints):
+        route = _route.get()
+        if route is not None:
+            route.pin()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # 복제본은 primary와 같은 데이터
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+# =============== 미들웨어 ===============
+class ReplicaRoutingMiddleware:
+    """
+    요청마다 Route를 정하고, 쓰기가 있었던 요청 응답에 read-your-writes 쿠키를 붙인다
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        monitor.refresh()
+        route = decide(request)
+        token = _route.set(route)
+        try:
+            response = self.get_response(request)
+        finally:
+            _route.reset(token)
+        return self._finish(request, route, response)
+
+    async def __acall__(self, request):
+        if monitor.due():
+            await sync_to_async(monitor.refresh)()
+        route = decide(request)
+        token = _route.set(route)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _route.reset(token)
+        return self._finish(request, route, response)
+
+    @staticmethod
+    def _finish(request, route, response):
+        route_decisions.labels(target='primary' if route.alias is None else 'replica', reason=route.reason).inc()
+        # ORM을 거치지 않은 쓰기(raw cursor)도 있으므로 쓰기 메서드 요청은 모두 스티키 대상
+        if route.wrote or request.method not in SAFE_METHODS:
+            window = settings.REPLICA_STICKY_SECONDS
+            response.set_cookie(
+                REPLICA_STICKY_COOKIE, f'{time.time() + window:.3f}', max_age=window, httponly=True, samesite='Lax'
+            )
+        return response
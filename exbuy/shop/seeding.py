@@ -0,0 +1,531 @@
+"""
+고속 데이터 시딩 (seed_data --fast / --scale-factor)과 데이터셋 스냅샷
+
+- 행 생성(Faker)은 multiprocessing 풀에서 청크 단위로 병렬 실행하고,
+  각 청크는 COPY 텍스트 형식 문자열로 만들어 부모 프로세스가 COPY FROM STDIN으로 흘려 넣는다.
+  본문(description/body)은 청크마다 TEXT_POOL_SIZE개를 만들어 돌려 쓴다.
+- 풀은 fork로 띄우고(워커가 설정된 Django를 그대로 사용) 트랜잭션을 열기 전에 만든다.
+  주문 워커에는 상품 가격이 필요하므로 상품은 트랜잭션 전에 임시 파일로 생성해 두고 트랜잭션 안에서 COPY한다.
+- 상품/주문 id는 1부터 클라이언트에서 부여한다 (TRUNCATE ... RESTART IDENTITY 후).
+  주문 아이템은 주문 id를 바로 참조하므로 조회가 필요 없고, 적재 후 시퀀스를 최대 id로 맞춘다.
+- TRUNCATE와 같은 트랜잭션에서 COPY ... (FREEZE)로 적재해 이후 VACUUM(가시성 정보 갱신)이 필요 없다.
+- drop_indexes=True면 보조 인덱스(PK/제약 조건 인덱스 제외)를 지우고 적재 후 다시 만든다.
+  모두 한 트랜잭션이라 중간에 실패해도 인덱스와 기존 데이터가 그대로 남는다.
+
+재현성: 청크마다 시드를 마스터 난수열에서 미리 뽑으므로 같은 시드/규모면 워커 수와 무관하게
+같은 데이터가 나온다. 생성 분포는 DatasetProfile (균등 / 치우친 분포)로 정한다.
+
+스냅샷: 시딩 결과를 같은 DB의 SNAPSHOT_SCHEMA 스키마에 테이블째 복사해 두고,
+restore_snapshot()이 TRUNCATE 후 INSERT ... SELECT로 되돌린다 (재시딩보다 수십 배 빠름).
+"""
+import bisect
+import io
+import json
+import multiprocessing
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from itertools import accumulate
+
+from django.db import connection, transaction
+from django.db.transaction import TransactionManagementError
+from django.utils import timezone
+from faker import Faker
+
+from .models import Product
+
+
+# 시딩 대상 - 적재/복원 순서 (FK 참조 순)
+SEED_TABLES = ['shop_product', 'shop_order', 'shop_orderitem', 'shop_review', 'shop_productdailysales']
+
+# 청크당 행 수 (워커 1회 작업량 - 부모는 청크 하나씩 COPY로 흘려 넣는다)
+CHUNK_SIZE = 5000
+
+# 청크마다 미리 만들어 돌려 쓰는 본문(Faker text) 수 - text(200)이 행 생성 시간의 대부분을 차지
+TEXT_POOL_SIZE = 250
+
+ORDER_STATUSES = ['pending', 'processing', 'shipped', 'delivered']
+
+# --scale-factor 1 = 중규모 (make seed-medium)
+SCALE_FACTOR_ROWS = {'products': 10000, 'orders': 50000, 'reviews': 100000}
+
+SNAPSHOT_SCHEMA = 'seed_snapshot'
+
+PRODUCT_COLUMNS = [
+    'id', 'name', 'price', 'stock', 'category', 'description', 'updated_at', 'created_at',
+    'review_count', 'rating_sum',
+    'rating_1_count', 'rating_2_count', 'rating_3_count', 'rating_4_count', 'rating_5_count',
+]
+ORDER_COLUMNS = ['id', 'user_id', 'status', 'total_price', 'created_at', 'updated_at']
+ORDER_ITEM_COLUMNS = ['order_id', 'product_id', 'quantity', 'unit_price']
+REVIEW_COLUMNS = ['product_id', 'user_id', 'rating', 'body', 'created_at', 'updated_at']
+
+# 보조 인덱스 (PK, UNIQUE 등 제약 조건이 소유한 인덱스 제외)
+SECONDARY_INDEXES_SQL = """
+    SELECT i.indexname, i.indexdef
+    FROM pg_indexes AS i
+    WHERE i.schemaname = current_schema() AND i.tablename = ANY(%s)
+      AND NOT EXISTS (
+          SELECT 1 FROM pg_constraint AS c
+          WHERE c.conindid = (quote_ident(i.schemaname) || '.' || quote_ident(i.indexname))::regclass
+      )
+    ORDER BY i.tablename, i.indexname
+"""
+
+# 생성 컬럼(Product.search_vector 등)은 INSERT/복사 대상에서 제외
+COLUMNS_SQL = """
+    SELECT attname FROM pg_attribute
+    WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped AND attgenerated = ''
+    ORDER BY attnum
+"""
+
+
+# =============== 생성 분포 ===============
+class DatasetProfile:
+    """
+    데이터셋 생성 분포
+
+    zipf: 상품 인기도 Zipf 지수 (0이면 균등) - 주문 아이템/리뷰의 상품 선택에 적용.
+          인기 순위는 시드로 섞은 상품 id 순서라 id가 작은 상품이 인기 상품인 것은 아니다.
+    days: created_at을 end 이전 days일에 걸쳐 id 순으로 분산 (0이면 모두 end)
+    order_sizes/quantities/ratings: 주문당 상품 수 / 수량 / 별점 가중치 (1부터)
+    status_by_age: 주문 상태를 주문 시점에 따라 결정 (최근 주문일수록 pending)
+    """
+
+    def __init__(self, name, zipf=0.0, days=0, end=None, order_sizes=None, quantities=None, ratings=None,
+                 status_by_age=False):
+        self.name = name
+        self.zipf = zipf
+        self.days = days
+        self.end = end
+        self.order_sizes = order_sizes or [1] * 5
+        self.quantities = quantities or [1] * 10
+        self.ratings = ratings or [1] * 5
+        self.status_by_age = status_by_age
+
+    @classmethod
+    def uniform(cls):
+        """
+        기존 seed_data와 같은 분포 (상품/상태/별점 균등, created_at은 적재 시각)
+        """
+        return cls('uniform', end=timezone.now())
+
+    @classmethod
+    def skewed(cls, zipf=1.1, days=365, end=None):
+        """
+        운영 트래픽에 가까운 분포 - 소수 인기 상품에 주문/리뷰 집중, 소량 주문 위주, 별점 J자형
+        end를 고정하면 실행 날짜와 무관하게 같은 데이터가 나온다
+        """
+        return cls(
+            'skewed', zipf=zipf, days=days, end=end or datetime(2025, 1, 1, tzinfo=dt_timezone.utc),
+            order_sizes=[45, 25, 13, 8, 5, 2, 1, 1],
+            quantities=[70, 18, 6, 3, 2, 1],
+            ratings=[8, 4, 9, 25, 54],
+            status_by_age=True,
+        )
+
+    def describe(self):
+        return {
+            'profile': self.name, 'zipf': self.zipf, 'days': self.days,
+            'end': self.end.isoformat() if self.days else None,
+        }
+
+    def timestamp(self, index, count, rng, offset_days=0):
+        """
+        index번째(0부터) 행의 created_at - id 순으로 증가하도록 구간 안에서 흩뿌린다
+        """
+        if not self.days:
+            return self.end
+        position = (index + rng.random()) / max(count, 1)
+        return self.end - timedelta(days=offset_days + self.days * (1 - position))
+
+    def order_status(self, created_at, rng):
+        if not self.status_by_age:
+            return rng.choice(ORDER_STATUSES)
+        if rng.random() < 0.03:
+            return 'cancelled'
+        age = (self.end - created_at).total_seconds() / 86400
+        if age < 1:
+            return 'pending'
+        if age < 3:
+            return 'processing' if rng.random() < 0.7 else 'pending'
+        if age < 10:
+            return 'shipped' if rng.random() < 0.8 else 'processing'
+        return 'delivered'
+
+
+def scaled_counts(scale_factor):
+    """
+    --scale-factor → {'products', 'orders', 'reviews'}
+    """
+    return {name: max(1, round(rows * scale_factor)) for name, rows in SCALE_FACTOR_ROWS.items()}
+
+
+# =============== COPY 텍스트 형식 ===============
+_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def _text(value):
+    return value.translate(_ESCAPES)
+
+
+def _row(values):
+    return '\t'.join(map(str, values)) + '\n'
+
+
+# =============== 워커 (청크 생성) ===============
+# 워커 초기화 시 전달: 생성 분포, 상품 가격(id-1 순), 인기 순위 상품 id와 누적 가중치
+_profile = None
+_prices = None
+_ranked_ids = None
+_cumulative = None
+
+
+def _init_worker(profile, prices=None, ranked_ids=None):
+    global _profile, _prices, _ranked_ids, _cumulative
+    _profile = profile
+    _prices = prices
+    _ranked_ids = ranked_ids
+    _cumulative = None
+    if ranked_ids and profile.zipf:
+        _cumulative = list(accumulate(1 / rank ** profile.zipf for rank in range(1, len(ranked_ids) + 1)))
+
+
+def _pick_product(rng):
+    if _cumulative is None:
+        return rng.randint(1, len(_ranked_ids))
+    return _ranked_ids[bisect.bisect_left(_cumulative, rng.random() * _cumulative[-1])]
+
+
+def _weighted(weights, rng):
+    return rng.choices(range(1, len(weights) + 1), weights)[0]
+
+
+def _faker(seed):
+    fake = Faker()
+    fake.seed_instance(seed)
+    return fake
+
+
+def _text_pool(fake):
+    return [_text(fake.text(200)) for _ in range(TEXT_POOL_SIZE)]
+
+
+def _generate_products(task):
+    """
+    반환: (행 수, COPY 텍스트) - 상품 id start..end-1
+    """
+    start, end, seed, count = task
+    rng = random.Random(seed)
+    fake = _faker(seed)
+    categories = [value for value, _ in Product.CATEGORY_CHOICES]
+    texts = _text_pool(fake)
+    buffer = io.StringIO()
+    for product_id in range(start, end):
+        # 상품은 주문 기간 이전 구간에 분산
+        created_at = _profile.timestamp(product_id - 1, count, rng, offset_days=_profile.days).isoformat()
+        buffer.write(_row([
+            product_id,
+            _text(fake.catch_phrase()[:200]),
+            Decimal(str(rng.uniform(10, 1000))).quantize(Decimal('0.01')),
+            rng.randint(0, 1000),
+            rng.choice(categories),
+            rng.choice(texts),
+            created_at, created_at,
+            0, 0, 0, 0, 0, 0, 0,
+        ]))
+    return end - start, buffer.getvalue()
+
+
+def _generate_orders(task):
+    """
+    반환: (주문 수, 주문 COPY 텍스트, 아이템 수, 아이템 COPY 텍스트) - 주문 id start..end-1
+    """
+    start, end, seed, count, user_count = task
+    rng = random.Random(seed)
+    orders, items = io.StringIO(), io.StringIO()
+    item_count = 0
+    for order_id in range(start, end):
+        created_at = _profile.timestamp(order_id - 1, count, rng)
+        total_price = Decimal('0.00')
+        for _ in range(_weighted(_profile.order_sizes, rng)):
+            product_id = _pick_product(rng)
+            quantity = _weighted(_profile.quantities, rng)
+            unit_price = _prices[product_id - 1]
+            items.write(_row([order_id, product_id, quantity, unit_price]))
+            total_price += unit_price * quantity
+            item_count += 1
+        orders.write(_row([
+            order_id, rng.randint(1, user_count), _profile.order_status(created_at, rng), total_price,
+            created_at.isoformat(), created_at.isoformat(),
+        ]))
+    return end - start, orders.getvalue(), item_count, items.getvalue()
+
+
+def _generate_reviews(task):
+    """
+    반환: (행 수, COPY 텍스트)
+    """
+    start, end, seed, count, user_count = task
+    rng = random.Random(seed)
+    texts = _text_pool(_faker(seed))
+    buffer = io.StringIO()
+    for index in range(start, end):
+        created_at = _profile.timestamp(index - 1, count, rng).isoformat()
+        buffer.write(_row([
+            _pick_product(rng), rng.randint(1, user_count), _weighted(_profile.ratings, rng),
+            rng.choice(texts), created_at, created_at,
+        ]))
+    return end - start, buffer.getvalue()
+
+
+# =============== 적재 ===============
+def _copy(cursor, table, columns, text):
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FREEZE)",
+        io.StringIO(text),
+    )
+
+
+def _pool(workers, *initargs):
+    """
+    생성 프로세스 풀 - 열린 트랜잭션 없이 만든다
+    spawn이면 워커가 django.setup() 없이 shop.models를 임포트하다 실패하므로 fork를 명시 (Linux/macOS)
+    """
+    # 워커가 부모 DB 연결(소켓)을 물려받지 않도록 - 부모는 다음 쿼리에서 다시 연결
+    connection.close()
+    return multiprocessing.get_context('fork').Pool(workers, initializer=_init_worker, initargs=initargs)
+
+
+def _tasks(count, rng, *extra):
+    return [
+        (start, min(start + CHUNK_SIZE, count + 1), rng.randrange(2 ** 32), count, *extra)
+        for start in range(1, count + 1, CHUNK_SIZE)
+    ]
+
+
+def _truncate(cursor):
+    cursor.execute(f"TRUNCATE {', '.join(SEED_TABLES)} RESTART IDENTITY CASCADE")
+    # Django FK는 DEFERRABLE INITIALLY DEFERRED - 커밋까지 쌓이는 검사 이벤트가 있으면
+    # CREATE INDEX가 거부되므로 문장마다 바로 검사
+    cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+
+def _drop_secondary_indexes(cursor, log):
+    """
+    반환: 재생성용 [(이름, CREATE INDEX 문)]
+    """
+    cursor.execute(SECONDARY_INDEXES_SQL, [SEED_TABLES])
+    indexes = cursor.fetchall()
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX {connection.ops.quote_name(name)}')
+    log(f'  보조 인덱스 {len(indexes)}개 삭제')
+    return indexes
+
+
+def _create_indexes(cursor, indexes, log):
+    start = time.perf_counter()
+    for _, definition in indexes:
+        cursor.execute(definition)
+    seconds = time.perf_counter() - start
+    log(f'  보조 인덱스 {len(indexes)}개 재생성 ({seconds:.1f}s)')
+    return seconds
+
+
+def _reset_sequences(cursor, tables):
+    """
+    id 시퀀스가 테이블 최대 id 다음 값부터 이어지도록 맞춘다
+    """
+    for table in tables:
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+        )
+
+
+class TableStats:
+    """
+    테이블별 적재 행 수/소요 시간
+    """
+
+    def __init__(self):
+        self.rows = {}
+        self.seconds = {}
+
+    def add(self, table, rows, seconds):
+        self.rows[table] = self.rows.get(table, 0) + rows
+        self.seconds[table] = self.seconds.get(table, 0) + seconds
+
+    def rate(self, table):
+        return self.rows[table] / self.seconds[table] if self.seconds.get(table) else 0
+
+
+def _silent(message, ending='\n'):
+    pass
+
+
+def fast_seed(products, orders, reviews, workers=None, drop_indexes=False, users=10000, seed=None,
+              profile=None, log=_silent):
+    """
+    기존 데이터를 TRUNCATE하고 상품/주문/주문 아이템/리뷰를 COPY로 적재 (한 트랜잭션 - 트랜잭션 밖에서 호출)
+    profile: DatasetProfile (기본: 균등 분포), seed: 같은 값이면 같은 데이터 (None이면 매번 다름)
+    log: 진행 상황 출력 (BaseCommand.stdout.write와 같은 시그니처)
+    반환: (TableStats, 인덱스 재생성 초)
+    """
+    if connection.in_atomic_block:
+        # COPY FREEZE는 테이블을 TRUNCATE한 (서브트랜잭션이 아닌) 바로 그 트랜잭션에서만 가능하고,
+        # 열린 트랜잭션 중에 풀을 fork하면 워커가 그 연결을 물려받는다
+        raise TransactionManagementError('fast_seed는 트랜잭션(atomic) 밖에서 호출해야 합니다 (COPY FREEZE).')
+
+    profile = profile or DatasetProfile.uniform()
+    rng = random.Random(seed)
+    stats = TableStats()
+    index_seconds = 0.0
+
+    # 상품: 트랜잭션 전에 생성해 임시 파일에 모은다 (가격은 주문 워커 초기화에 필요)
+    prices = []
+    product_file = tempfile.TemporaryFile(mode='w+')
+    start = time.perf_counter()
+    with _pool(workers, profile) as pool:
+        for rows, text in pool.imap(_generate_products, _tasks(products, rng)):
+            product_file.write(text)
+            prices.extend(Decimal(line.split('\t')[2]) for line in text.splitlines())
+            log(f'  → 상품 {len(prices)}/{products}', ending='\r')
+        log('')
+    product_seconds = time.perf_counter() - start
+
+    # 주문 아이템 단가는 상품 가격 - 인기 순위와 함께 새 풀의 워커에 전달
+    ranked_ids = list(range(1, len(prices) + 1))
+    rng.shuffle(ranked_ids)
+
+    with product_file, _pool(workers, profile, prices, ranked_ids) as pool:
+        with transaction.atomic(), connection.cursor() as cursor:
+            _truncate(cursor)
+            indexes = _drop_secondary_indexes(cursor, log) if drop_indexes else []
+
+            start = time.perf_counter()
+            product_file.seek(0)
+            cursor.copy_expert(
+                f"COPY shop_product ({', '.join(PRODUCT_COLUMNS)}) FROM STDIN WITH (FREEZE)", product_file,
+            )
+            stats.add('shop_product', products, product_seconds + time.perf_counter() - start)
+
+            # 주문과 아이템은 같은 청크에서 함께 생성/적재 - 소요 시간을 같이 기록
+            start = time.perf_counter()
+            loaded = items = 0
+            for order_rows, order_text, item_rows, item_text in pool.imap(
+                _generate_orders, _tasks(orders if prices else 0, rng, users)
+            ):
+                _copy(cursor, 'shop_order', ORDER_COLUMNS, order_text)
+                _copy(cursor, 'shop_orderitem', ORDER_ITEM_COLUMNS, item_text)
+                loaded += order_rows
+                items += item_rows
+                log(f'  → 주문 {loaded}/{orders}', ending='\r')
+            elapsed = time.perf_counter() - start
+            stats.add('shop_order', loaded, elapsed)
+            stats.add('shop_orderitem', items, elapsed)
+            log('')
+
+            start = time.perf_counter()
+            loaded = 0
+            for rows, text in pool.imap(_generate_reviews, _tasks(reviews if prices else 0, rng, users)):
+                _copy(cursor, 'shop_review', REVIEW_COLUMNS, text)
+                loaded += rows
+                log(f'  → 리뷰 {loaded}/{reviews}', ending='\r')
+            stats.add('shop_review', loaded, time.perf_counter() - start)
+            log('')
+
+            # 클라이언트에서 부여한 id 이후부터 시퀀스가 이어지도록
+            _reset_sequences(cursor, ['shop_product', 'shop_order'])
+
+            if indexes:
+                index_seconds = _create_indexes(cursor, indexes, log)
+
+    return stats, index_seconds
+
+
+# =============== 스냅샷 ===============
+def _columns(cursor, table):
+    cursor.execute(COLUMNS_SQL, [table])
+    return ', '.join(connection.ops.quote_name(name) for name, in cursor.fetchall())
+
+
+def row_counts(schema=None):
+    """
+    반환: {테이블: 행 수} - schema를 주면 해당 스키마(스냅샷)의 테이블
+    """
+    prefix = f'{schema}.' if schema else ''
+    counts = {}
+    with connection.cursor() as cursor:
+        for table in SEED_TABLES:
+            cursor.execute(f'SELECT COUNT(*) FROM {prefix}{table}')
+            counts[table] = cursor.fetchone()[0]
+    return counts
+
+
+def snapshot_info():
+    """
+    반환: 저장된 스냅샷 메타데이터 {'saved_at', 'dataset', 'rows'}, 없으면 None
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT to_regclass(%s) IS NOT NULL', [f'{SNAPSHOT_SCHEMA}.meta'])
+        if not cursor.fetchone()[0]:
+            return None
+        cursor.execute(f'SELECT info FROM {SNAPSHOT_SCHEMA}.meta')
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    return row[0] if isinstance(row[0], dict) else json.loads(row[0])
+
+
+def save_snapshot(dataset=None, log=_silent):
+    """
+    현재 시딩 테이블을 SNAPSHOT_SCHEMA에 복사 (기존 스냅샷 교체)
+    dataset: 메타데이터로 남길 생성 조건 (seed_data가 규모/시드/분포를 넘긴다)
+    반환: 메타데이터 dict
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP SCHEMA IF EXISTS {SNAPSHOT_SCHEMA} CASCADE')
+            cursor.execute(f'CREATE SCHEMA {SNAPSHOT_SCHEMA}')
+            for table in SEED_TABLES:
+                start = time.perf_counter()
+                cursor.execute(
+                    f'CREATE TABLE {SNAPSHOT_SCHEMA}.{table} AS SELECT {_columns(cursor, table)} FROM {table}'
+                )
+                log(f'  {table}: {cursor.rowcount:,}행 ({time.perf_counter() - start:.1f}s)')
+
+        info = {
+            'saved_at': timezone.now().isoformat(),
+            'dataset': dataset,
+            'rows': row_counts(SNAPSHOT_SCHEMA),
+        }
+        with connection.cursor() as cursor:
+            cursor.execute(f'CREATE TABLE {SNAPSHOT_SCHEMA}.meta (info jsonb NOT NULL)')
+            cursor.execute(f'INSERT INTO {SNAPSHOT_SCHEMA}.meta (info) VALUES (%s)', [json.dumps(info)])
+    return info
+
+
+def restore_snapshot(drop_indexes=True, log=_silent):
+    """
+    시딩 테이블을 스냅샷 시점으로 되돌린다 (TRUNCATE 후 INSERT ... SELECT, 한 트랜잭션)
+    반환: 메타데이터 dict, 스냅샷이 없으면 None
+    """
+    info = snapshot_info()
+    if info is None:
+        return None
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        _truncate(cursor)
+        indexes = _drop_secondary_indexes(cursor, log) if drop_indexes else []
+        for table in SEED_TABLES:
+            start = time.perf_counter()
+            columns = _columns(cursor, table)
+            cursor.execute(f'INSERT INTO {table} ({columns}) SELECT {columns} FROM {SNAPSHOT_SCHEMA}.{table}')
+            log(f'  {table}: {cursor.rowcount:,}행 ({time.perf_counter() - start:.1f}s)')
+        _reset_sequences(cursor, SEED_TABLES)
+        if indexes:
+            _create_indexes(cursor, indexes, log)
+    return info
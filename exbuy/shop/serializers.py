@@ -1,9 +1,16 @@
+from django.conf import settings
 from rest_framework import serializers
 from .models import Product, Order, OrderItem, Review
 
 
 # ============= Product Serializers =============
 
+# 응답에 포함하지 않는 내부 컬럼 (검색 벡터, 집계 원본 값)
+PRODUCT_INTERNAL_FIELDS = [
+    'search_vector', 'rating_sum',
+    'rating_1_count', 'rating_2_count', 'rating_3_count', 'rating_4_count', 'rating_5_count',
+]
+
 class ProductListSerializer(serializers.ModelSerializer):
     """
     상품 목록 조회용 (최적화 - 필요한 필드만)
@@ -13,30 +20,43 @@ class ProductListSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'price', 'stock', 'category', 'updated_at']
 
 
+class ProductSearchSerializer(ProductListSerializer):
+    """
+    상품 검색 결과용 (목록 필드 + 검색 랭킹)
+    주의: search_queryset()의 annotate(rank=SearchRank(...)) 필요 (q 없으면 null)
+    """
+    rank = serializers.FloatField(read_only=True, allow_null=True)
+
+    class Meta(ProductListSerializer.Meta):
+        fields = ProductListSerializer.Meta.fields + ['rank']
+
+
 class ProductDetailSerializer(serializers.ModelSerializer):
     """
     상품 상세 조회용 (전체 필드)
-    주의: ViewSet에서 annotate(review_count=Count('reviews'), average_rating=Avg('reviews__rating')) 필요
+    리뷰 통계는 Product의 비정규화 집계 컬럼에서 읽음 (JOIN/GROUP BY 없음)
     """
     review_count = serializers.IntegerField(read_only=True)
     average_rating = serializers.FloatField(read_only=True)
+    rating_histogram = serializers.DictField(child=serializers.IntegerField(), read_only=True)
 
     class Meta:
         model = Product
-        fields = '__all__'
+        exclude = PRODUCT_INTERNAL_FIELDS
 
 
 class ProductDetailOptimizedSerializer(serializers.ModelSerializer):
     """
     상품 상세 조회용 (최적화 버전)
-    주의: ViewSet에서 annotate(review_count=Count('reviews'), average_rating=Avg('reviews__rating')) 필요
+    리뷰 통계는 Product의 비정규화 집계 컬럼에서 읽음 (JOIN/GROUP BY 없음)
     """
     review_count = serializers.IntegerField(read_only=True)
     average_rating = serializers.FloatField(read_only=True)
+    rating_histogram = serializers.DictField(child=serializers.IntegerField(), read_only=True)
 
     class Meta:
         model = Product
-        fields = '__all__'
+        exclude = PRODUCT_INTERNAL_FIELDS
 
 
 # ============= Review Serializers =============
@@ -164,6 +184,30 @@ class InventoryReserveSerializer(serializers.Serializer):
     quantity = serializers.IntegerField(min_value=1)
 
 
+class InventoryBatchReserveSerializer(serializers.Serializer):
+    """
+    장바구니(다건) 재고 예약 요청용
+    """
+    items = InventoryReserveSerializer(many=True, allow_empty=False, max_length=50)
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    """
+    하위 요청 1건 - 읽기(GET)만, shop/urls.py 라우트 경로 (/api/...)
+    """
+    method = serializers.ChoiceField(choices=['GET'], default='GET')
+    path = serializers.RegexField(
+        r'^/api/', max_length=2000, error_messages={'invalid': '경로는 /api/로 시작해야 합니다.'}
+    )
+
+
+class BatchSerializer(serializers.Serializer):
+    """
+    묶음 요청용 (POST /batch)
+    """
+    requests = BatchRequestSerializer(many=True, allow_empty=False, max_length=settings.BATCH_MAX_REQUESTS)
+
+
 # ============= Stats Serializer =============
 
 class TopProductSerializer(serializers.Serializer):
@@ -0,0 +1,4 @@
+"""
+shop 테스트 - DB_HOST=... python manage.py test shop (PostgreSQL 필요: 전문 검색, SKIP LOCKED, COPY)
+기능별 모듈 test_*.py, 공용 픽스처는 base.py
+"""
@@ -0,0 +1,53 @@
+import json
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from shop.models import Order, Product, Review
+
+
+class ShopTestCase(TestCase):
+    """
+    상품 3개 (food 2, books 1), 주문 2건 (pending, cancelled), 리뷰 2건 - 모두 API로 만들어 집계/롤업이 일치
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = [
+            Product.objects.create(
+                name=name, price=Decimal(price), stock=1000, category=category, description=description,
+            )
+            for name, price, category, description in [
+                ('Gaming Laptop', '1500.00', 'food', 'fast laptop with keyboard'),
+                ('Coffee Beans', '12.50', 'food', 'dark roast'),
+                ('Django Guide', '39.90', 'books', 'web framework book'),
+            ]
+        ]
+        cls.product, cls.other_product, cls.book = cls.products
+
+        def create(url, body):
+            response = cls.client_class().post(url, json.dumps(body), content_type='application/json')
+            assert response.status_code == 201, response.content
+            return response.json()['id']
+
+        items = [{'product_id': cls.product.pk, 'quantity': 1}, {'product_id': cls.book.pk, 'quantity': 2}]
+        cls.order = Order.objects.get(pk=create('/api/orders/', {'user_id': 1, 'items': items}))
+        cls.cancelled_order = Order.objects.get(pk=create('/api/orders/', {'user_id': 2, 'items': items}))
+        cls.client_class().patch(
+            f'/api/orders/{cls.cancelled_order.pk}/', json.dumps({'status': 'cancelled'}),
+            content_type='application/json',
+        )
+        cls.review = Review.objects.get(pk=create(
+            '/api/reviews/', {'product': cls.product.pk, 'user_id': 1, 'rating': 4, 'body': 'good'},
+        ))
+        create('/api/reviews/', {'product': cls.product.pk, 'user_id': 2, 'rating': 2, 'body': 'meh'})
+
+    def setUp(self):
+        # 응답 캐시(locmem)와 버전 카운터는 테스트 사이에 남는다
+        cache.clear()
+
+    def request(self, method, url, body=None, content_type='application/json', **extra):
+        if body is not None and content_type == 'application/json':
+            body = json.dumps(body)
+        return self.client.generic(method, url, body or '', content_type=content_type, **extra)
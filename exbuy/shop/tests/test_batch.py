@@ -0,0 +1,27 @@
+from django.test import override_settings
+
+from .base import ShopTestCase
+
+
+@override_settings(RESPONSE_CACHE=False, BATCH_CONCURRENCY=1)
+class BatchTests(ShopTestCase):
+    """
+    BATCH_CONCURRENCY > 1이면 풀 스레드가 별도 연결을 써 테스트 트랜잭션의 데이터를 보지 못한다
+    """
+
+    def test_sub_requests_match_direct_responses(self):
+        paths = [f'/api/products/{self.product.pk}/', f'/api/orders/{self.order.pk}/', '/api/reviews/',
+                 f'/api/products/{self.product.pk}/reviews/']
+        response = self.request('POST', '/api/batch', {'requests': [{'path': path} for path in paths]})
+        self.assertEqual(response.status_code, 200)
+        for path, result in zip(paths, response.json()['responses']):
+            with self.subTest(path=path):
+                self.assertEqual((result['path'], result['status']), (path, 200))
+                self.assertEqual(result['body'], self.client.get(path).json())
+
+    def test_errors_are_per_item(self):
+        response = self.request('POST', '/api/batch', {'requests': [
+            {'path': '/api/products/999999/'}, {'path': '/api/nope'}, {'path': '/api/batch'},
+            {'path': '/api/products/?ids=x'},
+        ]})
+        self.assertEqual([result['status'] for result in response.json()['responses']], [404, 404, 400, 400])
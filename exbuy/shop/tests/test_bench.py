@@ -0,0 +1,82 @@
+import io
+import os
+import tempfile
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+
+from shop import bench
+from shop.models import Product
+
+from .base import ShopTestCase
+
+
+def result(p50, queries=3, rows=10, memory=None):
+    return {
+        'latency_ms': {'p50': p50}, 'queries': queries, 'rows': rows,
+        'memory_kib': {'median': memory} if memory is not None else None,
+    }
+
+
+class CompareTests(SimpleTestCase):
+
+    def test_percentiles(self):
+        self.assertEqual(bench._percentiles([4.0]), {'p50': 4.0, 'p90': 4.0, 'p95': 4.0, 'p99': 4.0})
+        cuts = bench._percentiles([float(value) for value in range(1, 102)])
+        self.assertEqual((cuts['p50'], cuts['p99']), (51.0, 100.0))
+
+    def test_regressions(self):
+        baseline = {'endpoints': {'a': result(10.0, memory=100), 'b': result(0.5), 'gone': result(1.0)}}
+        current = {'endpoints': {'a': result(13.0, queries=4, memory=100), 'b': result(0.7), 'new': result(1.0)}}
+        rows = bench.compare(current, baseline, bench.DEFAULT_THRESHOLDS)
+        regressed = {(row['endpoint'], row['metric']) for row in rows if row['regressed']}
+        # b: +40%지만 0.2ms 증가는 latency_floor_ms 아래 (잡음)
+        self.assertEqual(regressed, {('a', 'latency p50 (ms)'), ('a', 'queries')})
+        self.assertEqual({row['endpoint'] for row in rows}, {'a', 'b'})
+
+    def test_dataset_mismatch(self):
+        current = {'meta': {'dataset': {'shop_product': 10, 'shop_order': 5}}}
+        baseline = {'meta': {'dataset': {'shop_product': 10, 'shop_order': 4}}}
+        self.assertEqual(bench.dataset_mismatch(current, baseline), ['shop_order'])
+
+
+class BenchCommandTests(ShopTestCase):
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def bench(self, **options):
+        out = io.StringIO()
+        call_command(
+            'bench', output=os.path.join(self.directory, 'run.json'),
+            baseline=os.path.join(self.directory, 'baseline.json'), stdout=out, **options,
+        )
+        return out.getvalue()
+
+    def test_iterations_must_be_positive(self):
+        for iterations in (0, -1):
+            with self.subTest(iterations=iterations), self.assertRaisesMessage(CommandError, '--iterations'):
+                self.bench(iterations=iterations)
+        with self.assertRaisesMessage(CommandError, '--warmup'):
+            self.bench(warmup=-1)
+
+    def test_run_and_baseline(self):
+        options = {
+            'endpoint': ['health', 'product-detail', 'order-create'], 'iterations': 2, 'warmup': 1,
+            'memory_iterations': 1,
+        }
+        stocks = dict(Product.objects.values_list('id', 'stock'))
+        self.bench(update_baseline=True, **options)
+        baseline = bench.load(os.path.join(self.directory, 'baseline.json'))
+        self.assertEqual(set(baseline['endpoints']), {'health', 'product-detail', 'order-create'})
+        created = baseline['endpoints']['order-create']
+        self.assertEqual((created['iterations'], created['statuses'], created['unexpected_status']), (2, {'201': 2}, 0))
+        self.assertGreater(created['queries'], 0)
+        # 쓰기는 요청마다 롤백 - 재고 그대로
+        self.assertEqual(dict(Product.objects.values_list('id', 'stock')), stocks)
+
+        output = self.bench(no_fail=True, **options)
+        self.assertIn('베이스라인 비교', output)
@@ -0,0 +1,45 @@
+from shop.querybudget import track_queries
+
+from .base import ShopTestCase
+
+
+class ResponseCacheTests(ShopTestCase):
+    """
+    응답 캐시 - 캐시 적중은 DB를 거치지 않고, 쓰기는 커밋 후 관련 캐시 항목과 ETag를 무효화
+    """
+
+    def get(self, url, **headers):
+        with track_queries() as log:
+            response = self.client.get(url, headers=headers)
+        return response, log.queries
+
+    def test_hit_skips_database(self):
+        for url in ['/api/products/', f'/api/products/{self.product.pk}/', f'/api/products/{self.product.pk}/reviews/',
+                    '/api/search/products?q=laptop']:
+            with self.subTest(url=url):
+                first, queries = self.get(url)
+                self.assertGreater(queries, 0)
+                second, queries = self.get(url)
+                self.assertEqual(queries, 0)
+                self.assertEqual(first.content, second.content)
+
+    def test_write_invalidates(self):
+        list_response, _ = self.get('/api/products/?category=food')
+        detail, _ = self.get(f'/api/products/{self.product.pk}/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.request('POST', '/api/reviews/', {'product': self.product.pk, 'user_id': 5, 'rating': 5, 'body': 'x'})
+
+        # 리뷰 집계가 상품 updated_at을 바꾸므로 목록(카테고리 버전)과 상세 모두 새 본문
+        response, _ = self.get('/api/products/?category=food', if_none_match=list_response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], list_response['ETag'])
+        response, _ = self.get(f'/api/products/{self.product.pk}/', if_none_match=detail['ETag'])
+        self.assertEqual(response.json()['review_count'], 3)
+
+        # 다른 카테고리 목록은 그대로 캐시에서
+        self.get('/api/products/?category=books')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.request('PATCH', f'/api/products/{self.product.pk}/', {'price': '1.00'})
+        _, queries = self.get('/api/products/?category=books')
+        self.assertEqual(queries, 0)
@@ -0,0 +1,52 @@
+import json
+import threading
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.test import TransactionTestCase, override_settings
+
+from shop.models import Product
+
+
+@override_settings(RESPONSE_CACHE=False)
+class CartLockTests(TransactionTestCase):
+    """
+    장바구니 예약의 행 락 처리 - 다른 연결이 상품 행을 잠근 상태 (실제 커밋된 데이터가 필요해 TransactionTestCase)
+    """
+
+    def setUp(self):
+        self.free = Product.objects.create(name='Free', price=Decimal('1.00'), stock=5, category='home')
+        self.busy = Product.objects.create(name='Busy', price=Decimal('1.00'), stock=5, category='home')
+        self.locked = threading.Event()
+        self.release = threading.Event()
+        self.holder = threading.Thread(target=self.hold_lock)
+        self.holder.start()
+        self.assertTrue(self.locked.wait(10))
+
+    def tearDown(self):
+        self.release.set()
+        self.holder.join(10)
+
+    def hold_lock(self):
+        try:
+            with transaction.atomic():
+                Product.objects.select_for_update().get(pk=self.busy.pk)
+                self.locked.set()
+                self.release.wait(10)
+        finally:
+            connection.close()
+
+    def reserve(self, lock):
+        items = [{'product_id': self.free.pk, 'quantity': 2}, {'product_id': self.busy.pk, 'quantity': 1}]
+        response = self.client.post(
+            f'/api/inventory/reserve/batch?lock={lock}', json.dumps({'items': items}), content_type='application/json',
+        )
+        return response.status_code, [item['status'] for item in response.json()['items']]
+
+    def test_skip_locked_reserves_the_rest(self):
+        self.assertEqual(self.reserve('skip_locked'), (200, ['reserved', 'locked']))
+        self.assertEqual(Product.objects.get(pk=self.free.pk).stock, 3)
+
+    def test_nowait_fails_whole_cart(self):
+        self.assertEqual(self.reserve('nowait'), (409, ['available', 'locked']))
+        self.assertEqual(Product.objects.get(pk=self.free.pk).stock, 5)
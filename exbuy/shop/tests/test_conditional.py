@@ -0,0 +1,43 @@
+from django.core.cache import cache
+
+from shop.querybudget import track_queries
+
+from .base import ShopTestCase
+
+
+class ConditionalGetTests(ShopTestCase):
+    """
+    조건부 GET(ETag/Last-Modified) - 검증자가 맞으면 캐시 적중이든 미스든 본문 없이 304
+    본문만 바뀐 리뷰 수정은 상품 목록의 검증자를 바꾸지 않는다
+    """
+
+    def get(self, url, **headers):
+        with track_queries() as log:
+            response = self.client.get(url, headers=headers)
+        return response, log.queries
+
+    def test_conditional_get(self):
+        url = f'/api/products/{self.product.pk}/'
+        response, _ = self.get(url)
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+
+        response, queries = self.get(url, if_none_match=etag)
+        self.assertEqual((response.status_code, queries), (304, 0))
+
+        # 캐시 미스에서도 검증자가 맞으면 본문 없이 304
+        cache.clear()
+        response, _ = self.get(url, if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_body_only_review_edit_keeps_list(self):
+        self.get('/api/products/')
+        reviews, _ = self.get(f'/api/products/{self.product.pk}/reviews/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.request('PATCH', f'/api/reviews/{self.review.pk}/', {'body': 'edited'})
+        _, queries = self.get('/api/products/')
+        self.assertEqual(queries, 0)
+        response, _ = self.get(f'/api/products/{self.product.pk}/reviews/')
+        self.assertNotEqual(response.content, reviews.content)
+        self.assertIn('edited', {review['body'] for review in response.json()})
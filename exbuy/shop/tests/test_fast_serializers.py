@@ -0,0 +1,20 @@
+from django.test import override_settings
+
+from .base import ShopTestCase
+
+
+@override_settings(RESPONSE_CACHE=False)
+class FastSerializerTests(ShopTestCase):
+    """
+    values() 기반 고속 직렬화 응답이 ModelSerializer 경로와 같은지
+    """
+
+    def test_same_response(self):
+        for url in ['/api/products/', '/api/products/?pagination=cursor', '/api/orders/', '/api/reviews/',
+                    f'/api/products/{self.product.pk}/reviews/', '/api/search/products?q=laptop']:
+            with self.subTest(url=url):
+                with override_settings(FAST_SERIALIZERS=True):
+                    fast = self.client.get(url).json()
+                with override_settings(FAST_SERIALIZERS=False):
+                    slow = self.client.get(url).json()
+                self.assertEqual(fast, slow)
@@ -0,0 +1,62 @@
+import io
+import json
+from unittest import mock
+
+from shop import ingest
+from shop.models import Product
+
+from .base import ShopTestCase
+
+
+class IngestTests(ShopTestCase):
+
+    def ndjson(self, *orders, bad=0):
+        lines = [json.dumps(order) for order in orders] + ['{"user_id": 1}'] * bad
+        return '\n'.join(lines).encode()
+
+    def line(self, product, quantity=1):
+        return {'user_id': 4, 'items': [{'product_id': product.pk, 'quantity': quantity}]}
+
+    def test_ingest(self):
+        body = self.ndjson(self.line(self.book, 2), self.line(self.book, 10 ** 6), self.line(self.book), bad=1)
+        response = self.request('POST', '/api/orders/ingest?chunk_size=2', body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 201)
+        summary = response.json()
+        self.assertEqual(
+            {key: summary[key] for key in ('created', 'rejected', 'lines', 'chunks', 'committed_through_line')},
+            {'created': 2, 'rejected': 2, 'lines': 4, 'chunks': 2, 'committed_through_line': 4},
+        )
+        self.assertEqual([error['line'] for error in summary['errors']], [2, 4])
+        self.assertEqual(Product.objects.get(pk=self.book.pk).stock, 1000 - 4 - 3)
+
+    def test_error_sample_is_bounded(self):
+        body = self.ndjson(self.line(self.product), bad=10)
+        with mock.patch.object(ingest, 'MAX_ERRORS', 3):
+            summary = self.request('POST', '/api/orders/ingest', body, content_type='application/x-ndjson').json()
+        self.assertEqual((summary['created'], summary['rejected'], summary['chunks']), (1, 10, 1))
+        self.assertEqual([error['line'] for error in summary['errors']], [2, 3, 4])
+
+    def test_error_sample_is_first_lines(self):
+        # 재고 거부(1번 줄)는 청크 적재 후에 알 수 있다 - 뒤 줄의 형식 오류가 상한을 먼저 채우면 안 된다
+        body = self.ndjson(self.line(self.product, 10 ** 6), bad=5)
+        with mock.patch.object(ingest, 'MAX_ERRORS', 3):
+            summary = self.request(
+                'POST', '/api/orders/ingest?chunk_size=3', body, content_type='application/x-ndjson',
+            ).json()
+        self.assertEqual(summary['rejected'], 6)
+        self.assertEqual([error['line'] for error in summary['errors']], [1, 2, 3])
+        self.assertTrue(summary['errors'][0]['error'].startswith('재고 부족'))
+
+    def test_chunked_upload(self):
+        # Content-Length 없는 chunked 전송 - gunicorn은 디코딩한 본문을 wsgi.input으로 끝까지 준다
+        body = self.ndjson(self.line(self.product), self.line(self.product))
+        response = self.client.generic(
+            'POST', '/api/orders/ingest', content_type='application/x-ndjson',
+            CONTENT_LENGTH='', **{'wsgi.input': io.BytesIO(body), 'wsgi.input_terminated': True},
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['created'], 2)
+
+    def test_empty_body(self):
+        response = self.request('POST', '/api/orders/ingest', b'', content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,115 @@
+import json
+import math
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+
+from shop.loadgen import k6results
+
+
+class TQuantileTests(SimpleTestCase):
+    """
+    Bonferroni 보정된 신뢰 수준(꼬리 확률 1e-4 이하)과 작은 자유도에서도 정확한 Student t 분위수
+    """
+
+    def test_matches_tables(self):
+        for probability, df, expected in [
+            (0.975, 1, 12.7062), (0.975, 10, 2.2281), (0.975, 30, 2.0423), (0.95, 5, 2.0150),
+            (0.99995, 3, 28.0001), (0.975, 1e6, 1.9600),
+        ]:
+            with self.subTest(probability=probability, df=df):
+                self.assertAlmostEqual(k6results._t_quantile(probability, df), expected, places=3)
+
+    def test_closed_form_df2(self):
+        # df=2: t = (2p - 1) / sqrt(2p(1 - p))
+        for probability in (0.9, 0.999, 0.99995):
+            exact = (2 * probability - 1) / math.sqrt(2 * probability * (1 - probability))
+            self.assertAlmostEqual(k6results._t_quantile(probability, 2) / exact, 1, places=9)
+
+    def test_symmetric(self):
+        self.assertAlmostEqual(k6results._t_quantile(0.025, 7.5), -k6results._t_quantile(0.975, 7.5))
+
+
+class ReadK6Tests(SimpleTestCase):
+    """
+    NDJSON 스트리밍 집계 - 실행 그룹, 엔드포인트, 시간 창
+    """
+
+    def write(self, name, lines):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, name)
+        with open(path, 'w') as file:
+            file.write('\n'.join(json.dumps(line) for line in lines) + '\n')
+        return path
+
+    def point(self, metric, second, value, **tags):
+        # 나노초 자리와 시간대 오프셋이 붙은 k6 시각
+        stamp = f'2024-05-09T14:{second // 60:02d}:{second % 60:02d}.500000000+09:00'
+        return {'type': 'Point', 'metric': metric, 'data': {'time': stamp, 'value': value, 'tags': tags}}
+
+    def test_groups_and_windows(self):
+        lines = [{'type': 'Metric', 'metric': 'http_req_duration', 'data': {}}]
+        for second in range(30):
+            for name, latency in (('list', 10.0), ('detail', 30.0)):
+                tags = {'server_type': 'uvicorn', 'scenario': 'read-heavy', 'name': name}
+                lines.append(self.point('http_req_duration', second, latency, **tags))
+                lines.append(self.point('http_req_failed', second, int(name == 'detail' and second < 3), **tags))
+            lines.append(self.point('http_reqs', second, 1, server_type='uvicorn', scenario='read-heavy'))
+        runs = k6results.read_k6(self.write('ignored-mixed.json', lines), 10)
+
+        self.assertEqual(list(runs), [('uvicorn', 'read-heavy')])
+        run = runs['uvicorn', 'read-heavy']
+        self.assertEqual(run.duration, 29)
+        self.assertEqual(run.started_at, '2024-05-09T05:00:00+00:00')
+        summary = run.summary()
+        self.assertEqual({name: summary[name]['requests'] for name in summary}, {'*': 60, 'list': 30, 'detail': 30})
+        self.assertAlmostEqual(summary['detail']['error_rate'], 10.0)
+        self.assertAlmostEqual(summary['list']['p50'], 10.0, delta=0.01)
+        self.assertAlmostEqual(summary['*']['mean'], 20.0)
+
+        windows = run.series['detail'].windows
+        self.assertEqual([window['index'] for window in windows], [0, 1, 2])
+        self.assertEqual([window['error_rate'] for window in windows], [30.0, 0.0, 0.0])
+        self.assertEqual([window['rps'] for window in windows], [1.0, 1.0, 1.0])
+
+    def test_group_from_file_name(self):
+        lines = [self.point('http_req_duration', 0, 5.0, scenario='default', url='http://x/api/products/')]
+        runs = k6results.read_k6(self.write('gunicorn-sync-write-heavy.json', lines), 10)
+        self.assertEqual(list(runs), [('gunicorn-sync', 'write-heavy')])
+        self.assertIn('http://x/api/products/', runs['gunicorn-sync', 'write-heavy'].series)
+
+
+class WelchTests(SimpleTestCase):
+    """
+    창별 평균 비교 - 창 3개 미만은 판단하지 않는다
+    """
+
+    def test_too_few_windows(self):
+        self.assertIsNone(k6results.welch([1.0, 2.0], [1.0, 2.0, 3.0], 0.95))
+        self.assertIsNone(k6results.welch([1.0, 2.0, 3.0], [], 0.95))
+
+    def test_no_variance(self):
+        self.assertEqual(k6results.welch([5.0] * 4, [7.0] * 4, 0.95), (2.0, 2.0, 2.0))
+
+    def test_interval(self):
+        before = [10.0, 10.4, 9.8, 10.1, 9.9, 10.2, 9.7, 10.3]
+        diff, low, high = k6results.welch(before, [value + 2 for value in before], 0.95)
+        self.assertAlmostEqual(diff, 2.0)
+        self.assertGreater(low, 0)
+        self.assertLess(low, diff)
+        self.assertGreater(high, diff)
+
+        _, low, high = k6results.welch(before, list(reversed(before)), 0.95)
+        self.assertLess(low, 0)
+        self.assertGreater(high, 0)
+        # 신뢰 수준이 높을수록 구간이 넓다
+        _, wide_low, wide_high = k6results.welch(before, list(reversed(before)), 0.9999)
+        self.assertLess(wide_low, low)
+        self.assertGreater(wide_high, high)
+
+    def test_steady_windows(self):
+        windows = [{'requests': count} for count in (5, 100, 104, 98, 30, 60)]
+        self.assertEqual([window['requests'] for window in k6results.steady_windows(windows)], [100, 104, 98, 60])
+        self.assertEqual(k6results.steady_windows([]), [])
@@ -0,0 +1,111 @@
+import json
+import random
+
+from django.test import SimpleTestCase
+
+from shop.loadgen.hdr import Histogram
+from shop.loadgen.runner import Stats, arrivals, parse_stages
+
+
+class HistogramTests(SimpleTestCase):
+    """
+    백분위 정밀도(유효 숫자 3자리), 병합, 직렬화 왕복
+    """
+
+    def filled(self, values, **options):
+        histogram = Histogram(**options)
+        for value in values:
+            histogram.record(value)
+        return histogram
+
+    def test_percentiles_within_precision(self):
+        histogram = self.filled(range(1, 100_001))
+        result = histogram.percentiles([50, 90, 99, 99.9, 100])
+        for percentile, expected in [(50, 50_000), (90, 90_000), (99, 99_000), (99.9, 99_900)]:
+            with self.subTest(percentile=percentile):
+                # 구간의 최대 동등값 - 과소 보고하지 않고 0.1% 이내
+                self.assertGreaterEqual(result[percentile], expected)
+                self.assertLessEqual(result[percentile], expected * 1.001)
+                self.assertEqual(histogram.value_at_percentile(percentile), result[percentile])
+        self.assertEqual(result[100], 100_000)
+        self.assertEqual((histogram.min, histogram.max, histogram.mean), (1, 100_000, 50_000.5))
+
+    def test_small_values_exact_and_empty(self):
+        histogram = self.filled([1, 2, 3, 1000])
+        self.assertEqual(histogram.percentiles([25, 50, 75, 100]), {25: 1, 50: 2, 75: 3, 100: 1000})
+        self.assertEqual(Histogram().percentiles([50, 99]), {50: 0, 99: 0})
+        self.assertEqual(Histogram().value_at_percentile(99), 0)
+
+    def test_saturation(self):
+        histogram = self.filled([10, 5000, -3], highest=1000)
+        self.assertEqual((histogram.saturated, histogram.max, histogram.min), (1, 1000, 0))
+        self.assertEqual(histogram.value_at_percentile(100), 1000)
+
+    def test_merge_equals_single_recording(self):
+        rng = random.Random(3)
+        values = [int(rng.lognormvariate(8, 1.5)) for _ in range(5000)]
+        merged = self.filled(values[:2000]).add(self.filled(values[2000:]))
+        single = self.filled(values)
+        self.assertEqual(merged.counts, single.counts)
+        self.assertEqual(
+            (merged.total, merged.min, merged.max, merged.mean), (single.total, single.min, single.max, single.mean),
+        )
+        self.assertEqual(Histogram().add(single).percentiles([50, 99]), single.percentiles([50, 99]))
+        with self.assertRaises(ValueError):
+            merged.add(Histogram(significant_figures=2))
+
+    def test_round_trip(self):
+        histogram = self.filled([5, 50, 500, 5_000_000_000])
+        restored = Histogram.from_dict(json.loads(json.dumps(histogram.to_dict())))
+        self.assertEqual(restored.counts, histogram.counts)
+        self.assertEqual(restored.to_dict(), histogram.to_dict())
+        self.assertEqual(restored.percentiles([50, 100]), histogram.percentiles([50, 100]))
+
+    def test_stats_round_trip(self):
+        stats = Stats(2)
+        stats.record('list', True, 200, 0.0, 0.001, 0.011, 0, 512)
+        stats.record('detail', False, 500, 1.0, 1.0, 1.5, 1, 64)
+        restored = Stats.from_dict(json.loads(json.dumps(stats.to_dict())))
+        self.assertEqual(restored.to_dict(), stats.to_dict())
+        self.assertEqual(restored.requests['detail']['statuses'], {500: 1})
+        self.assertEqual((restored.completed, restored.errors, restored.bytes), (2, 1, 576))
+
+
+class ArrivalTests(SimpleTestCase):
+    """
+    도착 시각 - 프로세스별로 나눠 맡아도 합치면 목표 간격, 단계 번호(워밍업 -1)
+    """
+
+    def schedule(self, stages, processes, index, arrival='constant', warmup=0, seed=0):
+        return list(arrivals(parse_stages(stages), warmup, processes, index, arrival, random.Random(seed)))
+
+    def test_constant_spacing(self):
+        own = self.schedule('100:1s', 4, 1)
+        self.assertEqual(len(own), 25)
+        self.assertAlmostEqual(own[0][0], 0.01)
+        for (previous, _), (offset, _) in zip(own, own[1:]):
+            self.assertAlmostEqual(offset - previous, 0.04)
+
+        combined = sorted(offset for index in range(4) for offset, _ in self.schedule('100:1s', 4, index))
+        self.assertEqual(len(combined), 100)
+        for number, offset in enumerate(combined):
+            self.assertAlmostEqual(offset, number / 100)
+
+    def test_stages_and_warmup(self):
+        plan = self.schedule('10:1s,0:1s,20:500ms', 1, 0, warmup=0.5)
+        stages = [stage for _, stage in plan]
+        self.assertEqual([stages.count(number) for number in (-1, 0, 1, 2)], [5, 10, 0, 10])
+        offsets = [offset for offset, _ in plan]
+        self.assertEqual(offsets, sorted(offsets))
+        # 0 req/s 단계도 시간은 흐른다
+        self.assertAlmostEqual(offsets[stages.index(2)], 2.5)
+        self.assertLess(offsets[-1], 3.0)
+
+    def test_poisson_rate(self):
+        plan = self.schedule('1000:10s', 2, 0, arrival='poisson', seed=5)
+        # 프로세스당 rate/N - 기대 5000건, 표준편차 약 71
+        self.assertLess(abs(len(plan) - 5000), 300)
+        offsets = [offset for offset, _ in plan]
+        self.assertEqual(offsets, sorted(offsets))
+        self.assertLess(offsets[-1], 10)
+        self.assertEqual(plan, self.schedule('1000:10s', 2, 0, arrival='poisson', seed=5))
@@ -0,0 +1,55 @@
+from django.test import override_settings
+
+from shop.models import Order, Product
+
+from .base import ShopTestCase
+
+
+@override_settings(RESPONSE_CACHE=False)
+class OrderCreateTests(ShopTestCase):
+    """
+    주문/벌크 주문 생성 - 조건부 합계 차감 (재고 부족/없는 상품이면 전체 롤백)
+    """
+
+    def stock(self, product):
+        return Product.objects.values_list('stock', flat=True).get(pk=product.pk)
+
+    def test_order_create_decrements_stock(self):
+        response = self.request('POST', '/api/orders/', {
+            'user_id': 7, 'items': [{'product_id': self.book.pk, 'quantity': 3}, {'product_id': self.book.pk, 'quantity': 2}],
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['total_price'], '199.50')
+        # setUpTestData: 주문 2건 x 2개
+        self.assertEqual(self.stock(self.book), 1000 - 4 - 5)
+
+    def test_insufficient_stock_rolls_back(self):
+        before = Order.objects.count()
+        response = self.request('POST', '/api/orders/', {
+            'user_id': 7, 'items': [{'product_id': self.product.pk, 'quantity': 1}, {'product_id': self.book.pk, 'quantity': 10 ** 6}],
+        })
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['shortages'][0]['product_id'], self.book.pk)
+        self.assertEqual(self.stock(self.product), 1000 - 2)
+        self.assertEqual(Order.objects.count(), before)
+
+    def test_bulk_create(self):
+        response = self.request('POST', '/api/orders/bulk', {'orders': [
+            {'user_id': 7, 'items': [{'product_id': self.book.pk, 'quantity': 1}]},
+            {'user_id': 8, 'items': [{'product_id': self.book.pk, 'quantity': 2}, {'product_id': self.product.pk, 'quantity': 1}]},
+        ]})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['created'], 2)
+        self.assertEqual((self.stock(self.book), self.stock(self.product)), (1000 - 4 - 3, 1000 - 2 - 1))
+
+    def test_bulk_missing_product(self):
+        response = self.request('POST', '/api/orders/bulk', {'orders': [
+            {'user_id': 7, 'items': [{'product_id': 999999, 'quantity': 1}]},
+        ]})
+        self.assertEqual(response.status_code, 404)
+
+    def test_bulk_empty(self):
+        # 차감할 상품이 없으면 UPDATE를 보내지 않는다 (빈 VALUES 목록은 문법 오류)
+        response = self.request('POST', '/api/orders/bulk', {'orders': []})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {'created': 0, 'order_ids': []})
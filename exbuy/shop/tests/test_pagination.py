@@ -0,0 +1,66 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from shop.models import Product
+from shop.pagination import KeysetPagination
+
+from .base import ShopTestCase
+
+
+async def _acount(queryset):
+    return await queryset.acount()
+
+
+@override_settings(RESPONSE_CACHE=False)
+class KeysetPaginationTests(ShopTestCase):
+
+    def walk(self, url):
+        pages = []
+        while url:
+            data = self.client.get(url).json()
+            self.assertNotIn('count', data)
+            pages.append(data)
+            url = data['next']
+        return pages
+
+    def test_walks_all_pages_in_order(self):
+        with mock.patch.object(KeysetPagination, 'page_size', 1):
+            pages = self.walk('/api/products/?pagination=cursor&ordering=-price')
+            self.assertEqual(
+                [page['results'][0]['name'] for page in pages],
+                ['Gaming Laptop', 'Django Guide', 'Coffee Beans'],
+            )
+            back = self.client.get(pages[-1]['previous']).json()
+        self.assertEqual([product['name'] for product in back['results']], ['Django Guide'])
+        self.assertIsNone(pages[0]['previous'])
+
+    def test_estimated_count_is_whole_result_set(self):
+        # 추정치를 정확한 COUNT로 바꿔 어떤 집합을 세는지 확인 - 커서 이후 행만 세면 페이지마다 줄어든다
+        with mock.patch.object(KeysetPagination, 'page_size', 1), \
+                mock.patch('shop.pagination.estimate_count', lambda queryset: queryset.count()):
+            pages = self.walk('/api/products/?pagination=cursor&ordering=-price&count=estimate&category=food')
+        self.assertEqual([page['estimated_count'] for page in pages], [2, 2])
+
+    def test_async_estimated_count_is_whole_result_set(self):
+        paginator = KeysetPagination()
+        queryset = Product.objects.all()
+        with mock.patch.object(KeysetPagination, 'page_size', 1), mock.patch('shop.pagination.aestimate_count', _acount):
+            url = '/api/products/?pagination=cursor&count=estimate'
+            counts = []
+            while url:
+                request = Request(APIRequestFactory().get(url))
+                async_to_sync(paginator.apaginate_queryset)(queryset, request)
+                counts.append(paginator.estimated_count)
+                url = paginator.get_next_link()
+        self.assertEqual(counts, [3, 3, 3])
+
+    def test_rejects_unindexed_ordering(self):
+        response = self.client.get('/api/products/?pagination=cursor&ordering=name')
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/api/orders/?cursor=garbage').status_code, 404)
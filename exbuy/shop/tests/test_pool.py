@@ -0,0 +1,112 @@
+import threading
+import time
+
+import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS
+from django.db import connections
+from django.test import SimpleTestCase
+
+from shop.db.pool import ConnectionPool, PoolTimeout
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    """
+    checkout/checkin/정리 - 테스트 DB에 psycopg2 연결을 직접 연다 (Django 연결과 별개)
+    """
+
+    def setUp(self):
+        self.params = connections['default'].get_connection_params()
+        self.opened = []
+        self.addCleanup(self.close_all)
+
+    def close_all(self):
+        for connection in self.opened:
+            connection.close()
+
+    def connect(self):
+        connection = psycopg2.connect(**self.params)
+        self.opened.append(connection)
+        return connection
+
+    def pool(self, **options):
+        return ConnectionPool('test', **{'max_size': 2, 'timeout': 1, **options})
+
+    def test_reuses_most_recent_idle(self):
+        pool = self.pool()
+        first, second = pool.checkout(self.connect), pool.checkout(self.connect)
+        pool.checkin(first)
+        pool.checkin(second)
+        self.assertIs(pool.checkout(self.connect), second)
+        self.assertIs(pool.checkout(self.connect), first)
+        self.assertEqual(len(self.opened), 2)
+
+    def test_timeout_when_exhausted(self):
+        pool = self.pool(max_size=1, timeout=0.05)
+        pool.checkout(self.connect)
+        started = time.monotonic()
+        with self.assertRaises(PoolTimeout):
+            pool.checkout(self.connect)
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+        self.assertEqual(len(self.opened), 1)
+
+    def test_waiter_gets_returned_connection(self):
+        pool = self.pool(max_size=1)
+        connection = pool.checkout(self.connect)
+        timer = threading.Timer(0.05, pool.checkin, [connection])
+        timer.start()
+        self.addCleanup(timer.join)
+        self.assertIs(pool.checkout(self.connect), connection)
+
+    def test_checkin_rolls_back(self):
+        pool = self.pool()
+        connection = pool.checkout(self.connect)
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE TEMP TABLE pool_probe (id int)')
+        self.assertEqual(connection.info.transaction_status, TRANSACTION_STATUS_INTRANS)
+        pool.checkin(connection)
+        self.assertEqual(connection.info.transaction_status, TRANSACTION_STATUS_IDLE)
+        with pool.checkout(self.connect).cursor() as cursor:
+            cursor.execute("SELECT to_regclass('pg_temp.pool_probe')")
+            self.assertIsNone(cursor.fetchone()[0])
+
+    def test_broken_connection_is_replaced(self):
+        pool = self.pool(max_size=1, check_interval=0)
+        connection = pool.checkout(self.connect)
+        pool.checkin(connection)
+        # 서버 쪽에서 끊긴 연결 - 상태 검사(SELECT 1)에서 걸러진다
+        with self.connect() as killer, killer.cursor() as cursor:
+            cursor.execute('SELECT pg_terminate_backend(%s)', [connection.info.backend_pid])
+        replacement = pool.checkout(self.connect)
+        self.assertIsNot(replacement, connection)
+        self.assertTrue(connection.closed)
+        with replacement.cursor() as cursor:
+            cursor.execute('SELECT 1')
+
+        replacement.close()
+        pool.checkin(replacement)
+        self.assertIsNot(pool.checkout(self.connect), replacement)
+
+    def test_reap_idle_and_lifetime(self):
+        pool = self.pool(max_idle=0, min_size=1)
+        first, second = pool.checkout(self.connect), pool.checkout(self.connect)
+        pool.checkin(first)
+        pool.checkin(second)
+        # min_size만큼은 남긴다
+        self.assertEqual((first.closed, second.closed, pool._size), (True, False, 1))
+
+        pool = self.pool(max_lifetime=0)
+        connection = pool.checkout(self.connect)
+        pool.checkin(connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool._size, 0)
+
+    def test_failed_connect_frees_slot(self):
+        pool = self.pool(max_size=1, timeout=0.05)
+
+        def refuse():
+            raise psycopg2.OperationalError('refused')
+
+        with self.assertRaises(psycopg2.OperationalError):
+            pool.checkout(refuse)
+        self.assertEqual(pool._size, 0)
+        pool.checkout(self.connect)
@@ -0,0 +1,121 @@
+import os
+import sys
+import tempfile
+import time
+
+from django.test import SimpleTestCase, override_settings
+
+from shop import profiler
+
+from .base import ShopTestCase
+
+
+def busy(profile, deadline=2):
+    # 샘플러가 이 프레임을 한 번 이상 볼 때까지
+    until = time.perf_counter() + deadline
+    while not profile.samples and time.perf_counter() < until:
+        sum(range(1000))
+
+
+def wait_for_sampler_exit(deadline=2):
+    until = time.perf_counter() + deadline
+    while profiler._sampler_running and time.perf_counter() < until:
+        time.sleep(0.005)
+    return not profiler._sampler_running
+
+
+@override_settings(PROFILER_INTERVAL_MS=0.5, PROFILER_MAX_ACTIVE=2)
+class SamplerTests(SimpleTestCase):
+    """
+    무장된 요청이 있는 동안만 샘플러 스레드가 돌고, 미들웨어 프레임 아래의 스택만 센다
+    """
+
+    def test_samples_stack_below_root(self):
+        profile = profiler.start(sys._getframe(), 'token')
+        try:
+            busy(profile)
+        finally:
+            profiler.stop(profile)
+        self.assertGreater(profile.samples, 0)
+        names = {code.co_name for stack in profile.stacks for code in stack}
+        self.assertIn('busy', names)
+        self.assertNotIn('test_samples_stack_below_root', names)
+        self.assertTrue(wait_for_sampler_exit())
+
+    def test_max_active(self):
+        profiles = [profiler.start(sys._getframe(), 'rule') for _ in range(3)]
+        try:
+            self.assertIsNone(profiles[2])
+        finally:
+            for profile in filter(None, profiles):
+                profiler.stop(profile)
+
+    def test_restart_after_exit(self):
+        # 샘플러가 내려가는 순간에 무장해도 새 프로파일이 샘플링된다
+        for _ in range(50):
+            profiler.stop(profiler.start(sys._getframe(), 'rule'))
+        profile = profiler.start(sys._getframe(), 'rule')
+        try:
+            busy(profile)
+        finally:
+            profiler.stop(profile)
+        self.assertGreater(profile.samples, 0)
+        self.assertTrue(wait_for_sampler_exit())
+
+
+class FileFormatTests(SimpleTestCase):
+
+    def test_parse_rules(self):
+        self.assertEqual(
+            profiler.parse_rules(' product-detail:5, product-list:0.5,,health-check'),
+            {'product-detail': 0.05, 'product-list': 0.005, 'health-check': 1.0},
+        )
+
+    def test_collapsed_round_trip(self):
+        lines = {'local;product-list;a (x.py:1);b (x.py:2)': 120, 'local;product-list;a (x.py:1)': 30}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'p.collapsed')
+            profiler.write_collapsed(path, lines)
+            self.assertEqual(profiler.read_collapsed(path), lines)
+
+    def test_speedscope_document(self):
+        document = profiler.speedscope_document('GET /', {'a;b': 10, 'a;c': 5})
+        self.assertEqual([frame['name'] for frame in document['shared']['frames']], ['a', 'b', 'c'])
+        self.assertEqual(document['profiles'][0]['samples'], [[0, 1], [0, 2]])
+        self.assertEqual(document['profiles'][0]['endValue'], 15)
+
+    def test_file_stem(self):
+        profile = profiler.Profile(None, 'token')
+        stem = profiler.file_stem('product-list', 'gunicorn-gthread', profile.started_at)
+        parsed = profiler.parse_file_stem(stem)
+        self.assertEqual((parsed['view'], parsed['tag']), ('product-list', 'gunicorn-gthread'))
+        self.assertEqual(parsed['started_at'], profile.started_at)
+        self.assertIsNone(profiler.parse_file_stem('notes'))
+
+
+class ProfilerMiddlewareTests(ShopTestCase):
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_token_saves_profile(self):
+        with override_settings(PROFILER_DIR=self.directory, PROFILER_INTERVAL_MS=0.1):
+            response = self.client.get('/api/products/', HTTP_X_EXBUY_PROFILE=profiler.make_token())
+        self.assertEqual(response.status_code, 200)
+        # 목록 요청(수 ms)은 0.1ms 간격 샘플러에 여러 번 잡힌다
+        stem = response['X-Exbuy-Profile']
+        self.assertEqual(profiler.parse_file_stem(stem)['view'], 'product-list')
+        self.assertEqual(
+            sorted(os.listdir(self.directory)),
+            [stem + profiler.COLLAPSED_SUFFIX, stem + profiler.SPEEDSCOPE_SUFFIX],
+        )
+
+    def test_invalid_token_is_not_armed(self):
+        with override_settings(PROFILER_DIR=self.directory):
+            response = self.client.get('/api/products/?_profile=forged')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Exbuy-Profile', response)
+        self.assertEqual(os.listdir(self.directory), [])
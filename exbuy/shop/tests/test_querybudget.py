@@ -0,0 +1,227 @@
+import json
+from decimal import Decimal
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+from django.http import QueryDict
+from django.test import SimpleTestCase, override_settings
+from django.urls import URLResolver
+
+from shop import urls as shop_urls
+from shop.inventory import DECREMENT_SQL
+from shop.models import Order, OrderItem, Product, Review
+from shop.queries import review_queryset
+from shop.querybudget import QueryBudgetExceeded, assert_query_budget, budget_for, fingerprint
+from shop.serializers import OrderDetailSerializer, ReviewListSerializer
+
+from .base import ShopTestCase
+
+
+def routed_methods():
+    """
+    shop/urls.py 라우트가 받는 (URL 이름, HTTP 메서드) 집합
+    DRF 뷰셋은 actions 매핑, api_view/APIView는 구현된 메서드 핸들러 (OPTIONS/HEAD 제외)
+    """
+    routes = set()
+    patterns = list(shop_urls.urlpatterns)
+    while patterns:
+        pattern = patterns.pop()
+        if isinstance(pattern, URLResolver):
+            patterns.extend(pattern.url_patterns)
+            continue
+        if not pattern.name or pattern.name == 'api-root':
+            continue
+        actions = getattr(pattern.callback, 'actions', None)
+        if actions:
+            methods = actions
+        else:
+            view_class = pattern.callback.cls
+            methods = [method for method in view_class.http_method_names if hasattr(view_class, method)]
+        # HEAD는 GET 핸들러, OPTIONS는 DRF 메타데이터 (DB 접근 없음)
+        routes.update((pattern.name, method.upper()) for method in methods if method not in ('options', 'head'))
+    return routes
+
+
+class FingerprintTests(SimpleTestCase):
+    """
+    값 목록의 길이/형 변환과 무관하게 같은 fingerprint - 반복 감지와 querystats 집계가 한 형태로 모인다
+    """
+
+    def test_literals_and_params(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id = %s AND name = 'it''s' LIMIT 21"),
+            'SELECT * FROM t WHERE id = ? AND name = ? LIMIT ?',
+        )
+
+    def test_in_list_any_length(self):
+        one = fingerprint('SELECT a FROM t WHERE id IN (%s)')
+        self.assertEqual(one, 'SELECT a FROM t WHERE id IN (...)')
+        self.assertEqual(fingerprint('SELECT a FROM t WHERE id IN (%s, %s, %s)'), one)
+        self.assertEqual(fingerprint('SELECT a FROM t WHERE id IN ( 1 ,2 )'), one)
+
+    def test_values_rows_with_casts(self):
+        one, three = (
+            fingerprint(DECREMENT_SQL.format(values=', '.join(['(%s::bigint, %s::integer)'] * count)))
+            for count in (1, 3)
+        )
+        self.assertEqual(one, three)
+        self.assertIn('AS (VALUES (...))', one)
+        self.assertEqual(
+            fingerprint("INSERT INTO x (a, b) VALUES (%s, 'x'), (%s, 2)"),
+            fingerprint('INSERT INTO x (a, b) VALUES (%s, %s)'),
+        )
+
+    def test_column_lists_are_kept(self):
+        self.assertEqual(
+            fingerprint('INSERT INTO x (a, b) VALUES (%s::text[], %s)'), 'INSERT INTO x (a, b) VALUES (...)',
+        )
+
+
+@override_settings(QUERY_BUDGET_MODE='raise', RESPONSE_CACHE=False, BATCH_CONCURRENCY=1)
+class QueryBudgetTests(ShopTestCase):
+    """
+    라우트가 받는 모든 메서드를 raise 모드로 실행 - 예산 위반은 QueryBudgetExceeded로 테스트 실패
+    요청마다 savepoint 안에서 실행하고 되돌려 서로 영향을 주지 않는다 (캐시 미스 기준)
+    """
+
+    def cases(self):
+        product, other, book = self.product.pk, self.other_product.pk, self.book.pk
+        order, cancelled, review = self.order.pk, self.cancelled_order.pk, self.review.pk
+        product_body = {'name': 'Tea', 'price': '3.00', 'stock': 10, 'category': 'food', 'description': 'green'}
+        order_body = {'user_id': 3, 'items': [{'product_id': product, 'quantity': 1}]}
+        cart = [{'product_id': product, 'quantity': 1}, {'product_id': 999999, 'quantity': 1}]
+        ndjson = b'\n'.join(json.dumps(order_body).encode() for _ in range(3))
+        return {
+            ('health-check', 'GET'): [('/api/health', None)],
+            ('product-list', 'GET'): [
+                ('/api/products/', None),
+                ('/api/products/?category=food&ordering=-price', None),
+                ('/api/products/?pagination=cursor', None),
+                (f'/api/products/?ids={product},{book},999999', None),
+            ],
+            ('product-list', 'POST'): [('/api/products/', product_body)],
+            ('product-detail', 'GET'): [(f'/api/products/{product}/', None)],
+            ('product-detail', 'PUT'): [(f'/api/products/{product}/', product_body)],
+            ('product-detail', 'PATCH'): [(f'/api/products/{product}/', {'price': '9.99'})],
+            ('product-detail', 'DELETE'): [(f'/api/products/{product}/', None)],
+            ('product-reviews', 'GET'): [(f'/api/products/{product}/reviews/', None)],
+            ('product-search', 'GET'): [('/api/search/products?q=laptop&category=food', None)],
+            ('order-list', 'GET'): [('/api/orders/', None), ('/api/orders/?pagination=cursor', None)],
+            ('order-list', 'POST'): [('/api/orders/', order_body)],
+            ('order-detail', 'GET'): [(f'/api/orders/{order}/', None)],
+            ('order-detail', 'PATCH'): [
+                (f'/api/orders/{order}/', {'status': 'shipped'}),
+                (f'/api/orders/{order}/', {'status': 'cancelled'}),
+                (f'/api/orders/{cancelled}/', {'status': 'pending'}),
+            ],
+            ('order-detail', 'PUT'): [
+                (f'/api/orders/{order}/', {'user_id': 5, 'status': 'cancelled', 'total_price': '1.00'}),
+            ],
+            ('order-detail', 'DELETE'): [(f'/api/orders/{order}/', None)],
+            ('order-bulk-create', 'POST'): [('/api/orders/bulk', {'orders': [order_body, order_body]})],
+            ('order-ingest', 'POST'): [('/api/orders/ingest?chunk_size=2', ndjson)],
+            ('inventory-reserve', 'POST'): [
+                (f'/api/inventory/reserve?lock_type={lock_type}', {'product_id': product, 'quantity': quantity})
+                for lock_type in ('optimistic', 'pessimistic', 'atomic', 'batched')
+                for quantity in (1, 10 ** 6)
+            ],
+            ('inventory-reserve-batch', 'POST'): [
+                (f'/api/inventory/reserve/batch?lock={lock}', {'items': cart})
+                for lock in ('nowait', 'skip_locked', 'wait')
+            ],
+            ('stats-top-products', 'GET'): [('/api/stats/top-products?limit=5', None)],
+            ('review-list', 'GET'): [('/api/reviews/', None), (f'/api/reviews/?product_id={product}', None)],
+            ('review-list', 'POST'): [('/api/reviews/', {'product': book, 'user_id': 3, 'rating': 5, 'body': 'x'})],
+            ('review-detail', 'GET'): [(f'/api/reviews/{review}/', None)],
+            ('review-detail', 'PUT'): [
+                (f'/api/reviews/{review}/', {'product': other, 'user_id': 1, 'rating': 1, 'body': 'moved'}),
+            ],
+            ('review-detail', 'PATCH'): [
+                (f'/api/reviews/{review}/', {'body': 'edited'}),
+                (f'/api/reviews/{review}/', {'rating': 5}),
+                (f'/api/reviews/{review}/', {'product': book}),
+            ],
+            ('review-detail', 'DELETE'): [(f'/api/reviews/{review}/', None)],
+            ('file-upload', 'POST'): [('/api/uploads', None)],
+            ('batch', 'POST'): [('/api/batch', {'requests': [
+                {'path': f'/api/products/{product}/'}, {'path': f'/api/orders/{order}/'},
+                {'path': f'/api/products/?ids={product},{book}'}, {'path': '/api/reviews/'},
+            ]})],
+        }
+
+    def _send(self, method, url, body):
+        if url == '/api/uploads':
+            upload = SimpleUploadedFile('a.txt', b'hello', content_type='text/plain')
+            return self.client.post(url, {'file': upload})
+        if isinstance(body, bytes):
+            return self.request(method, url, body, content_type='application/x-ndjson')
+        return self.request(method, url, body)
+
+    def test_every_routed_method_declares_budget(self):
+        undeclared = sorted(route for route in routed_methods() if budget_for(*route) is None)
+        self.assertEqual(undeclared, [], 'shop/urls.py declare_query_budgets에 메서드별 예산을 추가하세요')
+
+    def test_every_routed_method_is_exercised(self):
+        untested = sorted(routed_methods() - set(self.cases()))
+        self.assertEqual(untested, [], 'QueryBudgetTests.cases()에 요청을 추가하세요')
+
+    def test_every_routed_method_within_budget(self):
+        for (name, method), requests in self.cases().items():
+            for url, body in requests:
+                with self.subTest(view=name, method=method, url=url):
+                    with transaction.atomic():
+                        response = self._send(method, url, body)
+                        transaction.set_rollback(True)
+                    self.assertLess(response.status_code, 500, response.content[:300])
+
+
+class NPlusOneTests(ShopTestCase):
+    """
+    관계 필드를 읽는 직렬화/표시 경로 - assert_query_budget으로 엔드포인트 예산 안인지 확인
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # 상품이 서로 다른 아이템/리뷰를 반복 허용치(3회)보다 많이 - N+1이면 같은 SQL이 반복된다
+        extra = [
+            Product.objects.create(name=f'Item {index}', price=Decimal('1.00'), stock=10, category='home')
+            for index in range(5)
+        ]
+        cls.big_order = Order.objects.create(user_id=9, total_price=Decimal('5.00'))
+        OrderItem.objects.bulk_create(
+            OrderItem(order=cls.big_order, product=product, quantity=1, unit_price=product.price)
+            for product in extra
+        )
+        Review.objects.bulk_create(Review(product=product, user_id=9, rating=3, body='x') for product in extra)
+
+    def test_order_detail_serializer_with_prefetch(self):
+        with assert_query_budget('order-detail'):
+            order = Order.objects.prefetch_related('items__product').get(pk=self.big_order.pk)
+            data = OrderDetailSerializer(order).data
+            labels = [str(item) for item in order.items.all()]
+        self.assertEqual(len(data['items']), 5)
+        self.assertEqual(labels[0], 'Item 0 x 1')
+
+    def test_order_item_str_without_prefetch_is_caught(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            with assert_query_budget('order-detail'):
+                [str(item) for item in OrderItem.objects.filter(order=self.big_order)]
+
+    def test_review_list_serializer_product_name(self):
+        with assert_query_budget('review-list'):
+            data = ReviewListSerializer(review_queryset(QueryDict(), 'list'), many=True).data
+        self.assertEqual(len(data), 7)
+        self.assertIn('Item 4', {review['product_name'] for review in data})
+
+    def test_review_list_endpoint(self):
+        for fast in (True, False):
+            with self.subTest(fast=fast), override_settings(FAST_SERIALIZERS=fast):
+                with assert_query_budget('review-list'):
+                    response = self.client.get('/api/reviews/')
+                self.assertEqual(response.json()['count'], 7)
+
+    def test_order_detail_endpoint(self):
+        with assert_query_budget('order-detail'):
+            response = self.client.get(f'/api/orders/{self.big_order.pk}/')
+        self.assertEqual([item['product_name'] for item in response.json()['items']][-1], 'Item 4')
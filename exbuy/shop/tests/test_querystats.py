@@ -0,0 +1,69 @@
+from django.test import SimpleTestCase
+
+from shop.ingest import ORDER_IDS_SQL
+from shop.querystats import RequestStats, explainable
+
+
+class RequestStatsTests(SimpleTestCase):
+    """
+    요청 안의 fingerprint별 집계 - 호출 수, 총/최대 시간, 행 수, EXPLAIN 후보(slow)
+    """
+
+    def test_aggregates_by_fingerprint(self):
+        stats = RequestStats(slow_threshold=1)
+        stats.record('SELECT * FROM t WHERE id IN (%s)', (1,), False, 'default', 0.25, 1)
+        stats.record('SELECT * FROM t WHERE id IN (%s, %s)', (1, 2), False, 'default', 0.5, 2)
+        stats.record('UPDATE t SET a = %s', (1,), False, 'default', 0.125, 7)
+        self.assertEqual(stats.shapes, {
+            'SELECT * FROM t WHERE id IN (...)': [2, 0.75, 0.5, 3],
+            'UPDATE t SET a = ?': [1, 0.125, 0.125, 7],
+        })
+        self.assertEqual(stats.slow, {})
+
+    def test_slow_keeps_slowest_select(self):
+        stats = RequestStats(slow_threshold=0.1)
+        stats.record('SELECT * FROM t WHERE id = %s', (1,), False, 'default', 0.2, 1)
+        stats.record('SELECT * FROM t WHERE id = %s', (2,), False, 'replica', 0.3, 1)
+        stats.record('SELECT * FROM t WHERE id = %s', (3,), False, 'default', 0.15, 1)
+        self.assertEqual(stats.slow, {
+            'SELECT * FROM t WHERE id = ?': (0.3, 'SELECT * FROM t WHERE id = %s', (2,), 'replica'),
+        })
+
+    def test_slow_skips_writes_and_side_effects(self):
+        stats = RequestStats(slow_threshold=0)
+        stats.record('UPDATE t SET a = %s', (1,), False, 'default', 1, 1)
+        stats.record('INSERT INTO t (a) VALUES (%s)', [(1,), (2,)], True, 'default', 1, 2)
+        stats.record(ORDER_IDS_SQL, (5,), False, 'default', 1, 5)
+        stats.record('SELECT * FROM t WHERE id = %s FOR UPDATE', (1,), False, 'default', 1, 1)
+        self.assertEqual(stats.slow, {})
+        self.assertEqual(len(stats.shapes), 4)
+
+
+class ExplainableTests(SimpleTestCase):
+    """
+    EXPLAIN ANALYZE는 문장을 실행한다 - 롤백으로 되돌려지지 않는 부수 효과가 있으면 제외
+    """
+
+    def test_plain_reads(self):
+        for sql in (
+            'SELECT "shop_product"."id" FROM "shop_product" WHERE "shop_product"."id" IN (...)',
+            'SELECT COUNT(*) AS "__count" FROM "shop_order"',
+        ):
+            with self.subTest(sql=sql):
+                self.assertTrue(explainable(sql))
+
+    def test_side_effects(self):
+        for sql in (
+            'UPDATE t SET a = ?',
+            'WITH x AS (UPDATE t SET a = ? RETURNING id) SELECT * FROM x',
+            'SELECT * FROM t WHERE id = ? FOR UPDATE',
+            'SELECT * FROM t WHERE id = ? FOR NO KEY UPDATE SKIP LOCKED',
+            'SELECT nextval(pg_get_serial_sequence(...)) FROM generate_series(...)',
+            'SELECT setval(pg_get_serial_sequence(...), ?)',
+            'SELECT pg_advisory_xact_lock(?)',
+            'SELECT pg_try_advisory_lock(?, ?)',
+            'SELECT pg_notify(?, ?)',
+            'SELECT * INTO backup FROM t',
+        ):
+            with self.subTest(sql=sql):
+                self.assertFalse(explainable(sql))
@@ -0,0 +1,115 @@
+import io
+import json
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+import msgpack
+from django.test import SimpleTestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from shop.models import Order
+from shop.parsers import MessagePackParser, ORJSONParser
+from shop.renderers import MessagePackRenderer, ORJSONRenderer
+from shop.serializers import OrderDetailSerializer
+
+from .base import ShopTestCase
+
+
+SAMPLE = {
+    'id': 2 ** 53 + 1,
+    'price': Decimal('1500.10'),
+    'ratio': 0.1,
+    'name': '게이밍 노트북 — "quoted" \\ </script>',
+    'separators': 'a\u2028b\u2029c',
+    'control': '\x00\x1f\x7f',
+    'created_at': datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+    'updated_at': datetime(2024, 5, 1, 21, 30, tzinfo=timezone(timedelta(hours=9))),
+    'naive': datetime(2024, 5, 1, 12, 30),
+    'day': date(2024, 5, 1),
+    'at': time(9, 15, 30),
+    'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'lazy': gettext_lazy('hello'),
+    'empty': [], 'none': None, 'flag': True,
+    'nested': [{'a': 1, 'b': [1.5, -2, 'x']}, {}],
+    1: 'int key',
+}
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    """
+    DRF JSONRenderer와 바이트 단위로 같은 출력
+    """
+
+    def assertSameBytes(self, data, media_type=None, context=None):
+        expected = JSONRenderer().render(data, media_type, context)
+        self.assertEqual(ORJSONRenderer().render(data, media_type, context), expected)
+
+    def test_same_bytes(self):
+        self.assertSameBytes(SAMPLE)
+        self.assertSameBytes([SAMPLE, SAMPLE])
+        self.assertSameBytes('plain')
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_fallbacks(self):
+        # 64비트 초과 정수는 orjson이 표현하지 못해 JSONRenderer로
+        self.assertSameBytes({'big': 2 ** 64})
+        # indent 요청도 JSONRenderer 출력 그대로
+        self.assertSameBytes(SAMPLE, 'application/json; indent=4')
+        self.assertSameBytes(SAMPLE, None, {'indent': 2})
+
+
+class MessagePackTests(SimpleTestCase):
+    """
+    MessagePack 응답은 JSON 응답과 같은 값, 파서는 렌더러 출력을 그대로 되돌린다
+    """
+
+    def test_same_values_as_json(self):
+        packed = msgpack.unpackb(MessagePackRenderer().render(SAMPLE), raw=False, strict_map_key=False)
+        expected = json.loads(JSONRenderer().render(SAMPLE))
+        self.assertEqual({str(key): value for key, value in packed.items()}, expected)
+
+    def test_round_trip(self):
+        payload = {'orders': [{'user_id': 1, 'items': [{'product_id': 2 ** 40, 'quantity': 3}]}], 'note': '주문'}
+        for renderer, parser in [(ORJSONRenderer(), ORJSONParser()), (MessagePackRenderer(), MessagePackParser())]:
+            with self.subTest(parser=type(parser).__name__):
+                self.assertEqual(parser.parse(io.BytesIO(renderer.render(payload))), payload)
+
+    def test_parse_errors(self):
+        with self.assertRaises(ParseError):
+            MessagePackParser().parse(io.BytesIO(b'\xc1'))
+        # JSONParser와 같이 NaN/Infinity 거부
+        for body in (b'{"a": NaN}', b'[Infinity]', b'{"a": '):
+            with self.subTest(body=body):
+                with self.assertRaises(ParseError):
+                    JSONParser().parse(io.BytesIO(body))
+                with self.assertRaises(ParseError):
+                    ORJSONParser().parse(io.BytesIO(body))
+
+
+@override_settings(RESPONSE_CACHE=False)
+class NegotiationTests(ShopTestCase):
+
+    def test_order_detail_bytes(self):
+        order = Order.objects.prefetch_related('items__product').get(pk=self.order.pk)
+        data = OrderDetailSerializer(order).data
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        response = self.client.get(f'/api/orders/{self.order.pk}/')
+        self.assertEqual(response.content, JSONRenderer().render(data))
+
+    def test_msgpack_request_and_response(self):
+        body = msgpack.packb({'user_id': 7, 'items': [{'product_id': self.book.pk, 'quantity': 1}]})
+        response = self.client.post(
+            '/api/orders/', body, content_type='application/msgpack', HTTP_ACCEPT='application/msgpack',
+        )
+        self.assertEqual((response.status_code, response['Content-Type']), (201, 'application/msgpack'))
+        created = msgpack.unpackb(response.content, raw=False)
+        self.assertEqual(created['user_id'], 7)
+        as_json = self.client.get(f'/api/orders/{created["id"]}/').json()
+        as_msgpack = msgpack.unpackb(
+            self.client.get(f'/api/orders/{created["id"]}/', HTTP_ACCEPT='application/msgpack').content, raw=False,
+        )
+        self.assertEqual(as_msgpack, as_json)
@@ -0,0 +1,106 @@
+import time
+from unittest import mock
+
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from shop import replicas
+from shop.models import Product
+
+
+router = replicas.ReplicaRouter()
+
+
+@override_settings(REPLICA_DATABASES=['replica1'], REPLICA_STICKY_SECONDS=5)
+class ReplicaRoutingTests(SimpleTestCase):
+    """
+    요청 단위 라우팅과 read-your-writes 쿠키 - 복제본 별칭은 라우팅 결정만 보고 연결하지 않는다
+    """
+
+    def setUp(self):
+        patcher = mock.patch.object(replicas, 'monitor', mock.Mock(healthy=['replica1']))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.factory = RequestFactory()
+
+    def call(self, request, view):
+        seen = []
+
+        def get_response(request):
+            seen.extend(view())
+            return HttpResponse()
+
+        response = replicas.ReplicaRoutingMiddleware(get_response)(request)
+        return seen, response.cookies.get(replicas.REPLICA_STICKY_COOKIE)
+
+    def read(self):
+        return [router.db_for_read(Product)]
+
+    def test_get_reads_replica(self):
+        seen, cookie = self.call(self.factory.get('/api/products/'), self.read)
+        self.assertEqual((seen, cookie), (['replica1'], None))
+
+    def test_write_pins_rest_of_request(self):
+        def view():
+            before = router.db_for_read(Product)
+            write = router.db_for_write(Product)
+            return [before, write, router.db_for_read(Product)]
+
+        seen, cookie = self.call(self.factory.get('/api/products/'), view)
+        self.assertEqual(seen, ['replica1', 'default', 'default'])
+        self.assertGreater(float(cookie.value), time.time())
+        self.assertEqual(cookie['max-age'], 5)
+
+    def test_write_method_is_sticky(self):
+        seen, cookie = self.call(self.factory.post('/api/orders/'), self.read)
+        self.assertEqual(seen, ['default'])
+        self.assertIsNotNone(cookie)
+
+    def test_sticky_cookie(self):
+        for value, expected in [
+            (f'{time.time() + 60:.3f}', 'default'), (f'{time.time() - 1:.3f}', 'replica1'), ('garbage', 'replica1'),
+        ]:
+            with self.subTest(value=value):
+                request = self.factory.get('/api/products/')
+                request.COOKIES[replicas.REPLICA_STICKY_COOKIE] = value
+                self.assertEqual(self.call(request, self.read)[0], [expected])
+
+    def test_no_healthy_replica(self):
+        replicas.monitor.healthy = []
+        route = replicas.decide(self.factory.get('/api/products/'))
+        self.assertEqual((route.alias, route.reason), (None, 'no_healthy_replica'))
+
+    def test_reads_in_transaction_and_outside_requests_use_primary(self):
+        self.assertEqual(router.db_for_read(Product), 'default')
+
+        def view():
+            with mock.patch.object(connections['default'], 'in_atomic_block', True):
+                return self.read()
+
+        self.assertEqual(self.call(self.factory.get('/api/products/'), view)[0], ['default'])
+        self.assertFalse(router.allow_migrate('replica1', 'shop'))
+
+
+@override_settings(REPLICA_DATABASES=['default'], REPLICA_LAG_CHECK_INTERVAL=60)
+class ReplicaMonitorTests(TestCase):
+    """
+    지연 검사 - primary를 가리키는 별칭은 지연 0 (로컬 테스트 구성과 같음)
+    """
+
+    def test_check_lag(self):
+        monitor = replicas.ReplicaMonitor()
+        self.assertTrue(monitor._check('default'))
+        with override_settings(REPLICA_MAX_LAG_SECONDS=-1):
+            self.assertFalse(monitor._check('default'))
+
+    def test_refresh_interval(self):
+        monitor = replicas.ReplicaMonitor()
+        with mock.patch.object(monitor, '_check', return_value=False) as check:
+            monitor.refresh()
+            monitor.refresh()
+        self.assertEqual((monitor.healthy, check.call_count), ([], 1))
+        self.assertFalse(monitor.due())
+        with override_settings(REPLICA_LAG_CHECK_INTERVAL=0):
+            monitor.refresh()
+        self.assertEqual(monitor.healthy, ['default'])
@@ -0,0 +1,90 @@
+import threading
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+
+from shop.inventory import INSUFFICIENT, NOT_FOUND, ReservationBatcher, _Reservation
+from shop.models import Product
+from shop.querybudget import track_queries
+
+from .base import ShopTestCase
+
+
+@override_settings(RESPONSE_CACHE=False)
+class ReservationBatchTests(ShopTestCase):
+    """
+    그룹 커밋(lock_type=batched) - 묶음의 합계 차감과, 도착 순서대로 처리했을 때와 같은 예약별 결과
+    """
+
+    def execute(self, *requests):
+        batch = [
+            _Reservation(product.pk if isinstance(product, Product) else product, quantity)
+            for product, quantity in requests
+        ]
+        ReservationBatcher._execute(batch)
+        return [reservation.result for reservation in batch]
+
+    def stock(self, product):
+        return Product.objects.values_list('stock', flat=True).get(pk=product.pk)
+
+    def test_totals_in_one_update(self):
+        product_stock, book_stock = self.stock(self.product), self.stock(self.book)
+        with track_queries() as log:
+            results = self.execute((self.product, 3), (self.book, 1), (self.product, 2), (self.product, 4))
+        # 예약 시점의 남은 재고 - 같은 상품의 예약은 도착 순서대로
+        self.assertEqual(results, [product_stock - 3, book_stock - 1, product_stock - 5, product_stock - 9])
+        self.assertEqual((self.stock(self.product), self.stock(self.book)), (product_stock - 9, book_stock - 1))
+        self.assertEqual(log.queries, 1)
+
+    def test_shortage_falls_back_in_arrival_order(self):
+        Product.objects.filter(pk=self.product.pk).update(stock=5)
+        results = self.execute((self.product, 3), (self.product, 3), (self.product, 2), (999999, 1))
+        # 합계 8 > 5: 단건 차감으로 3 → 부족 → 2
+        self.assertEqual(results, [2, INSUFFICIENT, 0, NOT_FOUND])
+        self.assertEqual(self.stock(self.product), 0)
+
+    def test_endpoint(self):
+        stock = self.stock(self.book)
+        url = '/api/inventory/reserve?lock_type=batched'
+        response = self.request('POST', url, {'product_id': self.book.pk, 'quantity': 2})
+        self.assertEqual(response.json(), {'product_id': self.book.pk, 'reserved': 2, 'remaining_stock': stock - 2})
+        response = self.request('POST', url, {'product_id': self.book.pk, 'quantity': stock})
+        self.assertEqual(response.status_code, 400)
+        response = self.request('POST', url, {'product_id': 999999, 'quantity': 1})
+        self.assertEqual(response.status_code, 404)
+
+
+class ConcurrentReservationBatchTests(TransactionTestCase):
+    """
+    동시에 도착한 예약이 한 묶음(리더 1명)으로 처리되는지 - 스레드마다 연결이 필요해 TransactionTestCase
+    """
+
+    def test_one_batch_for_concurrent_requests(self):
+        product = Product.objects.create(name='Hot', price=Decimal('1.00'), stock=10, category='home')
+        batcher = ReservationBatcher(window=0.2)
+        results = []
+        executed = []
+        execute = ReservationBatcher._execute
+
+        def counting_execute(batch):
+            executed.append(len(batch))
+            execute(batch)
+
+        def reserve(quantity):
+            try:
+                results.append(batcher.reserve(product.pk, quantity))
+            finally:
+                connection.close()
+
+        batcher._execute = counting_execute
+        threads = [threading.Thread(target=reserve, args=(quantity,)) for quantity in (4, 4, 4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        self.assertEqual(executed, [3])
+        # 도착 순서는 스레드 스케줄에 따르지만 두 건만 성공
+        self.assertEqual(sorted(results, key=str), [2, 6, INSUFFICIENT])
+        self.assertEqual(Product.objects.get(pk=product.pk).stock, 2)
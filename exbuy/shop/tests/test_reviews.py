@@ -0,0 +1,53 @@
+import io
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+
+from shop.aggregates import rebuild_review_stats, review_stats_drift
+from shop.models import Product
+
+from .base import ShopTestCase
+
+
+@override_settings(RESPONSE_CACHE=False)
+class ReviewAggregateTests(ShopTestCase):
+    """
+    리뷰 쓰기 경로의 증분 집계와 rebuild_review_stats 재계산
+    """
+
+    def test_review_aggregates(self):
+        detail = self.client.get(f'/api/products/{self.product.pk}/').json()
+        self.assertEqual((detail['review_count'], detail['average_rating']), (2, 3.0))
+
+        self.request('PATCH', f'/api/reviews/{self.review.pk}/', {'rating': 5})
+        detail = self.client.get(f'/api/products/{self.product.pk}/').json()
+        self.assertEqual((detail['review_count'], detail['average_rating']), (2, 3.5))
+
+        self.request('PATCH', f'/api/reviews/{self.review.pk}/', {'product': self.book.pk})
+        self.request('DELETE', f'/api/reviews/{self.review.pk}/')
+        product = Product.objects.get(pk=self.product.pk)
+        book = Product.objects.get(pk=self.book.pk)
+        self.assertEqual((product.review_count, product.rating_sum, product.rating_2_count), (1, 2, 1))
+        self.assertEqual((book.review_count, book.rating_sum, book.rating_5_count), (0, 0, 0))
+
+    def test_rebuild_fixes_drift(self):
+        Product.objects.filter(pk=self.product.pk).update(review_count=9, rating_sum=0)
+        Product.objects.filter(pk=self.book.pk).update(rating_5_count=1)
+        self.assertEqual(review_stats_drift()[0], 2)
+
+        call_command('rebuild_review_stats', stdout=io.StringIO())
+        self.assertEqual(review_stats_drift(), (0, []))
+        product = Product.objects.get(pk=self.product.pk)
+        self.assertEqual((product.review_count, product.rating_sum, product.rating_4_count), (2, 6, 1))
+
+    def test_rebuild_locks_reviews(self):
+        # 재계산 스냅샷 이후 커밋되는 리뷰 쓰기의 증분이 덮어써지지 않도록 트랜잭션 끝까지 리뷰 쓰기를 막는다
+        rebuild_review_stats()
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT mode FROM pg_locks
+                WHERE pid = pg_backend_pid() AND relation = 'shop_review'::regclass
+            """)
+            modes = {row[0] for row in cursor.fetchall()}
+        self.assertIn('ShareRowExclusiveLock', modes)
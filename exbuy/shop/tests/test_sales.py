@@ -0,0 +1,33 @@
+import io
+
+from django.core.management import call_command
+from django.test import override_settings
+
+from shop.aggregates import sales_rollup_drift
+from shop.models import ProductDailySales
+
+from .base import ShopTestCase
+
+
+@override_settings(RESPONSE_CACHE=False)
+class SalesRollupTests(ShopTestCase):
+    """
+    일별 판매 롤업 - 주문 상태 변경 경로의 증분 갱신과 rebuild_sales_rollup 재계산
+    """
+
+    def top_products(self):
+        return {row['product_id']: row['total_quantity'] for row in self.client.get('/api/stats/top-products').json()}
+
+    def test_cancel_removes_sales(self):
+        self.assertEqual(self.top_products()[self.book.pk], 2)
+        self.request('PATCH', f'/api/orders/{self.order.pk}/', {'status': 'cancelled'})
+        self.assertEqual(self.top_products()[self.book.pk], 0)
+        self.request('PATCH', f'/api/orders/{self.cancelled_order.pk}/', {'status': 'shipped'})
+        self.assertEqual(self.top_products()[self.book.pk], 2)
+
+    def test_rebuild_fixes_drift(self):
+        ProductDailySales.objects.filter(product=self.book).update(quantity=99)
+        self.assertEqual(sales_rollup_drift()[0], 1)
+        call_command('rebuild_sales_rollup', stdout=io.StringIO())
+        self.assertEqual(sales_rollup_drift(), (0, []))
+        self.assertEqual(self.top_products()[self.book.pk], 2)
@@ -0,0 +1,25 @@
+from decimal import Decimal
+
+from django.test import override_settings
+
+from shop.models import Product
+
+from .base import ShopTestCase
+
+
+@override_settings(RESPONSE_CACHE=False)
+class SearchTests(ShopTestCase):
+
+    def names(self, query):
+        return [product['name'] for product in self.client.get(f'/api/search/products?{query}').json()['results']]
+
+    def test_full_text(self):
+        self.assertEqual(self.names('q=laptops'), ['Gaming Laptop'])
+        self.assertEqual(self.names('q=keyboard'), ['Gaming Laptop'])
+        self.assertEqual(self.names('q="dark roast"'), ['Coffee Beans'])
+        self.assertEqual(self.names('q=laptop OR roast&category=food'), ['Gaming Laptop', 'Coffee Beans'])
+        self.assertEqual(self.names('q=laptop -keyboard'), [])
+
+    def test_ranked_by_name_weight(self):
+        Product.objects.create(name='Stand', price=Decimal('20.00'), stock=1, category='home', description='laptop stand')
+        self.assertEqual(self.names('q=laptop'), ['Gaming Laptop', 'Stand'])
@@ -0,0 +1,111 @@
+import io
+import random
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.db.transaction import TransactionManagementError
+from django.test import SimpleTestCase, TransactionTestCase
+
+from shop import seeding
+from shop.aggregates import review_stats_drift, sales_rollup_drift
+from shop.models import Order, OrderItem, Product, Review
+
+
+def dataset():
+    """
+    비교용 데이터 요약 - 생성된 값 전체 (id 순)
+    """
+    return (
+        list(Product.objects.order_by('id').values_list('id', 'name', 'price', 'stock', 'category', 'created_at')),
+        list(Order.objects.order_by('id').values_list('id', 'user_id', 'status', 'total_price', 'created_at')),
+        list(OrderItem.objects.order_by('id').values_list('order_id', 'product_id', 'quantity', 'unit_price')),
+        list(Review.objects.order_by('id').values_list('product_id', 'user_id', 'rating', 'created_at')),
+    )
+
+
+def index_names():
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT indexname FROM pg_indexes WHERE tablename = ANY(%s)', [seeding.SEED_TABLES])
+        return {name for name, in cursor.fetchall()}
+
+
+class DatasetProfileTests(SimpleTestCase):
+
+    def test_scaled_counts(self):
+        self.assertEqual(seeding.scaled_counts(1), seeding.SCALE_FACTOR_ROWS)
+        self.assertEqual(seeding.scaled_counts(0.0001), {'products': 1, 'orders': 5, 'reviews': 10})
+
+    def test_skewed_timestamps_and_status(self):
+        profile = seeding.DatasetProfile.skewed(days=10, end=datetime(2025, 1, 1, tzinfo=timezone.utc))
+        rng = random.Random(1)
+        stamps = [profile.timestamp(index, 100, rng) for index in range(100)]
+        self.assertEqual(stamps, sorted(stamps))
+        self.assertTrue(profile.end - stamps[0] <= timedelta(days=10))
+        self.assertEqual(profile.order_status(profile.end, random.Random(0)), 'pending')
+        old = profile.end - timedelta(days=30)
+        statuses = {profile.order_status(old, random.Random(seed)) for seed in range(20)}
+        self.assertEqual(statuses - {'cancelled'}, {'delivered'})
+
+    def test_copy_escapes(self):
+        self.assertEqual(seeding._row([1, seeding._text('a\tb\nc\\')]), '1\ta\\tb\\nc\\\\\n')
+
+
+@mock.patch.object(seeding, 'CHUNK_SIZE', 7)
+class FastSeedTests(TransactionTestCase):
+    """
+    COPY 고속 시딩 - 트랜잭션 밖에서 실행해야 해 TransactionTestCase (청크 여러 개가 되도록 CHUNK_SIZE 축소)
+    """
+
+    def seed(self, **options):
+        return seeding.fast_seed(
+            20, 30, 40, **{'workers': 2, 'seed': 7, 'profile': seeding.DatasetProfile.skewed(), **options},
+        )
+
+    def test_loads_rows_and_resets_sequences(self):
+        stats, _ = self.seed()
+        counts = seeding.row_counts()
+        self.assertEqual(
+            {table: counts[table] for table in ('shop_product', 'shop_order', 'shop_review')},
+            {'shop_product': 20, 'shop_order': 30, 'shop_review': 40},
+        )
+        self.assertEqual(stats.rows['shop_orderitem'], counts['shop_orderitem'])
+        self.assertGreaterEqual(counts['shop_orderitem'], 30)
+        # 주문 합계는 아이템 단가 × 수량
+        order = Order.objects.prefetch_related('items').order_by('id').first()
+        self.assertEqual(order.total_price, sum(item.unit_price * item.quantity for item in order.items.all()))
+        # 클라이언트가 부여한 id 다음부터
+        self.assertEqual(Product.objects.create(name='x', price=1, stock=1, category='home').pk, 21)
+        self.assertEqual(Order.objects.create(user_id=1, total_price=0).pk, 31)
+
+    def test_same_seed_same_data(self):
+        self.seed(workers=1)
+        first = dataset()
+        self.seed(workers=3)
+        self.assertEqual(dataset(), first)
+        self.seed(seed=8)
+        self.assertNotEqual(dataset(), first)
+
+    def test_drop_indexes_recreates_them(self):
+        before = index_names()
+        _, seconds = self.seed(drop_indexes=True)
+        self.assertEqual(index_names(), before)
+        self.assertGreater(seconds, 0)
+
+    def test_inside_transaction_is_rejected(self):
+        with transaction.atomic(), self.assertRaises(TransactionManagementError):
+            self.seed()
+
+    def test_command_builds_aggregates(self):
+        call_command('seed_data', scale_factor=0.001, workers=2, stdout=io.StringIO())
+        counts = seeding.row_counts()
+        self.assertEqual(
+            {table: counts[table] for table in ('shop_product', 'shop_order', 'shop_review')},
+            {'shop_product': 10, 'shop_order': 50, 'shop_review': 100},
+        )
+        self.assertGreater(counts['shop_productdailysales'], 0)
+        self.assertEqual(review_stats_drift(), (0, []))
+        self.assertEqual(sales_rollup_drift(), (0, []))
+        with self.assertRaisesMessage(CommandError, '--scale-factor'):
+            call_command('seed_data', scale_factor=0, stdout=io.StringIO())
@@ -0,0 +1,69 @@
+import io
+from decimal import Decimal
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TransactionTestCase
+
+from shop import seeding
+from shop.models import Order, OrderItem, Product, Review
+
+
+class SnapshotTests(TransactionTestCase):
+    """
+    SNAPSHOT_SCHEMA 저장/복원 - 스키마는 테스트 DB 플러시 대상이 아니므로 테스트마다 지운다
+    """
+
+    def setUp(self):
+        self.addCleanup(self.drop_snapshot)
+        self.product = Product.objects.create(name='Lamp', price=Decimal('20.00'), stock=5, category='home')
+        order = Order.objects.create(user_id=1, total_price=Decimal('40.00'))
+        OrderItem.objects.create(order=order, product=self.product, quantity=2, unit_price=Decimal('20.00'))
+        Review.objects.create(product=self.product, user_id=1, rating=5, body='bright')
+
+    @staticmethod
+    def drop_snapshot():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP SCHEMA IF EXISTS {seeding.SNAPSHOT_SCHEMA} CASCADE')
+
+    def test_save_and_restore(self):
+        info = seeding.save_snapshot({'seed': 42})
+        self.assertEqual(info['dataset'], {'seed': 42})
+        self.assertEqual(seeding.snapshot_info(), info)
+        saved_rows = seeding.row_counts()
+        self.assertEqual(info['rows'], saved_rows)
+
+        # 부하 테스트가 남긴 변경
+        Product.objects.filter(pk=self.product.pk).update(stock=0)
+        Review.objects.all().delete()
+        Product.objects.create(name='Extra', price=Decimal('1.00'), stock=1, category='home')
+
+        self.assertEqual(seeding.restore_snapshot(), info)
+        self.assertEqual(seeding.row_counts(), saved_rows)
+        self.assertEqual(Product.objects.get(pk=self.product.pk).stock, 5)
+        self.assertEqual(list(Review.objects.values_list('body', flat=True)), ['bright'])
+        # 시퀀스는 복원된 최대 id 다음부터
+        created = Product.objects.create(name='After', price=Decimal('1.00'), stock=1, category='home')
+        self.assertEqual(created.pk, self.product.pk + 1)
+
+    def test_restore_keeps_indexes(self):
+        seeding.save_snapshot()
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM pg_indexes WHERE tablename = ANY(%s)', [seeding.SEED_TABLES])
+            before = cursor.fetchone()[0]
+            for drop_indexes in (True, False):
+                seeding.restore_snapshot(drop_indexes=drop_indexes)
+                cursor.execute('SELECT COUNT(*) FROM pg_indexes WHERE tablename = ANY(%s)', [seeding.SEED_TABLES])
+                self.assertEqual(cursor.fetchone()[0], before)
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command('dataset_snapshot', 'status', stdout=out)
+        self.assertIn('저장된 스냅샷이 없습니다', out.getvalue())
+        with self.assertRaisesMessage(CommandError, '저장된 스냅샷이 없습니다'):
+            call_command('dataset_snapshot', 'restore', stdout=io.StringIO())
+
+        call_command('dataset_snapshot', 'save', stdout=io.StringIO())
+        Order.objects.all().delete()
+        call_command('dataset_snapshot', 'restore', stdout=io.StringIO())
+        self.assertEqual(Order.objects.count(), 1)
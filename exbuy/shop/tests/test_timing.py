@@ -0,0 +1,102 @@
+import json
+import time
+
+from django.test import SimpleTestCase, override_settings
+from prometheus_client import REGISTRY
+
+from shop import timing
+
+from .base import ShopTestCase
+
+
+def parse(header):
+    """
+    'db;dur=1.84;desc="3 queries", serialize;dur=0.92, ...' → {'db': (1.84, '3 queries'), 'serialize': (0.92, None), ...}
+    """
+    result = {}
+    for entry in header.split(', '):
+        name, *params = entry.split(';')
+        values = dict(param.split('=', 1) for param in params)
+        result[name] = (float(values['dur']), values['desc'].strip('"') if 'desc' in values else None)
+    return result
+
+
+def observed(view, phase):
+    labels = {'view': view, 'phase': phase}
+    return REGISTRY.get_sample_value(f'{timing.phase_seconds._name}_count', labels) or 0
+
+
+@override_settings(RESPONSE_CACHE=False)
+class ServerTimingTests(ShopTestCase):
+    """
+    Server-Timing 헤더 - 구간 순서, 쿼리 수, app = total - (db + serialize + render)
+    """
+
+    def test_header(self):
+        before = observed('product-list', 'total')
+        response = self.request('GET', '/api/products/')
+        phases = parse(response['Server-Timing'])
+        self.assertEqual(list(phases), list(timing.PHASES))
+        self.assertEqual(phases['db'][1], '3 queries')
+        durations = {name: duration for name, (duration, _) in phases.items()}
+        self.assertGreater(durations['db'], 0)
+        parts = durations['db'] + durations['serialize'] + durations['render'] + durations['app']
+        self.assertAlmostEqual(parts, durations['total'], delta=0.05)
+        self.assertEqual(observed('product-list', 'total'), before + 1)
+
+    def test_unresolved_view_label(self):
+        before = observed(timing.UNRESOLVED_VIEW, 'db')
+        with self.assertLogs('django.request', 'WARNING'):
+            response = self.request('GET', '/api/no-such-endpoint')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(parse(response['Server-Timing'])['db'], (0.0, '0 queries'))
+        self.assertEqual(observed(timing.UNRESOLVED_VIEW, 'db'), before + 1)
+
+    @override_settings(SERVER_TIMING=False)
+    def test_disabled(self):
+        self.assertNotIn('Server-Timing', self.request('GET', '/api/products/'))
+
+    @override_settings(SERVER_TIMING_LOG_SLOW_MS=0, SERVER_TIMING_LOG_SAMPLE_RATE=0)
+    def test_slow_request_log(self):
+        with self.assertLogs('shop.timing', 'INFO') as logs:
+            self.request('GET', f'/api/products/{self.product.pk}/')
+        entry = json.loads(logs.records[0].getMessage())
+        self.assertEqual(
+            {key: entry[key] for key in ('event', 'view', 'method', 'status', 'queries', 'slow')},
+            {'event': 'request_timing', 'view': 'product-detail', 'method': 'GET', 'status': 200,
+             'queries': 2, 'slow': True},
+        )
+
+    @override_settings(SERVER_TIMING_LOG_SLOW_MS=60_000, SERVER_TIMING_LOG_SAMPLE_RATE=0)
+    def test_fast_request_not_logged(self):
+        with self.assertNoLogs('shop.timing', 'INFO'):
+            self.request('GET', '/api/products/')
+
+
+class PhaseTests(SimpleTestCase):
+    """
+    phase() - 안에서 실행된 SQL 시간은 빼고, 중첩 구간은 바깥에서만 센다
+    """
+
+    def test_nested_and_db_excluded(self):
+        timings = timing.Timings()
+        token = timing._timings.set(timings)
+        try:
+            started = time.perf_counter()
+            with timing.phase('serialize'):
+                time.sleep(0.02)
+                timings.db += 0.01     # 안쪽 SQL 10ms
+                with timing.phase('render'):
+                    pass
+            elapsed = time.perf_counter() - started
+        finally:
+            timing._timings.reset(token)
+        self.assertEqual(timings.render, 0.0)
+        self.assertGreaterEqual(timings.serialize, 0.009)
+        self.assertLessEqual(timings.serialize, elapsed - 0.01)
+        self.assertIsNone(timings.active)
+
+    def test_no_request(self):
+        with timing.phase('render'):
+            pass
+        self.assertIsNone(timing._timings.get())
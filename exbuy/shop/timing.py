@@ -0,0 +1,241 @@
+"""
+요청 구간별 시간 측정 (ServerTimingMiddleware) - Server-Timing 헤더, view별 Prometheus 히스토그램, 구조화 로그
+
+구간
+- db: SQL 실행 시간 합 (연결 execute wrapper, 모든 DB 별칭 - sync_to_async 스레드 포함)
+- serialize: Serializer.data / FastSerializer.to_representation (안에서 실행된 SQL 시간은 db로 빼고 센다)
+- render: Response.rendered_content (DRF 렌더러 - orjson/json/msgpack) 와 async 뷰의 _render
+- app: 전체 - 위 구간 (미들웨어, 파싱, 뷰 로직, 캐시 조회 등)
+- total: 이 미들웨어 안쪽 전체
+
+    Server-Timing: db;dur=1.84;desc="3 queries", serialize;dur=0.92, render;dur=0.21, app;dur=0.64, total;dur=3.61
+
+측정 중이 아닐 때 훅의 추가 비용은 ContextVar 조회 1회다. 측정 중에는 구간마다 perf_counter 2회,
+요청마다 히스토그램 관측 5회 - k6 부하 중에도 켜 둘 수 있다 (SERVER_TIMING=False로 끄면 미들웨어는 그대로 통과).
+구조화 로그(shop.timing 로거, JSON 한 줄)는 SERVER_TIMING_LOG_SAMPLE_RATE 비율과
+SERVER_TIMING_LOG_SLOW_MS 이상 걸린 요청만 남긴다.
+"""
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django_prometheus.conf import NAMESPACE
+from prometheus_client import Histogram
+
+
+logger = logging.getLogger(__name__)
+
+PHASES = ('db', 'serialize', 'render', 'app', 'total')
+
+# 해석되지 않은 URL(404)은 view 라벨 하나로 모은다 (라벨 수 제한)
+UNRESOLVED_VIEW = '<unresolved>'
+
+
+# =============== Prometheus 메트릭 (/metrics) ===============
+phase_seconds = Histogram(
+    'django_request_phase_seconds', '요청 구간별 시간 (phase: db / serialize / render / app / total)',
+    ['view', 'phase'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+    namespace=NAMESPACE,
+)
+
+_children = {}
+
+
+def _observers(view):
+    # view별 라벨 자식을 캐시 - 요청마다 labels() 조회를 반복하지 않는다
+    observers = _children.get(view)
+    if observers is None:
+        observers = _children[view] = [phase_seconds.labels(view=view, phase=phase).observe for phase in PHASES]
+    return observers
+
+
+# =============== 요청별 기록 ===============
+class Timings:
+    """
+    db/serialize/render: 누적 시간 (초), queries: SQL 실행 수
+    active: 측정 중인 구간 - 중첩된 같은 종류 호출(SerializerMethodField 안의 .data 등)은 바깥에서만 센다
+    """
+    __slots__ = ('db', 'queries', 'serialize', 'render', 'active')
+
+    def __init__(self):
+        self.db = 0.0
+        self.queries = 0
+        self.serialize = 0.0
+        self.render = 0.0
+        self.active = None
+
+    def phases(self, total):
+        """
+        반환: PHASES 순서의 시간 (초)
+        """
+        app = max(total - self.db - self.serialize - self.render, 0.0)
+        return self.db, self.serialize, self.render, app, total
+
+    def header(self, total):
+        db, serialize, render, app, total = self.phases(total)
+        return (
+            f'db;dur={db * 1000:.2f};desc="{self.queries} queries", serialize;dur={serialize * 1000:.2f}, '
+            f'render;dur={render * 1000:.2f}, app;dur={app * 1000:.2f}, total;dur={total * 1000:.2f}'
+        )
+
+
+_timings = ContextVar('request_timings', default=None)
+
+# 중첩 atomic의 트랜잭션 제어문은 세지 않는다 (shop/querybudget.py와 같은 기준)
+_TRANSACTION_CONTROL = ('SAVEPOINT ', 'RELEASE SAVEPOINT ', 'ROLLBACK TO SAVEPOINT ')
+
+
+def _execute_wrapper(execute, sql, params, many, context):
+    timings = _timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db += time.perf_counter() - started
+        if not sql.startswith(_TRANSACTION_CONTROL):
+            timings.queries += 1
+
+
+@receiver(connection_created)
+def _install_wrapper(sender, connection, **kwargs):
+    if _execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_execute_wrapper)
+
+
+@contextmanager
+def phase(name):
+    """
+    블록 시간을 name('serialize' / 'render') 구간에 더한다 - 안에서 실행된 SQL 시간은 빼고
+        with phase('render'):
+            body = renderer.render(data)
+    """
+    timings = _timings.get()
+    if timings is None or timings.active is not None:
+        yield
+        return
+    timings.active = name
+    db = timings.db
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started - (timings.db - db)
+        setattr(timings, name, getattr(timings, name) + elapsed)
+        timings.active = None
+
+
+def timed(name):
+    """
+    phase(name)의 데코레이터 형태 - 측정 중이 아니면 ContextVar 조회 1회만 추가된다
+    """
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if _timings.get() is None:
+                return function(*args, **kwargs)
+            with phase(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def install():
+    """
+    DRF 직렬화/렌더링 진입점에 구간 측정을 건다 (ShopConfig.ready에서 한 번)
+    - BaseSerializer.data: Serializer.data / ListSerializer.data가 모두 super().data로 거친다
+    - Response.rendered_content: SimpleTemplateResponse.render()가 읽는 본문
+    """
+    from rest_framework.response import Response
+    from rest_framework.serializers import BaseSerializer
+
+    for cls, name, phase_name in (
+        (BaseSerializer, 'data', 'serialize'),
+        (Response, 'rendered_content', 'render'),
+    ):
+        prop = cls.__dict__[name]
+        if not getattr(prop.fget, '_timed', False):
+            fget = timed(phase_name)(prop.fget)
+            fget._timed = True
+            setattr(cls, name, property(fget, prop.fset, prop.fdel, prop.__doc__))
+
+
+# =============== 미들웨어 ===============
+class ServerTimingMiddleware:
+    """
+    요청마다 Timings를 ContextVar에 두고, 응답에 Server-Timing 헤더를 붙이고 view(URL 이름) 라벨로 관측한다
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = settings.SERVER_TIMING
+        self.log_sample_rate = settings.SERVER_TIMING_LOG_SAMPLE_RATE
+        self.log_slow = settings.SERVER_TIMING_LOG_SLOW_MS / 1000
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+        timings = Timings()
+        token = _timings.set(timings)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _timings.reset(token)
+        self._finish(request, response, timings, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+        timings = Timings()
+        token = _timings.set(timings)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _timings.reset(token)
+        self._finish(request, response, timings, time.perf_counter() - started)
+        return response
+
+    def _finish(self, request, response, timings, total):
+        response['Server-Timing'] = timings.header(total)
+
+        match = request.resolver_match
+        view = match.url_name if match is not None and match.url_name else UNRESOLVED_VIEW
+        values = timings.phases(total)
+        for observe, value in zip(_observers(view), values):
+            observe(value)
+
+        if total >= self.log_slow or (self.log_sample_rate and random.random() < self.log_sample_rate):
+            db, serialize, render, app, total = values
+            logger.info(json.dumps({
+                'event': 'request_timing',
+                'view': view,
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'queries': timings.queries,
+                'db_ms': round(db * 1000, 3),
+                'serialize_ms': round(serialize * 1000, 3),
+                'render_ms': round(render * 1000, 3),
+                'app_ms': round(app * 1000, 3),
+                'total_ms': round(total * 1000, 3),
+                'slow': total >= self.log_slow,
+            }, ensure_ascii=False))
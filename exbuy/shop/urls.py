@@ -1,6 +1,8 @@
-from django.urls import path, include
+from django.conf import settings
+from django.urls import path, re_path, include
 from rest_framework.routers import DefaultRouter
-from . import views
+from . import views, async_views
+from .querybudget import QueryBudget, declare_query_budgets
 
 # Router for ViewSets
 router = DefaultRouter()
@@ -28,9 +30,11 @@ urlpatterns = [
 
     # 9. Bulk order creation
     path('orders/bulk', views.bulk_create_orders, name='order-bulk-create'),
+    path('orders/ingest', views.ingest_orders_ndjson, name='order-ingest'),
 
     # 10. Inventory reservation
     path('inventory/reserve', views.reserve_inventory, name='inventory-reserve'),
+    path('inventory/reserve/batch', views.reserve_inventory_batch, name='inventory-reserve-batch'),
 
     # 11. Top products stats
     path('stats/top-products', views.top_products, name='stats-top-products'),
@@ -42,6 +46,68 @@ urlpatterns = [
     # 14. File upload
     path('uploads', views.FileUploadView.as_view(), name='file-upload'),
 
+    # 15. Batch - GET 하위 요청 묶음 (shop/batch.py)
+    path('batch', views.batch, name='batch'),
+
     # Include router URLs
     path('', include(router.urls)),
 ]
+
+# 엔드포인트별 쿼리 예산 (shop/querybudget.py) - 캐시 미스 기준 SQL 수, 같은 형태 SQL은 기본 3회까지
+# 조건부 GET 검증자 쿼리 포함, 트랜잭션 BEGIN/COMMIT은 세지 않음
+# 라우트가 받는 모든 메서드에 선언한다 - shop/tests/test_querybudget.py가 raise 모드로 전부 실행해 확인
+declare_query_budgets({
+    'health-check': QueryBudget(0),
+    # 검증자(MAX/COUNT) + COUNT + 페이지 (?ids= 다건 조회: 검증자 + in_bulk) / 생성: INSERT
+    'product-list': {'GET': QueryBudget(3), 'POST': QueryBudget(1)},
+    # 상세: 검증자 + 행 / 수정: 행 + UPDATE
+    # 삭제: 행 + CASCADE 대상(주문 아이템, 리뷰, 일별 판매) 일괄 DELETE + 상품 DELETE
+    'product-detail': {
+        'GET': QueryBudget(2), 'PUT': QueryBudget(2), 'PATCH': QueryBudget(2), 'DELETE': QueryBudget(5),
+    },
+    # 상품 검증자 + 리뷰 검증자 + 상품 + 리뷰(select_related)
+    'product-reviews': QueryBudget(4),
+    'product-search': QueryBudget(2),
+    # 주문 생성: 재고 차감 UPDATE + 주문/아이템 INSERT + 판매 롤업 UPSERT
+    'order-list': {'GET': QueryBudget(2), 'POST': QueryBudget(4)},
+    # 상세: 주문 + items + product (prefetch_related)
+    # 판매 롤업 변경(order_sales_change): 변경 전/후 기여분 집계 2 + 반영 UPSERT (취소로/에서 바뀔 때만)
+    # 상태 변경: 상세 3 + UPDATE + 롤업 3 / PUT: 행 + UPDATE + 롤업 3
+    # 삭제: 행 + CASCADE(아이템) + DELETE + 롤업 3
+    'order-detail': {
+        'GET': QueryBudget(3), 'PATCH': QueryBudget(7), 'PUT': QueryBudget(5), 'DELETE': QueryBudget(6),
+    },
+    'order-bulk-create': QueryBudget(4),
+    # 청크 수에 비례 - 요청당 상한 없음, 청크마다 같은 COPY/UPDATE 반복
+    'order-ingest': QueryBudget(None, repeats=None),
+    # optimistic: SELECT + UPDATE + refresh_from_db / pessimistic: SELECT FOR UPDATE + UPDATE
+    # atomic: 조건부 UPDATE (실패 시 + 원인 SELECT)
+    # batched: 묶음 SQL은 여러 요청 몫이라 세지 않음 (shop/inventory.py, querybudget.untracked)
+    'inventory-reserve': QueryBudget(3),
+    # 락 SELECT + 차감 UPDATE (+ 락을 못 잡은 상품이 있으면 원인 SELECT)
+    'inventory-reserve-batch': QueryBudget(3),
+    'stats-top-products': QueryBudget(1),
+    # 리뷰 작성: INSERT + 상품 FK 확인 + 상품 리뷰 집계 UPDATE
+    'review-list': {'GET': QueryBudget(2), 'POST': QueryBudget(3)},
+    # 수정: 행 + 행 잠금 + (PUT/상품 변경 시) 상품 FK 확인 + UPDATE + 이전/새 상품 집계 UPDATE
+    # 삭제: 행 + 행 잠금 + DELETE + 집계 UPDATE
+    'review-detail': {
+        'GET': QueryBudget(1), 'PUT': QueryBudget(6), 'PATCH': QueryBudget(6), 'DELETE': QueryBudget(4),
+    },
+    'file-upload': QueryBudget(0),
+    # 하위 요청 수에 비례 - 같은 형태의 상세 조회가 반복되는 것이 정상
+    'batch': QueryBudget(None, repeats=None),
+})
+
+# ASGI(Uvicorn) 배포: 읽기 엔드포인트를 네이티브 async 뷰로 우선 매칭
+# (GET 이외의 메서드는 async 뷰 내부에서 기존 DRF 뷰로 위임)
+if settings.ASYNC_VIEWS:
+    urlpatterns = [
+        path('search/products', async_views.search_products, name='product-search'),
+        path('stats/top-products', async_views.top_products, name='stats-top-products'),
+        re_path(r'^products/$', async_views.product_list, name='product-list'),
+        re_path(r'^products/(?P<pk>[^/.]+)/$', async_views.product_detail, name='product-detail'),
+        re_path(r'^products/(?P<pk>[^/.]+)/reviews/$', async_views.product_reviews, name='product-reviews'),
+        re_path(r'^reviews/$', async_views.review_list, name='review-list'),
+        re_path(r'^reviews/(?P<pk>[^/.]+)/$', async_views.review_detail, name='review-detail'),
+    ] + urlpatterns
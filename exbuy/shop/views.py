@@ -1,6 +1,11 @@
+import logging
+
+from django.conf import settings
+from django.http import Http404
 from django.shortcuts import get_object_or_404
-from django.db import transaction
-from django.db.models import F, Sum, Count, Q, Avg
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
 from rest_framework import status, viewsets
 from rest_framework.decorators import api_view, action
 from rest_framework.response import Response
@@ -8,17 +13,39 @@ from rest_framework.views import APIView
 from rest_framework.parsers import MultiPartParser, FormParser
 from decimal import Decimal
 
+from .aggregates import SALES_EXCLUDED_STATUSES, apply_review, apply_sales, order_sales_change
+from .batch import run_batch
+from .ingest import MAX_CHUNK_SIZE as MAX_INGEST_CHUNK_SIZE, IngestError, ingest_orders
+from .inventory import (
+    CART_LOCK_MODES, INSUFFICIENT, NOT_FOUND, decrement_stock, inventory_lock_wait, reserve_atomic, reserve_batched,
+    reserve_cart, stock_failures,
+)
+from .fast_serializers import FastListMixin, compile_serializer, fast_serializers_enabled
+from .conditional import (
+    conditional_cached_get, product_detail_state, product_list_state, product_reviews_state,
+)
+from .cache import (
+    cached_data, category_version_keys, product_version_keys,
+    invalidate_products, invalidate_product_details,
+)
 from .models import Product, Order, OrderItem, Review
+from .pagination import SearchPagination
+from .queries import (
+    product_ids_param, product_queryset, search_queryset, review_queryset, top_products_queryset
+)
 from .serializers import (
-    ProductListSerializer, ProductDetailSerializer, ProductDetailOptimizedSerializer,
+    ProductListSerializer, ProductSearchSerializer, ProductDetailSerializer, ProductDetailOptimizedSerializer,
     ReviewSerializer, ReviewListSerializer, ReviewListOptimizedSerializer,
     OrderListSerializer, OrderDetailSerializer, OrderCreateSerializer,
     OrderStatusUpdateSerializer, BulkOrderCreateSerializer,
-    InventoryReserveSerializer, TopProductSerializer,
-    OrderItemSerializer
+    InventoryReserveSerializer, InventoryBatchReserveSerializer,
+    OrderItemSerializer, BatchSerializer
 )
 
 
+logger = logging.getLogger(__name__)
+
+
 # =============== 1. Health Check ===============
 @api_view(['GET'])
 def health_check(request):
@@ -29,118 +56,157 @@ def health_check(request):
 
 
 # =============== 2-5. Product Views ===============
-class ProductViewSet(viewsets.ModelViewSet):
+def product_multi_get_version_keys(ids):
+    return [key for product_id in ids for key in product_version_keys(product_id)]
+
+
+def product_multi_get_data(ids, products):
+    """
+    다건 조회 응답 - results는 요청한 id 순서의 상세 응답, 없는 id는 missing으로
+    products: in_bulk 결과 {id: Product}
+    """
+    return {
+        'results': ProductDetailSerializer(
+            [products[product_id] for product_id in ids if product_id in products], many=True
+        ).data,
+        'missing': [product_id for product_id in ids if product_id not in products],
+    }
+
+
+class ProductViewSet(FastListMixin, viewsets.ModelViewSet):
     """
     상품 CRUD - 읽기 중심 성능 테스트용
     """
     queryset = Product.objects.all()
     serializer_class = ProductListSerializer
 
+    # 키셋 페이지네이션(?pagination=cursor) 허용 정렬 - (정렬키, id) 복합 인덱스 존재
+    keyset_orderings = ('created_at', 'price')
+
     def get_queryset(self):
         """
         Level B: 필터링, 정렬, 페이지네이션
         ?category=electronics&min_price=100&max_price=1000&ordering=-price
         기본적으로 최적화 적용 (annotate로 review_count, average_rating 계산)
         """
-        queryset = Product.objects.all()
-
-        # 필터링
-        category = self.request.query_params.get('category')
-        if category:
-            queryset = queryset.filter(category=category)
+        return product_queryset(self.request.query_params, self.action)
 
-        min_price = self.request.query_params.get('min_price')
-        if min_price:
-            queryset = queryset.filter(price__gte=min_price)
+    def get_serializer_class(self):
+        if self.action == 'retrieve':
+            return ProductDetailSerializer
+        return ProductListSerializer
 
-        max_price = self.request.query_params.get('max_price')
-        if max_price:
-            queryset = queryset.filter(price__lte=max_price)
+    # 목록/상세: 응답 캐시(쓰기 시 버전 카운터로 무효화, 검증자 포함) → 조건부 GET(ETag/Last-Modified, 304) → DB
+    def list(self, request, *args, **kwargs):
+        if 'ids' in request.query_params:
+            return self.multi_get(request)
+        return conditional_cached_get(
+            request, 'product-list',
+            category_version_keys(request.query_params.get('category')),
+            lambda: product_list_state(self.get_queryset()),
+            lambda: super(ProductViewSet, self).list(request, *args, **kwargs).data,
+        )
 
-        # 검색
-        q = self.request.query_params.get('q')
-        if q:
-            queryset = queryset.filter(Q(name__icontains=q) | Q(description__icontains=q))
+    def retrieve(self, request, *args, **kwargs):
+        return conditional_cached_get(
+            request, 'product-detail',
+            product_version_keys(kwargs['pk']),
+            lambda: product_detail_state(self.get_queryset(), kwargs['pk']),
+            lambda: super(ProductViewSet, self).retrieve(request, *args, **kwargs).data,
+        )
 
-        # 정렬
-        ordering = self.request.query_params.get('ordering', '-created_at')
-        queryset = queryset.order_by(ordering)
+    def multi_get(self, request):
+        """
+        GET /products?ids=3,1,2
+        상세 응답 여러 개를 쿼리 1번(in_bulk)으로 - 검증자는 지정한 상품 집합, 캐시는 상품별 버전에 의존
+        """
+        ids = product_ids_param(request.query_params)
+        return conditional_cached_get(
+            request, 'product-multi-get',
+            product_multi_get_version_keys(ids),
+            lambda: product_list_state(self.get_queryset()),
+            lambda: product_multi_get_data(ids, self.get_queryset().in_bulk(ids)),
+        )
 
-        # 상세 조회 시 리뷰 통계를 DB에서 계산 (N+1 방지)
-        if self.action == 'retrieve':
-            queryset = queryset.annotate(
-                review_count=Count('reviews'),
-                average_rating=Avg('reviews__rating')
-            )
+    def perform_create(self, serializer):
+        product = serializer.save()
+        invalidate_products([product])
 
-        return queryset
+    def perform_update(self, serializer):
+        before = (serializer.instance.pk, serializer.instance.category)
+        product = serializer.save()
+        invalidate_products([before, product])
 
-    def get_serializer_class(self):
-        if self.action == 'retrieve':
-            return ProductDetailSerializer
-        return ProductListSerializer
+    def perform_destroy(self, instance):
+        invalidate_products([instance])
+        instance.delete()
 
     @action(detail=True, methods=['get'])
     def reviews(self, request, pk=None):
         """
         3. GET /products/{id}/reviews
         Level B-C: 기본적으로 최적화 적용 (select_related)
+        조건부 GET(ETag/Last-Modified) 지원 - 변경이 없으면 304, 응답 캐시는 상품 버전에 의존 (리뷰 쓰기 시 증가)
         """
-        product = self.get_object()
-        # 기본적으로 select_related 적용하여 N+1 방지
-        reviews = product.reviews.select_related('product').all()
-        serializer = ReviewListSerializer(reviews, many=True)
-        return Response(serializer.data)
+        def build():
+            product = self.get_object()
+            # 기본적으로 select_related 적용하여 N+1 방지
+            reviews = product.reviews.select_related('product').defer('product__search_vector')
+            if self.use_fast_list():
+                fast = compile_serializer(ReviewListSerializer)
+                return fast.to_representation(fast.values(reviews))
+            return ReviewListSerializer(reviews, many=True).data
+
+        return conditional_cached_get(
+            request, 'product-reviews', product_version_keys(pk),
+            lambda: product_reviews_state(self.get_queryset(), pk),
+            build,
+        )
 
 
 @api_view(['GET'])
 def search_products(request):
     """
     5. GET /search/products
-    Level B: 텍스트 검색 + 복합 필터
-    ?q=laptop&category=electronics&min_price=500
+    Level B: 전문 검색(랭킹) + 복합 필터 + 페이지네이션
+    ?q=laptop&category=electronics&min_price=500&page=1&page_size=20
     """
-    queryset = Product.objects.all()
-
-    q = request.query_params.get('q', '')
-    if q:
-        queryset = queryset.filter(
-            Q(name__icontains=q) | Q(description__icontains=q)
-        )
+    def build():
+        queryset = search_queryset(request.query_params)
 
-    category = request.query_params.get('category')
-    if category:
-        queryset = queryset.filter(category=category)
+        paginator = SearchPagination()
+        if fast_serializers_enabled():
+            # values() + 컴파일된 변환기 (shop/fast_serializers.py)
+            fast = compile_serializer(ProductSearchSerializer)
+            page = paginator.paginate_queryset(fast.values(queryset), request)
+            return paginator.get_paginated_data(fast.to_representation(page))
 
-    min_price = request.query_params.get('min_price')
-    if min_price:
-        queryset = queryset.filter(price__gte=min_price)
+        page = paginator.paginate_queryset(queryset, request)
+        serializer = ProductSearchSerializer(page, many=True)
+        return paginator.get_paginated_data(serializer.data)
 
-    max_price = request.query_params.get('max_price')
-    if max_price:
-        queryset = queryset.filter(price__lte=max_price)
-
-    in_stock = request.query_params.get('in_stock')
-    if in_stock == 'true':
-        queryset = queryset.filter(stock__gt=0)
-
-    serializer = ProductListSerializer(queryset, many=True)
-    return Response(serializer.data)
+    # 응답 캐시 (shop/cache.py)
+    return Response(cached_data(
+        'product-search', request, category_version_keys(request.query_params.get('category')), build
+    ))
 
 
 # =============== 6-9. Order Views ===============
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(FastListMixin, viewsets.ModelViewSet):
     """
     주문 관리 - 쓰기/트랜잭션 테스트용
     """
     queryset = Order.objects.all()
     serializer_class = OrderListSerializer
 
+    # 키셋 페이지네이션(?pagination=cursor) 허용 정렬 - (정렬키, id) 복합 인덱스 존재
+    keyset_orderings = ('created_at',)
+
     def get_queryset(self):
         queryset = Order.objects.all()
 
-        # 최적화: 상세 조회 시 items와 product를 기본적으로 prefetch (N+1 방지)
-        if self.action == 'retrieve':
+        # 최적화: 상세 조회/상태 변경(응답이 상세 형식) 시 items와 product를 기본적으로 prefetch (N+1 방지)
+        if self.action in ('retrieve', 'partial_update'):
             queryset = queryset.prefetch_related('items__product')
 
         return queryset
@@ -159,8 +225,8 @@ class OrderViewSet(viewsets.ModelViewSet):
         """
         6. POST /orders
         Level C: 트랜잭션 + 다건 insert + 재고 차감 (최적화됨)
-        - in_bulk()로 상품 일괄 조회
-        - bulk_update()로 재고 일괄 업데이트
+        - 조건부 UPDATE 1문으로 재고 확인 + 차감 + 가격 조회 (동시 주문의 차감 유실 없음)
+        - 주문/아이템은 INSERT ... RETURNING 각 1회, 응답은 메모리의 아이템으로 직렬화
         """
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -168,76 +234,131 @@ class OrderViewSet(viewsets.ModelViewSet):
         user_id = serializer.validated_data['user_id']
         items_data = serializer.validated_data['items']
 
-        # 1. 모든 상품을 한 번에 조회 (N번 쿼리 → 1번 쿼리)
-        product_ids = [item['product_id'] for item in items_data]
-        products = Product.objects.in_bulk(product_ids)
-
-        # 존재하지 않는 상품 확인
-        for product_id in product_ids:
-            if product_id not in products:
-                return Response(
-                    {'error': f'상품 ID {product_id}를 찾을 수 없습니다.'},
-                    status=status.HTTP_404_NOT_FOUND
-                )
-
-        # 2. 주문 생성
-        order = Order.objects.create(user_id=user_id, total_price=0)
-        total_price = Decimal('0.00')
-
-        # 3. 주문 아이템 생성 준비 + 재고 확인
-        order_items = []
-        products_to_update = []
-
-        for item_data in items_data:
-            product = products[item_data['product_id']]
-
-            # 재고 확인
-            if product.stock < item_data['quantity']:
-                raise ValueError(f"재고 부족: {product.name}")
-
-            # 재고 차감 준비
-            product.stock -= item_data['quantity']
-            products_to_update.append(product)
-
-            # 주문 아이템 생성 준비
-            order_item = OrderItem(
-                order=order,
-                product=product,
-                quantity=item_data['quantity'],
-                unit_price=product.price
-            )
-            order_items.append(order_item)
-            total_price += product.price * item_data['quantity']
-
-        # 4. 벌크 업데이트 (N번 UPDATE → 1번 UPDATE)
-        Product.objects.bulk_update(products_to_update, ['stock'])
+        # 1. 재고 차감 (상품별 합계, 재고 부족/없는 상품이 있으면 롤백 후 409/404)
+        quantities = _order_quantities([items_data])
+        now = timezone.now()
+        with connection.cursor() as cursor:
+            products = decrement_stock(cursor, quantities, now)
+            if len(products) < len(quantities):
+                return _stock_failure_response(cursor, quantities, products)
+
+        # 2. 주문 생성 (총액까지 계산한 뒤 INSERT 1회)
+        order_items = _order_items(items_data, products)
+        order = Order.objects.create(
+            user_id=user_id,
+            total_price=sum((item.subtotal for item in order_items), Decimal('0.00'))
+        )
 
-        # 5. 주문 아이템 벌크 생성
+        # 3. 주문 아이템 벌크 생성
+        for item in order_items:
+            item.order = order
         OrderItem.objects.bulk_create(order_items)
 
-        # 6. 총액 업데이트
-        order.total_price = total_price
-        order.save()
+        # 4. 일별 판매 롤업 증분 갱신
+        apply_sales([
+            (order.id, order.created_at, item.product_id, item.quantity, item.unit_price)
+            for item in order_items
+        ])
+
+        # 5. 재고가 바뀐 상품의 응답 캐시 무효화 (커밋 후)
+        invalidate_products((product_id, row[1]) for product_id, row in products.items())
 
         return Response(
-            OrderDetailSerializer(order).data,
+            _order_detail_data(order, order_items),
             status=status.HTTP_201_CREATED
         )
 
+    @transaction.atomic
     def partial_update(self, request, *args, **kwargs):
         """
         8. PATCH /orders/{id}
         Level A: 단순 상태 업데이트
+        취소(cancelled)로/에서 바뀌면 일별 판매 롤업에서 빼거나 다시 더한다.
         """
         order = self.get_object()
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        order.status = serializer.validated_data['status']
-        order.save()
+        new_status = serializer.validated_data['status']
+        if (order.status in SALES_EXCLUDED_STATUSES) != (new_status in SALES_EXCLUDED_STATUSES):
+            with order_sales_change([order.pk]):
+                order.status = new_status
+                order.save()
+        else:
+            order.status = new_status
+            order.save()
 
         return Response(OrderDetailSerializer(order).data)
 
+    # PUT/DELETE도 판매 롤업에 반영 (변경 전 기여분 제거 후 재반영)
+    @transaction.atomic
+    def perform_update(self, serializer):
+        with order_sales_change([serializer.instance.pk]):
+            serializer.save()
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        with order_sales_change([instance.pk]):
+            instance.delete()
+
+
+def _order_quantities(orders_items):
+    """
+    주문(들)의 아이템을 상품별 차감량으로 합산
+    """
+    quantities = {}
+    for items_data in orders_items:
+        for item_data in items_data:
+            product_id = item_data['product_id']
+            quantities[product_id] = quantities.get(product_id, 0) + item_data['quantity']
+    return quantities
+
+
+def _order_items(items_data, products):
+    """
+    decrement_stock 결과(가격, 이름)로 OrderItem 준비 - product는 응답 직렬화용 메모리 인스턴스
+    """
+    return [
+        OrderItem(
+            product=Product(
+                id=item_data['product_id'],
+                price=products[item_data['product_id']][2],
+                name=products[item_data['product_id']][3],
+            ),
+            quantity=item_data['quantity'],
+            unit_price=products[item_data['product_id']][2]
+        )
+        for item_data in items_data
+    ]
+
+
+def _stock_failure_response(cursor, quantities, products):
+    """
+    차감되지 않은 상품이 있으면 트랜잭션(이미 차감한 상품 포함)을 롤백하고 404/409 응답
+    """
+    missing, shortages = stock_failures(cursor, quantities, products)
+    transaction.set_rollback(True)
+    if missing:
+        return Response(
+            {'error': f'상품 ID {missing[0]}를 찾을 수 없습니다.'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    return Response(
+        {
+            'error': f"재고 부족: {', '.join(shortage['name'] for shortage in shortages)}",
+            'shortages': shortages,
+        },
+        status=status.HTTP_409_CONFLICT
+    )
+
+
+def _order_detail_data(order, order_items):
+    """
+    방금 생성한 주문의 상세 응답 - items/product 재조회 없이 메모리의 아이템 사용
+    """
+    order._prefetched_objects_cache = {'items': order_items}
+    return OrderDetailSerializer(order).data
+
 
 @api_view(['POST'])
 @transaction.atomic
@@ -245,95 +366,52 @@ def bulk_create_orders(request):
     """
     9. POST /orders/bulk
     Level C: 벌크 인서트 성능 테스트 (대폭 최적화됨)
-    - 모든 상품을 한 번에 조회 (600번 → 1번)
-    - bulk_create/bulk_update 활용
+    - 전체 주문의 상품별 합계를 조건부 UPDATE 1문으로 차감 (재고 확인 + 가격 조회 포함)
+    - 주문/아이템은 bulk_create (INSERT ... RETURNING) 각 1회
     """
     serializer = BulkOrderCreateSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
 
     orders_data = serializer.validated_data['orders']
 
-    # 1. 모든 상품 ID를 수집하여 한 번에 조회 (최적화 핵심!)
-    all_product_ids = set()
-    for order_data in orders_data:
-        for item_data in order_data['items']:
-            all_product_ids.add(item_data['product_id'])
-
-    products = Product.objects.in_bulk(list(all_product_ids))
+    # 1. 재고 차감 (전체 주문의 상품별 합계, 하나라도 부족하면 전체 롤백 후 409)
+    quantities = _order_quantities(order_data['items'] for order_data in orders_data)
+    now = timezone.now()
+    with connection.cursor() as cursor:
+        products = decrement_stock(cursor, quantities, now)
+        if len(products) < len(quantities):
+            return _stock_failure_response(cursor, quantities, products)
 
-    # 존재하지 않는 상품 확인
-    for product_id in all_product_ids:
-        if product_id not in products:
-            return Response(
-                {'error': f'상품 ID {product_id}를 찾을 수 없습니다.'},
-                status=status.HTTP_404_NOT_FOUND
-            )
-
-    # 2. 주문 및 아이템 생성 준비
+    # 2. 주문 및 아이템 준비 (총액은 차감 시점 가격으로 계산)
     orders_to_create = []
-    order_items_to_create = []
-    product_stock_changes = {}  # product_id -> 차감량
-
+    order_items_by_order = []
     for order_data in orders_data:
-        user_id = order_data['user_id']
-        items_data = order_data['items']
-        total_price = Decimal('0.00')
-
-        # 주문 객체 생성 (아직 DB에 저장 안함)
-        order = Order(user_id=user_id, total_price=0)
-        orders_to_create.append(order)
-
-        # 주문 아이템 준비 (order는 나중에 연결)
-        order_item_info = []
-        for item_data in items_data:
-            product = products[item_data['product_id']]
-            quantity = item_data['quantity']
-
-            # 재고 확인
-            current_deduction = product_stock_changes.get(product.id, 0)
-            if product.stock - current_deduction < quantity:
-                raise ValueError(f"재고 부족: {product.name}")
-
-            # 재고 차감량 누적
-            product_stock_changes[product.id] = current_deduction + quantity
-
-            # 주문 아이템 정보 저장 (order 연결은 나중에)
-            order_item_info.append({
-                'product': product,
-                'quantity': quantity,
-                'unit_price': product.price
-            })
-            total_price += product.price * quantity
-
-        order.total_price = total_price
-        # order와 연결할 아이템 정보 저장
-        order._items_info = order_item_info
-
-    # 3. 주문 벌크 생성 (N번 INSERT → 1번 INSERT)
+        order_items = _order_items(order_data['items'], products)
+        orders_to_create.append(Order(
+            user_id=order_data['user_id'],
+            total_price=sum((item.subtotal for item in order_items), Decimal('0.00'))
+        ))
+        order_items_by_order.append(order_items)
+
+    # 3. 주문 벌크 생성 (N번 INSERT → 1번 INSERT ... RETURNING id)
     Order.objects.bulk_create(orders_to_create)
 
-    # 4. 주문 아이템 생성 (order.id가 할당된 후)
-    for order in orders_to_create:
-        for item_info in order._items_info:
-            order_item = OrderItem(
-                order=order,
-                product=item_info['product'],
-                quantity=item_info['quantity'],
-                unit_price=item_info['unit_price']
-            )
-            order_items_to_create.append(order_item)
-
-    # 5. 주문 아이템 벌크 생성
+    # 4. 주문 아이템 벌크 생성 (order.id가 할당된 후)
+    order_items_to_create = []
+    for order, order_items in zip(orders_to_create, order_items_by_order):
+        for item in order_items:
+            item.order = order
+            order_items_to_create.append(item)
     OrderItem.objects.bulk_create(order_items_to_create)
 
-    # 6. 재고 벌크 업데이트 (N번 UPDATE → 1번 UPDATE)
-    products_to_update = []
-    for product_id, deduction in product_stock_changes.items():
-        product = products[product_id]
-        product.stock -= deduction
-        products_to_update.append(product)
+    # 5. 일별 판매 롤업 증분 갱신 (전체 주문을 (상품, 일자)별로 합쳐 1번 UPSERT)
+    apply_sales([
+        (item.order_id, item.order.created_at, item.product_id, item.quantity, item.unit_price)
+        for item in order_items_to_create
+    ])
 
-    Product.objects.bulk_update(products_to_update, ['stock'])
+    # 6. 재고가 바뀐 상품의 응답 캐시 무효화 (커밋 후)
+    invalidate_products((product_id, row[1]) for product_id, row in products.items())
 
     return Response(
         {'created': len(orders_to_create), 'order_ids': [o.id for o in orders_to_create]},
@@ -341,14 +419,61 @@ def bulk_create_orders(request):
     )
 
 
+def _request_body_stream(request):
+    """
+    본문 원본 스트림 (request.data 대신 직접 읽어 본문 전체를 메모리에 올리지 않음)
+    DRF request.stream은 Content-Length가 없으면 None이므로 Django 요청에서 직접 얻는다.
+    - ASGI: 서버가 받은 본문 파일 전체 (Content-Length 무관)
+    - WSGI + Content-Length: 그 길이까지 (LimitedStream)
+    - WSGI chunked 전송: 서버가 본문 끝을 알려줄 때(wsgi.input_terminated - gunicorn)만 wsgi.input을 끝까지
+    """
+    django_request = request._request
+    environ = getattr(django_request, 'environ', None)
+    if environ is not None and not environ.get('CONTENT_LENGTH') and environ.get('wsgi.input_terminated'):
+        return environ['wsgi.input']
+    return django_request
+
+
+@api_view(['POST'])
+def ingest_orders_ndjson(request):
+    """
+    9-1. POST /orders/ingest
+    Level C: 대용량 주문 스트리밍 적재 (NDJSON, 줄당 주문 1건, 크기 제한 없음)
+    ?chunk_size=1000 - 청크마다 커밋, 주문/아이템은 COPY로 적재
+    재고 부족/없는 상품/형식 오류 줄은 거부하고 나머지는 계속 적재 (합계 + 거부 줄 앞 100건 반환)
+    """
+    try:
+        chunk_size = int(request.query_params.get('chunk_size', settings.ORDER_INGEST_CHUNK_SIZE))
+    except ValueError:
+        chunk_size = 0
+    if not 1 <= chunk_size <= MAX_INGEST_CHUNK_SIZE:
+        return Response(
+            {'chunk_size': f'1 이상 {MAX_INGEST_CHUNK_SIZE} 이하의 정수여야 합니다.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        summary = ingest_orders(_request_body_stream(request), chunk_size)
+    except IngestError as exc:
+        # 앞선 청크는 커밋됨 - 클라이언트는 committed_through_line 다음 줄부터 다시 보낸다
+        logger.exception('주문 적재 실패 (%s번째 줄까지 커밋)', exc.summary['committed_through_line'])
+        return Response(
+            {**exc.summary, 'error': str(exc)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    if not summary['lines']:
+        return Response({'error': '본문이 비어 있습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(summary, status=status.HTTP_201_CREATED if summary['created'] else status.HTTP_200_OK)
+
+
 # =============== 10. Inventory ===============
 @api_view(['POST'])
-@transaction.atomic
 def reserve_inventory(request):
     """
     10. POST /inventory/reserve
-    Level C: 동시성 제어 (낙관적/비관적 락 테스트)
-    ?lock_type=optimistic|pessimistic
+    Level C: 동시성 제어 (낙관적/비관적 락, 조건부 UPDATE, 그룹 커밋 비교)
+    ?lock_type=optimistic|pessimistic|atomic|batched
     """
     serializer = InventoryReserveSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
@@ -357,26 +482,48 @@ def reserve_inventory(request):
     quantity = serializer.validated_data['quantity']
     lock_type = request.query_params.get('lock_type', 'optimistic')
 
-    if lock_type == 'pessimistic':
-        # 비관적 락 (SELECT FOR UPDATE)
-        product = Product.objects.select_for_update().get(id=product_id)
-    else:
-        # 낙관적 락 (F() 사용)
-        product = Product.objects.get(id=product_id)
+    if lock_type in ('atomic', 'batched'):
+        # 조건부 UPDATE ... RETURNING (batched는 워커 내 요청을 묶어 1문으로)
+        reserve = reserve_atomic if lock_type == 'atomic' else reserve_batched
+        remaining = reserve(product_id, quantity)
+        if remaining == NOT_FOUND:
+            raise Http404
+        if remaining == INSUFFICIENT:
+            return Response(
+                {'error': '재고 부족'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response({
+            'product_id': product_id,
+            'reserved': quantity,
+            'remaining_stock': remaining
+        })
 
-    if product.stock < quantity:
-        return Response(
-            {'error': '재고 부족'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
+    with transaction.atomic():
+        if lock_type == 'pessimistic':
+            # 비관적 락 (SELECT FOR UPDATE)
+            with inventory_lock_wait.labels(endpoint='single', lock='wait').time():
+                product = Product.objects.select_for_update().get(id=product_id)
+        else:
+            # 낙관적 락 (F() 사용)
+            product = Product.objects.get(id=product_id)
+
+        if product.stock < quantity:
+            return Response(
+                {'error': '재고 부족'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if lock_type == 'pessimistic':
+            product.stock -= quantity
+            product.save()
+        else:
+            # F()를 사용한 원자적 업데이트
+            Product.objects.filter(id=product_id).update(stock=F('stock') - quantity, updated_at=timezone.now())
+            product.refresh_from_db()
 
-    if lock_type == 'pessimistic':
-        product.stock -= quantity
-        product.save()
-    else:
-        # F()를 사용한 원자적 업데이트
-        Product.objects.filter(id=product_id).update(stock=F('stock') - quantity)
-        product.refresh_from_db()
+        # 응답 캐시 무효화 (커밋 후)
+        invalidate_products([product])
 
     return Response({
         'product_id': product.id,
@@ -385,30 +532,44 @@ def reserve_inventory(request):
     })
 
 
+@api_view(['POST'])
+def reserve_inventory_batch(request):
+    """
+    10-1. POST /inventory/reserve/batch
+    Level C: 장바구니(다건) 재고 예약 - 한 트랜잭션, 상품 id 순 행 락, 잠긴 행은 대기하지 않음
+    ?lock=nowait|skip_locked|wait
+    {"items": [{"product_id": 1, "quantity": 2}, ...]}
+    """
+    serializer = InventoryBatchReserveSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    lock = request.query_params.get('lock', 'nowait')
+    if lock not in CART_LOCK_MODES:
+        return Response(
+            {'lock': f'{", ".join(CART_LOCK_MODES)} 중 하나여야 합니다.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    reserved, lines = reserve_cart(serializer.validated_data['items'], lock=lock)
+
+    # 예약이 하나도 반영되지 않았으면 409 (줄별 status로 원인 확인)
+    return Response(
+        {'reserved': reserved, 'items': lines},
+        status=status.HTTP_200_OK if reserved else status.HTTP_409_CONFLICT
+    )
+
+
 # =============== 11. Stats ===============
 @api_view(['GET'])
 def top_products(request):
     """
     11. GET /stats/top-products
     Level C: 집계 쿼리 (GROUP BY, JOIN)
-    ?limit=10
+    ?limit=10&from=2024-01-01&to=2024-01-31&category=electronics
+    일별 판매 롤업(ProductDailySales)에서 집계 (취소 주문 제외)
     """
-    limit = int(request.query_params.get('limit', 10))
-
     # 상품별 판매 통계
-    stats = OrderItem.objects.values(
-        'product_id',
-        'product__name'
-    ).annotate(
-        total_quantity=Sum('quantity'),
-        total_revenue=Sum(F('quantity') * F('unit_price')),
-        order_count=Count('order', distinct=True)
-    ).order_by('-total_revenue')[:limit]
-
-    serializer = TopProductSerializer(stats, many=True, context={
-        'product_id': 'product_id',
-        'product_name': 'product__name'
-    })
+    stats = top_products_queryset(request.query_params)
 
     # 수동으로 필드 매핑
     result = []
@@ -425,37 +586,59 @@ def top_products(request):
 
 
 # =============== 12-13. Review Views ===============
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(FastListMixin, viewsets.ModelViewSet):
     """
     리뷰 관리
     """
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
 
-    def get_queryset(self):
-        queryset = Review.objects.all()
-
-        # 상품별 필터
-        product_id = self.request.query_params.get('product_id')
-        if product_id:
-            queryset = queryset.filter(product_id=product_id)
-
-        # 사용자별 필터
-        user_id = self.request.query_params.get('user_id')
-        if user_id:
-            queryset = queryset.filter(user_id=user_id)
-
-        # 최적화: 목록 조회 시 기본적으로 select_related 적용 (N+1 방지)
-        if self.action == 'list':
-            queryset = queryset.select_related('product')
+    # 키셋 페이지네이션(?pagination=cursor) 허용 정렬 - (정렬키, id) 복합 인덱스 존재
+    keyset_orderings = ('created_at',)
 
-        return queryset
+    def get_queryset(self):
+        return review_queryset(self.request.query_params, self.action)
 
     def get_serializer_class(self):
         if self.action == 'list':
             return ReviewListSerializer
         return ReviewSerializer
 
+    # 리뷰 쓰기 시 상품 리뷰 집계(review_count, rating_sum, rating_N_count)를 같은 트랜잭션에서 갱신
+    # apply_review가 상품 updated_at을 바꾸므로 상세뿐 아니라 목록/검색(카테고리 버전)도 무효화
+    @transaction.atomic
+    def perform_create(self, serializer):
+        review = serializer.save()
+        category = apply_review(review.product_id, review.rating, 1)
+        invalidate_products([(review.product_id, category)])
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        # 동시 수정 시에도 이전 값을 정확히 차감하도록 행 잠금 후 현재 값 기준으로 계산
+        before = Review.objects.select_for_update().only('product_id', 'rating').get(pk=serializer.instance.pk)
+        review = serializer.save()
+        if (before.product_id, before.rating) != (review.product_id, review.rating):
+            # 상품 행 잠금 순서를 id 순으로 고정 (상품 변경 시 데드락 방지)
+            changes = sorted([
+                (before.product_id, before.rating, -1),
+                (review.product_id, review.rating, 1),
+            ])
+            invalidate_products([
+                (product_id, apply_review(product_id, rating, delta)) for product_id, rating, delta in changes
+            ])
+        else:
+            # 평점/상품이 그대로면 상품 행은 바뀌지 않는다 - 리뷰 본문이 보이는 상품 리뷰 목록만 무효화
+            invalidate_product_details([review.product_id])
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        current = Review.objects.select_for_update().only('product_id', 'rating').filter(pk=instance.pk).first()
+        if current is None:
+            return
+        current.delete()
+        category = apply_review(current.product_id, current.rating, -1)
+        invalidate_products([(current.product_id, category)])
+
 
 # =============== 14. File Upload ===============
 class FileUploadView(APIView):
@@ -488,3 +671,18 @@ class FileUploadView(APIView):
             'content_type': file_obj.content_type,
             'status': 'uploaded'
         }, status=status.HTTP_201_CREATED)
+
+
+# =============== 15. Batch ===============
+@api_view(['POST'])
+def batch(request):
+    """
+    15. POST /batch
+    GET 하위 요청 여러 개를 프로세스 안에서 실행해 한 응답으로 (shop/batch.py)
+    {"requests": [{"method": "GET", "path": "/api/products/1/"}, {"path": "/api/orders/3/"}, ...]}
+    → {"responses": [{"path": ..., "status": 200, "body": {...}}, ...]} (요청 순서, 항목별 상태 코드)
+    """
+    serializer = BatchSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    paths = [item['path'] for item in serializer.validated_data['requests']]
+    return Response({'responses': run_batch(request._request, paths)})